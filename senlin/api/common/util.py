@@ -11,13 +11,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import functools
 
 import jsonschema
+from oslo_serialization import jsonutils
 from oslo_utils import strutils
 import six
 from webob import exc
 
+from senlin.common import consts
 from senlin.common.i18n import _
 from senlin.common import policy
 from senlin.objects import base as obj_base
@@ -110,6 +113,56 @@ def get_allowed_params(params, whitelist):
     return allowed_params
 
 
+def encode_cursor(marker):
+    """Encode the ID of the last item of a page into an opaque cursor."""
+    data = jsonutils.dump_as_bytes({consts.PARAM_MARKER: marker})
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into the ID of the last item of a page."""
+    padding = '=' * (-len(cursor) % 4)
+    try:
+        data = base64.urlsafe_b64decode(str(cursor + padding))
+        return jsonutils.loads(data)[consts.PARAM_MARKER]
+    except (KeyError, TypeError, ValueError):
+        raise exc.HTTPBadRequest(_("Invalid cursor '%s'") % cursor)
+
+
+def parse_cursor_param(params):
+    """Replace the ``cursor`` entry of ``params`` by the marker it holds.
+
+    :param params: a dict of parameters returned by `get_allowed_params`.
+    """
+    cursor = params.pop(consts.PARAM_CURSOR, None)
+    if cursor is None:
+        return
+
+    if consts.PARAM_MARKER in params:
+        msg = _("The '%(c)s' and '%(m)s' parameters cannot be specified "
+                "together.") % {'c': consts.PARAM_CURSOR,
+                                'm': consts.PARAM_MARKER}
+        raise exc.HTTPBadRequest(msg)
+
+    params[consts.PARAM_MARKER] = decode_cursor(cursor)
+
+
+def get_next_cursor(items, limit):
+    """Get the cursor to the page following a list of items.
+
+    A page holding fewer items than the limit is the last one, so that a
+    listing can be walked through without counting its items first.
+
+    :param items: a list of resources returned from the engine.
+    :param limit: the page size requested, if any.
+    :returns: the cursor to the next page or None if there is none.
+    """
+    if limit is None or not items or len(items) < int(limit):
+        return None
+
+    return encode_cursor(items[-1]['id'])
+
+
 def parse_bool_param(name, value):
     if str(value).lower() not in ('true', 'false'):
         msg = _("Invalid value '%(value)s' specified for '%(name)s'"
@@ -13,6 +13,7 @@
 from oslo_config import cfg
 from oslo_middleware import request_id as oslo_request_id
 from oslo_utils import encodeutils
+from oslo_utils import strutils
 
 from senlin.api.common import wsgi
 from senlin.common import context
@@ -54,6 +55,9 @@ class ContextMiddleware(wsgi.Middleware):
             if roles is not None:
                 roles = roles.split(',')
 
+            read_primary = strutils.bool_from_string(
+                headers.get('X-Senlin-Read-Primary'))
+
             env_req_id = environ.get(oslo_request_id.ENV_REQUEST_ID)
             if env_req_id is None:
                 request_id = None
@@ -81,5 +85,6 @@ class ContextMiddleware(wsgi.Middleware):
             auth_token_info=auth_token_info,
             region_name=region_name,
             roles=roles,
-            api_version=api_version
+            api_version=api_version,
+            read_primary=read_primary
         )
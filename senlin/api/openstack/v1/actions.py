@@ -14,6 +14,7 @@
 from webob import exc
 
 from senlin.api.common import util
+from senlin.api.common import version_request as vr
 from senlin.api.common import wsgi
 from senlin.common import consts
 from senlin.common.i18n import _
@@ -66,10 +67,14 @@ class ActionController(wsgi.Controller):
             consts.PARAM_SORT: 'single',
             consts.PARAM_GLOBAL_PROJECT: 'single',
         }
+        if req.version_request >= vr.APIVersionRequest("1.12"):
+            whitelist[consts.PARAM_CURSOR] = 'single'
+
         for key in req.params.keys():
             if key not in whitelist.keys():
                 raise exc.HTTPBadRequest(_('Invalid parameter %s') % key)
         params = util.get_allowed_params(req.params, whitelist)
+        util.parse_cursor_param(params)
 
         project_safe = not util.parse_bool_param(
             consts.PARAM_GLOBAL_PROJECT,
@@ -79,7 +84,15 @@ class ActionController(wsgi.Controller):
         obj = util.parse_request('ActionListRequest', req, params)
         actions = self.rpc_client.call(req.context, "action_list", obj)
 
-        return {'actions': actions}
+        if req.version_request < vr.APIVersionRequest("1.13"):
+            for action in actions:
+                action.pop('timing', None)
+
+        result = {'actions': actions}
+        if req.version_request >= vr.APIVersionRequest("1.12"):
+            result['next'] = util.get_next_cursor(
+                actions, params.get(consts.PARAM_LIMIT))
+        return result
 
     @util.policy_enforce
     def create(self, req, body):
@@ -97,5 +110,7 @@ class ActionController(wsgi.Controller):
         params = {'identity': action_id}
         obj = util.parse_request('ActionGetRequest', req, params)
         action = self.rpc_client.call(req.context, 'action_get', obj)
+        if req.version_request < vr.APIVersionRequest("1.13"):
+            action.pop('timing', None)
 
         return {'action': action}
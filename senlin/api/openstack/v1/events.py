@@ -17,6 +17,7 @@ Event endpoint for Senlin v1 REST API.
 from webob import exc
 
 from senlin.api.common import util
+from senlin.api.common import version_request as vr
 from senlin.api.common import wsgi
 from senlin.common import consts
 from senlin.common.i18n import _
@@ -44,10 +45,14 @@ class EventController(wsgi.Controller):
             consts.PARAM_GLOBAL_PROJECT: 'single',
         }
 
+        if req.version_request >= vr.APIVersionRequest("1.12"):
+            whitelist[consts.PARAM_CURSOR] = 'single'
+
         for key in req.params.keys():
             if key not in whitelist.keys():
                 raise exc.HTTPBadRequest(_('Invalid parameter %s') % key)
         params = util.get_allowed_params(req.params, whitelist)
+        util.parse_cursor_param(params)
 
         project_safe = not util.parse_bool_param(
             consts.PARAM_GLOBAL_PROJECT,
@@ -57,7 +62,11 @@ class EventController(wsgi.Controller):
         obj = util.parse_request('EventListRequest', req, params)
         events = self.rpc_client.call(req.context, "event_list", obj)
 
-        return {'events': events}
+        result = {'events': events}
+        if req.version_request >= vr.APIVersionRequest("1.12"):
+            result['next'] = util.get_next_cursor(
+                events, params.get(consts.PARAM_LIMIT))
+        return result
 
     @util.policy_enforce
     def get(self, req, event_id):
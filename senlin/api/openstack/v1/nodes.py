@@ -16,6 +16,7 @@ Node endpoint for Senlin v1 REST API.
 from webob import exc
 
 from senlin.api.common import util
+from senlin.api.common import version_request as vr
 from senlin.api.common import wsgi
 from senlin.common import consts
 from senlin.common.i18n import _
@@ -43,10 +44,14 @@ class NodeController(wsgi.Controller):
             consts.PARAM_SORT: 'single',
             consts.PARAM_GLOBAL_PROJECT: 'single'
         }
+        if req.version_request >= vr.APIVersionRequest("1.12"):
+            whitelist[consts.PARAM_CURSOR] = 'single'
+
         for key in req.params.keys():
             if key not in whitelist.keys():
                 raise exc.HTTPBadRequest(_('Invalid parameter %s') % key)
         params = util.get_allowed_params(req.params, whitelist)
+        util.parse_cursor_param(params)
 
         project_safe = not util.parse_bool_param(
             consts.PARAM_GLOBAL_PROJECT,
@@ -55,7 +60,12 @@ class NodeController(wsgi.Controller):
 
         obj = util.parse_request('NodeListRequest', req, params)
         nodes = self.rpc_client.call(req.context, 'node_list', obj)
-        return {'nodes': nodes}
+
+        result = {'nodes': nodes}
+        if req.version_request >= vr.APIVersionRequest("1.12"):
+            result['next'] = util.get_next_cursor(
+                nodes, params.get(consts.PARAM_LIMIT))
+        return result
 
     @util.policy_enforce
     def create(self, req, body):
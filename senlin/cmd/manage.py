@@ -15,6 +15,7 @@ CLI interface for senlin management.
 """
 
 import sys
+import time
 
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -42,15 +43,89 @@ def do_db_sync():
     api.db_sync(api.get_engine(), CONF.command.version)
 
 
-def do_event_purge():
-    """Purge the specified event records in senlin's database."""
+def _purge_in_batches(purge, resource):
+    """Purge records in batches until there is nothing left to purge.
+
+    Each batch is committed on its own, so an interrupted purge can simply
+    be started again.
+
+    :param purge: A callable purging at most the given number of records
+                  and returning the number of records purged.
+    :param resource: Name of the records purged, used in the report.
+    :returns: Number of records purged.
+    """
+    batch_size = CONF.command.batch_size
+    total = 0
+    watch = timeutils.StopWatch()
+    watch.start()
+    while True:
+        count = purge(batch_size)
+        total += count
+        if count < batch_size:
+            break
+
+        print(_("Purged %(total)s %(resource)s so far.") %
+              {'total': total, 'resource': resource})
+        if CONF.command.throttle:
+            time.sleep(CONF.command.throttle)
+
+    elapsed = watch.elapsed()
+    rate = total / elapsed if elapsed else 0
+    print(_("Purged %(total)s %(resource)s in %(elapsed).1f seconds "
+            "(%(rate).1f rows per second).") %
+          {'total': total, 'resource': resource, 'elapsed': elapsed,
+           'rate': rate})
+    return total
+
+
+def _check_purge_args():
     if CONF.command.age < 0:
         print(_("age must be a positive integer."))
+        return False
+    if CONF.command.batch_size < 1:
+        print(_("batch-size must be a positive integer."))
+        return False
+    if CONF.command.throttle < 0:
+        print(_("throttle must not be negative."))
+        return False
+    return True
+
+
+def do_event_purge():
+    """Purge the specified event records in senlin's database."""
+    if not _check_purge_args():
+        return
+
+    engine = api.get_engine()
+    _purge_in_batches(
+        lambda limit: api.event_purge(engine,
+                                      CONF.command.project_id,
+                                      CONF.command.granularity,
+                                      CONF.command.age,
+                                      limit=limit),
+        'events')
+
+
+def do_action_purge():
+    """Purge the specified completed action records in senlin's database.
+
+    Dependencies of the purged actions and dependencies left over by
+    actions deleted earlier are purged as well.
+    """
+    if not _check_purge_args():
         return
-    api.event_purge(api.get_engine(),
-                    CONF.command.project_id,
-                    CONF.command.granularity,
-                    CONF.command.age)
+
+    engine = api.get_engine()
+    _purge_in_batches(
+        lambda limit: api.action_purge(engine,
+                                       CONF.command.project_id,
+                                       CONF.command.granularity,
+                                       CONF.command.age,
+                                       limit=limit),
+        'actions')
+    _purge_in_batches(
+        lambda limit: api.dependency_purge(engine, limit=limit),
+        'orphaned dependencies')
 
 
 class ServiceManageCommand(object):
@@ -130,32 +205,55 @@ def add_command_parsers(subparsers):
 
     parser = subparsers.add_parser('event_purge')
     parser.set_defaults(func=do_event_purge)
+    _add_purge_arguments(parser, 'event')
+
+    parser = subparsers.add_parser('action_purge')
+    parser.set_defaults(func=do_action_purge)
+    _add_purge_arguments(parser, 'completed action')
+
+
+def _add_purge_arguments(parser, resource):
+    params = {'resource': resource}
     parser.add_argument('-p',
                         '--project-id',
                         nargs='?',
                         metavar='<project1;project2...>',
-                        help=_("Purge event records with specified project. "
-                               "This can be specified multiple times, or once "
-                               "with parameters separated by semicolon."),
+                        help=_("Purge %(resource)s records with specified "
+                               "project. This can be specified multiple "
+                               "times, or once with parameters separated by "
+                               "semicolon.") % params,
                         action='append')
     parser.add_argument('-g',
                         '--granularity',
                         default='days',
                         choices=['days', 'hours', 'minutes', 'seconds'],
-                        help=_("Purge event records which were created in the "
-                               "specified time period. The time is specified "
-                               "by age and granularity, whose value must be "
-                               "one of 'days', 'hours', 'minutes' or "
-                               "'seconds' (default)."))
+                        help=_("Purge %(resource)s records which were created "
+                               "in the specified time period. The time is "
+                               "specified by age and granularity, whose value "
+                               "must be one of 'days', 'hours', 'minutes' or "
+                               "'seconds' (default).") % params)
+    parser.add_argument('-b',
+                        '--batch-size',
+                        type=int,
+                        default=1000,
+                        help=_("Number of %(resource)s records purged in each "
+                               "transaction. Defaults to 1000.") % params)
+    parser.add_argument('-t',
+                        '--throttle',
+                        type=float,
+                        default=0,
+                        help=_("Seconds to sleep between two batches, so that "
+                               "the purge does not slow down the engines. "
+                               "Defaults to 0."))
     parser.add_argument('age',
                         type=int,
                         default=30,
-                        help=_("Purge event records which were created in the "
-                               "specified time period. The time is specified "
-                               "by age and granularity. For example, "
-                               "granularity=hours and age=2 means purging "
-                               "events created two hours ago. Defaults to "
-                               "30."))
+                        help=_("Purge %(resource)s records which were created "
+                               "in the specified time period. The time is "
+                               "specified by age and granularity. For "
+                               "example, granularity=hours and age=2 means "
+                               "purging records created two hours ago. "
+                               "Defaults to 30.") % params)
 
 
 command_opt = cfg.SubCommandOpt('command',
@@ -72,19 +72,62 @@ engine_opts = [
                help=_('Timeout in seconds for actions.')),
     cfg.IntOpt('max_actions_per_batch',
                default=0,
-               help=_('Maximum number of node actions that each engine worker '
-                      'can schedule consecutively per batch. 0 means no '
-                      'limit.')),
+               deprecated_for_removal=True,
+               deprecated_reason=_('Node actions are now throttled by the '
+                                   'adaptive limiters configured in the '
+                                   '[throttle] section.'),
+               help=_('Maximum number of node operations that each engine '
+                      'starts per batch, also capping the concurrency '
+                      'limit of each backend. 0 means no limit.')),
     cfg.IntOpt('batch_interval',
                default=3,
-               help=_('Seconds to pause between scheduling two consecutive '
-                      'batches of node actions.')),
+               deprecated_for_removal=True,
+               deprecated_reason=_('Node actions are now throttled by the '
+                                   'adaptive limiters configured in the '
+                                   '[throttle] section.'),
+               help=_('Seconds between the starts of two consecutive '
+                      'batches of node operations.')),
+    cfg.IntOpt('action_acquire_batch_size',
+               default=50, min=1,
+               help=_('Maximum number of ready actions that each engine '
+                      'worker claims from the database in one transaction.')),
+    cfg.IntOpt('dependency_check_interval',
+               default=10, min=1,
+               help=_('Maximum seconds an action waiting for its depended '
+                      'actions sleeps before checking their status again. '
+                      'Waiting actions are normally woken up as soon as the '
+                      'depended actions complete.')),
+    cfg.FloatOpt('dispatch_coalesce_window',
+                 default=0.1, min=0,
+                 help=_('Seconds during which requests for scheduling '
+                        'ready actions are coalesced into one notification '
+                        'sent to the engines. A value of 0 sends every '
+                        'request immediately.')),
+    cfg.BoolOpt('dispatch_targeted',
+                default=True,
+                help=_('Whether requests for scheduling ready actions are '
+                       'sent to the least loaded live engine instead of '
+                       'being broadcast to all engines. The engine claims '
+                       'at most action_acquire_batch_size actions and sends '
+                       'the request for the actions left to the least loaded '
+                       'engine again. A broadcast is still sent when no live '
+                       'engine can be reached.')),
     cfg.IntOpt('lock_retry_times',
                default=3,
                help=_('Number of times trying to grab a lock.')),
     cfg.IntOpt('lock_retry_interval',
                default=10,
                help=_('Number of seconds between lock retries.')),
+    cfg.IntOpt('lock_wait_timeout',
+               default=60, min=0,
+               help=_('Maximum number of seconds an action waits in queue '
+                      'for a cluster lock to be released before giving up. '
+                      'A value of 0 disables waiting.')),
+    cfg.IntOpt('lock_wait_check_interval',
+               default=5, min=1,
+               help=_('Number of seconds after which an action waiting for '
+                      'a cluster lock checks the lock again when no release '
+                      'notification was received.')),
     cfg.IntOpt('database_retry_limit',
                default=10,
                help=_('Number of times retrying a failed operation on the '
@@ -95,6 +138,14 @@ engine_opts = [
     cfg.IntOpt('database_max_retry_interval',
                default=2,
                help=_('Maximum number of seconds between database retries.')),
+    cfg.BoolOpt('database_read_replica',
+                default=False,
+                help=_('Flag to indicate whether the read-only listings of '
+                       'clusters, nodes, actions and events are served from '
+                       'the replica database configured by the '
+                       'slave_connection option of the [database] section. '
+                       'The replica may lag behind the primary database, so '
+                       'new or changed objects may not be listed at once.')),
     cfg.IntOpt('engine_life_check_timeout',
                default=2,
                help=_('RPC timeout for the engine liveness check that is used'
@@ -107,9 +158,47 @@ engine_opts = [
                default=60,
                help=_('Maximum time since last check-in for a service to be '
                       'considered up.')),
+    cfg.BoolOpt('scheduler_fair_share',
+                default=False,
+                help=_('Flag to indicate whether ready actions are scheduled '
+                       'by priority and shared fairly among projects instead '
+                       'of strictly by creation time.')),
+    cfg.ListOpt('scheduler_priority_actions',
+                default=['CLUSTER_CHECK', 'CLUSTER_RECOVER', 'NODE_CHECK',
+                         'NODE_RECOVER'],
+                help=_('Actions scheduled before any other actions when fair '
+                       'share scheduling is enabled. Actions requested by '
+                       'users are scheduled before derived actions.')),
+    cfg.IntOpt('scheduler_candidate_limit',
+               default=500, min=1,
+               help=_('Maximum number of ready actions examined in each '
+                      'round of fair share scheduling.')),
+    cfg.IntOpt('scheduler_project_candidate_limit',
+               default=50, min=1,
+               help=_('Maximum number of ready actions of a single project '
+                      'examined in each round of fair share scheduling.')),
     cfg.IntOpt('scheduler_thread_pool_size',
                default=1000,
                help=_('Maximum number of threads to use for scheduler.')),
+    cfg.IntOpt('object_cache_size',
+               default=256, min=0,
+               help=_('Maximum number of profiles and of policies each '
+                      'engine keeps in its in-memory cache. A value of 0 '
+                      'disables the cache.')),
+    cfg.IntOpt('live_engine_cache_ttl',
+               default=5, min=0,
+               help=_('Number of seconds each engine caches the set of live '
+                      'engines used when deciding whether to steal a lock, '
+                      'claiming a health registry or dispatching actions. '
+                      'A value of 0 disables the cache.')),
+    cfg.BoolOpt('batch_action_writes',
+                default=True,
+                help=_('Flag to indicate whether the updates of the data, '
+                       'inputs and outputs of an action and of the data and '
+                       'metadata of nodes made during the execution of the '
+                       'action are deferred and written in one transaction '
+                       'before a lock is released, before the action waits '
+                       'for other actions and before its status is set.')),
 ]
 cfg.CONF.register_opts(engine_opts)
 
@@ -143,11 +232,75 @@ dispatcher_opts = [
                choices=("critical", "error", "warning", "info", "debug"),
                help=_("Lowest event priorities to be dispatched.")),
     cfg.BoolOpt("exclude_derived_actions", default=True,
-                help=_("Exclude derived actions from events dumping."))]
+                help=_("Exclude derived actions from events dumping.")),
+    cfg.IntOpt('event_buffer_size', default=10000, min=0,
+               help=_('Maximum number of events buffered in memory by the '
+                      'database dispatcher before being written. Events '
+                      'are dropped when the buffer is full. Events are '
+                      'written synchronously when set to 0.')),
+    cfg.IntOpt('event_batch_size', default=100, min=1,
+               help=_('Maximum number of events written into the database '
+                      'in one insert. Buffered events are written as soon '
+                      'as this many are pending.')),
+    cfg.FloatOpt('event_flush_interval', default=1.0, min=0,
+                 help=_('Maximum seconds an event stays in the buffer of '
+                        'the database dispatcher before being written.')),
+]
 
 cfg.CONF.register_group(dispatcher_group)
 cfg.CONF.register_opts(dispatcher_opts, group=dispatcher_group)
 
+# Throttle section
+throttle_group = cfg.OptGroup('throttle')
+throttle_opts = [
+    cfg.BoolOpt('enabled', default=True,
+                help=_('Flag to indicate whether node operations are '
+                       'throttled per backend (profile type and region).')),
+    cfg.IntOpt('initial_limit', default=20, min=1,
+               help=_('Initial number of concurrent node operations allowed '
+                      'for each backend.')),
+    cfg.IntOpt('min_limit', default=1, min=1,
+               help=_('Minimum number of concurrent node operations allowed '
+                      'for each backend.')),
+    cfg.IntOpt('max_limit', default=200, min=1,
+               help=_('Maximum number of concurrent node operations allowed '
+                      'for each backend.')),
+    cfg.DictOpt('max_limits', default={},
+                help=_('Maximum number of concurrent node operations allowed '
+                       'for specific profile types, e.g. '
+                       '"os.nova.server:100,os.heat.stack:20".')),
+    cfg.FloatOpt('backoff_factor', default=0.5, min=0.1, max=1.0,
+                 help=_('Factor applied to the concurrency limit of a backend '
+                        'when an operation fails or is too slow.')),
+    cfg.FloatOpt('latency_factor', default=3.0, min=1.0,
+                 help=_('An operation taking longer than its average latency '
+                        'multiplied by this factor is treated as a sign of '
+                        'backend overload.')),
+]
+cfg.CONF.register_group(throttle_group)
+cfg.CONF.register_opts(throttle_opts, group=throttle_group)
+
+# Metrics section
+metrics_group = cfg.OptGroup('metrics')
+metrics_opts = [
+    cfg.BoolOpt('enabled', default=True,
+                help=_('Flag to indicate whether metrics of the action '
+                       'pipeline are collected by the engines.')),
+    cfg.StrOpt('dump_dir',
+               help=_('Directory where each engine periodically dumps its '
+                      'metrics into a file named after the engine ID. '
+                      'Metrics are not dumped if not set.')),
+    cfg.StrOpt('dump_format', default='prometheus',
+               choices=['prometheus', 'json'],
+               help=_('Format of the metrics dump files. The prometheus '
+                      'format can be collected by the textfile collector '
+                      'of the Prometheus node exporter.')),
+    cfg.IntOpt('dump_interval', default=60, min=1,
+               help=_('Seconds between two consecutive metrics dumps.')),
+]
+cfg.CONF.register_group(metrics_group)
+cfg.CONF.register_opts(metrics_opts, group=metrics_group)
+
 # Authentication section
 authentication_group = cfg.OptGroup('authentication')
 authentication_opts = [
@@ -176,6 +329,27 @@ healthmgr_opts = [
                help=_("Exchange name for heat notifications.")),
     cfg.MultiStrOpt("enabled_endpoints", default=['nova', 'heat'],
                     help=_("Notification endpoints to enable.")),
+    cfg.IntOpt('health_check_pool_size', default=100, min=1,
+               help=_("Maximum number of nodes an engine checks at the "
+                      "same time across all the clusters it manages.")),
+    cfg.IntOpt('health_check_concurrency', default=10, min=1,
+               help=_("Maximum number of nodes of a cluster checked at the "
+                      "same time. The nodes which are not checked within "
+                      "the check interval of the cluster are skipped until "
+                      "the next round.")),
+    cfg.FloatOpt('health_check_jitter', default=0.1, min=0, max=1,
+                 help=_("Maximum fraction of the check interval by which "
+                        "the checks of a cluster are delayed on top of their "
+                        "fixed offset, so that the checks of clusters do not "
+                        "fire together. Both are derived from the cluster "
+                        "ID.")),
+    cfg.IntOpt('probe_pool_size', default=500, min=1,
+               help=_("Maximum number of URLs an engine polls at the same "
+                      "time for the health of nodes.")),
+    cfg.IntOpt('probe_connections_per_host', default=10, min=1,
+               help=_("Maximum number of connections kept alive to the "
+                      "same host when polling URLs for the health of "
+                      "nodes.")),
 ]
 cfg.CONF.register_group(healthmgr_group)
 cfg.CONF.register_opts(healthmgr_opts, group=healthmgr_group)
@@ -274,6 +448,8 @@ def list_opts():
     yield 'DEFAULT', event_opts
     yield authentication_group.name, authentication_opts
     yield dispatcher_group.name, dispatcher_opts
+    yield throttle_group.name, throttle_opts
+    yield metrics_group.name, metrics_opts
     yield healthmgr_group.name, healthmgr_opts
     yield revision_group.name, revision_opts
     yield receiver_group.name, receiver_opts
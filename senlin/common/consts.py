@@ -28,10 +28,10 @@ RPC_ATTRS = (
 
 RPC_PARAMS = (
     PARAM_LIMIT, PARAM_MARKER, PARAM_GLOBAL_PROJECT,
-    PARAM_SHOW_DETAILS, PARAM_SORT,
+    PARAM_SHOW_DETAILS, PARAM_SORT, PARAM_CURSOR,
 ) = (
     'limit', 'marker', 'global_project',
-    'show_details', 'sort',
+    'show_details', 'sort', 'cursor',
 )
 
 SUPPORT_STATUSES = (
@@ -31,7 +31,8 @@ class RequestContext(base_context.RequestContext):
                  user_name=None, project_name=None, domain_name=None,
                  user_domain_name=None, project_domain_name=None,
                  auth_token_info=None, region_name=None, roles=None,
-                 password=None, api_version=None, **kwargs):
+                 password=None, api_version=None, read_primary=False,
+                 **kwargs):
 
         """Initializer of request context."""
         # We still have 'tenant' param because oslo_context still use it.
@@ -62,6 +63,9 @@ class RequestContext(base_context.RequestContext):
         self.region_name = region_name
         self.password = password
         self.api_version = api_version
+        # Whether listings must be read from the primary database even when
+        # a replica is configured, e.g. to see the caller's own writes.
+        self.read_primary = read_primary
 
         # Check user is admin or not
         if is_admin is None:
@@ -92,6 +96,7 @@ class RequestContext(base_context.RequestContext):
             'region_name': self.region_name,
             'password': self.password,
             'api_version': self.api_version,
+            'read_primary': self.read_primary,
         })
         return d
 
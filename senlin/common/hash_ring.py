@@ -0,0 +1,61 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Consistent hash ring.
+
+Each member is placed at a number of points on the ring and a key belongs to
+the member at the first point following the hash of the key. When a member
+joins or leaves the ring, only the keys falling next to its points move, the
+other keys stay with their members.
+"""
+
+import bisect
+import hashlib
+
+from oslo_utils import encodeutils
+
+# Number of points of each member on the ring
+REPLICAS = 100
+
+
+def _hash(key):
+    return int(hashlib.md5(encodeutils.safe_encode(key)).hexdigest(), 16)
+
+
+class HashRing(object):
+    """Consistent hash ring mapping keys to members."""
+
+    def __init__(self, members, replicas=REPLICAS):
+        """Build a ring.
+
+        :param members: An iterable of member IDs, e.g. engine IDs.
+        :param replicas: Number of points of each member on the ring.
+        """
+        self.members = frozenset(members)
+        self._owners = {}
+        for member in sorted(self.members):
+            for i in range(replicas):
+                self._owners.setdefault(_hash('%s-%s' % (member, i)), member)
+        self._points = sorted(self._owners)
+
+    def get_member(self, key):
+        """Get the member a key belongs to.
+
+        :param key: The key to be mapped, e.g. a cluster ID.
+        :returns: The ID of the member or None if the ring is empty.
+        """
+        if not self._points:
+            return None
+
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
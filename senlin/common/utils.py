@@ -38,6 +38,10 @@ cfg.CONF.import_opt('periodic_interval', 'senlin.common.config')
 LOG = logging.getLogger(__name__)
 _ISO8601_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
 
+# IDs of live engines and the time they expire, keyed by the duration used
+# for checking liveness
+_LIVE_ENGINES = {}
+
 
 class URLFetchError(exception.Error, IOError):
     pass
@@ -218,6 +222,34 @@ def get_path_parser(path):
     return expr
 
 
+def get_live_engines(ctx, duration=None, refresh=False):
+    """Get the IDs of live engines.
+
+    The result is cached for ``live_engine_cache_ttl`` seconds so that the
+    lock code and the health manager do not read the service table over and
+    over again.
+
+    :param ctx: A request context.
+    :param duration: The time duration in seconds within which a live engine
+                     has reported its status.
+    :param refresh: Whether to bypass the cached result.
+    :returns: A frozenset of engine IDs.
+    """
+    if not duration:
+        duration = 2 * cfg.CONF.periodic_interval
+
+    now = timeutils.now()
+    cached = _LIVE_ENGINES.get(duration)
+    if not refresh and cached and cached[1] > now:
+        return cached[0]
+
+    engines = frozenset(service_obj.Service.get_live_ids(ctx, duration))
+    ttl = cfg.CONF.live_engine_cache_ttl
+    if ttl > 0:
+        _LIVE_ENGINES[duration] = (engines, now + ttl)
+    return engines
+
+
 def is_engine_dead(ctx, engine_id, duration=None):
     """Check if an engine is dead.
 
@@ -228,12 +260,11 @@ def is_engine_dead(ctx, engine_id, duration=None):
     :param engine_id: The ID of the engine to test.
     :param duration: The time duration in seconds.
     """
-    if not duration:
-        duration = 2 * cfg.CONF.periodic_interval
-
-    eng = service_obj.Service.get(ctx, engine_id)
-    if not eng:
-        return True
-    if timeutils.is_older_than(eng.updated_at, duration):
-        return True
-    return False
+    if engine_id in get_live_engines(ctx, duration):
+        return False
+
+    # The engine may have started after the live engines were cached, make
+    # sure it is really dead before its locks get stolen.
+    if cfg.CONF.live_engine_cache_ttl > 0:
+        return engine_id not in get_live_engines(ctx, duration, refresh=True)
+    return True
@@ -40,6 +40,11 @@ def cluster_get(context, cluster_id, project_safe=True):
     return IMPL.cluster_get(context, cluster_id, project_safe=project_safe)
 
 
+def cluster_get_runtime_data(context, cluster_id, project_safe=True):
+    return IMPL.cluster_get_runtime_data(context, cluster_id,
+                                         project_safe=project_safe)
+
+
 def cluster_get_by_name(context, cluster_name, project_safe=True):
     return IMPL.cluster_get_by_name(context, cluster_name,
                                     project_safe=project_safe)
@@ -51,13 +56,14 @@ def cluster_get_by_short_id(context, short_id, project_safe=True):
 
 
 def cluster_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                    project_safe=True):
+                    project_safe=True, use_replica=False):
     return IMPL.cluster_get_all(context, limit=limit, marker=marker, sort=sort,
-                                filters=filters, project_safe=project_safe)
+                                filters=filters, project_safe=project_safe,
+                                use_replica=use_replica)
 
 
-def cluster_next_index(context, cluster_id):
-    return IMPL.cluster_next_index(context, cluster_id)
+def cluster_next_index(context, cluster_id, count=1):
+    return IMPL.cluster_next_index(context, cluster_id, count=count)
 
 
 def cluster_count_all(context, filters=None, project_safe=True):
@@ -78,6 +84,10 @@ def node_create(context, values):
     return IMPL.node_create(context, values)
 
 
+def node_create_many(context, values):
+    return IMPL.node_create_many(context, values)
+
+
 def node_get(context, node_id, project_safe=True):
     return IMPL.node_get(context, node_id, project_safe=project_safe)
 
@@ -92,10 +102,11 @@ def node_get_by_short_id(context, short_id, project_safe=True):
 
 
 def node_get_all(context, cluster_id=None, limit=None, marker=None, sort=None,
-                 filters=None, project_safe=True):
+                 filters=None, project_safe=True, use_replica=False):
     return IMPL.node_get_all(context, cluster_id=cluster_id, filters=filters,
                              limit=limit, marker=marker, sort=sort,
-                             project_safe=project_safe)
+                             project_safe=project_safe,
+                             use_replica=use_replica)
 
 
 def node_get_all_by_cluster(context, cluster_id, filters=None,
@@ -116,6 +127,14 @@ def node_update(context, node_id, values):
     return IMPL.node_update(context, node_id, values)
 
 
+def node_update_many(context, values):
+    return IMPL.node_update_many(context, values)
+
+
+def batch_update(context, actions=None, nodes=None):
+    return IMPL.batch_update(context, actions=actions, nodes=nodes)
+
+
 def node_migrate(context, node_id, to_cluster, timestamp, role=None):
     return IMPL.node_migrate(context, node_id, to_cluster, timestamp, role)
 
@@ -166,6 +185,11 @@ def policy_get(context, policy_id, project_safe=True):
     return IMPL.policy_get(context, policy_id, project_safe=project_safe)
 
 
+def policy_get_version(context, policy_id, project_safe=True):
+    return IMPL.policy_get_version(context, policy_id,
+                                   project_safe=project_safe)
+
+
 def policy_get_by_name(context, name, project_safe=True):
     return IMPL.policy_get_by_name(context, name, project_safe=project_safe)
 
@@ -234,6 +258,11 @@ def profile_get(context, profile_id, project_safe=True):
     return IMPL.profile_get(context, profile_id, project_safe=project_safe)
 
 
+def profile_get_version(context, profile_id, project_safe=True):
+    return IMPL.profile_get_version(context, profile_id,
+                                    project_safe=project_safe)
+
+
 def profile_get_by_name(context, name, project_safe=True):
     return IMPL.profile_get_by_name(context, name, project_safe=project_safe)
 
@@ -284,6 +313,10 @@ def event_create(context, values):
     return IMPL.event_create(context, values)
 
 
+def event_create_many(context, values):
+    return IMPL.event_create_many(context, values)
+
+
 def event_get(context, event_id, project_safe=True):
     return IMPL.event_get(context, event_id, project_safe=project_safe)
 
@@ -294,9 +327,10 @@ def event_get_by_short_id(context, short_id, project_safe=True):
 
 
 def event_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                  project_safe=True):
+                  project_safe=True, use_replica=False):
     return IMPL.event_get_all(context, limit=limit, marker=marker, sort=sort,
-                              filters=filters, project_safe=project_safe)
+                              filters=filters, project_safe=project_safe,
+                              use_replica=use_replica)
 
 
 def event_count_by_cluster(context, cluster_id, project_safe=True):
@@ -320,6 +354,10 @@ def action_create(context, values):
     return IMPL.action_create(context, values)
 
 
+def action_create_many(context, values, dependent=None):
+    return IMPL.action_create_many(context, values, dependent=dependent)
+
+
 def action_update(context, action_id, values):
     return IMPL.action_update(context, action_id, values)
 
@@ -353,10 +391,11 @@ def action_get_all_active_by_target(context, target_id, project_safe=True):
 
 
 def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
-                   project_safe=True):
+                   project_safe=True, use_replica=False):
     return IMPL.action_get_all(context, filters=filters, sort=sort,
                                limit=limit, marker=marker,
-                               project_safe=project_safe)
+                               project_safe=project_safe,
+                               use_replica=use_replica)
 
 
 def action_check_status(context, action_id, timestamp):
@@ -382,20 +421,25 @@ def dependency_get_dependents(context, action_id):
     return IMPL.dependency_get_dependents(context, action_id)
 
 
-def action_mark_succeeded(context, action_id, timestamp):
-    return IMPL.action_mark_succeeded(context, action_id, timestamp)
+def action_mark_succeeded(context, action_id, timestamp, timing=None):
+    return IMPL.action_mark_succeeded(context, action_id, timestamp,
+                                      timing=timing)
 
 
-def action_mark_ready(context, action_id, timestamp):
-    return IMPL.action_mark_ready(context, action_id, timestamp)
+def action_mark_ready(context, action_id, timestamp, timing=None):
+    return IMPL.action_mark_ready(context, action_id, timestamp,
+                                  timing=timing)
 
 
-def action_mark_failed(context, action_id, timestamp, reason=None):
-    return IMPL.action_mark_failed(context, action_id, timestamp, reason)
+def action_mark_failed(context, action_id, timestamp, reason=None,
+                       timing=None):
+    return IMPL.action_mark_failed(context, action_id, timestamp, reason,
+                                   timing=timing)
 
 
-def action_mark_cancelled(context, action_id, timestamp):
-    return IMPL.action_mark_cancelled(context, action_id, timestamp)
+def action_mark_cancelled(context, action_id, timestamp, timing=None):
+    return IMPL.action_mark_cancelled(context, action_id, timestamp,
+                                      timing=timing)
 
 
 def action_acquire(context, action_id, owner, timestamp):
@@ -410,6 +454,22 @@ def action_acquire_first_ready(context, owner, timestamp):
     return IMPL.action_acquire_first_ready(context, owner, timestamp)
 
 
+def action_get_all_ready(context, limit=None, priority_actions=None,
+                         project_limit=None):
+    return IMPL.action_get_all_ready(context, limit=limit,
+                                     priority_actions=priority_actions,
+                                     project_limit=project_limit)
+
+
+def action_count_ready(context):
+    return IMPL.action_count_ready(context)
+
+
+def action_acquire_batch(context, owner, timestamp, limit, action_ids=None):
+    return IMPL.action_acquire_batch(context, owner, timestamp, limit,
+                                     action_ids=action_ids)
+
+
 def action_abandon(context, action_id, values=None):
     return IMPL.action_abandon(context, action_id, values)
 
@@ -486,6 +546,10 @@ def service_get_all():
     return IMPL.service_get_all()
 
 
+def service_get_live_ids(duration=None):
+    return IMPL.service_get_live_ids(duration=duration)
+
+
 def gc_by_engine(engine_id):
     return IMPL.gc_by_engine(engine_id)
 
@@ -504,8 +568,16 @@ def registry_delete(context, cluster_id):
     return IMPL.registry_delete(context, cluster_id)
 
 
-def registry_claim(context, engine_id):
-    return IMPL.registry_claim(context, engine_id)
+def registry_get_orphans(context):
+    return IMPL.registry_get_orphans(context)
+
+
+def registry_claim(context, engine_id, cluster_ids=None):
+    return IMPL.registry_claim(context, engine_id, cluster_ids=cluster_ids)
+
+
+def registry_release(context, engine_id, cluster_ids):
+    return IMPL.registry_release(context, engine_id, cluster_ids)
 
 
 def registry_get(context, cluster_id):
@@ -526,6 +598,16 @@ def db_version(engine):
     return IMPL.db_version(engine)
 
 
-def event_purge(engine, project, granularity, age):
+def event_purge(engine, project, granularity, age, limit=None):
     """Purge the event records in database."""
-    return IMPL.event_purge(project, granularity, age)
+    return IMPL.event_purge(project, granularity, age, limit=limit)
+
+
+def action_purge(engine, project, granularity, age, limit=None):
+    """Purge the completed action records in database."""
+    return IMPL.action_purge(project, granularity, age, limit=limit)
+
+
+def dependency_purge(engine, limit=None):
+    """Purge the orphaned action dependency records in database."""
+    return IMPL.dependency_purge(limit=limit)
@@ -29,6 +29,7 @@ from oslo_log import log as logging
 from oslo_utils import timeutils
 import osprofiler.sqlalchemy
 import sqlalchemy
+from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import joinedload_all
 from sqlalchemy.sql.expression import func
 
@@ -47,6 +48,8 @@ _CONTEXT = threading.local()
 cfg.CONF.import_opt('database_retry_limit', 'senlin.common.config')
 cfg.CONF.import_opt('database_retry_interval', 'senlin.common.config')
 cfg.CONF.import_opt('database_max_retry_interval', 'senlin.common.config')
+cfg.CONF.import_opt('database_read_replica', 'senlin.common.config')
+cfg.CONF.import_opt('periodic_interval', 'senlin.common.config')
 
 
 def _get_main_context_manager():
@@ -65,8 +68,20 @@ def get_engine():
     return _get_main_context_manager().writer.get_engine()
 
 
-def session_for_read():
-    return _get_main_context_manager().reader.using(_CONTEXT)
+def session_for_read(use_replica=False):
+    """Get a session for reading from the database.
+
+    :param use_replica: Whether the session may read from the replica
+                        database configured by ``[database]slave_connection``
+                        instead of the primary one. The replica may lag
+                        behind the primary, so this only suits queries which
+                        need not see the latest writes. It is ignored unless
+                        the ``database_read_replica`` option is enabled.
+    """
+    reader = _get_main_context_manager().reader
+    if use_replica and CONF.database_read_replica:
+        reader = reader.async_
+    return reader.using(_CONTEXT)
 
 
 def session_for_write():
@@ -87,8 +102,9 @@ def retry_on_deadlock(f):
         max_retry_interval=CONF.database_max_retry_interval)(f)
 
 
-def model_query(context, *args):
-    with session_for_read() as session:
+def model_query(context, *args, **kwargs):
+    use_replica = kwargs.get('use_replica', False)
+    with session_for_read(use_replica=use_replica) as session:
         query = session.query(*args).options(joinedload_all('*'))
         return query
 
@@ -145,6 +161,49 @@ def cluster_get(context, cluster_id, project_safe=True):
     return cluster
 
 
+def cluster_get_runtime_data(context, cluster_id, project_safe=True):
+    """Get a cluster together with the data needed for operating on it.
+
+    The cluster, its profile, its policy bindings with the bound policies
+    and its nodes are retrieved in one read session with a fixed number of
+    queries, regardless of how many policies are attached to the cluster.
+    Only the nodes owned by the project of the context are retrieved, like
+    `node_get_all_by_cluster` does by default.
+
+    :param project_safe: Whether the cluster is looked up in the project of
+                         the context only.
+    :returns: A dict with the keys 'cluster', 'profile', 'bindings' and
+              'nodes', or None if the cluster is not found. The bindings
+              are sorted by priority and their policies are loaded.
+    """
+    with session_for_read() as session:
+        query = session.query(models.Cluster).filter_by(id=cluster_id)
+        if project_safe:
+            query = query.filter_by(project=context.project_id)
+        cluster = query.first()
+        if cluster is None:
+            return None
+
+        profile = session.query(models.Profile).get(cluster.profile_id)
+
+        query = session.query(models.ClusterPolicies).options(
+            joinedload('policy'))
+        query = query.filter_by(cluster_id=cluster_id)
+        bindings = query.order_by(models.ClusterPolicies.priority).all()
+
+        query = session.query(models.Node).options(joinedload('profile'))
+        query = query.filter_by(cluster_id=cluster_id,
+                                project=context.project_id)
+        nodes = query.all()
+
+        return {
+            'cluster': cluster,
+            'profile': profile,
+            'bindings': bindings,
+            'nodes': nodes,
+        }
+
+
 def cluster_get_by_name(context, name, project_safe=True):
     return query_by_name(context, models.Cluster, name,
                          project_safe=project_safe)
@@ -155,8 +214,8 @@ def cluster_get_by_short_id(context, short_id, project_safe=True):
                              project_safe=project_safe)
 
 
-def _query_cluster_get_all(context, project_safe=True):
-    query = model_query(context, models.Cluster)
+def _query_cluster_get_all(context, project_safe=True, use_replica=False):
+    query = model_query(context, models.Cluster, use_replica=use_replica)
 
     if project_safe:
         query = query.filter_by(project=context.project_id)
@@ -164,28 +223,31 @@ def _query_cluster_get_all(context, project_safe=True):
 
 
 def cluster_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                    project_safe=True):
-    query = _query_cluster_get_all(context, project_safe=project_safe)
+                    project_safe=True, use_replica=False):
+    query = _query_cluster_get_all(context, project_safe=project_safe,
+                                   use_replica=use_replica)
     if filters:
         query = utils.exact_filter(query, models.Cluster, filters)
 
     keys, dirs = utils.get_sort_params(sort, consts.CLUSTER_INIT_AT)
     if marker:
-        marker = model_query(context, models.Cluster).get(marker)
+        marker = model_query(context, models.Cluster,
+                             use_replica=use_replica).get(marker)
 
     return sa_utils.paginate_query(query, models.Cluster, limit, keys,
                                    marker=marker, sort_dirs=dirs).all()
 
 
-def cluster_next_index(context, cluster_id):
+def cluster_next_index(context, cluster_id, count=1):
     with session_for_write() as session:
         cluster = session.query(models.Cluster).with_for_update().get(
             cluster_id)
         if cluster is None:
             return 0
 
+        # Reserve a block of 'count' indexes starting from next_index
         next_index = cluster.next_index
-        cluster.next_index = cluster.next_index + 1
+        cluster.next_index = cluster.next_index + count
         cluster.save(session)
         return next_index
 
@@ -242,6 +304,22 @@ def node_create(context, values):
         return node
 
 
+@retry_on_deadlock
+def node_create_many(context, values):
+    # Nodes are inserted in one batch, IDs are assigned beforehand so that
+    # the rows need not be fetched back.
+    rows = []
+    for v in values:
+        row = dict(v)
+        row.setdefault('id', models.UUID4())
+        rows.append(row)
+
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Node, rows)
+
+    return [r['id'] for r in rows]
+
+
 def node_get(context, node_id, project_safe=True):
     node = model_query(context, models.Node).get(node_id)
     if not node:
@@ -263,8 +341,42 @@ def node_get_by_short_id(context, short_id, project_safe=True):
                              project_safe=project_safe)
 
 
-def _query_node_get_all(context, project_safe=True, cluster_id=None):
-    query = model_query(context, models.Node)
+def _paginate_query(context, query, model, default_key, limit=None,
+                    marker=None, sort=None, use_replica=False):
+    """Paginate a listing query.
+
+    When no sort option is specified, rows are ordered by ``default_key``
+    and ``id`` and the page following the marker is selected with a plain
+    range condition on these two columns. With a composite index on them,
+    the database reads only the rows of the page however deep it is.
+    Other sorting options are handled by the generic pagination which
+    also sorts the rows having NULL keys.
+    """
+    if marker:
+        marker = model_query(context, model,
+                             use_replica=use_replica).get(marker)
+
+    if sort or (marker is not None and
+                getattr(marker, default_key) is None):
+        keys, dirs = utils.get_sort_params(sort, default_key)
+        return sa_utils.paginate_query(query, model, limit, keys,
+                                       marker=marker, sort_dirs=dirs).all()
+
+    column = getattr(model, default_key)
+    if marker is not None:
+        value = getattr(marker, default_key)
+        query = query.filter(sqlalchemy.or_(
+            column > value,
+            sqlalchemy.and_(column == value, model.id > marker.id)))
+    query = query.order_by(column.asc(), model.id.asc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def _query_node_get_all(context, project_safe=True, cluster_id=None,
+                        use_replica=False):
+    query = model_query(context, models.Node, use_replica=use_replica)
 
     if cluster_id is not None:
         query = query.filter_by(cluster_id=cluster_id)
@@ -276,18 +388,17 @@ def _query_node_get_all(context, project_safe=True, cluster_id=None):
 
 
 def node_get_all(context, cluster_id=None, limit=None, marker=None, sort=None,
-                 filters=None, project_safe=True):
+                 filters=None, project_safe=True, use_replica=False):
     query = _query_node_get_all(context, project_safe=project_safe,
-                                cluster_id=cluster_id)
+                                cluster_id=cluster_id,
+                                use_replica=use_replica)
 
     if filters:
         query = utils.exact_filter(query, models.Node, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.NODE_INIT_AT)
-    if marker:
-        marker = model_query(context, models.Node).get(marker)
-    return sa_utils.paginate_query(query, models.Node, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return _paginate_query(context, query, models.Node, consts.NODE_INIT_AT,
+                           limit=limit, marker=marker, sort=sort,
+                           use_replica=use_replica)
 
 
 def node_get_all_by_cluster(context, cluster_id, filters=None,
@@ -348,6 +459,63 @@ def node_update(context, node_id, values):
                 cluster.save(session)
 
 
+@retry_on_deadlock
+def node_update_many(context, values):
+    """Update many nodes with new property values in one transaction.
+
+    Nodes which no longer exist in database are skipped.
+
+    :param values: A dictionary mapping the ID of each node to be updated to
+                   a dictionary of values to be updated on the node.
+    """
+    if not values:
+        return
+
+    with session_for_write() as session:
+        query = session.query(models.Node).filter(
+            models.Node.id.in_(list(values.keys())))
+        for node in query:
+            node_values = values[node.id]
+            node.update(node_values)
+            if 'status' in node_values and node.cluster_id is not None:
+                cluster = session.query(models.Cluster).get(node.cluster_id)
+                if cluster is not None:
+                    if node_values['status'] == 'ERROR':
+                        cluster.status = consts.CS_WARNING
+                    if 'status_reason' in node_values:
+                        cluster.status_reason = (
+                            'Node %(node)s: %(reason)s' % {
+                                'node': node.name,
+                                'reason': node_values['status_reason']})
+
+        # Rows are flushed together so that they can be updated in batches
+        session.flush()
+
+
+@retry_on_deadlock
+def batch_update(context, actions=None, nodes=None):
+    """Update many actions and nodes in one transaction.
+
+    Records which no longer exist in database are skipped.
+
+    :param actions: A dictionary mapping the ID of each action to be updated
+                    to a dictionary of values to be updated on the action.
+    :param nodes: A dictionary mapping the ID of each node to be updated to
+                  a dictionary of values to be updated on the node.
+    """
+    with session_for_write() as session:
+        for model, values in ((models.Action, actions), (models.Node, nodes)):
+            if not values:
+                continue
+
+            query = session.query(model).filter(
+                model.id.in_(list(values.keys())))
+            for obj in query:
+                obj.update(values[obj.id])
+
+        session.flush()
+
+
 @retry_on_deadlock
 def node_add_dependents(context, depended, dependent, dep_type=None):
     """Add dependency between nodes.
@@ -597,6 +765,28 @@ def policy_get(context, policy_id, project_safe=True):
     return policy
 
 
+def policy_get_version(context, policy_id, project_safe=True):
+    """Get the creation and update time of a policy.
+
+    This is much cheaper than loading the whole policy and is used to check
+    whether a cached copy of the policy is stale.
+
+    :returns: A tuple of the created_at and updated_at timestamps, or None
+              if the policy is not found.
+    """
+    with session_for_read() as session:
+        query = session.query(models.Policy.created_at,
+                              models.Policy.updated_at)
+        query = query.filter_by(id=policy_id)
+        if project_safe:
+            query = query.filter_by(project=context.project_id)
+
+        row = query.first()
+        if row is None:
+            return None
+        return tuple(row)
+
+
 def policy_get_by_name(context, name, project_safe=True):
     return query_by_name(context, models.Policy, name,
                          project_safe=project_safe)
@@ -832,6 +1022,28 @@ def profile_get(context, profile_id, project_safe=True):
     return profile
 
 
+def profile_get_version(context, profile_id, project_safe=True):
+    """Get the creation and update time of a profile.
+
+    This is much cheaper than loading the whole profile and is used to check
+    whether a cached copy of the profile is stale.
+
+    :returns: A tuple of the created_at and updated_at timestamps, or None
+              if the profile is not found.
+    """
+    with session_for_read() as session:
+        query = session.query(models.Profile.created_at,
+                              models.Profile.updated_at)
+        query = query.filter_by(id=profile_id)
+        if project_safe:
+            query = query.filter_by(project=context.project_id)
+
+        row = query.first()
+        if row is None:
+            return None
+        return tuple(row)
+
+
 def profile_get_by_name(context, name, project_safe=True):
     return query_by_name(context, models.Profile, name,
                          project_safe=project_safe)
@@ -943,6 +1155,21 @@ def event_create(context, values):
         return event
 
 
+def event_create_many(context, values):
+    # Events are inserted in one batch, IDs are assigned beforehand so that
+    # the rows need not be fetched back.
+    rows = []
+    for v in values:
+        row = dict(v)
+        row.setdefault('id', models.UUID4())
+        rows.append(row)
+
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Event, rows)
+
+    return [r['id'] for r in rows]
+
+
 @retry_on_deadlock
 def event_get(context, event_id, project_safe=True):
     event = model_query(context, models.Event).get(event_id)
@@ -959,25 +1186,26 @@ def event_get_by_short_id(context, short_id, project_safe=True):
 
 
 def _event_filter_paginate_query(context, query, filters=None,
-                                 limit=None, marker=None, sort=None):
+                                 limit=None, marker=None, sort=None,
+                                 use_replica=False):
     if filters:
         query = utils.exact_filter(query, models.Event, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.EVENT_TIMESTAMP)
-    if marker:
-        marker = model_query(context, models.Event).get(marker)
-    return sa_utils.paginate_query(query, models.Event, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return _paginate_query(context, query, models.Event,
+                           consts.EVENT_TIMESTAMP, limit=limit,
+                           marker=marker, sort=sort,
+                           use_replica=use_replica)
 
 
 def event_get_all(context, limit=None, marker=None, sort=None, filters=None,
-                  project_safe=True):
-    query = model_query(context, models.Event)
+                  project_safe=True, use_replica=False):
+    query = model_query(context, models.Event, use_replica=use_replica)
     if project_safe:
         query = query.filter_by(project=context.project_id)
 
     return _event_filter_paginate_query(context, query, filters=filters,
-                                        limit=limit, marker=marker, sort=sort)
+                                        limit=limit, marker=marker, sort=sort,
+                                        use_replica=use_replica)
 
 
 def event_count_by_cluster(context, cluster_id, project_safe=True):
@@ -1013,23 +1241,43 @@ def event_prune(context, cluster_id, project_safe=True):
         return query.delete(synchronize_session='fetch')
 
 
+def _purge_time_line(granularity, age):
+    if granularity == 'days':
+        age = age * 86400
+    elif granularity == 'hours':
+        age = age * 3600
+    elif granularity == 'minutes':
+        age = age * 60
+    return timeutils.utcnow() - datetime.timedelta(seconds=age)
+
+
 @retry_on_deadlock
-def event_purge(project, granularity='days', age=30):
+def event_purge(project, granularity='days', age=30, limit=None):
+    """Purge events older than the given age.
+
+    :param limit: Maximum number of events purged. Each call is committed
+                  separately so that purging in batches does not lock the
+                  table for long.
+    :returns: Number of events purged.
+    """
     with session_for_write() as session:
-        query = session.query(models.Event).with_for_update()
+        query = session.query(models.Event)
         if project is not None:
             query = query.filter(models.Event.project.in_(project))
         if granularity is not None and age is not None:
-            if granularity == 'days':
-                age = age * 86400
-            elif granularity == 'hours':
-                age = age * 3600
-            elif granularity == 'minutes':
-                age = age * 60
-            time_line = timeutils.utcnow() - datetime.timedelta(seconds=age)
+            time_line = _purge_time_line(granularity, age)
             query = query.filter(models.Event.timestamp < time_line)
 
-        return query.delete(synchronize_session='fetch')
+        if limit is None:
+            return query.with_for_update().delete(
+                synchronize_session='fetch')
+
+        ids = [r[0] for r in query.with_entities(models.Event.id).limit(limit)]
+        if not ids:
+            return 0
+
+        query = session.query(models.Event).filter(models.Event.id.in_(ids))
+        return query.delete(synchronize_session=False)
 
 
 # Actions
@@ -1042,6 +1290,36 @@ def action_create(context, values):
         return action
 
 
+@retry_on_deadlock
+def action_create_many(context, values, dependent=None):
+    rows = []
+    for v in values:
+        row = dict(v)
+        row.setdefault('id', models.UUID4())
+        rows.append(row)
+    ids = [r['id'] for r in rows]
+
+    with session_for_write() as session:
+        session.bulk_insert_mappings(models.Action, rows)
+        if dependent is None:
+            return ids
+
+        # The dependent action waits for all the new actions, which is
+        # recorded in the same transaction as the actions themselves.
+        session.bulk_insert_mappings(
+            models.ActionDependency,
+            [{'id': models.UUID4(), 'depended': i, 'dependent': dependent}
+             for i in ids])
+
+        query = session.query(models.Action).with_for_update()
+        query = query.filter_by(id=dependent)
+        query.update({'status': consts.ACTION_WAITING,
+                      'status_reason': 'Waiting for depended actions.'},
+                     synchronize_session=False)
+
+    return ids
+
+
 @retry_on_deadlock
 def action_update(context, action_id, values):
     with session_for_write() as session:
@@ -1118,20 +1396,19 @@ def action_get_all_active_by_target(context, target_id, project_safe=True):
 
 
 def action_get_all(context, filters=None, limit=None, marker=None, sort=None,
-                   project_safe=True):
+                   project_safe=True, use_replica=False):
 
-    query = model_query(context, models.Action)
+    query = model_query(context, models.Action, use_replica=use_replica)
     if project_safe:
         query = query.filter_by(project=context.project_id)
 
     if filters:
         query = utils.exact_filter(query, models.Action, filters)
 
-    keys, dirs = utils.get_sort_params(sort, consts.ACTION_CREATED_AT)
-    if marker:
-        marker = model_query(context, models.Action).get(marker)
-    return sa_utils.paginate_query(query, models.Action, limit, keys,
-                                   marker=marker, sort_dirs=dirs).all()
+    return _paginate_query(context, query, models.Action,
+                           consts.ACTION_CREATED_AT, limit=limit,
+                           marker=marker, sort=sort,
+                           use_replica=use_replica)
 
 
 @retry_on_deadlock
@@ -1168,6 +1445,32 @@ def dependency_get_dependents(context, action_id):
         return [d.dependent for d in q.all()]
 
 
+@retry_on_deadlock
+def dependency_purge(limit=None):
+    """Purge dependencies referring to actions which no longer exist.
+
+    :param limit: Maximum number of dependencies purged.
+    :returns: Number of dependencies purged.
+    """
+    model = models.ActionDependency
+    with session_for_write() as session:
+        depended = session.query(models.Action.id).filter(
+            models.Action.id == model.depended).exists()
+        dependent = session.query(models.Action.id).filter(
+            models.Action.id == model.dependent).exists()
+        query = session.query(model.id).filter(
+            sqlalchemy.or_(~depended, ~dependent))
+        if limit is not None:
+            query = query.limit(limit)
+
+        ids = [r[0] for r in query]
+        if not ids:
+            return 0
+
+        return session.query(model).filter(model.id.in_(ids)).delete(
+            synchronize_session=False)
+
+
 @retry_on_deadlock
 def dependency_add(context, depended, dependent):
     if isinstance(depended, list) and isinstance(dependent, list):
@@ -1206,7 +1509,7 @@ def dependency_add(context, depended, dependent):
 
 
 @retry_on_deadlock
-def action_mark_succeeded(context, action_id, timestamp):
+def action_mark_succeeded(context, action_id, timestamp, timing=None):
     with session_for_write() as session:
 
         query = session.query(models.Action).filter_by(id=action_id)
@@ -1216,15 +1519,26 @@ def action_mark_succeeded(context, action_id, timestamp):
             'status_reason': 'Action completed successfully.',
             'end_time': timestamp,
         }
+        if timing is not None:
+            values['timing'] = timing
         query.update(values, synchronize_session=False)
 
         subquery = session.query(models.ActionDependency).filter_by(
             depended=action_id)
-        subquery.delete(synchronize_session='fetch')
+        dependents = [d.dependent for d in subquery.all()]
+        subquery.delete(synchronize_session=False)
+        if not dependents:
+            return []
+
+        # Find the dependents that are still waiting for other actions
+        query = session.query(models.ActionDependency.dependent).filter(
+            models.ActionDependency.dependent.in_(dependents)).distinct()
+        waiting = set(d.dependent for d in query.all())
+        return [d for d in dependents if d not in waiting]
 
 
 @retry_on_deadlock
-def action_mark_ready(context, action_id, timestamp):
+def action_mark_ready(context, action_id, timestamp, timing=None):
     with session_for_write() as session:
 
         query = session.query(models.Action).filter_by(id=action_id)
@@ -1234,11 +1548,13 @@ def action_mark_ready(context, action_id, timestamp):
             'status_reason': 'Lifecycle timeout.',
             'end_time': timestamp,
         }
+        if timing is not None:
+            values['timing'] = timing
         query.update(values, synchronize_session=False)
 
 
 @retry_on_deadlock
-def _mark_failed(session, action_id, timestamp, reason=None):
+def _mark_failed(session, action_id, timestamp, reason=None, timing=None):
     # mark myself as failed
     query = session.query(models.Action).filter_by(id=action_id)
     values = {
@@ -1248,6 +1564,8 @@ def _mark_failed(session, action_id, timestamp, reason=None):
                           'Action execution failed'),
         'end_time': timestamp,
     }
+    if timing is not None:
+        values['timing'] = timing
     query.update(values, synchronize_session=False)
 
     query = session.query(models.ActionDependency)
@@ -1258,15 +1576,19 @@ def _mark_failed(session, action_id, timestamp, reason=None):
     for d in dependents:
         _mark_failed(session, d, timestamp)
 
+    return dependents
+
 
 @retry_on_deadlock
-def action_mark_failed(context, action_id, timestamp, reason=None):
+def action_mark_failed(context, action_id, timestamp, reason=None,
+                       timing=None):
     with session_for_write() as session:
-        _mark_failed(session, action_id, timestamp, reason)
+        return _mark_failed(session, action_id, timestamp, reason, timing)
 
 
 @retry_on_deadlock
-def _mark_cancelled(session, action_id, timestamp, reason=None):
+def _mark_cancelled(session, action_id, timestamp, reason=None,
+                    timing=None):
     query = session.query(models.Action).filter_by(id=action_id)
     values = {
         'owner': None,
@@ -1275,6 +1597,8 @@ def _mark_cancelled(session, action_id, timestamp, reason=None):
                           'Action execution failed'),
         'end_time': timestamp,
     }
+    if timing is not None:
+        values['timing'] = timing
     query.update(values, synchronize_session=False)
 
     query = session.query(models.ActionDependency)
@@ -1285,11 +1609,14 @@ def _mark_cancelled(session, action_id, timestamp, reason=None):
     for d in dependents:
         _mark_cancelled(session, d, timestamp)
 
+    return dependents
+
 
 @retry_on_deadlock
-def action_mark_cancelled(context, action_id, timestamp, reason=None):
+def action_mark_cancelled(context, action_id, timestamp, reason=None,
+                          timing=None):
     with session_for_write() as session:
-        _mark_cancelled(session, action_id, timestamp, reason)
+        return _mark_cancelled(session, action_id, timestamp, reason, timing)
 
 
 @retry_on_deadlock
@@ -1344,6 +1671,91 @@ def action_acquire_first_ready(context, owner, timestamp):
         return action_acquire(context, action.id, owner, timestamp)
 
 
+def action_get_all_ready(context, limit=None, priority_actions=None,
+                         project_limit=None):
+    """Get brief information of READY actions not owned by any worker.
+
+    :param context: The request context.
+    :param limit: Maximum number of actions to return.
+    :param priority_actions: A list of action names returned before the
+                             other actions. Actions requested through RPC
+                             come next, then derived actions.
+    :param project_limit: Maximum number of actions to return for each
+                          project, so that a project with many ready
+                          actions does not crowd out the others.
+    :return: A list of rows with the id, project, action, cause,
+             created_at and rank columns, by rank and oldest first.
+    """
+    whens = [(models.Action.cause == consts.CAUSE_RPC, 1)]
+    if priority_actions:
+        whens.insert(0, (models.Action.action.in_(priority_actions), 0))
+    rank = sqlalchemy.case(whens, else_=2).label('rank')
+
+    with session_for_read() as session:
+        query = session.query(models.Action.id, models.Action.project,
+                              models.Action.action, models.Action.cause,
+                              models.Action.created_at, rank)
+        query = query.filter_by(status=consts.ACTION_READY, owner=None)
+        query = query.order_by(rank, models.Action.created_at)
+        if not project_limit:
+            if limit:
+                query = query.limit(limit)
+            return query.all()
+
+        projects = session.query(models.Action.project).filter_by(
+            status=consts.ACTION_READY, owner=None).distinct()
+        rows = []
+        for project, in projects:
+            rows.extend(query.filter_by(project=project).limit(
+                project_limit).all())
+
+    return sorted(rows, key=lambda r: (r.rank, r.created_at))[:limit]
+
+
+def action_count_ready(context):
+    """Count READY actions not owned by any worker."""
+    with session_for_read() as session:
+        query = session.query(models.Action.id)
+        query = query.filter_by(status=consts.ACTION_READY, owner=None)
+        return query.count()
+
+
+@retry_on_deadlock
+def action_acquire_batch(context, owner, timestamp, limit, action_ids=None):
+    """Claim up to `limit` READY actions in a single transaction.
+
+    :param context: The request context.
+    :param owner: ID of the worker claiming the actions.
+    :param timestamp: Timestamp to be recorded as start time.
+    :param limit: Maximum number of actions to claim.
+    :param action_ids: Optional list of IDs restricting the actions that can
+                       be claimed.
+    :return: A list of claimed actions, oldest first.
+    """
+    with session_for_write() as session:
+        query = session.query(models.Action).filter_by(
+            status=consts.ACTION_READY).filter_by(owner=None)
+        if action_ids is not None:
+            query = query.filter(models.Action.id.in_(action_ids))
+        query = query.order_by(consts.ACTION_CREATED_AT)
+        actions = query.limit(limit).with_for_update().all()
+
+        acquired = []
+        for action in actions:
+            # Another worker may have taken the row while we were waiting
+            # for the row lock.
+            if action.owner or action.status != consts.ACTION_READY:
+                continue
+            action.owner = owner
+            action.start_time = timestamp
+            action.status = consts.ACTION_RUNNING
+            action.status_reason = 'The action is being processed.'
+            acquired.append(action)
+
+        session.flush()
+        return acquired
+
+
 @retry_on_deadlock
 def action_abandon(context, action_id, values=None):
     """Abandon an action for other workers to execute again.
@@ -1430,6 +1842,44 @@ def action_delete_by_target(context, target, action=None,
         return q.delete(synchronize_session='fetch')
 
 
+@retry_on_deadlock
+def action_purge(project, granularity='days', age=30, limit=None):
+    """Purge completed actions older than the given age.
+
+    Dependencies from or to the purged actions are purged as well.
+
+    :param limit: Maximum number of actions purged. Each call is committed
+                  separately so that purging in batches does not lock the
+                  table for long.
+    :returns: Number of actions purged.
+    """
+    with session_for_write() as session:
+        query = session.query(models.Action.id).filter(
+            models.Action.status.in_([consts.ACTION_SUCCEEDED,
+                                      consts.ACTION_FAILED,
+                                      consts.ACTION_CANCELLED]))
+        if project is not None:
+            query = query.filter(models.Action.project.in_(project))
+        if granularity is not None and age is not None:
+            time_line = _purge_time_line(granularity, age)
+            query = query.filter(models.Action.created_at < time_line)
+        if limit is not None:
+            query = query.limit(limit)
+
+        ids = [r[0] for r in query]
+        if not ids:
+            return 0
+
+        model = models.ActionDependency
+        session.query(model).filter(
+            sqlalchemy.or_(model.depended.in_(ids),
+                           model.dependent.in_(ids))
+        ).delete(synchronize_session=False)
+
+        return session.query(models.Action).filter(
+            models.Action.id.in_(ids)).delete(synchronize_session=False)
+
+
 # Receivers
 @retry_on_deadlock
 def receiver_create(context, values):
@@ -1543,6 +1993,24 @@ def service_get_all():
         return session.query(models.Service).all()
 
 
+def _query_live_service_ids(session, duration=None):
+    if not duration:
+        duration = 2 * CONF.periodic_interval
+    time_line = timeutils.utcnow(True) - datetime.timedelta(seconds=duration)
+    return session.query(models.Service.id).filter(
+        models.Service.updated_at >= time_line)
+
+
+def service_get_live_ids(duration=None):
+    """Get IDs of services which reported their status recently.
+
+    :param duration: Seconds within which a live service has reported its
+                     status, twice the periodic interval by default.
+    """
+    with session_for_read() as session:
+        return [r[0] for r in _query_live_service_ids(session, duration)]
+
+
 def _mark_engine_failed(session, action_id, timestamp, reason=None):
     query = session.query(models.ActionDependency)
     # process cluster actions
@@ -1637,15 +2105,28 @@ def registry_update(context, cluster_id, values):
             registry.save(session)
 
 
+def _query_orphan_registries(session):
+    # Liveness is checked by the database, live services are not loaded
+    live_ids = _query_live_service_ids(session).subquery()
+    return session.query(models.HealthRegistry).filter(sqlalchemy.or_(
+        models.HealthRegistry.engine_id.is_(None),
+        models.HealthRegistry.engine_id.notin_(live_ids)))
+
+
+def registry_get_orphans(context):
+    with session_for_read() as session:
+        query = _query_orphan_registries(session).with_entities(
+            models.HealthRegistry.cluster_id)
+        return [r.cluster_id for r in query.all()]
+
+
 @retry_on_deadlock
-def registry_claim(context, engine_id):
+def registry_claim(context, engine_id, cluster_ids=None):
     with session_for_write() as session:
-        engines = session.query(models.Service).all()
-        svc_ids = [e.id for e in engines if not utils.is_service_dead(e)]
-        q_reg = session.query(models.HealthRegistry).with_for_update()
-        if svc_ids:
+        q_reg = _query_orphan_registries(session).with_for_update()
+        if cluster_ids is not None:
             q_reg = q_reg.filter(
-                models.HealthRegistry.engine_id.notin_(svc_ids))
+                models.HealthRegistry.cluster_id.in_(cluster_ids))
 
         result = q_reg.all()
         q_reg.update({'engine_id': engine_id}, synchronize_session=False)
@@ -1653,6 +2134,15 @@ def registry_claim(context, engine_id):
         return result
 
 
+@retry_on_deadlock
+def registry_release(context, engine_id, cluster_ids):
+    with session_for_write() as session:
+        q_reg = session.query(models.HealthRegistry).filter(
+            models.HealthRegistry.engine_id == engine_id,
+            models.HealthRegistry.cluster_id.in_(cluster_ids))
+        return q_reg.update({'engine_id': None}, synchronize_session=False)
+
+
 @retry_on_deadlock
 def registry_delete(context, cluster_id):
     with session_for_write() as session:
@@ -0,0 +1,33 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from sqlalchemy import Index, MetaData, Table
+
+INDEXES = (
+    ('ix_action_status_owner_created_at', 'action',
+     ('status', 'owner', 'created_at')),
+    ('ix_action_target_status', 'action', ('target', 'status')),
+    ('ix_node_cluster_id', 'node', ('cluster_id',)),
+    ('ix_event_cluster_id_timestamp', 'event', ('cluster_id', 'timestamp')),
+    ('ix_dependency_depended', 'dependency', ('depended',)),
+    ('ix_dependency_dependent', 'dependency', ('dependent',)),
+)
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    for name, table_name, columns in INDEXES:
+        table = Table(table_name, meta, autoload=True)
+        index = Index(name, *[table.c[c] for c in columns])
+        index.create(migrate_engine)
@@ -16,7 +16,7 @@ SQLAlchemy models for Senlin data.
 
 from oslo_db.sqlalchemy import models
 from oslo_utils import uuidutils
-from sqlalchemy import Boolean, Column, Numeric, ForeignKey, Integer
+from sqlalchemy import Boolean, Column, Numeric, ForeignKey, Index, Integer
 from sqlalchemy import String, Text
 from sqlalchemy.ext import declarative
 from sqlalchemy.orm import backref
@@ -99,7 +99,11 @@ class Cluster(BASE, TimestampMixin, models.ModelBase):
 class Node(BASE, TimestampMixin, models.ModelBase):
     """Node objects."""
 
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_node_cluster_id', 'cluster_id'),
+        Index('ix_node_init_at_id', 'init_at', 'id'),
+        {'mysql_engine': 'InnoDB'},
+    )
     __tablename__ = 'node'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -205,7 +209,11 @@ class Credential(BASE, models.ModelBase):
 
 class ActionDependency(BASE, models.ModelBase):
     """Action dependencies."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_dependency_depended', 'depended'),
+        Index('ix_dependency_dependent', 'dependent'),
+        {'mysql_engine': 'InnoDB'},
+    )
     __tablename__ = 'dependency'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -217,7 +225,13 @@ class ActionDependency(BASE, models.ModelBase):
 
 class Action(BASE, TimestampMixin, models.ModelBase):
     """Action objects."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_action_status_owner_created_at',
+              'status', 'owner', 'created_at'),
+        Index('ix_action_target_status', 'target', 'status'),
+        Index('ix_action_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'},
+    )
     __tablename__ = 'action'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -237,6 +251,8 @@ class Action(BASE, TimestampMixin, models.ModelBase):
     inputs = Column(types.Dict)
     outputs = Column(types.Dict)
     data = Column(types.Dict)
+    # Time spent in each phase of the last execution
+    timing = Column(types.Dict)
     user = Column(String(32))
     project = Column(String(32))
     domain = Column(String(32))
@@ -244,7 +260,11 @@ class Action(BASE, TimestampMixin, models.ModelBase):
 
 class Event(BASE, models.ModelBase):
     """Events generated by the Senin engine."""
-    __table_args__ = {'mysql_engine': 'InnoDB'}
+    __table_args__ = (
+        Index('ix_event_cluster_id_timestamp', 'cluster_id', 'timestamp'),
+        Index('ix_event_timestamp_id', 'timestamp', 'id'),
+        {'mysql_engine': 'InnoDB'},
+    )
     __tablename__ = 'event'
 
     id = Column('id', String(36), primary_key=True, default=lambda: UUID4())
@@ -280,3 +300,5 @@ class Service(BASE, TimestampMixin, models.ModelBase):
     topic = Column(String(255))
     disabled = Column(Boolean, default=False)
     disabled_reason = Column(String(255))
+    # Number of actions running in the engine as last reported
+    load = Column(Integer, default=0)
@@ -53,6 +53,10 @@ class NovaClient(base.DriverBase):
     def server_get(self, server):
         return self.conn.compute.get_server(server)
 
+    @sdk.translate_exception
+    def server_list(self, details=True, **query):
+        return [s for s in self.conn.compute.servers(details, **query)]
+
     @sdk.translate_exception
     def server_update(self, server, **attrs):
         return self.conn.compute.update_server(server, **attrs)
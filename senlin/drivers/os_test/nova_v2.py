@@ -199,6 +199,9 @@ class NovaClient(base.DriverBase):
     def server_get(self, server):
         return sdk.FakeResourceObject(self.fake_server_get)
 
+    def server_list(self, details=True, **query):
+        return [sdk.FakeResourceObject(self.fake_server_get)]
+
     def wait_for_server(self, server, timeout=None):
         # sleep for simulated wait time if it was supplied during server_create
         if server in self.simulated_waits:
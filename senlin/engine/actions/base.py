@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import contextlib
 import eventlet
 import six
 import time
@@ -24,16 +25,55 @@ from senlin.common import exception
 from senlin.common import utils
 from senlin.engine import dispatcher
 from senlin.engine import event as EVENT
+from senlin.engine import metrics
 from senlin.objects import action as ao
 from senlin.objects import cluster_lock as cl
 from senlin.objects import cluster_policy as cpo
 from senlin.objects import dependency as dobj
 from senlin.objects import node_lock as nl
+from senlin.objects import unit_of_work
 from senlin.policies import base as policy_mod
 
 wallclock = time.time
 LOG = logging.getLogger(__name__)
 
+# Maximum number of spans recorded in the timing profile of an action
+MAX_SPANS = 200
+
+
+class Timing(object):
+    """Timing profile of an action execution made of named spans."""
+
+    def __init__(self):
+        self.watch = timeutils.StopWatch().start()
+        self.spans = []
+
+    @contextlib.contextmanager
+    def span(self, name, **info):
+        """Record the time spent in the enclosed block.
+
+        :param name: Name of the span, e.g. 'execute'.
+        :param info: Additional information to be recorded with the span.
+        """
+        start = self.watch.elapsed()
+        try:
+            yield
+        finally:
+            if len(self.spans) < MAX_SPANS:
+                span = {
+                    'name': name,
+                    'start': round(start, 6),
+                    'duration': round(self.watch.elapsed() - start, 6),
+                }
+                span.update(info)
+                self.spans.append(span)
+
+    def to_dict(self):
+        return {
+            'spans': list(self.spans),
+            'total': round(self.watch.elapsed(), 6),
+        }
+
 
 class Action(object):
     """An action can be performed on a cluster or a node of a cluster."""
@@ -108,6 +148,9 @@ class Action(object):
         # working on the action.  It also serves as a lock.
         self.owner = kwargs.get('owner', None)
 
+        # Last control signal recorded for the action, if any
+        self.control = kwargs.get('control', None)
+
         # An action may need to be executed repeatitively, interval is the
         # time in seconds between two consecutive execution.
         # A value of -1 indicates that this action is only to be executed once
@@ -139,16 +182,16 @@ class Action(object):
 
         self.data = kwargs.get('data', {})
 
-    def store(self, ctx):
-        """Store the action record into database table.
+        # Timing profile of the last execution as stored, and the timer of
+        # the execution in progress
+        self.timing = kwargs.get('timing', None)
+        self.timer = Timing()
 
-        :param ctx: An instance of the request context.
-        :return: The ID of the stored object.
-        """
+        # Values of the fields as last loaded from or stored into database
+        self._stored = self._get_values() if self.id else {}
 
-        timestamp = timeutils.utcnow(True)
-
-        values = {
+    def _get_values(self):
+        return {
             'name': self.name,
             'context': self.context.to_dict(),
             'target': self.target,
@@ -166,20 +209,43 @@ class Action(object):
             'created_at': self.created_at,
             'updated_at': self.updated_at,
             'data': self.data,
+            'timing': self.timing,
             'user': self.user,
             'project': self.project,
             'domain': self.domain,
         }
 
+    def store(self, ctx):
+        """Store the action record into database table.
+
+        :param ctx: An instance of the request context.
+        :return: The ID of the stored object.
+        """
+
+        timestamp = timeutils.utcnow(True)
+
+        values = self._get_values()
+
         if self.id:
             self.updated_at = timestamp
             values['updated_at'] = timestamp
+            stored, self._stored = self._stored, values
+            unit = unit_of_work.current()
+            if unit is not None and unit.action_id == self.id:
+                # Only the fields changed since the action was loaded or
+                # last stored are written. Unless one of them is not
+                # deferrable, the update is written at the next checkpoint.
+                fields = unit_of_work.DEFERRABLE_FIELDS[unit_of_work.ACTION]
+                values = dict((k, v) for k, v in values.items()
+                              if k in fields or k not in stored or
+                              stored[k] != v)
             ao.Action.update(ctx, self.id, values)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
             action = ao.Action.create(ctx, values)
             self.id = action.id
+            self._stored = values
 
         return self.id
 
@@ -196,6 +262,7 @@ class Action(object):
             'name': obj.name,
             'cause': obj.cause,
             'owner': obj.owner,
+            'control': obj.control,
             'interval': obj.interval,
             'start_time': obj.start_time,
             'end_time': obj.end_time,
@@ -207,6 +274,7 @@ class Action(object):
             'created_at': obj.created_at,
             'updated_at': obj.updated_at,
             'data': obj.data,
+            'timing': obj.timing,
         }
 
         target_type = obj.action.split('_')[0]
@@ -253,6 +321,65 @@ class Action(object):
         cls._check_action_lock(target, action)
         cls._check_conflicting_actions(ctx, target, action)
 
+        c = cls._derive_context(ctx)
+
+        if action in consts.CLUSTER_SCALE_ACTIONS:
+            Action.validate_scaling_action(c, target, action)
+
+        obj = cls(target, action, c, **kwargs)
+        return obj.store(ctx)
+
+    @classmethod
+    def create_many(cls, ctx, targets, action, dependent, **kwargs):
+        """Create a batch of actions that are ready for execution.
+
+        This is meant for the child actions derived from a cluster action
+        on nodes that have just been created, so the lock and conflict
+        checks done by `create` are skipped. The actions are inserted in
+        one batch together with their dependencies on the parent action.
+
+        :param ctx: The requesting context.
+        :param targets: A list of IDs of the target nodes.
+        :param action: Name of the action.
+        :param dependent: ID of the action that waits for the new actions.
+        :param dict kwargs: Other keyword arguments for the actions.
+        :return: A list of IDs of the actions created.
+        """
+        c = cls._derive_context(ctx)
+        timestamp = timeutils.utcnow(True)
+
+        # NOTE: The records are built without instantiating the action
+        # classes, which would load the target of each action from DB.
+        values = []
+        for target in targets:
+            values.append({
+                'name': '%s_%s' % (action.lower(), target[:8]),
+                'context': c.to_dict(),
+                'target': target,
+                'action': action,
+                'cause': kwargs.get('cause', ''),
+                'owner': None,
+                'interval': kwargs.get('interval', -1),
+                'start_time': None,
+                'end_time': None,
+                'timeout': kwargs.get('timeout',
+                                      cfg.CONF.default_action_timeout),
+                'status': cls.READY,
+                'status_reason': '',
+                'inputs': kwargs.get('inputs', {}),
+                'outputs': {},
+                'created_at': timestamp,
+                'updated_at': None,
+                'data': kwargs.get('data', {}),
+                'user': c.user_id,
+                'project': c.project_id,
+                'domain': c.domain_id,
+            })
+
+        return ao.Action.create_many(ctx, values, dependent=dependent)
+
+    @staticmethod
+    def _derive_context(ctx):
         params = {
             'user_id': ctx.user_id,
             'project_id': ctx.project_id,
@@ -261,13 +388,7 @@ class Action(object):
             'request_id': ctx.request_id,
             'trusts': ctx.trusts,
         }
-        c = req_context.RequestContext.from_dict(params)
-
-        if action in consts.CLUSTER_SCALE_ACTIONS:
-            Action.validate_scaling_action(c, target, action)
-
-        obj = cls(target, action, c, **kwargs)
-        return obj.store(ctx)
+        return req_context.RequestContext.from_dict(params)
 
     @staticmethod
     def _check_action_lock(target, action):
@@ -332,6 +453,9 @@ class Action(object):
             return
 
         ao.Action.signal(self.context, self.id, cmd)
+        # Push the signal to the engine running the action so that it does
+        # not have to poll the database for it
+        dispatcher.signal_action(self.id, cmd, self.owner)
 
     def execute(self, **kwargs):
         """Execute the action.
@@ -347,28 +471,38 @@ class Action(object):
         """Set action status based on return value from execute."""
 
         timestamp = wallclock()
+        dependents = None
+        # The timing profile is stored along with the status
+        self.timing = self.timer.to_dict()
 
         if result == self.RES_OK:
             status = self.SUCCEEDED
-            ao.Action.mark_succeeded(self.context, self.id, timestamp)
+            dependents = ao.Action.mark_succeeded(self.context, self.id,
+                                                  timestamp,
+                                                  timing=self.timing)
 
         elif result == self.RES_ERROR:
             status = self.FAILED
-            ao.Action.mark_failed(self.context, self.id, timestamp,
-                                  reason or 'ERROR')
+            dependents = ao.Action.mark_failed(self.context, self.id,
+                                               timestamp, reason or 'ERROR',
+                                               timing=self.timing)
 
         elif result == self.RES_TIMEOUT:
             status = self.FAILED
-            ao.Action.mark_failed(self.context, self.id, timestamp,
-                                  reason or 'TIMEOUT')
+            dependents = ao.Action.mark_failed(self.context, self.id,
+                                               timestamp, reason or 'TIMEOUT',
+                                               timing=self.timing)
 
         elif result == self.RES_CANCEL:
             status = self.CANCELLED
-            ao.Action.mark_cancelled(self.context, self.id, timestamp)
+            dependents = ao.Action.mark_cancelled(self.context, self.id,
+                                                  timestamp,
+                                                  timing=self.timing)
 
         elif result == self.RES_LIFECYCLE_COMPLETE:
             status = self.SUCCEEDED
-            ao.Action.mark_ready(self.context, self.id, timestamp)
+            ao.Action.mark_ready(self.context, self.id, timestamp,
+                                 timing=self.timing)
 
         else:  # result == self.RES_RETRY:
             retries = self.data.get('retries', 0)
@@ -379,16 +513,25 @@ class Action(object):
                 retries += 1
 
                 self.data.update({'retries': retries})
-                ao.Action.abandon(self.context, self.id, {'data': self.data})
+                ao.Action.abandon(self.context, self.id,
+                                  {'data': self.data, 'timing': self.timing})
                 # sleep for a while
                 eventlet.sleep(cfg.CONF.lock_retry_interval)
-                dispatcher.start_action(self.id)
+                dispatcher.start_action()
             else:
                 status = self.RES_ERROR
                 if not reason:
                     reason = ('Exceeded maximum number of retries (%d)'
                               '') % cfg.CONF.lock_retry_times
-                ao.Action.mark_failed(self.context, self.id, timestamp, reason)
+                dependents = ao.Action.mark_failed(self.context, self.id,
+                                                   timestamp, reason,
+                                                   timing=self.timing)
+
+        if dependents:
+            self._wakeup_dependents(dependents)
+
+        metrics.inc(metrics.ACTIONS_COMPLETED, action=self.action,
+                    status=status)
 
         if status == self.SUCCEEDED:
             EVENT.info(self, consts.PHASE_END, reason or 'SUCCEEDED')
@@ -400,6 +543,24 @@ class Action(object):
         self.status = status
         self.status_reason = reason
 
+    def _wakeup_dependents(self, dependents):
+        """Wake up actions that were waiting for this action.
+
+        :param dependents: A list of IDs of the dependent actions.
+        :returns: None
+        """
+        for dep_id in dependents:
+            if dispatcher.wakeup_action(dep_id):
+                continue
+
+            # The dependent is not waiting in this engine
+            try:
+                owner = ao.Action.lock_check(self.context, dep_id)
+            except exception.ResourceNotFound:
+                continue
+            if owner and owner != self.owner:
+                dispatcher.wakeup_action(dep_id, owner)
+
     def get_status(self):
         timestamp = wallclock()
         status = ao.Action.check_status(self.context, self.id, timestamp)
@@ -418,6 +579,9 @@ class Action(object):
             EVENT.debug(self, consts.PHASE_ERROR, 'TIMEOUT')
             return self.RES_TIMEOUT
 
+        if dispatcher.is_receiving(self.id):
+            return dispatcher.get_signal(self.id)
+
         result = ao.Action.signal_query(self.context, self.id)
         return result
 
@@ -430,6 +594,15 @@ class Action(object):
     def is_resumed(self):
         return self._check_signal() == self.SIG_RESUME
 
+    def span(self, name, **info):
+        """Record the time spent in a phase of the action execution.
+
+        :param name: Name of the phase, e.g. 'lock_acquire'.
+        :param info: Additional information to be recorded with the span.
+        :returns: A context manager enclosing the phase.
+        """
+        return self.timer.span(name, **info)
+
     def _check_result(self, name):
         """Check policy status and generate event.
 
@@ -445,6 +618,31 @@ class Action(object):
                                ) % {'name': name, 'reason': reason}
         return False
 
+    def _get_policy_bindings(self, cluster_id):
+        """Get the enabled policy bindings of a cluster.
+
+        The bindings loaded along with the cluster this action operates on
+        are reused as long as they have not been changed since.
+
+        :param cluster_id: The ID of the cluster.
+        :returns: A generator of (binding, policy) tuples sorted by priority.
+        """
+        entity = getattr(self, 'entity', None)
+        rt = getattr(entity, 'rt', None)
+        if (getattr(entity, 'id', None) == cluster_id and
+                isinstance(rt, dict) and rt.get('bindings') is not None):
+            policies = dict((p.id, p) for p in rt['policies'])
+            for b in rt['bindings']:
+                if b.enabled and b.policy_id in policies:
+                    yield b, policies[b.policy_id]
+            return
+
+        bindings = cpo.ClusterPolicy.get_all(self.context, cluster_id,
+                                             sort='priority',
+                                             filters={'enabled': True})
+        for b in bindings:
+            yield b, policy_mod.Policy.load(self.context, b.policy_id)
+
     def policy_check(self, cluster_id, target):
         """Check all policies attached to cluster and give result.
 
@@ -457,16 +655,11 @@ class Action(object):
         if target not in ['BEFORE', 'AFTER']:
             return
 
-        bindings = cpo.ClusterPolicy.get_all(self.context, cluster_id,
-                                             sort='priority',
-                                             filters={'enabled': True})
         # default values
         self.data['status'] = policy_mod.CHECK_OK
         self.data['reason'] = 'Completed policy checking.'
 
-        for pb in bindings:
-            policy = policy_mod.Policy.load(self.context, pb.policy_id)
-
+        for pb, policy in self._get_policy_bindings(cluster_id):
             # add last_op as input for the policy so that it can be used
             # during pre_op
             self.inputs['last_op'] = pb.last_op
@@ -476,11 +669,14 @@ class Action(object):
 
             if target == 'BEFORE':
                 method = getattr(policy, 'pre_op', None)
+                span = 'policy_pre_op'
             else:  # target == 'AFTER'
                 method = getattr(policy, 'post_op', None)
+                span = 'policy_post_op'
 
             if method is not None:
-                method(cluster_id, self)
+                with self.span(span, policy=policy.name):
+                    method(cluster_id, self)
 
             res = self._check_result(policy.name)
             if res is False:
@@ -587,19 +783,45 @@ class Action(object):
 def ActionProc(ctx, action_id):
     """Action process."""
 
+    # Receive control signals pushed to the action from now on
+    dispatcher.add_signal_receiver(action_id)
+    try:
+        return _execute_action(ctx, action_id)
+    finally:
+        dispatcher.remove_signal_receiver(action_id)
+
+
+def _execute_action(ctx, action_id):
     # Step 1: materialize the action object
-    action = Action.load(ctx, action_id=action_id, project_safe=False)
+    timer = Timing()
+    with timer.span('load'):
+        action = Action.load(ctx, action_id=action_id, project_safe=False)
     if action is None:
         LOG.error('Action "%s" could not be found.', action_id)
         return False
 
+    action.timer = timer
+
+    # Signals sent before the action was picked up are only in the database
+    dispatcher.add_signal_receiver(action_id, action.control)
+
+    if action.created_at:
+        metrics.observe(metrics.ACQUIRE_SECONDS,
+                        timeutils.delta_seconds(action.created_at,
+                                                timeutils.utcnow(True)),
+                        action=action.action)
+
     EVENT.info(action, consts.PHASE_START, action_id[:8])
 
     reason = 'Action completed'
     success = True
+    watch = timeutils.StopWatch().start()
     try:
-        # Step 2: execute the action
-        result, reason = action.execute()
+        # Step 2: execute the action, the deferred updates are written
+        # before the status is set below.
+        with unit_of_work.begin(action.context, action.id):
+            with action.span('execute'):
+                result, reason = action.execute()
         if result == action.RES_RETRY:
             success = False
     except Exception as ex:
@@ -615,5 +837,7 @@ def ActionProc(ctx, action_id):
     finally:
         # NOTE: locks on action is eventually released here by status update
         action.set_status(result, reason)
+        metrics.observe(metrics.EXECUTION_SECONDS, watch.elapsed(),
+                        action=action.action, status=action.status)
 
     return success
@@ -13,6 +13,7 @@
 import copy
 import eventlet
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
 from osprofiler import profiler
@@ -24,14 +25,15 @@ from senlin.common import utils
 from senlin.engine.actions import base
 from senlin.engine import cluster as cluster_mod
 from senlin.engine import dispatcher
+from senlin.engine import metrics
 from senlin.engine import node as node_mod
 from senlin.engine.notifications import message as msg
-from senlin.engine import scheduler
 from senlin.engine import senlin_lock
 from senlin.objects import action as ao
 from senlin.objects import cluster as co
 from senlin.objects import dependency as dobj
 from senlin.objects import node as no
+from senlin.objects import unit_of_work
 from senlin.policies import base as policy_mod
 
 LOG = logging.getLogger(__name__)
@@ -65,6 +67,18 @@ class ClusterAction(base.Action):
 
         :returns: A tuple containing the result and the corresponding reason.
         """
+        unit_of_work.checkpoint()
+        dispatcher.add_waiter(self.id)
+        watch = timeutils.StopWatch().start()
+        try:
+            with self.span('child_wait'):
+                return self._wait_for_status(lifecycle_hook_timeout)
+        finally:
+            dispatcher.remove_waiter(self.id)
+            metrics.observe(metrics.DEPENDENTS_WAIT_SECONDS, watch.elapsed(),
+                            action=self.action)
+
+    def _wait_for_status(self, lifecycle_hook_timeout=None):
         status = self.get_status()
         while status != self.READY:
             if status == self.FAILED:
@@ -97,8 +111,9 @@ class ClusterAction(base.Action):
                 LOG.debug(reason)
                 return self.RES_LIFECYCLE_HOOK_TIMEOUT, reason
 
-            # Continue waiting (with reschedule)
-            scheduler.reschedule(self.id, 3)
+            # Continue waiting until woken up by a depended action or until
+            # the fallback interval expires
+            dispatcher.wait(self.id, cfg.CONF.dependency_check_interval)
             status = self.get_status()
 
         return self.RES_OK, 'All dependents ended with success'
@@ -115,11 +130,15 @@ class ClusterAction(base.Action):
 
         placement = self.data.get('placement', None)
 
+        # Reserve a block of indexes for the new nodes
+        first = co.Cluster.get_next_index(self.context, self.entity.id,
+                                          count=count)
+        name_format = self.entity.config.get("node.name.format", "")
+        profile = self.entity.rt['profile']
+
         nodes = []
-        child = []
-        # conunt >= 1
         for m in range(count):
-            index = co.Cluster.get_next_index(self.context, self.entity.id)
+            index = first + m
             kwargs = {
                 'index': index,
                 'metadata': {},
@@ -131,28 +150,19 @@ class ClusterAction(base.Action):
                 # We assume placement is a list
                 kwargs['data'] = {'placement': placement['placements'][m]}
 
-            name_format = self.entity.config.get("node.name.format", "")
             name = utils.format_node_name(name_format, self.entity, index)
             node = node_mod.Node(name, self.entity.profile_id,
-                                 self.entity.id, context=self.context,
-                                 **kwargs)
-
-            node.store(self.context)
+                                 self.entity.id, **kwargs)
+            # All nodes share the profile of the cluster
+            node.rt = {'profile': profile}
             nodes.append(node)
 
-            kwargs = {
-                'name': 'node_create_%s' % node.id[:8],
-                'cause': consts.CAUSE_DERIVED,
-            }
-            action_id = base.Action.create(self.context, node.id,
-                                           consts.NODE_CREATE, **kwargs)
-            child.append(action_id)
+        node_ids = node_mod.Node.store_many(self.context, nodes)
 
-        # Build dependency and make the new action ready
-        dobj.Dependency.create(self.context, [a for a in child], self.id)
-        for cid in child:
-            ao.Action.update(self.context, cid,
-                             {'status': base.Action.READY})
+        # Create the child actions ready for execution together with their
+        # dependencies
+        base.Action.create_many(self.context, node_ids, consts.NODE_CREATE,
+                                self.id, cause=consts.CAUSE_DERIVED)
         dispatcher.start_action()
 
         # Wait for cluster creation to complete
@@ -1147,10 +1157,11 @@ class ClusterAction(base.Action):
         """
         # Try to lock cluster before do real operation
         forced = True if self.action == consts.CLUSTER_DELETE else False
-        res = senlin_lock.cluster_lock_acquire(self.context, self.target,
-                                               self.id, self.owner,
-                                               senlin_lock.CLUSTER_SCOPE,
-                                               forced)
+        with self.span('lock_acquire', lock='cluster'):
+            res = senlin_lock.cluster_lock_acquire(self.context, self.target,
+                                                   self.id, self.owner,
+                                                   senlin_lock.CLUSTER_SCOPE,
+                                                   forced)
         # Failed to acquire lock, return RES_RETRY
         if not res:
             return self.RES_RETRY, 'Failed in locking cluster.'
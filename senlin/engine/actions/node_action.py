@@ -12,6 +12,7 @@
 
 import eventlet
 
+from oslo_config import cfg
 from oslo_log import log as logging
 from osprofiler import profiler
 
@@ -22,6 +23,7 @@ from senlin.engine import cluster as cm
 from senlin.engine import event as EVENT
 from senlin.engine import node as node_mod
 from senlin.engine import senlin_lock
+from senlin.engine import throttle
 from senlin.objects import action as ao
 from senlin.objects import node as no
 from senlin.policies import base as pb
@@ -239,6 +241,32 @@ class NodeAction(base.Action):
 
         return method()
 
+    def _get_limiter(self):
+        """Get the throttle for the backend hosting the node."""
+        profile = self.entity.rt.get('profile')
+        if profile is None:
+            return None
+
+        region = (profile.context or {}).get('region_name',
+                                             cfg.CONF.default_region_name)
+        return throttle.get_limiter(profile.type_name, region)
+
+    def _execute_throttled(self):
+        """Execute the action when the backend has capacity for it."""
+        limiter = self._get_limiter()
+        if limiter is None:
+            return self._execute()
+
+        limiter.acquire()
+        start = base.wallclock()
+        res = self.RES_ERROR
+        try:
+            res, reason = self._execute()
+        finally:
+            limiter.release(self.action, base.wallclock() - start,
+                            res == self.RES_OK)
+        return res, reason
+
     def execute(self, **kwargs):
         """Interface function for action execution.
 
@@ -250,9 +278,10 @@ class NodeAction(base.Action):
         saved_cluster_id = self.entity.cluster_id
         if saved_cluster_id:
             if self.cause == consts.CAUSE_RPC:
-                res = senlin_lock.cluster_lock_acquire(
-                    self.context, self.entity.cluster_id, self.id, self.owner,
-                    senlin_lock.NODE_SCOPE, False)
+                with self.span('lock_acquire', lock='cluster'):
+                    res = senlin_lock.cluster_lock_acquire(
+                        self.context, self.entity.cluster_id, self.id,
+                        self.owner, senlin_lock.NODE_SCOPE, False)
 
                 if not res:
                     return self.RES_RETRY, 'Failed in locking cluster'
@@ -268,13 +297,15 @@ class NodeAction(base.Action):
                 self.policy_check(self.entity.cluster_id, 'BEFORE')
 
         try:
-            res = senlin_lock.node_lock_acquire(self.context, self.entity.id,
-                                                self.id, self.owner, False)
+            with self.span('lock_acquire', lock='node'):
+                res = senlin_lock.node_lock_acquire(self.context,
+                                                    self.entity.id, self.id,
+                                                    self.owner, False)
             if not res:
                 res = self.RES_RETRY
                 reason = 'Failed in locking node'
             else:
-                res, reason = self._execute()
+                res, reason = self._execute_throttled()
                 if (res == self.RES_OK and saved_cluster_id and
                         self.cause == consts.CAUSE_RPC):
                     self.policy_check(saved_cluster_id, 'AFTER')
@@ -0,0 +1,79 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+In-memory cache of objects which are rarely changed.
+
+Profiles and policies are loaded for almost every action while they are
+seldom updated. Each engine keeps the most recently used ones in a cache
+so that they are not rebuilt and validated again on every load. An entry
+is tagged with the version of the object, i.e. its creation and update
+time, so that a change made through another engine is detected with a
+cheap query of these timestamps.
+"""
+
+import collections
+import copy
+
+from oslo_config import cfg
+
+
+class ObjectCache(object):
+    """LRU cache of objects keyed by their ID and version."""
+
+    def __init__(self):
+        self._items = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    @staticmethod
+    def enabled():
+        return cfg.CONF.object_cache_size > 0
+
+    def get(self, obj_id, version):
+        """Get a copy of a cached object.
+
+        :param obj_id: ID of the object.
+        :param version: Current version of the object. A cached copy of
+                        another version is stale and is dropped.
+        :returns: A shallow copy of the object or None if it is not cached.
+        """
+        item = self._items.pop(obj_id, None)
+        if item is None or item[0] != version:
+            return None
+
+        # re-insert to mark the entry as most recently used
+        self._items[obj_id] = item
+        return copy.copy(item[1])
+
+    def put(self, obj_id, version, obj):
+        """Cache a copy of an object.
+
+        A copy is kept so that the caller can modify the object without
+        affecting the cached one.
+        """
+        size = cfg.CONF.object_cache_size
+        if size <= 0:
+            return
+
+        self._items.pop(obj_id, None)
+        self._items[obj_id] = (version, copy.copy(obj))
+        while len(self._items) > size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, obj_id):
+        """Drop the cached copy of an object, if any."""
+        self._items.pop(obj_id, None)
+
+    def clear(self):
+        self._items.clear()
@@ -22,7 +22,6 @@ from senlin.engine import health_manager
 from senlin.engine import node as node_mod
 from senlin.objects import cluster as co
 from senlin.objects import cluster_policy as cpo
-from senlin.objects import node as no
 from senlin.policies import base as pcb
 from senlin.profiles import base as pfb
 
@@ -75,33 +74,41 @@ class Cluster(object):
         self.dependents = kwargs.get('dependents') or {}
         self.config = kwargs.get('config') or {}
 
-        # rt is a dict for runtime data
+        # rt is a dict for runtime data, 'bindings' is None when the policy
+        # bindings have been changed since they were loaded
         self.rt = {
             'profile': None,
             'nodes': [],
-            'policies': []
+            'policies': [],
+            'bindings': None,
         }
 
         if context is not None:
-            self._load_runtime_data(context)
+            self._load_runtime_data(context, kwargs.get('runtime_data'))
 
-    def _load_runtime_data(self, context):
+    def _load_runtime_data(self, context, data=None):
+        """Load the profile, policies and nodes of the cluster.
+
+        :param context: The context used for DB operations.
+        :param data: Optional runtime data retrieved along with the cluster.
+        """
         if self.id is None:
             return
 
-        policies = []
-        bindings = cpo.ClusterPolicy.get_all(context, self.id)
-        for b in bindings:
-            # Detect policy type conflicts
-            policy = pcb.Policy.load(context, b.policy_id, project_safe=False)
-            policies.append(policy)
+        if data is None:
+            data = co.Cluster.get_runtime_data(context, self.id,
+                                               project_safe=False)
+            if data is None:
+                raise exception.ResourceNotFound(type='cluster', id=self.id)
+
+        policies = [pcb.Policy.load(context, db_policy=b.policy)
+                    for b in data['bindings']]
 
         self.rt = {
-            'profile': pfb.Profile.load(context,
-                                        profile_id=self.profile_id,
-                                        project_safe=False),
-            'nodes': no.Node.get_all_by_cluster(context, self.id),
-            'policies': policies
+            'profile': pfb.Profile.load(context, profile=data['profile']),
+            'nodes': data['nodes'],
+            'policies': policies,
+            'bindings': data['bindings'],
         }
 
     def store(self, context):
@@ -146,11 +153,12 @@ class Cluster(object):
         return self.id
 
     @classmethod
-    def _from_object(cls, context, obj):
+    def _from_object(cls, context, obj, runtime_data=None):
         """Construct a cluster from database object.
 
         :param context: the context used for DB operations;
         :param obj: a DB cluster object that will receive all fields;
+        :param runtime_data: optional runtime data loaded with the cluster.
         """
         kwargs = {
             'id': obj.id,
@@ -170,6 +178,7 @@ class Cluster(object):
             'metadata': obj.metadata,
             'dependents': obj.dependents,
             'config': obj.config,
+            'runtime_data': runtime_data,
         }
 
         return cls(obj.name, obj.desired_capacity, obj.profile_id,
@@ -178,13 +187,15 @@ class Cluster(object):
     @classmethod
     def load(cls, context, cluster_id=None, dbcluster=None, project_safe=True):
         """Retrieve a cluster from database."""
-        if dbcluster is None:
-            dbcluster = co.Cluster.get(context, cluster_id,
-                                       project_safe=project_safe)
-            if dbcluster is None:
-                raise exception.ResourceNotFound(type='cluster', id=cluster_id)
+        if dbcluster is not None:
+            return cls._from_object(context, dbcluster)
+
+        data = co.Cluster.get_runtime_data(context, cluster_id,
+                                           project_safe=project_safe)
+        if data is None:
+            raise exception.ResourceNotFound(type='cluster', id=cluster_id)
 
-        return cls._from_object(context, dbcluster)
+        return cls._from_object(context, data['cluster'], runtime_data=data)
 
     @classmethod
     def load_all(cls, context, limit=None, marker=None, sort=None,
@@ -350,6 +361,7 @@ class Cluster(object):
 
         # refresh cached runtime
         self.rt['policies'].append(policy)
+        self.rt['bindings'] = None
 
         return True, 'Policy attached.'
 
@@ -386,6 +398,7 @@ class Cluster(object):
                 health_manager.disable(self.id)
 
         cpo.ClusterPolicy.update(ctx, self.id, policy_id, params)
+        self.rt['bindings'] = None
         return True, 'Policy updated.'
 
     def detach_policy(self, ctx, policy_id):
@@ -414,6 +427,7 @@ class Cluster(object):
 
         cpo.ClusterPolicy.delete(ctx, self.id, policy_id)
         self.rt['policies'].remove(found)
+        self.rt['bindings'] = None
 
         return True, 'Policy detached.'
 
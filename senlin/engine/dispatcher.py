@@ -10,23 +10,58 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import random
+
+import eventlet
+from eventlet import event
 from oslo_config import cfg
 from oslo_context import context as oslo_context
 from oslo_log import log as logging
 import oslo_messaging
 from oslo_service import service
+from oslo_utils import timeutils
 
 from senlin.common import consts
+from senlin.common import context
 from senlin.common import messaging
+from senlin.common import utils
+from senlin.objects import service as service_obj
 
 LOG = logging.getLogger(__name__)
 
 OPERATIONS = (
-    START_ACTION, CANCEL_ACTION, STOP
+    START_ACTION, CANCEL_ACTION, STOP, WAKEUP_ACTION, SIGNAL_ACTION,
+    WATCH_LOCK, LOCK_RELEASED,
 ) = (
-    'start_action', 'cancel_action', 'stop'
+    'start_action', 'cancel_action', 'stop', 'wakeup_action',
+    'signal_action', 'watch_lock', 'lock_released',
 )
 
+# Events of local actions waiting for their depended actions, keyed by
+# action ID.
+_WAITERS = {}
+
+# Control signals of actions running in the current engine, keyed by action
+# ID. The action table only serves as the durable record of the signals.
+_SIGNALS = {}
+
+# FIFO queues of local actions waiting for cluster locks, keyed by cluster
+# ID. Each queue maps action IDs to the events the actions are waiting on.
+_LOCK_WAITERS = {}
+
+# IDs of the remote engines to notify when a cluster lock held by a local
+# action is released, keyed by cluster ID.
+_LOCK_WATCHERS = {}
+
+# Green thread sending the pending request for scheduling ready actions
+_PENDING_DISPATCH = None
+
+# Loads reported by the enabled engines, keyed by engine ID, and the time
+# they are read again from the service table.
+_ENGINE_LOADS = {}
+_ENGINE_LOADS_EXPIRY = 0
+
 
 class Dispatcher(service.Service):
     """RPC server for dispatching actions.
@@ -58,8 +93,9 @@ class Dispatcher(service.Service):
         """Respond affirmatively to confirm that engine is still alive."""
         return True
 
-    def start_action(self, ctxt, action_id=None):
-        self.TG.start_action(self.engine_id, action_id)
+    def start_action(self, ctxt, action_id=None, limit=None):
+        self.TG.start_action(self.engine_id, action_id, limit=limit)
+        return True
 
     def cancel_action(self, ctxt, action_id):
         """Cancel an action."""
@@ -73,6 +109,22 @@ class Dispatcher(service.Service):
         """Resume an action."""
         self.TG.resume_action(action_id)
 
+    def wakeup_action(self, ctxt, action_id):
+        """Wake up an action waiting for its depended actions."""
+        wakeup(action_id)
+
+    def signal_action(self, ctxt, action_id, signal):
+        """Deliver a control signal to an action running in this engine."""
+        deliver_signal(action_id, signal)
+
+    def watch_lock(self, ctxt, cluster_id, watcher_id):
+        """Notify the given engine when the cluster lock is released."""
+        add_lock_watcher(cluster_id, watcher_id)
+
+    def lock_released(self, ctxt, cluster_id):
+        """Wake up the first local action waiting for the cluster lock."""
+        wakeup_lock_waiter(cluster_id)
+
     def stop(self):
         super(Dispatcher, self).stop()
         # Wait for all action threads to be finished
@@ -112,4 +164,336 @@ def notify(method, engine_id=None, **kwargs):
 
 
 def start_action(engine_id=None, **kwargs):
-    return notify(START_ACTION, engine_id, **kwargs)
+    """Request engines to schedule ready actions.
+
+    Requests not directed to a specific engine are coalesced within the
+    window set by the ``dispatch_coalesce_window`` option, then sent to
+    the least loaded live engine.
+
+    :param engine_id: ID of the engine to notify, if any.
+    :returns: True if the request was sent or queued, False otherwise.
+    """
+    if engine_id is not None or kwargs:
+        return notify(START_ACTION, engine_id, **kwargs)
+
+    window = cfg.CONF.dispatch_coalesce_window
+    if window <= 0:
+        return _dispatch()
+
+    global _PENDING_DISPATCH
+    if _PENDING_DISPATCH is None:
+        _PENDING_DISPATCH = eventlet.spawn_after(window, _flush)
+    return True
+
+
+def _flush():
+    global _PENDING_DISPATCH
+    _PENDING_DISPATCH = None
+    _dispatch()
+
+
+def _get_loads(ctx):
+    """Get the loads of the enabled engines, cached like the live engines."""
+    global _ENGINE_LOADS, _ENGINE_LOADS_EXPIRY
+
+    now = timeutils.now()
+    if _ENGINE_LOADS_EXPIRY <= now:
+        _ENGINE_LOADS = dict((s.id, s.load or 0)
+                             for s in service_obj.Service.get_all(ctx)
+                             if not s.disabled)
+        _ENGINE_LOADS_EXPIRY = now + cfg.CONF.live_engine_cache_ttl
+    return _ENGINE_LOADS
+
+
+def _get_candidates():
+    """Get IDs of live engines, the least loaded ones first."""
+    ctx = context.get_admin_context()
+    loads = _get_loads(ctx)
+    candidates = [e for e in utils.get_live_engines(ctx) if e in loads]
+
+    # Shuffle before sorting so that equally loaded engines share the work
+    random.shuffle(candidates)
+    candidates.sort(key=lambda e: loads[e])
+    return candidates
+
+
+def add_load(engine_id, count):
+    """Count actions on the cached load of an engine.
+
+    The count is kept until the loads are read again, so that the next
+    requests go to other engines if they are as loaded.
+
+    :param engine_id: ID of the engine.
+    :param count: Number of actions the engine is expected to run.
+    """
+    _ENGINE_LOADS[engine_id] = _ENGINE_LOADS.get(engine_id, 0) + count
+
+
+def _dispatch():
+    """Send a request for scheduling ready actions.
+
+    The request is cast to the least loaded live engine, which claims at
+    most one batch of ``action_acquire_batch_size`` actions and dispatches
+    the actions left again. The request is broadcast to all engines only
+    when it cannot be sent to any live engine.
+    """
+    if cfg.CONF.dispatch_targeted:
+        try:
+            candidates = _get_candidates()
+        except Exception as ex:
+            LOG.error('Failed in getting the live engines: %s', ex)
+            candidates = []
+
+        client = messaging.get_rpc_client(consts.DISPATCHER_TOPIC,
+                                          cfg.CONF.host)
+        limit = cfg.CONF.action_acquire_batch_size
+        for engine_id in candidates:
+            call_context = client.prepare(server=engine_id)
+            try:
+                call_context.cast(oslo_context.get_current(), START_ACTION,
+                                  limit=limit)
+            except oslo_messaging.MessagingException as ex:
+                LOG.warning('Failed in sending request for scheduling '
+                            'actions to engine %(engine)s: %(ex)s',
+                            {'engine': engine_id, 'ex': ex})
+                continue
+
+            add_load(engine_id, limit)
+            return True
+
+    return notify(START_ACTION)
+
+
+def wakeup_action(action_id, engine_id=None):
+    """Wake up an action that is waiting for its depended actions.
+
+    The action is woken up directly if it is waiting in the current engine,
+    otherwise a notification is sent to the engine owning it.
+
+    :param action_id: ID of the action to wake up.
+    :param engine_id: ID of the engine owning the action, if known.
+    :returns: True if the action was woken up or notified, False otherwise.
+    """
+    if wakeup(action_id):
+        return True
+
+    if engine_id is None:
+        return False
+
+    return notify(WAKEUP_ACTION, engine_id, action_id=action_id)
+
+
+def add_waiter(action_id):
+    """Register an action as waiting for wakeup notifications."""
+    _WAITERS.setdefault(action_id, event.Event())
+
+
+def remove_waiter(action_id):
+    """Unregister an action from wakeup notifications."""
+    _WAITERS.pop(action_id, None)
+
+
+def wait(action_id, timeout):
+    """Block an action until it is woken up or the timeout expires.
+
+    :param action_id: ID of the waiting action.
+    :param timeout: Maximum number of seconds to wait.
+    :returns: True if the action was woken up, False if the wait timed out.
+    """
+    evt = _WAITERS.get(action_id)
+    if evt is None:
+        eventlet.sleep(timeout)
+        return False
+
+    woken = False
+    with eventlet.Timeout(timeout, False):
+        evt.wait()
+        woken = True
+
+    # Re-arm the event for the next round of waiting
+    if evt.ready() and _WAITERS.get(action_id) is evt:
+        _WAITERS[action_id] = event.Event()
+
+    return woken
+
+
+def wakeup(action_id):
+    """Wake up an action waiting in the current engine.
+
+    :param action_id: ID of the action to wake up.
+    :returns: True if the action is waiting locally, False otherwise.
+    """
+    evt = _WAITERS.get(action_id)
+    if evt is None:
+        return False
+
+    if not evt.ready():
+        evt.send(True)
+    return True
+
+
+def signal_action(action_id, signal, engine_id=None):
+    """Push a control signal to a running action.
+
+    The signal is delivered directly if the action is running in the current
+    engine, otherwise a notification is sent to the engine owning it.
+
+    :param action_id: ID of the action to signal.
+    :param signal: The control signal, one of the action commands.
+    :param engine_id: ID of the engine owning the action, if known.
+    :returns: True if the signal was delivered or notified, False otherwise.
+    """
+    if deliver_signal(action_id, signal):
+        return True
+
+    if engine_id is None:
+        return False
+
+    return notify(SIGNAL_ACTION, engine_id, action_id=action_id,
+                  signal=signal)
+
+
+def add_signal_receiver(action_id, signal=None):
+    """Register an action as receiving control signals locally.
+
+    :param action_id: ID of the action running in the current engine.
+    :param signal: The signal recorded for the action, if any. It does not
+                   replace a signal already delivered to the action.
+    """
+    if _SIGNALS.get(action_id) is None:
+        _SIGNALS[action_id] = signal
+
+
+def remove_signal_receiver(action_id):
+    """Unregister an action from receiving control signals."""
+    _SIGNALS.pop(action_id, None)
+
+
+def is_receiving(action_id):
+    """Check if an action receives control signals in the current engine."""
+    return action_id in _SIGNALS
+
+
+def get_signal(action_id):
+    """Get the last control signal delivered to a local action."""
+    return _SIGNALS.get(action_id)
+
+
+def deliver_signal(action_id, signal):
+    """Deliver a control signal to an action running in the current engine.
+
+    :param action_id: ID of the action to signal.
+    :param signal: The control signal.
+    :returns: True if the action is running locally, False otherwise.
+    """
+    if action_id not in _SIGNALS:
+        return False
+
+    _SIGNALS[action_id] = signal
+    return True
+
+
+def add_lock_waiter(cluster_id, action_id):
+    """Append an action to the queue of waiters for a cluster lock."""
+    waiters = _LOCK_WAITERS.setdefault(cluster_id, collections.OrderedDict())
+    waiters.setdefault(action_id, event.Event())
+
+
+def remove_lock_waiter(cluster_id, action_id, wakeup_next=False):
+    """Remove an action from the queue of waiters for a cluster lock.
+
+    :param cluster_id: ID of the cluster.
+    :param action_id: ID of the action leaving the queue.
+    :param wakeup_next: True if the next waiter should be woken up so that it
+                        can try the lock as well.
+    """
+    waiters = _LOCK_WAITERS.get(cluster_id)
+    if waiters is None:
+        return
+
+    waiters.pop(action_id, None)
+    if not waiters:
+        _LOCK_WAITERS.pop(cluster_id, None)
+    elif wakeup_next:
+        wakeup_lock_waiter(cluster_id)
+
+
+def is_first_lock_waiter(cluster_id, action_id):
+    """Check if an action is at the head of the queue for a cluster lock."""
+    waiters = _LOCK_WAITERS.get(cluster_id)
+    if not waiters:
+        return False
+
+    return next(iter(waiters)) == action_id
+
+
+def wait_lock(cluster_id, action_id, timeout):
+    """Block an action until it is woken up or the timeout expires.
+
+    :param cluster_id: ID of the cluster the action wants to lock.
+    :param action_id: ID of the waiting action.
+    :param timeout: Maximum number of seconds to wait.
+    :returns: True if the action was woken up, False if the wait timed out.
+    """
+    waiters = _LOCK_WAITERS.get(cluster_id)
+    evt = waiters.get(action_id) if waiters else None
+    if evt is None:
+        eventlet.sleep(timeout)
+        return False
+
+    woken = False
+    with eventlet.Timeout(timeout, False):
+        evt.wait()
+        woken = True
+
+    # Re-arm the event for the next round of waiting
+    if evt.ready() and waiters.get(action_id) is evt:
+        waiters[action_id] = event.Event()
+
+    return woken
+
+
+def wakeup_lock_waiter(cluster_id):
+    """Wake up the first local action waiting for a cluster lock.
+
+    :param cluster_id: ID of the cluster.
+    :returns: True if an action was woken up, False otherwise.
+    """
+    waiters = _LOCK_WAITERS.get(cluster_id)
+    if not waiters:
+        return False
+
+    evt = next(iter(waiters.values()))
+    if not evt.ready():
+        evt.send(True)
+    return True
+
+
+def watch_lock(cluster_id, engine_id, watcher_id):
+    """Ask the engine holding a cluster lock to notify us on its release.
+
+    :param cluster_id: ID of the cluster.
+    :param engine_id: ID of the engine running the action holding the lock.
+    :param watcher_id: ID of the engine to notify.
+    :returns: True if the request was sent, False otherwise.
+    """
+    return notify(WATCH_LOCK, engine_id, cluster_id=cluster_id,
+                  watcher_id=watcher_id)
+
+
+def add_lock_watcher(cluster_id, engine_id):
+    """Record a remote engine waiting for a local cluster lock release."""
+    _LOCK_WATCHERS.setdefault(cluster_id, set()).add(engine_id)
+
+
+def release_lock(cluster_id):
+    """Announce that a cluster lock was released by a local action.
+
+    The first local waiter is woken up, and every remote engine that asked
+    to be notified is sent a notification.
+
+    :param cluster_id: ID of the cluster.
+    """
+    wakeup_lock_waiter(cluster_id)
+    for engine_id in _LOCK_WATCHERS.pop(cluster_id, ()):
+        notify(LOCK_RELEASED, engine_id, cluster_id=cluster_id)
@@ -39,6 +39,21 @@ def load_dispatcher():
         LOG.info("Loaded dispatchers: %s", dispatchers.names())
 
 
+def flush():
+    """Write out the events buffered by the dispatchers.
+
+    This is called when the engine is stopped so that no event is lost.
+    """
+    if dispatchers is None:
+        return
+
+    try:
+        dispatchers.map_method("flush")
+    except Exception as ex:
+        LOG.exception("Dispatcher failed to flush the events: %s",
+                      six.text_type(ex))
+
+
 def _event_data(action, phase=None, reason=None):
     action_name = action.action
     if action_name in [consts.NODE_OPERATION, consts.CLUSTER_OPERATION]:
@@ -19,25 +19,40 @@ health policies.
 
 from collections import defaultdict
 from collections import namedtuple
+import eventlet
+from eventlet import semaphore
+import hashlib
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging as messaging
 from oslo_service import service
 from oslo_service import threadgroup
+from oslo_utils import encodeutils
 from oslo_utils import timeutils
 import re
 import time
 
 from senlin.common import consts
 from senlin.common import context
+from senlin.common import hash_ring
 from senlin.common import messaging as rpc
 from senlin.common import utils
+from senlin.engine import metrics
 from senlin.engine import node as node_mod
+from senlin.engine import prober
 from senlin import objects
+from senlin.profiles import base as profile_base
 from senlin.rpc import client as rpc_client
 
 LOG = logging.getLogger(__name__)
 
+# Pattern of the parameters of the poll URL templates
+NODENAME_PATTERN = re.compile("(\{nodename\})")
+
+# Number of slots the check interval is divided into when reporting how the
+# check timers are spread over the interval
+TIMER_SLOTS = 10
+
 
 def _chase_up(start_time, interval):
     """Utility function to check if there are missed intervals.
@@ -55,6 +70,26 @@ def _chase_up(start_time, interval):
     return (missed + 1) * interval - elapsed
 
 
+def _get_phase(cluster_id, jitter=0.0):
+    """Get the fixed phase of the checks of a cluster.
+
+    :param cluster_id: The UUID of the cluster.
+    :param jitter: Maximum fraction of the check interval added to the phase.
+    :returns: A fraction of the check interval in [0, 1), which is derived
+              from the cluster ID, jitter included, so that it is the same on
+              all engines and across restarts.
+    """
+    digest = hashlib.md5(encodeutils.safe_encode(cluster_id)).hexdigest()
+    offset = int(digest[:8], 16) / float(0x100000000)
+    delay = int(digest[8:16], 16) / float(0x100000000)
+    return (offset + delay * jitter) % 1.0
+
+
+def _get_slot(phase):
+    """Get the slot of the check interval a timer phase falls in."""
+    return min(int(phase * TIMER_SLOTS), TIMER_SLOTS - 1)
+
+
 class NovaNotificationEndpoint(object):
 
     VM_FAILURE_EVENTS = {
@@ -241,8 +276,38 @@ class HealthCheckType(object):
         """
         pass
 
+    def run_health_checks(self, ctx, nodes, watch=None):
+        """Run health check on many nodes at once
+
+        :param watch: A started stopwatch whose duration is the deadline of
+                      the checks, if any.
+        :returns: A dict mapping the ID of each node checked to True if the
+                  node is healthy, False otherwise. The nodes which are not
+                  in the dict are checked one by one with run_health_check.
+        """
+        return {}
+
 
 class NodePollStatusHealthCheck(HealthCheckType):
+    def _is_healthy(self, node, check_result):
+        if check_result:
+            LOG.debug("NodePollStatusHealthCheck reports node %s is "
+                      "healthy.", node.id)
+            return True
+
+        # server was not found as a result of performing check
+        node_last_updated = node.updated_at or node.init_at
+        if not timeutils.is_older_than(
+                node_last_updated, self.node_update_timeout):
+            LOG.info("Node %s was updated at %s which is less "
+                     "than %d secs ago. Skip node recovery from "
+                     "NodePollStatusHealthCheck.",
+                     node.id, node_last_updated,
+                     self.node_update_timeout)
+            return True
+
+        return False
+
     def run_health_check(self, ctx, node):
         """Routine to be executed for polling node status.
 
@@ -253,23 +318,8 @@ class NodePollStatusHealthCheck(HealthCheckType):
             # create engine node from db node
             entity = node_mod.Node._from_object(ctx, node)
 
-            if not entity.do_check(ctx, return_check_result=True):
-                # server was not found as a result of performing check
-                node_last_updated = node.updated_at or node.init_at
-                if not timeutils.is_older_than(
-                        node_last_updated, self.node_update_timeout):
-                    LOG.info("Node %s was updated at %s which is less "
-                             "than %d secs ago. Skip node recovery from "
-                             "NodePollStatusHealthCheck.",
-                             node.id, node_last_updated,
-                             self.node_update_timeout)
-                    return True
-                else:
-                    return False
-            else:
-                LOG.debug("NodePollStatusHealthCheck reports node %s is "
-                          "healthy.", node.id)
-                return True
+            return self._is_healthy(
+                node, entity.do_check(ctx, return_check_result=True))
         except Exception as ex:
             LOG.warning(
                 'Error when performing health check on node %s: %s',
@@ -277,12 +327,43 @@ class NodePollStatusHealthCheck(HealthCheckType):
             )
             return False
 
+    def run_health_checks(self, ctx, nodes, watch=None):
+        """Routine to be executed for polling the status of many nodes.
+
+        The profiles of the nodes check their physical objects in bulk when
+        they support it, e.g. with one server listing per project for Nova
+        servers, instead of one request per node. A node whose physical
+        object is not found in bulk, e.g. because it is gone, is left out of
+        the result, so that it is checked on its own with
+        ``run_health_check``.
+
+        :returns: A dict mapping the ID of each node checked to True if the
+                  node is healthy, False otherwise.
+        """
+        checked = profile_base.Profile.check_objects(ctx, nodes)
+
+        return dict((node.id, self._is_healthy(node, checked[node.id]))
+                    for node in nodes if node.id in checked)
+
 
 class NodePollUrlHealthCheck(HealthCheckType):
+    def __init__(self, cluster_id, interval, node_update_timeout, params):
+        super(NodePollUrlHealthCheck, self).__init__(
+            cluster_id, interval, node_update_timeout, params)
+        self._healthy_patterns = {}
+
     @staticmethod
     def _convert_detection_tuple(dictionary):
         return namedtuple('DetectionMode', dictionary.keys())(**dictionary)
 
+    def _is_healthy_response(self, result):
+        expected_resp_str = self.params['poll_url_healthy_response']
+        pattern = self._healthy_patterns.get(expected_resp_str)
+        if pattern is None:
+            pattern = re.compile(expected_resp_str)
+            self._healthy_patterns[expected_resp_str] = pattern
+        return pattern.search(result) is not None
+
     def _expand_url_template(self, url_template, node):
         """Expands parameters in an URL template
 
@@ -294,8 +375,7 @@ class NodePollUrlHealthCheck(HealthCheckType):
         :returns: A string containing the expanded URL
         """
 
-        nodename_pattern = re.compile("(\{nodename\})")
-        url = nodename_pattern.sub(node.name, url_template)
+        url = NODENAME_PATTERN.sub(node.name, url_template)
 
         return url
 
@@ -310,7 +390,6 @@ class NodePollUrlHealthCheck(HealthCheckType):
         verify_ssl = self.params['poll_url_ssl_verify']
         conn_error_as_unhealthy = self.params[
             'poll_url_conn_error_as_unhealthy']
-        expected_resp_str = self.params['poll_url_healthy_response']
         max_unhealthy_retry = self.params['poll_url_retry_limit']
         retry_interval = self.params['poll_url_retry_interval']
 
@@ -353,7 +432,7 @@ class NodePollUrlHealthCheck(HealthCheckType):
 
             LOG.debug("Node status returned from URL(%s): %s", url,
                       result)
-            if re.search(expected_resp_str, result):
+            if self._is_healthy_response(result):
                 LOG.debug('NodePollUrlHealthCheck reports node %s is healthy.',
                           node.id)
                 return True
@@ -368,6 +447,104 @@ class NodePollUrlHealthCheck(HealthCheckType):
 
         return False
 
+    def _check_probe(self, node, url, result, attempts_left):
+        """Check the result of probing the URL of a node.
+
+        :returns: True if the node is considered to be healthy, False if
+                  the URL has to be probed again.
+        """
+        if isinstance(result, utils.URLFetchError):
+            if not self.params['poll_url_conn_error_as_unhealthy']:
+                LOG.error("Error when requesting node health status from"
+                          " %s: %s", url, result)
+                return True
+        else:
+            LOG.debug("Node status returned from URL(%s): %s", url, result)
+            if self._is_healthy_response(result):
+                LOG.debug('NodePollUrlHealthCheck reports node %s is healthy.',
+                          node.id)
+                return True
+
+            if node.status != consts.NS_ACTIVE:
+                LOG.info("Skip node recovery because node %s is not in "
+                         "ACTIVE state.", node.id)
+                return True
+
+        node_last_updated = node.updated_at or node.init_at
+        if not timeutils.is_older_than(
+                node_last_updated, self.node_update_timeout):
+            LOG.info("Node %s was updated at %s which is less than "
+                     "%d secs ago. Skip node recovery from "
+                     "NodePollUrlHealthCheck.",
+                     node.id, node_last_updated, self.node_update_timeout)
+            return True
+
+        LOG.info("Node %s is reported as down (%d retries left)",
+                 node.id, attempts_left)
+        return False
+
+    def run_health_checks(self, ctx, nodes, watch=None):
+        """Routine to check the status of many nodes from their URLs.
+
+        The URLs are probed concurrently by the HTTP prober of the engine,
+        at most ``health_check_concurrency`` of them at the same time. The
+        URLs of the nodes reported as down are probed again together after
+        the retry interval, instead of each node waiting on its own. No URL
+        is probed once the stopwatch expires, the nodes which are not
+        concluded by then are left to the next round.
+
+        :param nodes: The nodes to be checked.
+        :param watch: A started stopwatch whose duration is the deadline of
+                      the checks, if any.
+        :returns: A dict mapping the ID of each node concluded to True if
+                  the node is considered to be healthy, False otherwise.
+        """
+        verify_ssl = self.params['poll_url_ssl_verify']
+        retry_interval = self.params['poll_url_retry_interval']
+        timeout = max(retry_interval * 0.1, 1)
+        concurrency = cfg.CONF.health_manager.health_check_concurrency
+
+        pending = dict((node.id, node) for node in nodes)
+        urls = dict(
+            (node.id, self._expand_url_template(self.params['poll_url'],
+                                                node))
+            for node in nodes)
+
+        attempts_left = self.params['poll_url_retry_limit']
+        results = {}
+        while pending and attempts_left > 0:
+            attempts_left -= 1
+            fetched = prober.get_prober().fetch_many(
+                dict((node_id, urls[node_id]) for node_id in pending),
+                timeout=timeout, verify=verify_ssl, concurrency=concurrency,
+                watch=watch)
+
+            for node_id in set(pending) - set(fetched):
+                # the deadline is reached before the URL is probed, the node
+                # is left to the next round
+                del pending[node_id]
+
+            for node_id, result in fetched.items():
+                node = pending[node_id]
+                if self._check_probe(node, urls[node_id], result,
+                                     attempts_left):
+                    results[node_id] = True
+                    del pending[node_id]
+
+            if (pending and attempts_left > 0 and watch is not None and
+                    watch.leftover() <= retry_interval):
+                # there is no time left for probing the URLs again, the
+                # nodes are left to the next round
+                return results
+
+            if pending and attempts_left > 0:
+                eventlet.sleep(retry_interval)
+
+        for node_id in pending:
+            results[node_id] = False
+
+        return results
+
 
 class HealthManager(service.Service):
 
@@ -384,6 +561,17 @@ class HealthManager(service.Service):
             'registries': [],
         }
         self.health_check_types = defaultdict(lambda: [])
+        # Live engines when registries were last balanced
+        self._live_engines = None
+        # Ring of the live engines the registries are sharded on
+        self._ring = None
+        # Phases of the check timers as fractions of their intervals, and
+        # the number of timers in each slot of the intervals
+        self._timer_phases = {}
+        self._timer_slots = [0] * TIMER_SLOTS
+        # Green threads running the health checks of nodes
+        self._check_pool = eventlet.GreenPool(
+            cfg.CONF.health_manager.health_check_pool_size)
 
     def _dummy_task(self):
         """A Dummy task that is queued on the health manager thread group.
@@ -463,10 +651,100 @@ class HealthManager(service.Service):
     def _add_health_check(self, cluster_id, health_check):
         self.health_check_types[cluster_id].append(health_check)
 
+    @staticmethod
+    def _is_node_healthy(ctx, node, health_checks, recovery_cond,
+                         checked=None):
+        checked = checked or [{}] * len(health_checks)
+
+        def _run(hc, hc_checked):
+            if node.id in hc_checked:
+                return hc_checked[node.id]
+            return hc.run_health_check(ctx, node)
+
+        checks = zip(health_checks, checked)
+        if recovery_cond == consts.ANY_FAILED:
+            # recovery happens if any detection mode fails
+            # i.e. the inverse logic is that node is considered healthy
+            # if all detection modes pass
+            return all(_run(hc, c) for hc, c in checks)
+
+        # recovery happens if all detection modes fail
+        # i.e. the inverse logic is that node is considered healthy
+        # if any detection mode passes
+        return any(_run(hc, c) for hc, c in checks)
+
+    def _check_nodes(self, ctx, cluster_id, nodes, recovery_cond, watch):
+        """Run the health checks of nodes concurrently.
+
+        At most ``health_check_concurrency`` nodes of the cluster are checked
+        at the same time, in the green thread pool shared by all clusters.
+        The checks which are not completed when the stopwatch expires are
+        abandoned until the next round.
+
+        :param ctx: The context used for checking the nodes.
+        :param cluster_id: ID of the cluster the nodes belong to.
+        :param nodes: A list of node objects to be checked.
+        :param recovery_cond: The recovery conditional of the cluster.
+        :param watch: A started stopwatch whose duration is the deadline.
+        :returns: A dict mapping the ID of each node checked to a boolean
+                  telling whether the node is healthy.
+        """
+        health_checks = self.health_check_types[cluster_id]
+        slots = semaphore.Semaphore(
+            cfg.CONF.health_manager.health_check_concurrency)
+        results = {}
+
+        # Check the nodes in bulk first with the detection modes which
+        # support it, the nodes left are checked one by one.
+        checked = []
+        for hc in health_checks:
+            try:
+                checked.append(hc.run_health_checks(ctx, nodes, watch))
+            except Exception as ex:
+                LOG.warning('Error while checking the health of nodes of '
+                            'cluster %(c)s: %(e)s', {'c': cluster_id, 'e': ex})
+                checked.append({})
+
+        def _check(node):
+            try:
+                results[node.id] = self._is_node_healthy(
+                    ctx, node, health_checks, recovery_cond, checked)
+            except Exception as ex:
+                LOG.warning('Error while checking the health of node %(n)s: '
+                            '%(e)s', {'n': node.id, 'e': ex})
+            finally:
+                slots.release()
+
+        pending = []
+        for node in nodes:
+            if all(node.id in c for c in checked):
+                # no request left to be made for the node
+                results[node.id] = self._is_node_healthy(
+                    ctx, node, health_checks, recovery_cond, checked)
+            else:
+                pending.append(node)
+
+        threads = []
+        for node in pending:
+            if watch.expired() or not slots.acquire(timeout=watch.leftover()):
+                break
+            threads.append(self._check_pool.spawn(_check, node))
+
+        with eventlet.Timeout(watch.leftover(), False):
+            for thread in threads:
+                thread.wait()
+
+        # Stop the checks still running when the deadline is reached
+        for thread in threads:
+            thread.kill()
+
+        return results
+
     def _execute_health_check(self, interval, cluster_id,
                               recover_action, recovery_cond,
                               node_update_timeout):
         start_time = timeutils.utcnow(True)
+        watch = timeutils.StopWatch(duration=interval).start()
 
         try:
             if cluster_id not in self.health_check_types:
@@ -488,34 +766,27 @@ class HealthManager(service.Service):
             ctx = context.get_service_context(user_id=cluster.user,
                                               project_id=cluster.project)
 
+            if recovery_cond not in (consts.ANY_FAILED, consts.ALL_FAILED):
+                raise Exception(
+                    '{} is an invalid recovery conditional'.format(
+                        recovery_cond))
+
             actions = []
 
-            # loop through nodes and run all health checks on each node
+            # run all health checks on the nodes concurrently
             nodes = objects.Node.get_all_by_cluster(ctx, cluster_id)
+            results = self._check_nodes(ctx, cluster_id, nodes,
+                                        recovery_cond, watch)
+            skipped = len(nodes) - len(results)
+            if skipped:
+                metrics.inc(metrics.HEALTH_CHECKS_SKIPPED, skipped)
+                LOG.warning('Health check of %(s)s out of %(n)s nodes in '
+                            'cluster %(c)s did not complete within '
+                            '%(i)s seconds.', {'s': skipped, 'n': len(nodes),
+                                               'c': cluster_id, 'i': interval})
 
             for node in nodes:
-                node_is_healthy = True
-
-                if recovery_cond == consts.ANY_FAILED:
-                    # recovery happens if any detection mode fails
-                    # i.e. the inverse logic is that node is considered healthy
-                    # if all detection modes pass
-                    node_is_healthy = all(
-                        hc.run_health_check(ctx, node)
-                        for hc in self.health_check_types[cluster_id])
-                elif recovery_cond == consts.ALL_FAILED:
-                    # recovery happens if all detection modes fail
-                    # i.e. the inverse logic is that node is considered healthy
-                    # if any detection mode passes
-                    node_is_healthy = any(
-                        hc.run_health_check(ctx, node)
-                        for hc in self.health_check_types[cluster_id])
-                else:
-                    raise Exception(
-                        '{} is an invalid recovery conditional'.format(
-                            recovery_cond))
-
-                if not node_is_healthy:
+                if results.get(node.id) is False:
                     action = self._recover_node(node.id, ctx,
                                                 recover_action)
                     actions.append(action)
@@ -535,6 +806,14 @@ class HealthManager(service.Service):
         except Exception as ex:
             LOG.warning('Error while performing health check: %s', ex)
 
+        elapsed = watch.elapsed()
+        metrics.observe(metrics.HEALTH_SWEEP_SECONDS, elapsed)
+        if elapsed > interval:
+            metrics.inc(metrics.HEALTH_SWEEP_OVERRUNS)
+            LOG.warning('Health check of cluster %(c)s took %(e).1f seconds, '
+                        'longer than its interval of %(i)s seconds.',
+                        {'c': cluster_id, 'e': elapsed, 'i': interval})
+
         return _chase_up(start_time, interval)
 
     def _start_check(self, entry):
@@ -569,13 +848,20 @@ class HealthManager(service.Service):
             for check in ctype.split(','):
                 self._add_health_check(cid, HealthCheckType.factory(
                     check, cid, interval, params))
+
+            # Checks start at the phase of the cluster on the wall clock so
+            # that the checks of all clusters are spread over the interval.
+            phase = _get_phase(cid,
+                               cfg.CONF.health_manager.health_check_jitter)
+            delay = (phase * interval - time.time()) % interval
             timer = self.TG.add_dynamic_timer(self._execute_health_check,
-                                              None, None, interval, cid,
+                                              delay, None, interval, cid,
                                               recover_action,
                                               params['recovery_conditional'],
                                               params['node_update_timeout'])
 
             entry['timer'] = timer
+            self._set_timer_phase(cid, phase)
         elif (len(detection_types) == 1 and
               detection_types[0] == consts.LIFECYCLE_EVENTS):
             LOG.info("Start listening events for cluster (%s).", cid)
@@ -592,6 +878,36 @@ class HealthManager(service.Service):
 
         return entry
 
+    def _set_timer_phase(self, cluster_id, phase):
+        """Record the phase of the check timer of a cluster.
+
+        The timer counts of the slots are updated in place and only the
+        gauges of the slots changed are reported.
+
+        :param cluster_id: The UUID of the cluster.
+        :param phase: The phase of the timer, or None if it is stopped.
+        """
+        changed = set()
+        old_phase = self._timer_phases.pop(cluster_id, None)
+        if old_phase is not None:
+            slot = _get_slot(old_phase)
+            self._timer_slots[slot] -= 1
+            changed.add(slot)
+        if phase is not None:
+            self._timer_phases[cluster_id] = phase
+            slot = _get_slot(phase)
+            self._timer_slots[slot] += 1
+            changed.add(slot)
+
+        if not changed:
+            return
+
+        metrics.set_gauge(metrics.HEALTH_CHECK_TIMERS,
+                          len(self._timer_phases))
+        for slot in sorted(changed):
+            metrics.set_gauge(metrics.HEALTH_TIMER_SLOT_TIMERS,
+                              self._timer_slots[slot], slot=str(slot))
+
     def _stop_check(self, entry):
         """Routine for stopping the checking for a cluster.
 
@@ -609,6 +925,7 @@ class HealthManager(service.Service):
             self.TG.timer_done(timer)
             if entry['cluster_id'] in self.health_check_types:
                 self.health_check_types.pop(entry['cluster_id'])
+            self._set_timer_phase(entry['cluster_id'], None)
             return
 
         listener = entry.get('listener', None)
@@ -618,8 +935,53 @@ class HealthManager(service.Service):
             return
 
     def _load_runtime_registry(self):
-        """Load the initial runtime registry with a DB scan."""
-        db_registries = objects.HealthRegistry.claim(self.ctx, self.engine_id)
+        """Load the runtime registry with a DB scan.
+
+        Registries are sharded across the live engines with a consistent
+        hash ring of cluster IDs. When the live engines change, the
+        registries which now belong to other engines are released: their
+        checks are stopped before their engine is reset in the DB. Registries
+        released or left over by dead engines are then claimed by the engines
+        they belong to, so that a cluster is never checked by two engines and
+        a released cluster is picked up within a periodic interval.
+        """
+        live_engines = utils.get_live_engines(self.ctx) | {self.engine_id}
+        if live_engines != self._live_engines:
+            self._ring = hash_ring.HashRing(live_engines)
+            self._live_engines = live_engines
+            self._release_registries()
+
+        self._claim_registries()
+
+    def _owns(self, cluster_id):
+        return self._ring.get_member(cluster_id) == self.engine_id
+
+    def _release_registries(self):
+        """Release the registries which belong to other engines."""
+        released = [entry for entry in self.rt['registries']
+                    if not self._owns(entry['cluster_id'])]
+        if not released:
+            return
+
+        for entry in released:
+            self._stop_check(entry)
+            self.rt['registries'].remove(entry)
+
+        objects.HealthRegistry.release(
+            self.ctx, self.engine_id, [e['cluster_id'] for e in released])
+        LOG.info("Released %s clusters from health monitoring to other "
+                 "engines.", len(released))
+
+    def _claim_registries(self):
+        """Claim the orphan registries which belong to this engine."""
+        cluster_ids = [cid for cid in
+                       objects.HealthRegistry.get_orphans(self.ctx)
+                       if self._owns(cid)]
+        if not cluster_ids:
+            return
+
+        db_registries = objects.HealthRegistry.claim(
+            self.ctx, self.engine_id, cluster_ids=cluster_ids)
 
         for r in db_registries:
             # Claiming indicates we claim a health registry who's engine was
@@ -770,7 +1132,15 @@ def notify(engine_id, method, **kwargs):
         return False
 
 
+def get_owner_engine(cluster_id):
+    """Get the live engine a cluster belongs to on the hash ring."""
+    ctx = context.get_admin_context()
+    ring = hash_ring.HashRing(utils.get_live_engines(ctx))
+    return ring.get_member(cluster_id)
+
+
 def register(cluster_id, engine_id=None, **kwargs):
+    engine_id = engine_id or get_owner_engine(cluster_id)
     params = kwargs.pop('params', {})
     interval = kwargs.pop('interval', cfg.CONF.periodic_interval)
     node_update_timeout = kwargs.pop('node_update_timeout', 300)
@@ -787,6 +1157,9 @@ def unregister(cluster_id):
     engine_id = get_manager_engine(cluster_id)
     if engine_id:
         return notify(engine_id, 'unregister_cluster', cluster_id=cluster_id)
+
+    # The registry may be handed off from an engine to another
+    objects.HealthRegistry.delete(context.get_admin_context(), cluster_id)
     return True
 
 
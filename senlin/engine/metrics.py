@@ -0,0 +1,220 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Metrics of the action pipeline.
+
+Each engine process keeps its metrics in memory. Recording a sample only
+updates a few counters, so the metrics can be left on in production. The
+metrics are periodically dumped by the engine service into a file, either
+as JSON or in the Prometheus text format so that they can be collected by
+the textfile collector of the Prometheus node exporter.
+"""
+
+import bisect
+import json
+import os
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+METRICS = (
+    READY_ACTIONS, THREADS_RUNNING, THREAD_POOL_SIZE,
+    ACTIONS_COMPLETED, ACQUIRE_SECONDS, LOCK_WAIT_SECONDS,
+    DEPENDENTS_WAIT_SECONDS, EXECUTION_SECONDS,
+    EVENTS_BUFFERED, EVENTS_DROPPED, EVENT_DELAY_SECONDS,
+    HEALTH_SWEEP_SECONDS, HEALTH_SWEEP_OVERRUNS, HEALTH_CHECKS_SKIPPED,
+    HEALTH_PROBE_SECONDS, HEALTH_PROBE_ERRORS,
+    HEALTH_CHECK_TIMERS, HEALTH_TIMER_SLOT_TIMERS,
+    ACTIONS_SCHEDULED,
+) = (
+    'senlin_ready_actions', 'senlin_threads_running',
+    'senlin_thread_pool_size', 'senlin_actions_completed_total',
+    'senlin_action_acquire_seconds', 'senlin_action_lock_wait_seconds',
+    'senlin_action_dependents_wait_seconds',
+    'senlin_action_execution_seconds',
+    'senlin_events_buffered', 'senlin_events_dropped_total',
+    'senlin_event_delay_seconds',
+    'senlin_health_check_sweep_seconds',
+    'senlin_health_check_sweep_overruns_total',
+    'senlin_health_checks_skipped_total',
+    'senlin_health_probe_seconds', 'senlin_health_probe_errors_total',
+    'senlin_health_check_timers', 'senlin_health_check_timer_slot_timers',
+    'senlin_actions_scheduled_total',
+)
+
+# Upper bounds of the buckets of duration histograms, in seconds
+BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800, 3600)
+
+_GAUGES = {}
+_COUNTERS = {}
+_HISTOGRAMS = {}
+
+
+class Histogram(object):
+    """Distribution of samples over fixed buckets."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            buckets.append((str(bound), cumulative))
+
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': buckets,
+        }
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def set_gauge(name, value, **labels):
+    """Set the current value of a gauge."""
+    if cfg.CONF.metrics.enabled:
+        _GAUGES[_key(name, labels)] = value
+
+
+def inc(name, value=1, **labels):
+    """Increase a counter."""
+    if cfg.CONF.metrics.enabled:
+        key = _key(name, labels)
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    """Record a sample in a histogram."""
+    if not cfg.CONF.metrics.enabled:
+        return
+
+    key = _key(name, labels)
+    histogram = _HISTOGRAMS.get(key)
+    if histogram is None:
+        histogram = _HISTOGRAMS[key] = Histogram()
+    histogram.observe(value)
+
+
+def reset():
+    """Drop all metrics recorded so far."""
+    _GAUGES.clear()
+    _COUNTERS.clear()
+    _HISTOGRAMS.clear()
+
+
+def get_stats():
+    """Get all metrics recorded so far.
+
+    :returns: A list of dictionaries, one for each metric and label set.
+    """
+    result = []
+    for kind, metrics in (('gauge', _GAUGES), ('counter', _COUNTERS)):
+        for (name, labels), value in sorted(metrics.items()):
+            result.append({'name': name, 'type': kind,
+                           'labels': dict(labels), 'value': value})
+
+    for (name, labels), histogram in sorted(_HISTOGRAMS.items(),
+                                            key=lambda item: item[0]):
+        item = {'name': name, 'type': 'histogram', 'labels': dict(labels)}
+        item.update(histogram.to_dict())
+        result.append(item)
+
+    return result
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+
+    pairs = ['%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+             for k, v in sorted(labels.items())]
+    return '{%s}' % ','.join(pairs)
+
+
+def render_text():
+    """Render all metrics in the Prometheus text exposition format."""
+    lines = []
+    declared = set()
+    for item in get_stats():
+        name = item['name']
+        if name not in declared:
+            lines.append('# TYPE %s %s' % (name, item['type']))
+            declared.add(name)
+
+        labels = item['labels']
+        if item['type'] != 'histogram':
+            lines.append('%s%s %s' % (name, _format_labels(labels),
+                                      item['value']))
+            continue
+
+        for bound, count in item['buckets']:
+            bucket_labels = dict(labels, le=bound)
+            lines.append('%s_bucket%s %s' % (
+                name, _format_labels(bucket_labels), count))
+        lines.append('%s_sum%s %s' % (name, _format_labels(labels),
+                                      item['sum']))
+        lines.append('%s_count%s %s' % (name, _format_labels(labels),
+                                        item['count']))
+
+    return '\n'.join(lines) + '\n'
+
+
+def get_dump_file(engine_id):
+    """Get the path of the file the metrics of an engine are dumped into.
+
+    :returns: The file path, or None if metrics are not dumped.
+    """
+    conf = cfg.CONF.metrics
+    if not conf.dump_dir:
+        return None
+
+    suffix = 'prom' if conf.dump_format == 'prometheus' else 'json'
+    return os.path.join(conf.dump_dir,
+                        'senlin-engine-%s.%s' % (engine_id, suffix))
+
+
+def dump(engine_id):
+    """Dump all metrics into the file of the engine.
+
+    The file is replaced atomically so that readers never see a partial
+    dump.
+
+    :param engine_id: ID of the engine dumping its metrics.
+    """
+    path = get_dump_file(engine_id)
+    if path is None:
+        return
+
+    if cfg.CONF.metrics.dump_format == 'prometheus':
+        content = render_text()
+    else:
+        content = json.dumps(get_stats())
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.rename(tmp_path, path)
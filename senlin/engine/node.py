@@ -84,16 +84,8 @@ class Node(object):
 
         self.rt = {'profile': profile}
 
-    def store(self, context):
-        """Store the node into database table.
-
-        The invocation of object API could be a node_create or a node_update,
-        depending on whether node has an ID assigned.
-
-        @param context: Request context for node creation.
-        @return: UUID of node created.
-        """
-        values = {
+    def _get_values(self):
+        return {
             'name': self.name,
             'physical_id': self.physical_id,
             'cluster_id': self.cluster_id,
@@ -113,6 +105,17 @@ class Node(object):
             'dependents': self.dependents,
         }
 
+    def store(self, context):
+        """Store the node into database table.
+
+        The invocation of object API could be a node_create or a node_update,
+        depending on whether node has an ID assigned.
+
+        @param context: Request context for node creation.
+        @return: UUID of node created.
+        """
+        values = self._get_values()
+
         if self.id:
             no.Node.update(context, self.id, values)
         else:
@@ -125,6 +128,29 @@ class Node(object):
         self._load_runtime_data(context)
         return self.id
 
+    @classmethod
+    def store_many(cls, context, nodes):
+        """Store a list of new nodes into database table in one batch.
+
+        Unlike `store`, the runtime data of the nodes is not reloaded, the
+        caller is supposed to have it populated already.
+
+        @param context: Request context for node creation.
+        @param nodes: A list of nodes that have no ID assigned.
+        @return: A list of UUIDs of the nodes created.
+        """
+        init_at = timeutils.utcnow(True)
+        values = []
+        for node in nodes:
+            node.init_at = init_at
+            values.append(node._get_values())
+
+        node_ids = no.Node.create_many(context, values)
+        for node, node_id in zip(nodes, node_ids):
+            node.id = node_id
+
+        return node_ids
+
     @classmethod
     def _from_object(cls, context, obj):
         """Construct a node from node object.
@@ -0,0 +1,155 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+HTTP prober of the health manager.
+
+The prober fetches the URLs polled for the health of nodes. It keeps the
+connections to each host alive between probes and runs many probes at the
+same time in green threads, so that one engine can poll a large number of
+nodes within their check intervals.
+"""
+
+import eventlet
+from eventlet import semaphore
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import encodeutils
+from oslo_utils import timeutils
+import requests
+from requests import adapters
+
+from senlin.common.i18n import _
+from senlin.common import utils
+from senlin.engine import metrics
+
+LOG = logging.getLogger(__name__)
+cfg.CONF.import_opt('max_response_size', 'senlin.common.config')
+cfg.CONF.import_group('health_manager', 'senlin.common.config')
+
+_prober = None
+
+
+class HTTPProber(object):
+    """Prober fetching URLs over pooled HTTP connections."""
+
+    def __init__(self, pool_size, connections_per_host):
+        """Initialize a prober.
+
+        :param pool_size: Maximum number of probes running at the same time.
+        :param connections_per_host: Maximum number of connections kept
+                                     alive to the same host.
+        """
+        adapter = adapters.HTTPAdapter(pool_connections=pool_size,
+                                       pool_maxsize=connections_per_host,
+                                       pool_block=False)
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._pool = eventlet.GreenPool(pool_size)
+
+    def fetch(self, url, timeout=1, verify=True):
+        """Get the data at the specified URL.
+
+        :param url: The http or https URL to be fetched.
+        :param timeout: Timeout of the request in seconds.
+        :param verify: Whether the certificate of the server is verified.
+        :returns: The data fetched as a string.
+        :raises: `URLFetchError` if getting the data fails.
+        """
+        watch = timeutils.StopWatch().start()
+        try:
+            return self._fetch(url, timeout, verify)
+        except utils.URLFetchError:
+            metrics.inc(metrics.HEALTH_PROBE_ERRORS)
+            raise
+        finally:
+            metrics.observe(metrics.HEALTH_PROBE_SECONDS, watch.elapsed())
+
+    def _fetch(self, url, timeout, verify):
+        max_size = cfg.CONF.max_response_size
+        try:
+            resp = self._session.get(url, stream=True, verify=verify,
+                                     timeout=timeout)
+        except requests.exceptions.RequestException as ex:
+            raise utils.URLFetchError(_('Failed to retrieve data: %s') % ex)
+
+        # The connection goes back to the pool once the response is read
+        # completely, it is dropped otherwise.
+        try:
+            resp.raise_for_status()
+            chunks = []
+            size = 0
+            for chunk in resp.iter_content(chunk_size=1000):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > max_size:
+                    raise utils.URLFetchError(
+                        _("Data exceeds maximum allowed size (%s bytes)") %
+                        max_size)
+        except requests.exceptions.RequestException as ex:
+            raise utils.URLFetchError(_('Failed to retrieve data: %s') % ex)
+        finally:
+            resp.close()
+
+        return encodeutils.safe_decode(b''.join(chunks),
+                                       resp.encoding or 'utf-8', 'replace')
+
+    def fetch_many(self, urls, timeout=1, verify=True, concurrency=None,
+                   watch=None):
+        """Fetch many URLs concurrently.
+
+        :param urls: A dict mapping keys chosen by the caller to the URLs
+                     to be fetched.
+        :param timeout: Timeout of each request in seconds.
+        :param verify: Whether the certificates of the servers are verified.
+        :param concurrency: Maximum number of these URLs fetched at the same
+                            time, or None for no limit but the pool size.
+        :param watch: A started stopwatch whose duration is the deadline.
+                      The URLs whose fetching has not started when it
+                      expires are not fetched.
+        :returns: A dict mapping the key of each URL fetched to the data
+                  fetched from it, or to the `URLFetchError` raised when
+                  fetching it.
+        """
+        slots = semaphore.Semaphore(concurrency) if concurrency else None
+
+        def _probe(key, url):
+            try:
+                return key, self.fetch(url, timeout=timeout, verify=verify)
+            except utils.URLFetchError as ex:
+                return key, ex
+            finally:
+                if slots is not None:
+                    slots.release()
+
+        threads = []
+        for key, url in urls.items():
+            if watch is not None and watch.expired():
+                break
+            if slots is not None and not slots.acquire(
+                    timeout=watch.leftover() if watch is not None else None):
+                break
+            threads.append(self._pool.spawn(_probe, key, url))
+
+        return dict(thread.wait() for thread in threads)
+
+
+def get_prober():
+    """Get the HTTP prober of the engine, creating it if needed."""
+    global _prober
+
+    if _prober is None:
+        conf = cfg.CONF.health_manager
+        _prober = HTTPProber(conf.probe_pool_size,
+                             conf.probe_connections_per_host)
+    return _prober
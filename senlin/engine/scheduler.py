@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import time
 
 import eventlet
@@ -19,8 +20,11 @@ from oslo_log import log as logging
 from oslo_service import threadgroup
 from osprofiler import profiler
 
+from senlin.common import consts
 from senlin.common import context
 from senlin.engine.actions import base as action_mod
+from senlin.engine import dispatcher
+from senlin.engine import metrics
 from senlin.objects import action as ao
 
 LOG = logging.getLogger(__name__)
@@ -28,6 +32,90 @@ LOG = logging.getLogger(__name__)
 wallclock = time.time
 
 
+class ActionQueue(object):
+    """Orders ready actions by priority and fair share among projects.
+
+    Actions listed in the `scheduler_priority_actions` option come first,
+    followed by actions requested through RPC and then derived actions.
+    Within each priority, actions from different projects are interleaved in
+    a round-robin manner so that no single project can starve the others.
+    The round-robin carries over from one round of scheduling to the next:
+    the projects served least recently come first.
+    """
+
+    PRIORITIES = (
+        PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW,
+    ) = (
+        'HIGH', 'NORMAL', 'LOW',
+    )
+
+    def __init__(self):
+        self.priority_actions = set(cfg.CONF.scheduler_priority_actions)
+        # Sequence number of the last action scheduled for each project
+        self._last_served = {}
+        self._sequence = 0
+
+    def priority(self, action):
+        """Get the priority of a ready action."""
+        if action.action in self.priority_actions:
+            return self.PRIORITY_HIGH
+        if action.cause == consts.CAUSE_RPC:
+            return self.PRIORITY_NORMAL
+        return self.PRIORITY_LOW
+
+    def order(self, actions):
+        """Order ready actions for execution.
+
+        :param actions: A list of ready actions, oldest first.
+        :returns: A list of the same actions in scheduling order.
+        """
+        queues = dict((p, collections.OrderedDict()) for p in self.PRIORITIES)
+        for action in actions:
+            projects = queues[self.priority(action)]
+            projects.setdefault(action.project, []).append(action)
+
+        result = []
+        for priority in self.PRIORITIES:
+            # sorted() is stable, so projects never served keep the order of
+            # their oldest actions
+            projects = collections.OrderedDict(sorted(
+                queues[priority].items(),
+                key=lambda item: self._last_served.get(item[0], 0)))
+            while projects:
+                for project in list(projects):
+                    pending = projects[project]
+                    result.append(pending.pop(0))
+                    if not pending:
+                        del projects[project]
+
+        return result
+
+    def record(self, actions):
+        """Record the scheduling decisions made for the given actions.
+
+        :param actions: A list of actions scheduled, in scheduling order.
+        :returns: A tuple of the numbers of actions scheduled by priority
+                  and by project.
+        """
+        priorities = collections.Counter()
+        projects = collections.Counter()
+        for action in actions:
+            priority = self.priority(action)
+            priorities[priority] += 1
+            projects[action.project] += 1
+            self._sequence += 1
+            self._last_served[action.project] = self._sequence
+            metrics.inc(metrics.ACTIONS_SCHEDULED, priority=priority,
+                        project=action.project)
+
+        return priorities, projects
+
+    def forget(self, projects):
+        """Forget the projects which no longer have ready actions."""
+        for project in set(self._last_served) - set(projects):
+            del self._last_served[project]
+
+
 class ThreadGroupManager(object):
     """Thread group manager."""
 
@@ -43,6 +131,9 @@ class ThreadGroupManager(object):
         # TODO(Yanyan Hu): Build a DB session with full privilege
         # for DB accessing in scheduler module
         self.db_session = context.RequestContext(is_admin=True)
+        self.queue = ActionQueue()
+        # Number of actions being executed, reported as the engine load
+        self.running_actions = 0
 
     def _service_task(self):
         """Dummy task which gets queued on the service.Service threadgroup.
@@ -78,61 +169,108 @@ class ThreadGroupManager(object):
     def start(self, func, *args, **kwargs):
         """Run the given method in a thread."""
         req_cnxt = oslo_context.get_current()
-        self.group.add_thread(
+        return self.group.add_thread(
             self._start_with_trace, req_cnxt,
             self._serialize_profile_info(),
             func, *args, **kwargs)
 
-    def start_action(self, worker_id, action_id=None):
+    def _start_action_thread(self, action_id):
+        """Run an action claimed by this engine in a thread."""
+        th = self.start(action_mod.ActionProc, self.db_session, action_id)
+        self.running_actions += 1
+        th.link(self._action_done)
+
+    def _action_done(self, gt):
+        self.running_actions -= 1
+
+    def update_metrics(self, worker_id):
+        """Record the occupancy of the thread pool and the ready queue.
+
+        :param worker_id: ID of the worker the metrics are recorded for.
+        """
+        metrics.set_gauge(metrics.THREADS_RUNNING, self.group.pool.running(),
+                          engine=worker_id)
+        metrics.set_gauge(metrics.THREAD_POOL_SIZE,
+                          cfg.CONF.scheduler_thread_pool_size,
+                          engine=worker_id)
+        metrics.set_gauge(metrics.READY_ACTIONS,
+                          ao.Action.count_ready(self.db_session),
+                          engine=worker_id)
+
+    def _acquire_actions(self, worker_id, timestamp, limit):
+        """Claim a batch of ready actions for execution.
+
+        :param worker_id: ID of the worker claiming the actions.
+        :param timestamp: Timestamp to be recorded as start time.
+        :param limit: Maximum number of actions to claim.
+        :returns: A list of claimed actions in scheduling order.
+        """
+        if not cfg.CONF.scheduler_fair_share:
+            return ao.Action.acquire_batch(self.db_session, worker_id,
+                                           timestamp, limit)
+
+        candidates = ao.Action.get_all_ready(
+            self.db_session, limit=cfg.CONF.scheduler_candidate_limit,
+            priority_actions=list(self.queue.priority_actions),
+            project_limit=cfg.CONF.scheduler_project_candidate_limit)
+        self.queue.forget(a.project for a in candidates)
+        if not candidates:
+            return []
+
+        ordered = self.queue.order(candidates)[:limit]
+        position = dict((a.id, i) for i, a in enumerate(ordered))
+        actions = ao.Action.acquire_batch(self.db_session, worker_id,
+                                          timestamp, limit,
+                                          action_ids=list(position))
+        actions = sorted(actions, key=lambda a: position[a.id])
+
+        priorities, projects = self.queue.record(actions)
+        LOG.debug('Engine %(id)s scheduled %(num)s of %(total)s ready '
+                  'actions, by priority: %(priorities)s, by project: '
+                  '%(projects)s',
+                  {'id': worker_id, 'num': len(actions),
+                   'total': len(candidates), 'priorities': dict(priorities),
+                   'projects': dict(projects)})
+        return actions
+
+    def start_action(self, worker_id, action_id=None, limit=None):
         """Run action(s) in sub-thread(s).
 
         :param worker_id: ID of the worker thread; we fake workers using
                           senlin engines at the moment.
         :param action_id: ID of the action to be executed. None means all
                           ready actions will be acquired and scheduled to run.
+        :param limit: Maximum number of ready actions to be acquired, or None
+                      to acquire all of them. When the limit is reached, the
+                      actions left are dispatched to the engines again.
         """
-        actions_launched = 0
-        max_batch_size = cfg.CONF.max_actions_per_batch
-        batch_interval = cfg.CONF.batch_interval
+        acquire_size = cfg.CONF.action_acquire_batch_size
 
         if action_id is not None:
             timestamp = wallclock()
             action = ao.Action.acquire(self.db_session, action_id, worker_id,
                                        timestamp)
             if action:
-                self.start(action_mod.ActionProc, self.db_session, action.id)
-                actions_launched += 1
+                self._start_action_thread(action.id)
 
-        while True:
+        acquired = 0
+        while limit is None or acquired < limit:
+            size = acquire_size
+            if limit is not None:
+                size = min(size, limit - acquired)
             timestamp = wallclock()
-            action = ao.Action.acquire_first_ready(self.db_session, worker_id,
-                                                   timestamp)
-            if not action:
-                break
-
-            if max_batch_size == 0 or 'NODE' not in action.action:
-                self.start(action_mod.ActionProc, self.db_session, action.id)
-                continue
-
-            if max_batch_size > actions_launched:
-                self.start(action_mod.ActionProc, self.db_session, action.id)
-                actions_launched += 1
-                continue
-
-            self.start(action_mod.ActionProc, self.db_session, action.id)
-
-            LOG.debug(
-                'Engine %(id)s has launched %(num)s node actions '
-                'consecutively, stop scheduling node action for '
-                '%(interval)s second...',
-                {
-                    'id': worker_id,
-                    'num': max_batch_size,
-                    'interval': batch_interval
-                })
-
-            sleep(batch_interval)
-            actions_launched = 1
+            actions = self._acquire_actions(worker_id, timestamp, size)
+            for action in actions:
+                self._start_action_thread(action.id)
+
+            acquired += len(actions)
+            if len(actions) < size:
+                return
+
+        # More actions may be ready, they go to the least loaded engine
+        # which may be another one now that this one runs more actions.
+        dispatcher.add_load(worker_id, acquired)
+        dispatcher.start_action()
 
     def cancel_action(self, action_id):
         """Cancel an action execution progress."""
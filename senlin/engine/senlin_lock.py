@@ -10,27 +10,33 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import eventlet
-import random
 import time
 
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import timeutils
 
 from senlin.common.i18n import _
 from senlin.common import utils
+from senlin.engine import dispatcher
+from senlin.engine import metrics
 from senlin import objects
 from senlin.objects import action as ao
 from senlin.objects import cluster_lock as cl_obj
 from senlin.objects import node_lock as nl_obj
+from senlin.objects import unit_of_work
 
 CONF = cfg.CONF
 
 CONF.import_opt('lock_retry_times', 'senlin.common.config')
 CONF.import_opt('lock_retry_interval', 'senlin.common.config')
+CONF.import_opt('lock_wait_timeout', 'senlin.common.config')
+CONF.import_opt('lock_wait_check_interval', 'senlin.common.config')
 
 LOG = logging.getLogger(__name__)
 
+wallclock = time.time
+
 LOCK_SCOPES = (
     CLUSTER_SCOPE, NODE_SCOPE,
 ) = (
@@ -42,6 +48,9 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
                          scope=CLUSTER_SCOPE, forced=False):
     """Try to lock the specified cluster.
 
+    When the cluster is locked by another action, the action waits in a FIFO
+    queue until the lock is released or `lock_wait_timeout` expires.
+
     :param context: the context used for DB operations.
     :param cluster_id: ID of the cluster to be locked.
     :param action_id: ID of the action which wants to lock the cluster.
@@ -55,19 +64,11 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
 
     # Step 1: try lock the cluster - if the returned owner_id is the
     #         action id, it was a success
-    for retries in range(3):
-        owners = cl_obj.ClusterLock.acquire(cluster_id, action_id, scope)
-        if action_id in owners:
-            return True
-        eventlet.sleep(random.randrange(1, 3))
-
-    # Step 2: Last resort is 'forced locking', only needed when retry failed
-    if forced:
-        owners = cl_obj.ClusterLock.steal(cluster_id, action_id)
-        return action_id in owners
+    owners = cl_obj.ClusterLock.acquire(cluster_id, action_id, scope)
+    if action_id in owners:
+        return True
 
-    # Step 3: check if the owner is a dead engine, if so, steal the lock.
-    # Will reach here only because scope == CLUSTER_SCOPE
+    # Step 2: check if the owner is a dead engine, if so, steal the lock.
     action = ao.Action.get(context, owners[0])
     if (action and action.owner and action.owner != engine and
             utils.is_engine_dead(context, action.owner)):
@@ -80,6 +81,17 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
         objects.Service.gc_by_engine(dead_engine)
         return action_id in owners
 
+    # Step 3: wait in queue until the lock is released by its owner
+    owners = _wait_for_cluster_lock(context, cluster_id, action_id, engine,
+                                    scope, owners)
+    if action_id in owners:
+        return True
+
+    # Step 4: Last resort is 'forced locking', only needed when waiting failed
+    if forced:
+        owners = cl_obj.ClusterLock.steal(cluster_id, action_id)
+        return action_id in owners
+
     lock_owners = []
     for o in owners:
         lock_owners.append(o[:8])
@@ -90,14 +102,83 @@ def cluster_lock_acquire(context, cluster_id, action_id, engine=None,
     return False
 
 
+def _wait_for_cluster_lock(context, cluster_id, action_id, engine, scope,
+                           owners):
+    """Wait in a FIFO queue for a cluster lock.
+
+    Only the action at the head of the queue retries the lock when it is
+    woken up by a release in this engine or by a notification from the
+    engine holding the lock. The lock is checked again every
+    `lock_wait_check_interval` seconds in case a notification was missed.
+
+    :returns: The owners of the lock after the last attempt.
+    """
+    timeout = CONF.lock_wait_timeout
+    if timeout <= 0:
+        return owners
+
+    deadline = wallclock() + timeout
+    watched = None
+    acquired = False
+    watch = timeutils.StopWatch().start()
+    dispatcher.add_lock_waiter(cluster_id, action_id)
+    try:
+        while True:
+            is_first = dispatcher.is_first_lock_waiter(cluster_id, action_id)
+            if is_first and owners != watched:
+                _watch_cluster_lock(context, cluster_id, owners, engine)
+                watched = owners
+
+            remaining = deadline - wallclock()
+            if remaining <= 0:
+                break
+
+            dispatcher.wait_lock(cluster_id, action_id,
+                                 min(remaining, CONF.lock_wait_check_interval))
+            if not dispatcher.is_first_lock_waiter(cluster_id, action_id):
+                continue
+
+            owners = cl_obj.ClusterLock.acquire(cluster_id, action_id, scope)
+            if action_id in owners:
+                acquired = True
+                break
+    finally:
+        # Node scope locks are shared, so the next waiter may get it as well
+        wakeup_next = not acquired or scope == NODE_SCOPE
+        dispatcher.remove_lock_waiter(cluster_id, action_id, wakeup_next)
+        metrics.observe(metrics.LOCK_WAIT_SECONDS, watch.elapsed(),
+                        scope='node' if scope == NODE_SCOPE else 'cluster',
+                        acquired=acquired)
+
+    return owners
+
+
+def _watch_cluster_lock(context, cluster_id, owners, engine):
+    """Ask the remote engines holding a cluster lock to notify its release."""
+    if engine is None:
+        return
+
+    for owner in owners:
+        action = ao.Action.get(context, owner)
+        if action and action.owner and action.owner != engine:
+            dispatcher.watch_lock(cluster_id, action.owner, engine)
+
+
 def cluster_lock_release(cluster_id, action_id, scope):
     """Release the lock on the specified cluster.
 
+    Actions waiting for the lock in this engine or in the engines that asked
+    to be notified are woken up.
+
     :param cluster_id: ID of the cluster to be released.
     :param action_id: ID of the action that attempts to release the cluster.
     :param scope: The scope of the lock to be released.
     """
-    return cl_obj.ClusterLock.release(cluster_id, action_id, scope)
+    unit_of_work.checkpoint()
+    res = cl_obj.ClusterLock.release(cluster_id, action_id, scope)
+    if res:
+        dispatcher.release_lock(cluster_id)
+    return res
 
 
 def node_lock_acquire(context, node_id, action_id, engine=None,
@@ -149,4 +230,5 @@ def node_lock_release(node_id, action_id):
     :param node_id: ID of the node to be released.
     :param action_id: ID of the action that attempts to release the node.
     """
+    unit_of_work.checkpoint()
     return nl_obj.NodeLock.release(node_id, action_id)
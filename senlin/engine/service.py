@@ -12,6 +12,7 @@
 
 import copy
 import functools
+import os
 
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -37,6 +38,7 @@ from senlin.engine import dispatcher
 from senlin.engine import environment
 from senlin.engine import event as EVENT
 from senlin.engine import health_manager
+from senlin.engine import metrics
 from senlin.engine import node as node_mod
 from senlin.engine.receivers import base as receiver_mod
 from senlin.engine import scheduler
@@ -146,6 +148,10 @@ class EngineService(service.Service):
                                                self.service_manage_cleanup)
 
         self.TG.add_timer(CONF.periodic_interval, self.service_manage_report)
+
+        if CONF.metrics.enabled and CONF.metrics.dump_dir:
+            self.TG.add_timer(CONF.metrics.dump_interval,
+                              self.service_manage_metrics)
         super(EngineService, self).start()
 
     def _stop_rpc_server(self):
@@ -172,6 +178,13 @@ class EngineService(service.Service):
 
         self.TG.stop()
 
+        # Write the events buffered by the stopped actions
+        EVENT.flush()
+
+        dump_file = metrics.get_dump_file(self.engine_id)
+        if dump_file and os.path.exists(dump_file):
+            os.remove(dump_file)
+
         service_obj.Service.delete(self.engine_id)
         LOG.info('Engine %s is deleted', self.engine_id)
 
@@ -180,10 +193,18 @@ class EngineService(service.Service):
     def service_manage_report(self):
         try:
             ctx = senlin_context.get_admin_context()
-            service_obj.Service.update(ctx, self.engine_id)
+            service_obj.Service.update(ctx, self.engine_id,
+                                       {'load': self.TG.running_actions})
         except Exception as ex:
             LOG.error('Error while updating engine service: %s', ex)
 
+    def service_manage_metrics(self):
+        try:
+            self.TG.update_metrics(self.engine_id)
+            metrics.dump(self.engine_id)
+        except Exception as ex:
+            LOG.error('Error while dumping engine metrics: %s', ex)
+
     def _service_manage_cleanup(self):
         try:
             ctx = senlin_context.get_admin_context()
@@ -684,7 +705,8 @@ class EngineService(service.Service):
         if not req.project_safe and not ctx.is_admin:
             raise exception.Forbidden()
 
-        query = {'project_safe': req.project_safe}
+        query = {'project_safe': req.project_safe,
+                 'use_replica': not ctx.read_primary}
         if req.obj_attr_is_set('limit'):
             query['limit'] = req.limit
         if req.obj_attr_is_set('marker'):
@@ -1561,7 +1583,8 @@ class EngineService(service.Service):
         if not req.project_safe and not ctx.is_admin:
             raise exception.Forbidden()
 
-        query = {'project_safe': req.project_safe}
+        query = {'project_safe': req.project_safe,
+                 'use_replica': not ctx.read_primary}
         if req.obj_attr_is_set('limit'):
             query['limit'] = req.limit
         if req.obj_attr_is_set('marker'):
@@ -2211,7 +2234,8 @@ class EngineService(service.Service):
         if not req.project_safe and not ctx.is_admin:
             raise exception.Forbidden()
 
-        query = {'project_safe': req.project_safe}
+        query = {'project_safe': req.project_safe,
+                 'use_replica': not ctx.read_primary}
         if req.obj_attr_is_set('limit'):
             query['limit'] = req.limit
         if req.obj_attr_is_set('marker'):
@@ -2548,7 +2572,8 @@ class EngineService(service.Service):
         if not req.project_safe and not ctx.is_admin:
             raise exception.Forbidden()
 
-        query = {'project_safe': req.project_safe}
+        query = {'project_safe': req.project_safe,
+                 'use_replica': not ctx.read_primary}
         if req.obj_attr_is_set('limit'):
             query['limit'] = req.limit
         if req.obj_attr_is_set('marker'):
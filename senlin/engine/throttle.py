@@ -0,0 +1,192 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Adaptive throttling of requests sent to backend services.
+
+Each backend, identified by a profile type and a region, gets its own
+limiter. A limiter bounds the number of node operations running against the
+backend concurrently and adjusts the bound in an AIMD (additive increase,
+multiplicative decrease) manner: the limit grows by one after each successful
+operation and is cut down when an operation fails or when its latency is far
+above the average latency observed so far.
+
+Until they are removed, the deprecated ``max_actions_per_batch`` and
+``batch_interval`` options still cap the limiters: when the batch size is
+set, it bounds the limit of each backend and an engine starts at most that
+many node operations every ``batch_interval`` seconds.
+"""
+
+import collections
+
+import eventlet
+from eventlet import event
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import timeutils
+
+LOG = logging.getLogger(__name__)
+
+# Weight of a new latency sample in the moving average
+LATENCY_WEIGHT = 0.2
+
+_LIMITERS = {}
+
+# Number of node operations started in the current batch and the time the
+# batch ends, for the deprecated batch options
+_BATCH = {'count': 0, 'end': 0}
+
+
+def _pace():
+    """Wait until the current batch of node operations has room."""
+    size = cfg.CONF.max_actions_per_batch
+    if size <= 0:
+        return
+
+    while True:
+        now = timeutils.now()
+        if now >= _BATCH['end']:
+            _BATCH['count'] = 0
+            _BATCH['end'] = now + cfg.CONF.batch_interval
+        if _BATCH['count'] < size:
+            _BATCH['count'] += 1
+            return
+        eventlet.sleep(_BATCH['end'] - now)
+
+
+class AdaptiveLimiter(object):
+    """Concurrency limiter adapting to the health of a backend."""
+
+    def __init__(self, name, initial, minimum, maximum):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+
+        self.active = 0
+        # Moving average of operation latency in seconds, by operation
+        self.latency = {}
+        self.successes = 0
+        self.failures = 0
+        self._waiters = collections.deque()
+
+    @property
+    def waiting(self):
+        return len(self._waiters)
+
+    def acquire(self):
+        """Wait for a free slot and occupy it."""
+        _pace()
+        if not self._waiters and self.active < int(self.limit):
+            self.active += 1
+            return
+
+        evt = event.Event()
+        self._waiters.append(evt)
+        acquired = False
+        try:
+            # The slot is handed over by release()
+            evt.wait()
+            acquired = True
+        finally:
+            if not acquired:
+                # The wait was interrupted, e.g. the thread was killed or
+                # timed out, so the slot must not be leaked.
+                try:
+                    self._waiters.remove(evt)
+                except ValueError:
+                    # The slot was handed over already, give it back
+                    self.active -= 1
+                    self._wakeup()
+
+    def release(self, operation, latency, success):
+        """Free a slot and adapt the limit to the outcome of the operation.
+
+        :param operation: Name of the operation, e.g. 'NODE_CREATE'.
+        :param latency: Seconds the operation took.
+        :param success: Whether the operation succeeded.
+        """
+        self.active -= 1
+
+        average = self.latency.get(operation)
+        slow = (average is not None and
+                latency > average * cfg.CONF.throttle.latency_factor)
+        if success and not slow:
+            self.successes += 1
+            self.limit = min(self.limit + 1, self.maximum)
+        else:
+            if not success:
+                self.failures += 1
+            old = self.limit
+            self.limit = max(self.limit * cfg.CONF.throttle.backoff_factor,
+                             self.minimum)
+            LOG.info('Throttle %(name)s reduced from %(old)d to %(new)d '
+                     '(operation: %(op)s, success: %(ok)s, latency: '
+                     '%(lat).2fs).',
+                     {'name': self.name, 'old': old, 'new': self.limit,
+                      'op': operation, 'ok': success, 'lat': latency})
+
+        if average is None:
+            self.latency[operation] = latency
+        else:
+            self.latency[operation] = (average +
+                                       LATENCY_WEIGHT * (latency - average))
+
+        self._wakeup()
+
+    def _wakeup(self):
+        while self._waiters and self.active < int(self.limit):
+            self.active += 1
+            self._waiters.popleft().send(True)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'limit': int(self.limit),
+            'active': self.active,
+            'waiting': self.waiting,
+            'latency': dict(self.latency),
+            'successes': self.successes,
+            'failures': self.failures,
+        }
+
+
+def get_limiter(profile_type, region=None):
+    """Get the limiter for a backend.
+
+    :param profile_type: Profile type name, e.g. 'os.nova.server'.
+    :param region: Name of the region where the backend lives.
+    :returns: An `AdaptiveLimiter` instance or None if throttling is
+              disabled.
+    """
+    if not cfg.CONF.throttle.enabled:
+        return None
+
+    key = (profile_type, region)
+    limiter = _LIMITERS.get(key)
+    if limiter is None:
+        conf = cfg.CONF.throttle
+        maximum = int(conf.max_limits.get(profile_type, conf.max_limit))
+        if cfg.CONF.max_actions_per_batch > 0:
+            maximum = min(maximum, cfg.CONF.max_actions_per_batch)
+        name = profile_type if not region else '%s@%s' % (profile_type,
+                                                          region)
+        limiter = AdaptiveLimiter(name, conf.initial_limit, conf.min_limit,
+                                  maximum)
+        _LIMITERS[key] = limiter
+
+    return limiter
+
+
+def get_stats():
+    """Get the status of all limiters created so far."""
+    return [limiter.to_dict() for limiter in _LIMITERS.values()]
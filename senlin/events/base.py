@@ -47,3 +47,11 @@ class EventBackend(object):
         :returns: None
         """
         raise NotImplementedError
+
+    @classmethod
+    def flush(cls):
+        """Write out the events buffered by the backend, if any.
+
+        :returns: None
+        """
+        pass
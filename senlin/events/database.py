@@ -10,12 +10,81 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+
+import eventlet
+from oslo_config import cfg
+from oslo_log import log as logging
 from oslo_utils import timeutils
 
 from senlin.common import consts
+from senlin.common import context as senlin_context
+from senlin.engine import metrics
 from senlin.events import base
 from senlin.objects import event as eo
 
+LOG = logging.getLogger(__name__)
+
+# Events waiting to be written, each one with the time it was buffered
+_BUFFER = collections.deque()
+
+# Green thread writing the buffered events when the flush interval expires
+_PENDING_FLUSH = None
+
+
+def _schedule_flush():
+    global _PENDING_FLUSH
+
+    conf = cfg.CONF.dispatchers
+    if len(_BUFFER) >= conf.event_batch_size:
+        # A full batch is pending, write it now instead of waiting
+        if _PENDING_FLUSH is not None:
+            _PENDING_FLUSH.cancel()
+        _PENDING_FLUSH = eventlet.spawn(flush)
+    elif _PENDING_FLUSH is None:
+        _PENDING_FLUSH = eventlet.spawn_after(conf.event_flush_interval,
+                                              flush)
+
+
+def _write(batch):
+    ctx = senlin_context.get_admin_context()
+    try:
+        eo.Event.create_many(ctx, [values for values, _ in batch])
+        return
+    except Exception as ex:
+        LOG.warning('Failed in writing %(num)s events at once, retrying '
+                    'one by one: %(ex)s', {'num': len(batch), 'ex': ex})
+
+    # A single bad event must not cost the whole batch
+    for values, _ in batch:
+        try:
+            eo.Event.create(ctx, values)
+        except Exception as ex:
+            LOG.error('Failed in writing event: %s', ex)
+            metrics.inc(metrics.EVENTS_DROPPED)
+
+
+def flush():
+    """Write all buffered events into the database.
+
+    Events are written in batches of at most ``event_batch_size`` rows,
+    each batch with a single multi-row insert.
+    """
+    global _PENDING_FLUSH
+    _PENDING_FLUSH = None
+
+    batch_size = cfg.CONF.dispatchers.event_batch_size
+    while _BUFFER:
+        batch = []
+        while _BUFFER and len(batch) < batch_size:
+            batch.append(_BUFFER.popleft())
+        metrics.set_gauge(metrics.EVENTS_BUFFERED, len(_BUFFER))
+
+        _write(batch)
+        now = timeutils.now()
+        for _, buffered_at in batch:
+            metrics.observe(metrics.EVENT_DELAY_SECONDS, now - buffered_at)
+
 
 class DBEvent(base.EventBackend):
     """DB driver for event dumping"""
@@ -24,6 +93,10 @@ class DBEvent(base.EventBackend):
     def dump(cls, level, action, **kwargs):
         """Create an event record into database.
 
+        The event is only buffered so that the caller is not blocked by
+        the database. Buffered events are written in batches, either when
+        a batch is full or when ``event_flush_interval`` expires.
+
         :param level: An integer as defined by python logging module.
         :param action: The action that triggered this dump.
         :param dict kwargs: Additional parameters such as ``phase``,
@@ -60,4 +133,22 @@ class DBEvent(base.EventBackend):
             'meta_data': extra,
         }
 
-        eo.Event.create(ctx, values)
+        buffer_size = cfg.CONF.dispatchers.event_buffer_size
+        if buffer_size <= 0:
+            eo.Event.create(ctx, values)
+            return
+
+        if len(_BUFFER) >= buffer_size:
+            LOG.warning('Event buffer is full, dropping event of %(otype)s '
+                        '%(oid)s.', {'otype': otype, 'oid': entity.id})
+            metrics.inc(metrics.EVENTS_DROPPED)
+            return
+
+        _BUFFER.append((values, timeutils.now()))
+        metrics.set_gauge(metrics.EVENTS_BUFFERED, len(_BUFFER))
+        _schedule_flush()
+
+    @classmethod
+    def flush(cls):
+        """Write all buffered events into the database."""
+        flush()
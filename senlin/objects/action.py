@@ -20,6 +20,7 @@ from senlin.db import api as db_api
 from senlin.objects import base
 from senlin.objects import dependency as dobj
 from senlin.objects import fields
+from senlin.objects import unit_of_work
 
 
 @base.SenlinObjectRegistry.register
@@ -46,6 +47,7 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         'inputs': fields.JsonField(nullable=True),
         'outputs': fields.JsonField(nullable=True),
         'data': fields.JsonField(nullable=True),
+        'timing': fields.JsonField(nullable=True),
         'user': fields.StringField(),
         'project': fields.StringField(),
         'domain': fields.StringField(nullable=True),
@@ -56,6 +58,10 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.action_create(context, values)
         return cls._from_db_object(context, cls(context), obj)
 
+    @classmethod
+    def create_many(cls, context, values, dependent=None):
+        return db_api.action_create_many(context, values, dependent=dependent)
+
     @classmethod
     def find(cls, context, identity, **kwargs):
         """Find an action with the given identity.
@@ -120,20 +126,25 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
         return db_api.action_check_status(context, action_id, timestamp)
 
     @classmethod
-    def mark_succeeded(cls, context, action_id, timestamp):
-        return db_api.action_mark_succeeded(context, action_id, timestamp)
+    def mark_succeeded(cls, context, action_id, timestamp, timing=None):
+        return db_api.action_mark_succeeded(context, action_id, timestamp,
+                                            timing=timing)
 
     @classmethod
-    def mark_ready(cls, context, action_id, timestamp):
-        return db_api.action_mark_ready(context, action_id, timestamp)
+    def mark_ready(cls, context, action_id, timestamp, timing=None):
+        return db_api.action_mark_ready(context, action_id, timestamp,
+                                        timing=timing)
 
     @classmethod
-    def mark_failed(cls, context, action_id, timestamp, reason=None):
-        return db_api.action_mark_failed(context, action_id, timestamp, reason)
+    def mark_failed(cls, context, action_id, timestamp, reason=None,
+                    timing=None):
+        return db_api.action_mark_failed(context, action_id, timestamp,
+                                         reason, timing=timing)
 
     @classmethod
-    def mark_cancelled(cls, context, action_id, timestamp):
-        return db_api.action_mark_cancelled(context, action_id, timestamp)
+    def mark_cancelled(cls, context, action_id, timestamp, timing=None):
+        return db_api.action_mark_cancelled(context, action_id, timestamp,
+                                            timing=timing)
 
     @classmethod
     def acquire(cls, context, action_id, owner, timestamp):
@@ -147,6 +158,22 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
     def acquire_first_ready(cls, context, owner, timestamp):
         return db_api.action_acquire_first_ready(context, owner, timestamp)
 
+    @classmethod
+    def get_all_ready(cls, context, limit=None, priority_actions=None,
+                      project_limit=None):
+        return db_api.action_get_all_ready(context, limit=limit,
+                                           priority_actions=priority_actions,
+                                           project_limit=project_limit)
+
+    @classmethod
+    def count_ready(cls, context):
+        return db_api.action_count_ready(context)
+
+    @classmethod
+    def acquire_batch(cls, context, owner, timestamp, limit, action_ids=None):
+        return db_api.action_acquire_batch(context, owner, timestamp, limit,
+                                           action_ids=action_ids)
+
     @classmethod
     def abandon(cls, context, action_id, values=None):
         return db_api.action_abandon(context, action_id, values)
@@ -165,6 +192,8 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
 
     @classmethod
     def update(cls, context, action_id, values):
+        if unit_of_work.defer(unit_of_work.ACTION, action_id, values):
+            return
         return db_api.action_update(context, action_id, values)
 
     @classmethod
@@ -213,6 +242,7 @@ class Action(base.SenlinObject, base.VersionedObjectDictCompat):
             'created_at': utils.isotime(self.created_at),
             'updated_at': utils.isotime(self.updated_at),
             'data': self.data,
+            'timing': self.timing,
             'user': self.user,
             'project': self.project,
         }
@@ -21,6 +21,9 @@ from senlin.common import utils
 from senlin.db import api as db_api
 from senlin.objects import base
 from senlin.objects import fields
+from senlin.objects import node as node_obj
+from senlin.objects import policy as policy_obj
+from senlin.objects import profile as profile_obj
 
 
 @base.SenlinObjectRegistry.register
@@ -84,6 +87,43 @@ class Cluster(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.cluster_get(context, cluster_id, **kwargs)
         return cls._from_db_object(context, cls(), obj)
 
+    @classmethod
+    def get_runtime_data(cls, context, cluster_id, **kwargs):
+        """Get a cluster with its profile, policy bindings and nodes.
+
+        :returns: A dict with the cluster object under 'cluster', the
+                  profile object under 'profile', the binding objects
+                  sorted by priority under 'bindings' and the node objects
+                  under 'nodes'; or None if the cluster is not found.
+        """
+        # NOTE: imported here because the cluster_policy module imports
+        #       this module
+        from senlin.objects import cluster_policy as cp_obj
+
+        data = db_api.cluster_get_runtime_data(context, cluster_id, **kwargs)
+        if data is None:
+            return None
+
+        cluster = cls._from_db_object(context, cls(), data['cluster'])
+        profile = profile_obj.Profile._from_db_object(
+            context, profile_obj.Profile(), data['profile'])
+        bindings = []
+        for b in data['bindings']:
+            policy = policy_obj.Policy._from_db_object(
+                context, policy_obj.Policy(), b.policy)
+            bindings.append(cp_obj.ClusterPolicy._from_db_object(
+                context, cp_obj.ClusterPolicy(), b, cluster=cluster,
+                policy=policy))
+        nodes = [node_obj.Node._from_db_object(context, node_obj.Node(), n)
+                 for n in data['nodes']]
+
+        return {
+            'cluster': cluster,
+            'profile': profile,
+            'bindings': bindings,
+            'nodes': nodes,
+        }
+
     @classmethod
     def get_by_name(cls, context, name, **kwargs):
         obj = db_api.cluster_get_by_name(context, name, **kwargs)
@@ -100,8 +140,8 @@ class Cluster(base.SenlinObject, base.VersionedObjectDictCompat):
         return [cls._from_db_object(context, cls(), obj) for obj in objs]
 
     @classmethod
-    def get_next_index(cls, context, cluster_id):
-        return db_api.cluster_next_index(context, cluster_id)
+    def get_next_index(cls, context, cluster_id, count=1):
+        return db_api.cluster_next_index(context, cluster_id, count=count)
 
     @classmethod
     def count_all(cls, context, **kwargs):
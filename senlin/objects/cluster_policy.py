@@ -36,15 +36,24 @@ class ClusterPolicy(base.SenlinObject, base.VersionedObjectDictCompat):
     }
 
     @staticmethod
-    def _from_db_object(context, binding, db_obj):
+    def _from_db_object(context, binding, db_obj, cluster=None, policy=None):
+        """Build a binding from its DB object.
+
+        :param cluster: Optional cluster object of the binding. It is
+                        retrieved from the database if not provided.
+        :param policy: Optional policy object of the binding. It is
+                       retrieved from the database if not provided.
+        """
         if db_obj is None:
             return None
         for field in binding.fields:
             if field == 'cluster':
-                c = cluster_obj.Cluster.get(context, db_obj['cluster_id'])
+                c = cluster or cluster_obj.Cluster.get(context,
+                                                       db_obj['cluster_id'])
                 binding['cluster'] = c
             elif field == 'policy':
-                p = policy_obj.Policy.get(context, db_obj['policy_id'])
+                p = policy or policy_obj.Policy.get(context,
+                                                    db_obj['policy_id'])
                 binding['policy'] = p
             else:
                 binding[field] = db_obj[field]
@@ -45,6 +45,10 @@ class Event(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.event_create(context, values)
         return cls._from_db_object(context, cls(context), obj)
 
+    @classmethod
+    def create_many(cls, context, values):
+        return db_api.event_create_many(context, values)
+
     @classmethod
     def find(cls, context, identity, **kwargs):
         """Find an event with the given identity.
@@ -27,7 +27,7 @@ class HealthRegistry(base.SenlinObject, base.VersionedObjectDictCompat):
         'check_type': fields.StringField(),
         'interval': fields.IntegerField(nullable=True),
         'params': fields.JsonField(nullable=True),
-        'engine_id': fields.UUIDField(),
+        'engine_id': fields.UUIDField(nullable=True),
         'enabled': fields.BooleanField(),
     }
 
@@ -45,10 +45,19 @@ class HealthRegistry(base.SenlinObject, base.VersionedObjectDictCompat):
         db_api.registry_update(context, cluster_id, values)
 
     @classmethod
-    def claim(cls, context, engine_id):
-        objs = db_api.registry_claim(context, engine_id)
+    def get_orphans(cls, context):
+        return db_api.registry_get_orphans(context)
+
+    @classmethod
+    def claim(cls, context, engine_id, cluster_ids=None):
+        objs = db_api.registry_claim(context, engine_id,
+                                     cluster_ids=cluster_ids)
         return [cls._from_db_object(context, cls(), obj) for obj in objs]
 
+    @classmethod
+    def release(cls, context, engine_id, cluster_ids):
+        return db_api.registry_release(context, engine_id, cluster_ids)
+
     @classmethod
     def delete(cls, context, cluster_id):
         db_api.registry_delete(context, cluster_id)
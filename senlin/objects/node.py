@@ -19,6 +19,7 @@ from senlin.common import utils
 from senlin.db import api as db_api
 from senlin.objects import base
 from senlin.objects import fields
+from senlin.objects import unit_of_work
 
 
 @base.SenlinObjectRegistry.register
@@ -65,6 +66,7 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
             else:
                 obj[field] = db_obj[field]
 
+        unit_of_work.apply_pending(unit_of_work.NODE, obj)
         obj._context = context
         obj.obj_reset_changes()
 
@@ -79,6 +81,11 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.node_get(context, obj.id)
         return cls._from_db_object(context, cls(), obj)
 
+    @classmethod
+    def create_many(cls, context, values):
+        values = [cls._transpose_metadata(v) for v in values]
+        return db_api.node_create_many(context, values)
+
     @classmethod
     def find(cls, context, identity, project_safe=True):
         """Find a node with the given identity.
@@ -150,8 +157,23 @@ class Node(base.SenlinObject, base.VersionedObjectDictCompat):
     @classmethod
     def update(cls, context, obj_id, values):
         values = cls._transpose_metadata(values)
+        if unit_of_work.defer(unit_of_work.NODE, obj_id, values):
+            return
         db_api.node_update(context, obj_id, values)
 
+    @classmethod
+    def update_many(cls, context, values):
+        """Update many nodes in one transaction.
+
+        :param values: A dictionary mapping node IDs to the values to be
+                       updated on each node.
+        """
+        values = dict((node_id, cls._transpose_metadata(v))
+                      for node_id, v in values.items())
+        values = dict((node_id, v) for node_id, v in values.items()
+                      if not unit_of_work.defer(unit_of_work.NODE, node_id, v))
+        db_api.node_update_many(context, values)
+
     @classmethod
     def migrate(cls, context, obj_id, to_cluster, timestamp, role=None):
         return db_api.node_migrate(context, obj_id, to_cluster, timestamp,
@@ -76,6 +76,10 @@ class Policy(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.policy_get(context, policy_id, **kwargs)
         return cls._from_db_object(context, cls(), obj)
 
+    @classmethod
+    def get_version(cls, context, policy_id, **kwargs):
+        return db_api.policy_get_version(context, policy_id, **kwargs)
+
     @classmethod
     def get_by_name(cls, context, name, **kwargs):
         obj = db_api.policy_get_by_name(context, name, **kwargs)
@@ -76,6 +76,10 @@ class Profile(base.SenlinObject, base.VersionedObjectDictCompat):
         obj = db_api.profile_get(context, profile_id, **kwargs)
         return cls._from_db_object(context, cls(), obj)
 
+    @classmethod
+    def get_version(cls, context, profile_id, **kwargs):
+        return db_api.profile_get_version(context, profile_id, **kwargs)
+
     @classmethod
     def get_by_name(cls, context, name, **kwargs):
         obj = db_api.profile_get_by_name(context, name, **kwargs)
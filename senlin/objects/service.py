@@ -28,6 +28,7 @@ class Service(base.SenlinObject, base.VersionedObjectDictCompat):
         'topic': fields.StringField(),
         'disabled': fields.BooleanField(),
         'disabled_reason': fields.StringField(nullable=True),
+        'load': fields.IntegerField(nullable=True),
         'created_at': fields.DateTimeField(),
         'updated_at': fields.DateTimeField(),
     }
@@ -48,6 +49,11 @@ class Service(base.SenlinObject, base.VersionedObjectDictCompat):
         objs = db_api.service_get_all()
         return [cls._from_db_object(context, cls(), obj) for obj in objs]
 
+    @classmethod
+    def get_live_ids(cls, context, duration=None):
+        """An internal API for retrieving the IDs of live services only."""
+        return db_api.service_get_live_ids(duration=duration)
+
     @classmethod
     def update(cls, context, obj_id, values=None):
         obj = db_api.service_update(obj_id, values=values)
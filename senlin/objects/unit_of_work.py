@@ -0,0 +1,155 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Unit of work of an action execution.
+
+An action updates its own record and the records of its nodes many times
+during its execution, each update being a transaction of its own. When a
+unit of work is active in the current thread, the updates of the fields
+nobody else relies on while the action is running, e.g. the data of an
+action or of a node, are kept in memory instead. They are written in a
+single transaction when the action reaches a checkpoint, i.e. before a lock
+is released, before the action waits for other actions and before its
+status is set. Lock and status updates are never deferred. A failure in
+writing the deferred updates is raised, so that the action fails instead of
+losing its state.
+"""
+
+import contextlib
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import excutils
+
+from senlin.db import api as db_api
+
+LOG = logging.getLogger(__name__)
+cfg.CONF.import_opt('batch_action_writes', 'senlin.common.config')
+
+KINDS = (ACTION, NODE) = ('action', 'node')
+
+# Fields whose update can be deferred to the next checkpoint
+DEFERRABLE_FIELDS = {
+    ACTION: frozenset(['data', 'inputs', 'outputs', 'updated_at']),
+    NODE: frozenset(['data', 'meta_data']),
+}
+
+_LOCAL = threading.local()
+
+
+class UnitOfWork(object):
+    """Deferred updates of the records touched by an action."""
+
+    def __init__(self, context, action_id):
+        self.context = context
+        self.action_id = action_id
+        self._updates = dict((kind, {}) for kind in KINDS)
+
+    def defer(self, kind, obj_id, values):
+        """Defer the update of a record, if possible.
+
+        :param kind: Kind of the record, one of ``KINDS``.
+        :param obj_id: ID of the record.
+        :param values: A dictionary of values to be updated on the record.
+        :returns: True if the update is deferred or False if it has to be
+                  written immediately.
+        """
+        updates = self._updates[kind]
+        if values and set(values) <= DEFERRABLE_FIELDS[kind]:
+            updates.setdefault(obj_id, {}).update(values)
+            return True
+
+        # The immediate update supersedes the deferred values of the fields
+        # it writes.
+        pending = updates.get(obj_id)
+        if pending:
+            for key in values:
+                pending.pop(key, None)
+        return False
+
+    def get_pending(self, kind, obj_id):
+        """Get the deferred values of a record, if any."""
+        return self._updates[kind].get(obj_id)
+
+    def flush(self):
+        """Write all deferred updates in one transaction.
+
+        :raises: The exception raised by the DB API when writing fails.
+        """
+        actions = self._updates[ACTION]
+        nodes = self._updates[NODE]
+        if not actions and not nodes:
+            return
+
+        self._updates = dict((kind, {}) for kind in KINDS)
+        db_api.batch_update(self.context, actions=actions, nodes=nodes)
+
+
+def current():
+    """Get the unit of work active in the current thread, if any."""
+    return getattr(_LOCAL, 'unit', None)
+
+
+@contextlib.contextmanager
+def begin(context, action_id):
+    """Run a block of code in a unit of work, if enabled.
+
+    The deferred updates are written when the block is left.
+
+    :param context: The request context used for writing the updates.
+    :param action_id: ID of the action being executed.
+    """
+    if not cfg.CONF.batch_action_writes:
+        yield None
+        return
+
+    unit = UnitOfWork(context, action_id)
+    _LOCAL.unit = unit
+    try:
+        yield unit
+    except Exception:
+        with excutils.save_and_reraise_exception():
+            _LOCAL.unit = None
+            # The error of the block is raised rather than the error of
+            # writing the updates
+            try:
+                unit.flush()
+            except Exception:
+                LOG.exception('Failed in writing the deferred updates of '
+                              'action %s.', action_id)
+    finally:
+        _LOCAL.unit = None
+
+    unit.flush()
+
+
+def defer(kind, obj_id, values):
+    """Defer the update of a record to the active unit of work, if any."""
+    unit = current()
+    return unit is not None and unit.defer(kind, obj_id, values)
+
+
+def apply_pending(kind, obj):
+    """Apply the deferred values of a record to an object loaded from DB."""
+    unit = current()
+    pending = unit.get_pending(kind, obj.id) if unit else None
+    for key, value in (pending or {}).items():
+        obj['metadata' if key == 'meta_data' else key] = value
+
+
+def checkpoint():
+    """Write the deferred updates of the active unit of work, if any."""
+    unit = current()
+    if unit is not None:
+        unit.flush()
@@ -20,6 +20,7 @@ from senlin.common.i18n import _
 from senlin.common import schema
 from senlin.common import utils
 from senlin.drivers import base as driver
+from senlin.engine import cache
 from senlin.engine import environment
 from senlin.objects import credential as co
 from senlin.objects import policy as po
@@ -65,6 +66,9 @@ class Policy(object):
 
     properties_schema = {}
 
+    # Policies recently loaded by this engine
+    _cache = cache.ObjectCache()
+
     def __new__(cls, name, spec, **kwargs):
         """Create a new policy of the appropriate class.
 
@@ -151,19 +155,41 @@ class Policy(object):
         :param project_safe: Optional parameter specifying whether only
                              policies belong to the context.project will be
                              loaded.
-        :returns: An object of the proper policy class.
+        :returns: An object of the proper policy class. Policies are served
+                  from the cache of the engine unless they have been
+                  changed since they were cached.
         """
         if db_policy is None:
+            if cls._cache.enabled():
+                version = po.Policy.get_version(context, policy_id,
+                                                project_safe=project_safe)
+                if version is None:
+                    raise exception.ResourceNotFound(type='policy',
+                                                     id=policy_id)
+
+                result = cls._cache.get(policy_id, version)
+                if result is not None:
+                    return result
+
             db_policy = po.Policy.get(context, policy_id,
                                       project_safe=project_safe)
             if db_policy is None:
                 raise exception.ResourceNotFound(type='policy', id=policy_id)
-
-        return cls._from_object(db_policy)
+        else:
+            result = cls._cache.get(db_policy.id, (db_policy.created_at,
+                                                   db_policy.updated_at))
+            if result is not None:
+                return result
+
+        result = cls._from_object(db_policy)
+        cls._cache.put(db_policy.id,
+                       (db_policy.created_at, db_policy.updated_at), result)
+        return result
 
     @classmethod
     def delete(cls, context, policy_id):
         po.Policy.delete(context, policy_id)
+        cls._cache.invalidate(policy_id)
 
     def store(self, context):
         """Store the policy object into database table."""
@@ -183,6 +209,7 @@ class Policy(object):
             self.updated_at = timestamp
             values['updated_at'] = timestamp
             po.Policy.update(context, self.id, values)
+            self._cache.invalidate(self.id)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
@@ -364,6 +364,7 @@ class LoadBalancingPolicy(base.Policy):
         port = self.pool_spec.get(self.POOL_PROTOCOL_PORT)
         subnet = self.pool_spec.get(self.POOL_SUBNET)
 
+        values = {}
         for node in cluster.nodes:
             member_id = lb_driver.member_add(node, data['loadbalancer'],
                                              data['pool'], port, subnet)
@@ -372,13 +373,15 @@ class LoadBalancingPolicy(base.Policy):
                 # were created and return the failure reason.
                 # TODO(anyone): May need to "roll-back" changes caused by any
                 # successful member_add() calls.
+                no.Node.update_many(oslo_context.get_current(), values)
                 if not self.lb:
                     lb_driver.lb_delete(**data)
                 return False, 'Failed in adding node into lb pool'
 
             node.data.update({'lb_member': member_id})
-            values = {'data': node.data}
-            no.Node.update(oslo_context.get_current(), node.id, values)
+            values[node.id] = {'data': node.data}
+
+        no.Node.update_many(oslo_context.get_current(), values)
 
         cluster_data_lb = cluster.data.get('loadbalancers', {})
         cluster_data_lb[self.id] = {'vip_address': data.pop('vip_address')}
@@ -414,12 +417,12 @@ class LoadBalancingPolicy(base.Policy):
             if res is False:
                 return False, reason
 
+            values = {}
             for node in cluster.nodes:
                 if 'lb_member' in node.data:
                     node.data.pop('lb_member')
-                    values = {'data': node.data}
-                    no.Node.update(oslo_context.get_current(),
-                                   node.id, values)
+                    values[node.id] = {'data': node.data}
+            no.Node.update_many(oslo_context.get_current(), values)
         else:
             # the lb pool is existed, we need to remove servers from it
             nodes = cluster.nodes
@@ -485,6 +488,18 @@ class LoadBalancingPolicy(base.Policy):
 
         return candidates
 
+    @staticmethod
+    def _get_nodes(context, node_ids):
+        """Get the nodes with the given IDs with a single query.
+
+        :returns: A dictionary mapping node IDs to node objects.
+        """
+        if not node_ids:
+            return {}
+
+        nodes = no.Node.get_all(context, filters={'id': list(node_ids)})
+        return dict((node.id, node) for node in nodes)
+
     def _remove_member(self, context, candidates, policy, driver,
                        handle_err=True):
         # Load policy data
@@ -493,9 +508,11 @@ class LoadBalancingPolicy(base.Policy):
         pool_id = policy_data['pool']
 
         failed_nodes = []
+        updates = {}
+        nodes = self._get_nodes(context, candidates)
         for node_id in candidates:
-            node = no.Node.get(context, node_id=node_id)
-            node_data = node.data or {}
+            node = nodes.get(node_id)
+            node_data = (node.data or {}) if node else {}
             member_id = node_data.get('lb_member', None)
             if member_id is None:
                 LOG.warning('Node %(n)s not found in lb pool %(p)s.',
@@ -512,8 +529,9 @@ class LoadBalancingPolicy(base.Policy):
             else:
                 node.data.pop('lb_member', None)
                 values['data'] = node.data
-            no.Node.update(context, node_id, values)
+            updates[node_id] = values
 
+        no.Node.update_many(context, updates)
         return failed_nodes
 
     def _add_member(self, context, candidates, policy, driver):
@@ -525,8 +543,14 @@ class LoadBalancingPolicy(base.Policy):
         subnet = self.pool_spec.get(self.POOL_SUBNET)
 
         failed_nodes = []
+        updates = {}
+        nodes = self._get_nodes(context, candidates)
         for node_id in candidates:
-            node = no.Node.get(context, node_id=node_id)
+            node = nodes.get(node_id)
+            if node is None:
+                LOG.warning('Node %s is not found.', node_id)
+                continue
+
             node_data = node.data or {}
             member_id = node_data.get('lb_member', None)
             if member_id:
@@ -544,8 +568,9 @@ class LoadBalancingPolicy(base.Policy):
             else:
                 node.data.update({'lb_member': member_id})
                 values['data'] = node.data
-            no.Node.update(context, node_id, values)
+            updates[node_id] = values
 
+        no.Node.update_many(context, updates)
         return failed_nodes
 
     def _get_post_candidates(self, action):
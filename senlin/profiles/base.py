@@ -28,6 +28,7 @@ from senlin.common.i18n import _
 from senlin.common import schema
 from senlin.common import utils
 from senlin.drivers import base as driver_base
+from senlin.engine import cache
 from senlin.engine import environment
 from senlin.objects import credential as co
 from senlin.objects import profile as po
@@ -64,6 +65,9 @@ class Profile(object):
     properties_schema = {}
     OPERATIONS = {}
 
+    # Profiles recently loaded by this engine
+    _cache = cache.ObjectCache()
+
     def __new__(cls, name, spec, **kwargs):
         """Create a new profile of the appropriate class.
 
@@ -153,14 +157,36 @@ class Profile(object):
 
     @classmethod
     def load(cls, ctx, profile=None, profile_id=None, project_safe=True):
-        """Retrieve a profile object from database."""
+        """Retrieve a profile object from database.
+
+        Profiles are served from the cache of the engine unless they have
+        been changed since they were cached.
+        """
         if profile is None:
+            if cls._cache.enabled():
+                version = po.Profile.get_version(ctx, profile_id,
+                                                 project_safe=project_safe)
+                if version is None:
+                    raise exc.ResourceNotFound(type='profile', id=profile_id)
+
+                result = cls._cache.get(profile_id, version)
+                if result is not None:
+                    return result
+
             profile = po.Profile.get(ctx, profile_id,
                                      project_safe=project_safe)
             if profile is None:
                 raise exc.ResourceNotFound(type='profile', id=profile_id)
+        else:
+            result = cls._cache.get(profile.id, (profile.created_at,
+                                                 profile.updated_at))
+            if result is not None:
+                return result
 
-        return cls._from_object(profile)
+        result = cls._from_object(profile)
+        cls._cache.put(profile.id, (profile.created_at, profile.updated_at),
+                       result)
+        return result
 
     @classmethod
     def create(cls, ctx, name, spec, metadata=None):
@@ -192,6 +218,7 @@ class Profile(object):
     @classmethod
     def delete(cls, ctx, profile_id):
         po.Profile.delete(ctx, profile_id)
+        cls._cache.invalidate(profile_id)
 
     def store(self, ctx):
         """Store the profile into database and return its ID."""
@@ -212,6 +239,7 @@ class Profile(object):
             self.updated_at = timestamp
             values['updated_at'] = timestamp
             po.Profile.update(ctx, self.id, values)
+            self._cache.invalidate(self.id)
         else:
             self.created_at = timestamp
             values['created_at'] = timestamp
@@ -308,6 +336,37 @@ class Profile(object):
             LOG.debug(ex)
             return False
 
+    @classmethod
+    @profiler.trace('Profile.check_objects', hide_args=False)
+    def check_objects(cls, ctx, objs):
+        """Check the physical objects of many nodes at once.
+
+        The nodes are grouped by profile and each group is checked by the
+        ``do_check_objects`` method of its profile.
+
+        :param ctx: Request context.
+        :param objs: A list of node objects to be checked.
+        :returns: A dict mapping the ID of each node checked to True if its
+            physical object is healthy or False if not. A node whose physical
+            object is not found has no key in the dict, like the nodes whose
+            profile does not support bulk checks, and has to be checked on
+            its own with ``do_check``.
+        """
+        groups = {}
+        for obj in objs:
+            groups.setdefault(obj.profile_id, []).append(obj)
+
+        results = {}
+        for profile_id, group in groups.items():
+            try:
+                profile = cls.load(ctx, profile_id=profile_id)
+                results.update(profile.do_check_objects(group))
+            except Exception as ex:
+                LOG.warning('Failed in checking %(n)s nodes of profile '
+                            '%(p)s: %(e)s', {'n': len(group), 'p': profile_id,
+                                             'e': ex})
+        return results
+
     @classmethod
     @profiler.trace('Profile.recover_object', hide_args=False)
     def recover_object(cls, ctx, obj, **options):
@@ -475,6 +534,13 @@ class Profile(object):
         LOG.warning("Check operation not supported.")
         return True
 
+    def do_check_objects(self, objs):
+        """For subclass to override.
+
+        The nodes left out of the result are checked with ``do_check``.
+        """
+        return {}
+
     def do_get_details(self, obj):
         """For subclass to override."""
         LOG.warning("Get_details operation not supported.")
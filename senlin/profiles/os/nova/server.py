@@ -11,7 +11,9 @@
 # under the License.
 
 import base64
+import collections
 import copy
+import re
 
 from oslo_log import log as logging
 from oslo_utils import encodeutils
@@ -252,6 +254,8 @@ class ServerProfile(base.Profile):
     REBOOT_TYPES = (REBOOT_SOFT, REBOOT_HARD) = ('SOFT', 'HARD')
     ADMIN_PASSWORD = 'admin_pass'
     RESCUE_IMAGE = 'image_ref'
+    # Maximum number of server names matched by one listing
+    CHECK_BATCH_SIZE = 50
     EVACUATE_OPTIONS = (
         EVACUATE_HOST, EVACUATE_FORCE
     ) = (
@@ -1546,6 +1550,43 @@ class ServerProfile(base.Profile):
 
         return True
 
+    def do_check_objects(self, objs):
+        """Check the servers of many nodes with few listings per project.
+
+        The servers are listed by their names, at most CHECK_BATCH_SIZE names
+        per listing. A node whose server is not listed, e.g. because it was
+        renamed, is left out of the result to be checked with ``do_check``.
+
+        :param objs: A list of node objects to be checked.
+        :returns: A dict mapping the ID of each node to True if its server is
+            ACTIVE or False if not.
+        """
+        results = {}
+        projects = collections.defaultdict(list)
+        for obj in objs:
+            if obj.physical_id:
+                projects[obj.project].append(obj)
+            else:
+                results[obj.id] = False
+
+        for project_objs in projects.values():
+            names = sorted(set(self.properties[self.NAME] or obj.name
+                               for obj in project_objs))
+            status = {}
+            for i in range(0, len(names), self.CHECK_BATCH_SIZE):
+                batch = names[i:i + self.CHECK_BATCH_SIZE]
+                pattern = '^(%s)$' % '|'.join(re.escape(n) for n in batch)
+                servers = self.compute(project_objs[0]).server_list(
+                    name=pattern)
+                status.update((s.id, s.status) for s in servers)
+
+            for obj in project_objs:
+                if obj.physical_id in status:
+                    results[obj.id] = (status[obj.physical_id] ==
+                                       consts.VS_ACTIVE)
+
+        return results
+
     def do_recover(self, obj, **options):
         """Handler for recover operation.
 
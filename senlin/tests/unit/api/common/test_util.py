@@ -228,3 +228,56 @@ class TestParseBool(base.SenlinTestCase):
         for value in ('foo', 't', 'f', 'yes', 'no', 'y', 'n', '1', '0', None):
             self.assertRaises(exc.HTTPBadRequest,
                               util.parse_bool_param, name, value)
+
+
+class TestCursor(base.SenlinTestCase):
+
+    def test_encode_decode(self):
+        marker = '8216a86c-1bdc-442e-b493-329385d37cbd'
+
+        cursor = util.encode_cursor(marker)
+
+        self.assertNotIn(marker, cursor)
+        self.assertEqual(marker, util.decode_cursor(cursor))
+
+    def test_decode_invalid(self):
+        for cursor in ('bogus', '', 'W10', 'eyJmb28iOiAxfQ'):
+            self.assertRaises(exc.HTTPBadRequest,
+                              util.decode_cursor, cursor)
+
+    def test_parse_cursor_param(self):
+        params = {'cursor': util.encode_cursor('MARKER'), 'limit': '2'}
+
+        util.parse_cursor_param(params)
+
+        self.assertEqual({'marker': 'MARKER', 'limit': '2'}, params)
+
+    def test_parse_cursor_param_no_cursor(self):
+        params = {'marker': 'MARKER'}
+
+        util.parse_cursor_param(params)
+
+        self.assertEqual({'marker': 'MARKER'}, params)
+
+    def test_parse_cursor_param_with_marker(self):
+        params = {'cursor': util.encode_cursor('M1'), 'marker': 'M2'}
+
+        ex = self.assertRaises(exc.HTTPBadRequest,
+                               util.parse_cursor_param, params)
+
+        self.assertEqual("The 'cursor' and 'marker' parameters cannot be "
+                         "specified together.", six.text_type(ex))
+
+    def test_get_next_cursor(self):
+        items = [{'id': 'ID1'}, {'id': 'ID2'}]
+
+        cursor = util.get_next_cursor(items, '2')
+
+        self.assertEqual('ID2', util.decode_cursor(cursor))
+
+    def test_get_next_cursor_last_page(self):
+        items = [{'id': 'ID1'}]
+
+        self.assertIsNone(util.get_next_cursor(items, '2'))
+        self.assertIsNone(util.get_next_cursor(items, None))
+        self.assertIsNone(util.get_next_cursor([], '0'))
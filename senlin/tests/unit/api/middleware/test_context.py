@@ -44,7 +44,8 @@ class RequestContextMiddlewareTest(base.SenlinTestCase):
                 'show_deleted': False,
                 'project': None,
                 'user': None,
-                'user_name': None
+                'user_name': None,
+                'read_primary': False
             })
     ), (
         'token_creds',
@@ -69,7 +70,23 @@ class RequestContextMiddlewareTest(base.SenlinTestCase):
                 'show_deleted': False,
                 'project': 'bb9108c8-62d0-4d92-898c-d644a6af20e9',
                 'user': '7a87ff18-31c6-45ce-a186-ec7987f488c3',
-                'user_name': None
+                'user_name': None,
+                'read_primary': False
+            })
+    ), (
+        'read_primary',
+        dict(
+            environ=None,
+            headers={
+                'X-Senlin-Read-Primary': 'true',
+            },
+            expected_exception=None,
+            context_dict={
+                'auth_token': None,
+                'is_admin': False,
+                'project': None,
+                'user': None,
+                'read_primary': True
             })
     ), (
         'malformed_roles',
@@ -26,7 +26,7 @@ class TestTrustMiddleware(base.SenlinTestCase):
     def setUp(self):
         super(TestTrustMiddleware, self).setUp()
         self.context = utils.dummy_context()
-        self.req = mock.Mock
+        self.req = mock.Mock()
         self.req.context = self.context
         self.middleware = trust.TrustMiddleware(None)
 
@@ -225,6 +225,32 @@ class ActionControllerTest(shared.ControllerTest, base.SenlinTestCase):
         self.assertFalse(mock_call.called)
         self.assertFalse(mock_parse.called)
 
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_action_index_timing(self, mock_call, mock_parse, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        timing = {'spans': [], 'total': 1.5}
+        mock_call.return_value = [{'id': 'FAKE_ID', 'timing': timing}]
+
+        req = self._get('/actions', version='1.13')
+        result = self.controller.index(req)
+
+        self.assertEqual([{'id': 'FAKE_ID', 'timing': timing}],
+                         result['actions'])
+
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_action_index_timing_unsupported(self, mock_call, mock_parse,
+                                             mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        timing = {'spans': [], 'total': 1.5}
+        mock_call.return_value = [{'id': 'FAKE_ID', 'timing': timing}]
+
+        req = self._get('/actions', version='1.12')
+        result = self.controller.index(req)
+
+        self.assertEqual([{'id': 'FAKE_ID'}], result['actions'])
+
     def test_action_index_denied_policy(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', False)
         req = self._get('/actions')
@@ -274,6 +300,32 @@ class ActionControllerTest(shared.ControllerTest, base.SenlinTestCase):
         mock_call.assert_called_once_with(
             req.context, 'action_get', obj)
 
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_action_get_timing(self, mock_call, mock_parse, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get', True)
+        timing = {'spans': [], 'total': 1.5}
+        mock_call.return_value = {'id': 'FAKE_ID', 'timing': timing}
+
+        req = self._get('/actions/FAKE_ID', version='1.13')
+        response = self.controller.get(req, action_id='FAKE_ID')
+
+        self.assertEqual({'id': 'FAKE_ID', 'timing': timing},
+                         response['action'])
+
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_action_get_timing_unsupported(self, mock_call, mock_parse,
+                                           mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get', True)
+        timing = {'spans': [], 'total': 1.5}
+        mock_call.return_value = {'id': 'FAKE_ID', 'timing': timing}
+
+        req = self._get('/actions/FAKE_ID', version='1.12')
+        response = self.controller.get(req, action_id='FAKE_ID')
+
+        self.assertEqual({'id': 'FAKE_ID'}, response['action'])
+
     @mock.patch.object(util, 'parse_request')
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_action_get_not_found(self, mock_call, mock_parse,
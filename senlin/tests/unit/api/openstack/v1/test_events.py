@@ -116,6 +116,63 @@ class EventControllerTest(shared.ControllerTest, base.SenlinTestCase):
         mock_call.assert_called_once_with(req.context,
                                           'event_list', obj)
 
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_event_index_with_cursor(self, mock_call, mock_parse,
+                                     mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        marker_uuid = '8216a86c-1bdc-442e-b493-329385d37cbd'
+        params = {
+            'limit': 2,
+            'cursor': util.encode_cursor(marker_uuid),
+        }
+        req = self._get('/events', params=params, version='1.12')
+        engine_resp = [{'id': 'EVENT1'}, {'id': 'EVENT2'}]
+        mock_call.return_value = engine_resp
+        obj = mock.Mock()
+        mock_parse.return_value = obj
+
+        result = self.controller.index(req)
+
+        self.assertEqual(engine_resp, result['events'])
+        self.assertEqual('EVENT2', util.decode_cursor(result['next']))
+        mock_parse.assert_called_once_with(
+            'EventListRequest', req,
+            {
+                'project_safe': True,
+                'limit': '2',
+                'marker': marker_uuid,
+            })
+        mock_call.assert_called_once_with(req.context, 'event_list', obj)
+
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_event_index_last_page(self, mock_call, mock_parse,
+                                   mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/events', params={'limit': 2}, version='1.12')
+        mock_call.return_value = [{'id': 'EVENT1'}]
+
+        result = self.controller.index(req)
+
+        self.assertEqual([{'id': 'EVENT1'}], result['events'])
+        self.assertIsNone(result['next'])
+
+    @mock.patch.object(util, 'parse_request')
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_event_index_cursor_unsupported(self, mock_call, mock_parse,
+                                            mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        params = {'cursor': util.encode_cursor('FAKE_ID')}
+        req = self._get('/events', params=params, version='1.11')
+
+        ex = self.assertRaises(exc.HTTPBadRequest,
+                               self.controller.index, req)
+
+        self.assertEqual("Invalid parameter cursor", six.text_type(ex))
+        self.assertFalse(mock_parse.called)
+        self.assertFalse(mock_call.called)
+
     @mock.patch.object(util, 'parse_request')
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_event_index_whitelists_invalid_params(self, mock_call,
@@ -0,0 +1,88 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from senlin.cmd import manage
+from senlin.db import api
+from senlin.tests.unit.common import base
+
+
+class TestPurge(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestPurge, self).setUp()
+        self.conf = self.patchobject(manage, 'CONF')
+        self.conf.command = mock.Mock(project_id=None, granularity='days',
+                                      age=30, batch_size=2, throttle=0)
+        self.patchobject(api, 'get_engine', return_value='ENGINE')
+
+    @mock.patch('time.sleep')
+    def test_purge_in_batches(self, mock_sleep):
+        self.conf.command.throttle = 0.5
+        purge = mock.Mock(side_effect=[2, 2, 1])
+
+        res = manage._purge_in_batches(purge, 'events')
+
+        self.assertEqual(5, res)
+        purge.assert_has_calls([mock.call(2), mock.call(2), mock.call(2)])
+        self.assertEqual(2, mock_sleep.call_count)
+        mock_sleep.assert_called_with(0.5)
+
+    @mock.patch('time.sleep')
+    def test_purge_in_batches_nothing(self, mock_sleep):
+        purge = mock.Mock(return_value=0)
+
+        res = manage._purge_in_batches(purge, 'events')
+
+        self.assertEqual(0, res)
+        purge.assert_called_once_with(2)
+        self.assertEqual(0, mock_sleep.call_count)
+
+    @mock.patch.object(api, 'event_purge')
+    def test_do_event_purge(self, mock_purge):
+        mock_purge.return_value = 1
+
+        manage.do_event_purge()
+
+        mock_purge.assert_called_once_with('ENGINE', None, 'days', 30,
+                                           limit=2)
+
+    @mock.patch.object(api, 'event_purge')
+    def test_do_event_purge_bad_batch_size(self, mock_purge):
+        self.conf.command.batch_size = 0
+
+        manage.do_event_purge()
+
+        self.assertEqual(0, mock_purge.call_count)
+
+    @mock.patch.object(api, 'dependency_purge')
+    @mock.patch.object(api, 'action_purge')
+    def test_do_action_purge(self, mock_purge, mock_dep_purge):
+        mock_purge.side_effect = [2, 0]
+        mock_dep_purge.return_value = 1
+
+        manage.do_action_purge()
+
+        mock_purge.assert_has_calls([
+            mock.call('ENGINE', None, 'days', 30, limit=2),
+            mock.call('ENGINE', None, 'days', 30, limit=2),
+        ])
+        mock_dep_purge.assert_called_once_with('ENGINE', limit=2)
+
+    @mock.patch.object(api, 'action_purge')
+    def test_do_action_purge_bad_age(self, mock_purge):
+        self.conf.command.age = -1
+
+        manage.do_action_purge()
+
+        self.assertEqual(0, mock_purge.call_count)
@@ -73,6 +73,9 @@ class SenlinTestCase(testscenarios.WithScenarios,
 
         self.addCleanup(enable_sleep)
         self.addCleanup(cfg.CONF.reset)
+        # Objects cached by one test case must not leak into another one
+        cfg.CONF.set_override('object_cache_size', 0)
+        cfg.CONF.set_override('live_engine_cache_ttl', 0)
 
         messaging.setup("fake://", optional=True)
         self.addCleanup(messaging.cleanup)
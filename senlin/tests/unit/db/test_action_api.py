@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import six
 import time
 
@@ -55,6 +56,45 @@ class DBAPIActionTest(base.SenlinTestCase):
         self.assertEqual(self.ctx.domain_id, action.domain)
         self.assertIsNone(action.outputs)
 
+    def test_action_create_many(self):
+        values = [
+            {'name': 'node_create_%s' % i, 'target': 'NODE_%s' % i,
+             'action': 'NODE_CREATE', 'status': consts.ACTION_READY,
+             'project': self.ctx.project_id}
+            for i in range(3)
+        ]
+
+        res = db_api.action_create_many(self.ctx, values)
+
+        self.assertEqual(3, len(res))
+        for i, action_id in enumerate(res):
+            action = db_api.action_get(self.ctx, action_id)
+            self.assertEqual('NODE_%s' % i, action.target)
+            self.assertEqual(consts.ACTION_READY, action.status)
+
+    def test_action_create_many_with_dependent(self):
+        parent = _create_action(self.ctx, action=shared.sample_action,
+                                status=consts.ACTION_RUNNING)
+        values = [
+            {'name': 'node_create_%s' % i, 'target': 'NODE_%s' % i,
+             'action': 'NODE_CREATE', 'status': consts.ACTION_READY,
+             'project': self.ctx.project_id}
+            for i in range(2)
+        ]
+
+        res = db_api.action_create_many(self.ctx, values, dependent=parent.id)
+
+        self.assertEqual(sorted(res), sorted(
+            db_api.dependency_get_depended(self.ctx, parent.id)))
+        for action_id in res:
+            self.assertEqual(
+                [parent.id],
+                db_api.dependency_get_dependents(self.ctx, action_id))
+            action = db_api.action_get(self.ctx, action_id)
+            self.assertEqual(consts.ACTION_READY, action.status)
+        parent = db_api.action_get(self.ctx, parent.id)
+        self.assertEqual(consts.ACTION_WAITING, parent.status)
+
     def test_action_update(self):
         action = _create_action(self.ctx)
         values = {
@@ -187,6 +227,134 @@ class DBAPIActionTest(base.SenlinTestCase):
                                                    time.time())
         self.assertEqual(action1.id, result.id)
 
+    def test_action_acquire_batch(self):
+        specs = [
+            {'name': 'A01', 'status': 'INIT'},
+            {'name': 'A02', 'status': 'READY', 'owner': 'worker1'},
+            {'name': 'A03', 'status': 'READY'},
+            {'name': 'A04', 'status': 'READY'},
+            {'name': 'A05', 'status': 'READY'},
+        ]
+        for spec in specs:
+            spec['created_at'] = tu.utcnow(True)
+            _create_action(self.ctx, **spec)
+            time.sleep(0.01)
+
+        timestamp = time.time()
+        actions = db_api.action_acquire_batch(self.ctx, 'worker2', timestamp,
+                                              2)
+
+        self.assertEqual(['A03', 'A04'], [a.name for a in actions])
+        for action in actions:
+            self.assertEqual('worker2', action.owner)
+            self.assertEqual(consts.ACTION_RUNNING, action.status)
+            self.assertEqual(timestamp, float(action.start_time))
+
+        actions = db_api.action_acquire_batch(self.ctx, 'worker2', timestamp,
+                                              10)
+        self.assertEqual(['A05'], [a.name for a in actions])
+
+        actions = db_api.action_acquire_batch(self.ctx, 'worker2', timestamp,
+                                              10)
+        self.assertEqual([], actions)
+
+    def test_action_acquire_batch_with_ids(self):
+        specs = [
+            {'name': 'A01', 'status': 'READY'},
+            {'name': 'A02', 'status': 'READY'},
+            {'name': 'A03', 'status': 'READY'},
+        ]
+        id_of = {}
+        for spec in specs:
+            action = _create_action(self.ctx, **spec)
+            id_of[spec['name']] = action.id
+
+        actions = db_api.action_acquire_batch(
+            self.ctx, 'worker2', time.time(), 10,
+            action_ids=[id_of['A01'], id_of['A03']])
+
+        self.assertEqual(sorted([id_of['A01'], id_of['A03']]),
+                         sorted([a.id for a in actions]))
+        action = db_api.action_get(self.ctx, id_of['A02'])
+        self.assertEqual(consts.ACTION_READY, action.status)
+
+    def test_action_get_all_ready(self):
+        specs = [
+            {'name': 'A01', 'status': 'INIT'},
+            {'name': 'A02', 'status': 'READY', 'owner': 'worker1'},
+            {'name': 'A03', 'status': 'READY', 'cause': 'RPC Request'},
+            {'name': 'A04', 'status': 'READY'},
+        ]
+        id_of = {}
+        for spec in specs:
+            spec['created_at'] = tu.utcnow(True)
+            action = _create_action(self.ctx, **spec)
+            id_of[spec['name']] = action.id
+            time.sleep(0.01)
+
+        actions = db_api.action_get_all_ready(self.ctx)
+
+        self.assertEqual([id_of['A03'], id_of['A04']],
+                         [a.id for a in actions])
+        self.assertEqual(self.ctx.project_id, actions[0].project)
+        self.assertEqual('RPC Request', actions[0].cause)
+
+        actions = db_api.action_get_all_ready(self.ctx, limit=1)
+        self.assertEqual([id_of['A03']], [a.id for a in actions])
+
+    def test_action_get_all_ready_priority(self):
+        specs = [
+            {'name': 'A01', 'status': 'READY', 'action': 'NODE_CREATE'},
+            {'name': 'A02', 'status': 'READY', 'action': 'NODE_CREATE',
+             'cause': 'RPC Request'},
+            {'name': 'A03', 'status': 'READY', 'action': 'NODE_RECOVER'},
+            {'name': 'A04', 'status': 'READY', 'action': 'NODE_CREATE'},
+        ]
+        id_of = {}
+        for spec in specs:
+            spec['created_at'] = tu.utcnow(True)
+            action = _create_action(self.ctx, **spec)
+            id_of[spec['name']] = action.id
+            time.sleep(0.01)
+
+        actions = db_api.action_get_all_ready(
+            self.ctx, limit=3, priority_actions=['NODE_RECOVER'])
+
+        self.assertEqual([id_of['A03'], id_of['A02'], id_of['A01']],
+                         [a.id for a in actions])
+
+    def test_action_get_all_ready_project_limit(self):
+        ctx2 = utils.dummy_context(project='a_different_project')
+        specs = [
+            (self.ctx, 'A01'), (self.ctx, 'A02'), (self.ctx, 'A03'),
+            (ctx2, 'B01'), (self.ctx, 'A04'), (ctx2, 'B02'),
+        ]
+        id_of = {}
+        for ctx, name in specs:
+            action = _create_action(ctx, name=name, status='READY',
+                                    created_at=tu.utcnow(True))
+            id_of[name] = action.id
+            time.sleep(0.01)
+
+        actions = db_api.action_get_all_ready(self.ctx, limit=3,
+                                              project_limit=2)
+
+        # the oldest actions of each project only
+        self.assertEqual([id_of['A01'], id_of['A02'], id_of['B01']],
+                         [a.id for a in actions])
+
+    def test_action_count_ready(self):
+        specs = [
+            {'name': 'A01', 'status': 'INIT'},
+            {'name': 'A02', 'status': 'READY', 'owner': 'worker1'},
+            {'name': 'A03', 'status': 'READY'},
+            {'name': 'A04', 'status': 'READY'},
+        ]
+        for spec in specs:
+            _create_action(self.ctx, **spec)
+
+        self.assertEqual(2, db_api.action_count_ready(self.ctx))
+
     def test_action_acquire_random_ready(self):
         specs = [
             {'name': 'A01', 'status': 'INIT'},
@@ -395,7 +563,9 @@ class DBAPIActionTest(base.SenlinTestCase):
         timestamp = time.time()
         id_of = self._check_dependency_add_dependent_list()
 
-        db_api.action_mark_succeeded(self.ctx, id_of['A01'], timestamp)
+        res = db_api.action_mark_succeeded(self.ctx, id_of['A01'], timestamp)
+        self.assertEqual(
+            sorted([id_of['A02'], id_of['A03'], id_of['A04']]), sorted(res))
 
         res = db_api.dependency_get_depended(self.ctx, id_of['A01'])
         self.assertEqual(0, len(res))
@@ -408,6 +578,29 @@ class DBAPIActionTest(base.SenlinTestCase):
             res = db_api.dependency_get_dependents(self.ctx, aid)
             self.assertEqual(0, len(res))
 
+    def test_action_mark_succeeded_timing(self):
+        timestamp = time.time()
+        id_of = self._check_dependency_add_dependent_list()
+        timing = {'spans': [], 'total': 1.5}
+
+        db_api.action_mark_succeeded(self.ctx, id_of['A01'], timestamp,
+                                     timing=timing)
+
+        action = db_api.action_get(self.ctx, id_of['A01'])
+        self.assertEqual(consts.ACTION_SUCCEEDED, action.status)
+        self.assertEqual(timing, action.timing)
+
+    def test_action_mark_succeeded_ready_dependents(self):
+        timestamp = time.time()
+        id_of = self._check_dependency_add_depended_list()
+
+        res = db_api.action_mark_succeeded(self.ctx, id_of['A02'], timestamp)
+        self.assertEqual([], res)
+        res = db_api.action_mark_succeeded(self.ctx, id_of['A03'], timestamp)
+        self.assertEqual([], res)
+        res = db_api.action_mark_succeeded(self.ctx, id_of['A04'], timestamp)
+        self.assertEqual([id_of['A01']], res)
+
     def _prepare_action_mark_failed_cancel(self):
         specs = [
             {'name': 'A01', 'status': 'INIT', 'target': 'cluster_001'},
@@ -520,7 +713,9 @@ class DBAPIActionTest(base.SenlinTestCase):
     def test_action_mark_failed(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_failed(self.ctx, id_of['A01'], timestamp)
+        res = db_api.action_mark_failed(self.ctx, id_of['A01'], timestamp)
+        self.assertEqual(
+            sorted([id_of['A05'], id_of['A06'], id_of['A07']]), sorted(res))
 
         for aid in [id_of['A05'], id_of['A06'], id_of['A07']]:
             action = db_api.action_get(self.ctx, aid)
@@ -530,10 +725,26 @@ class DBAPIActionTest(base.SenlinTestCase):
         result = db_api.dependency_get_dependents(self.ctx, id_of['A01'])
         self.assertEqual(0, len(result))
 
+    def test_action_mark_failed_timing(self):
+        timestamp = time.time()
+        id_of = self._prepare_action_mark_failed_cancel()
+        timing = {'spans': [], 'total': 1.5}
+
+        db_api.action_mark_failed(self.ctx, id_of['A01'], timestamp,
+                                  timing=timing)
+
+        action = db_api.action_get(self.ctx, id_of['A01'])
+        self.assertEqual(timing, action.timing)
+        # the timing profile only belongs to the action itself
+        action = db_api.action_get(self.ctx, id_of['A05'])
+        self.assertIsNone(action.timing)
+
     def test_action_mark_cancelled(self):
         timestamp = time.time()
         id_of = self._prepare_action_mark_failed_cancel()
-        db_api.action_mark_cancelled(self.ctx, id_of['A01'], timestamp)
+        res = db_api.action_mark_cancelled(self.ctx, id_of['A01'], timestamp)
+        self.assertEqual(
+            sorted([id_of['A05'], id_of['A06'], id_of['A07']]), sorted(res))
 
         for aid in [id_of['A05'], id_of['A06'], id_of['A07']]:
             action = db_api.action_get(self.ctx, aid)
@@ -680,6 +891,59 @@ class DBAPIActionTest(base.SenlinTestCase):
         actions = db_api.action_get_all(self.ctx)
         self.assertEqual(3, len(actions))
 
+    def test_action_purge(self):
+        old = tu.utcnow() - datetime.timedelta(days=10)
+        a1 = _create_action(self.ctx, status=consts.ACTION_SUCCEEDED,
+                            created_at=old)
+        a2 = _create_action(self.ctx, status=consts.ACTION_FAILED,
+                            created_at=old)
+        a3 = _create_action(self.ctx, status=consts.ACTION_RUNNING,
+                            created_at=old)
+        a4 = _create_action(self.ctx, status=consts.ACTION_SUCCEEDED)
+        db_api.dependency_add(self.ctx, a1.id, a3.id)
+
+        res = db_api.action_purge(None, 'days', 5)
+
+        self.assertEqual(2, res)
+        self.assertIsNone(db_api.action_get(self.ctx, a1.id))
+        self.assertIsNone(db_api.action_get(self.ctx, a2.id))
+        self.assertIsNotNone(db_api.action_get(self.ctx, a3.id))
+        self.assertIsNotNone(db_api.action_get(self.ctx, a4.id))
+        self.assertEqual([], db_api.dependency_get_depended(self.ctx, a3.id))
+
+    def test_action_purge_with_limit(self):
+        old = tu.utcnow() - datetime.timedelta(days=10)
+        for i in range(3):
+            _create_action(self.ctx, status=consts.ACTION_SUCCEEDED,
+                           created_at=old)
+
+        self.assertEqual(2, db_api.action_purge(None, 'days', 5, limit=2))
+        self.assertEqual(1, db_api.action_purge(None, 'days', 5, limit=2))
+        self.assertEqual(0, db_api.action_purge(None, 'days', 5, limit=2))
+
+    def test_action_purge_project(self):
+        old = tu.utcnow() - datetime.timedelta(days=10)
+        action = _create_action(self.ctx, status=consts.ACTION_SUCCEEDED,
+                                created_at=old)
+
+        res = db_api.action_purge(['another-project'], 'days', 5)
+
+        self.assertEqual(0, res)
+        self.assertIsNotNone(db_api.action_get(self.ctx, action.id))
+
+    def test_dependency_purge(self):
+        a1 = _create_action(self.ctx)
+        a2 = _create_action(self.ctx)
+        a3 = _create_action(self.ctx, status=consts.ACTION_SUCCEEDED)
+        db_api.dependency_add(self.ctx, [a1.id, a3.id], a2.id)
+        db_api.action_delete(self.ctx, a3.id)
+
+        res = db_api.dependency_purge()
+
+        self.assertEqual(1, res)
+        self.assertEqual([a1.id],
+                         db_api.dependency_get_depended(self.ctx, a2.id))
+
     def test_action_abandon(self):
         spec = {
             "owner": "test_owner",
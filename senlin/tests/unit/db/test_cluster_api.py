@@ -12,6 +12,7 @@
 
 import mock
 
+from oslo_config import cfg
 from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_utils import timeutils as tu
 
@@ -87,6 +88,55 @@ class DBAPIClusterTest(base.SenlinTestCase):
         self.assertEqual(cluster.id, ret_cluster.id)
         self.assertEqual('db_test_cluster_name', ret_cluster.name)
 
+    def test_cluster_get_runtime_data(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        node1 = shared.create_node(self.ctx, cluster, self.profile)
+        node2 = shared.create_node(self.ctx, cluster, self.profile)
+        policy1 = shared.create_policy(self.ctx)
+        policy2 = shared.create_policy(self.ctx)
+        db_api.cluster_policy_attach(self.ctx, cluster.id, policy1.id,
+                                     {'priority': 50, 'enabled': True})
+        db_api.cluster_policy_attach(self.ctx, cluster.id, policy2.id,
+                                     {'priority': 10, 'enabled': False})
+
+        res = db_api.cluster_get_runtime_data(self.ctx, cluster.id)
+
+        self.assertEqual(cluster.id, res['cluster'].id)
+        self.assertEqual(self.profile.id, res['profile'].id)
+        self.assertEqual([policy2.id, policy1.id],
+                         [b.policy_id for b in res['bindings']])
+        self.assertEqual([policy2.id, policy1.id],
+                         [b.policy.id for b in res['bindings']])
+        self.assertEqual(set([node1.id, node2.id]),
+                         set(n.id for n in res['nodes']))
+        self.assertEqual(self.profile.id, res['nodes'][0].profile.id)
+
+    def test_cluster_get_runtime_data_not_found(self):
+        res = db_api.cluster_get_runtime_data(self.ctx, UUID1)
+        self.assertIsNone(res)
+
+    def test_cluster_get_runtime_data_diff_project(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        new_ctx = utils.dummy_context(project='a-different-project')
+
+        res = db_api.cluster_get_runtime_data(new_ctx, cluster.id)
+        self.assertIsNone(res)
+
+        res = db_api.cluster_get_runtime_data(new_ctx, cluster.id,
+                                              project_safe=False)
+        self.assertEqual(cluster.id, res['cluster'].id)
+
+    def test_cluster_get_runtime_data_nodes_project_safe(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        node = shared.create_node(self.ctx, cluster, self.profile)
+        new_ctx = utils.dummy_context(project='a-different-project')
+        shared.create_node(new_ctx, cluster, self.profile)
+
+        res = db_api.cluster_get_runtime_data(self.ctx, cluster.id,
+                                              project_safe=False)
+
+        self.assertEqual([node.id], [n.id for n in res['nodes']])
+
     def test_cluster_get_by_name(self):
         cluster = shared.create_cluster(self.ctx, self.profile)
         ret_cluster = db_api.cluster_get_by_name(self.ctx, cluster.name)
@@ -165,6 +215,34 @@ class DBAPIClusterTest(base.SenlinTestCase):
         res = db_api.cluster_get_by_short_id(ctx_new, UUID1[:11])
         self.assertIsNone(res)
 
+    @mock.patch.object(sa_utils, 'paginate_query')
+    @mock.patch.object(db_api, 'session_for_read')
+    def test_cluster_get_all_use_replica(self, mock_session, mock_paginate):
+        mock_session.return_value.__enter__.return_value = mock.Mock()
+
+        db_api.cluster_get_all(self.ctx, use_replica=True)
+
+        mock_session.assert_called_once_with(use_replica=True)
+
+    @mock.patch.object(db_api, '_get_main_context_manager')
+    def test_session_for_read_use_replica(self, mock_manager):
+        reader = mock_manager.return_value.reader
+        cfg.CONF.set_override('database_read_replica', True)
+
+        res = db_api.session_for_read(use_replica=True)
+
+        self.assertEqual(reader.async_.using.return_value, res)
+        self.assertEqual(0, reader.using.call_count)
+
+    @mock.patch.object(db_api, '_get_main_context_manager')
+    def test_session_for_read_replica_disabled(self, mock_manager):
+        reader = mock_manager.return_value.reader
+
+        res = db_api.session_for_read(use_replica=True)
+
+        self.assertEqual(reader.using.return_value, res)
+        self.assertEqual(0, reader.async_.using.call_count)
+
     def test_cluster_get_all(self):
         values = [
             {'name': 'cluster1'},
@@ -314,6 +392,17 @@ class DBAPIClusterTest(base.SenlinTestCase):
         res = db_api.cluster_get(self.ctx, cluster_id)
         self.assertEqual(3, res.next_index)
 
+    def test_cluster_next_index_block(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        cluster_id = cluster.id
+
+        res = db_api.cluster_next_index(self.ctx, cluster_id, count=5)
+        self.assertEqual(1, res)
+        res = db_api.cluster_get(self.ctx, cluster_id)
+        self.assertEqual(6, res.next_index)
+        res = db_api.cluster_next_index(self.ctx, cluster_id)
+        self.assertEqual(6, res)
+
     def test_cluster_count_all(self):
         clusters = [shared.create_cluster(self.ctx, self.profile)
                     for i in range(3)]
@@ -10,6 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
+import mock
+from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_log import log as logging
 from oslo_utils import reflection
 from oslo_utils import timeutils as tu
@@ -88,6 +92,19 @@ class DBAPIEventTest(base.SenlinTestCase):
         self.assertEqual(self.ctx.user_id, ret_event.user)
         self.assertEqual(self.ctx.project_id, ret_event.project)
 
+    def test_event_create_many(self):
+        values = [{'level': logging.INFO, 'oid': 'O%s' % i,
+                   'user': self.ctx.user_id, 'project': self.ctx.project_id}
+                  for i in range(3)]
+
+        ids = db_api.event_create_many(self.ctx, values)
+
+        self.assertEqual(3, len(ids))
+        for i, event_id in enumerate(ids):
+            event = db_api.event_get(self.ctx, event_id)
+            self.assertIsNotNone(event)
+            self.assertEqual('O%s' % i, event.oid)
+
     def test_event_get_diff_project(self):
         event = self.create_event(self.ctx)
         new_ctx = utils.dummy_context(project='a-different-project')
@@ -194,6 +211,38 @@ class DBAPIEventTest(base.SenlinTestCase):
         self.assertEqual(1, len(events))
         self.assertEqual(event2_id, events[0].id)
 
+    def test_event_get_all_pages_in_default_order(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        start = tu.utcnow(True)
+        for i in range(7):
+            # pairs of events share a timestamp to check the ties
+            ts = start + datetime.timedelta(seconds=i // 2)
+            self.create_event(self.ctx, entity=cluster1, timestamp=ts)
+
+        expected = db_api.event_get_all(self.ctx, sort='timestamp')
+
+        events = []
+        marker = None
+        while True:
+            page = db_api.event_get_all(self.ctx, limit=2, marker=marker)
+            events.extend(page)
+            if len(page) < 2:
+                break
+            marker = page[-1].id
+
+        self.assertEqual([e.id for e in expected], [e.id for e in events])
+
+    def test_event_get_all_pages_by_keyset(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        event1 = self.create_event(self.ctx, entity=cluster1)
+
+        with mock.patch.object(sa_utils, 'paginate_query') as m_paginate:
+            events = db_api.event_get_all(self.ctx, limit=1,
+                                          marker=event1.id)
+
+        self.assertEqual([], events)
+        self.assertFalse(m_paginate.called)
+
     def test_event_get_all_with_sorting(self):
         cluster1 = shared.create_cluster(self.ctx, self.profile)
 
@@ -548,3 +597,17 @@ class DBAPIEventTest(base.SenlinTestCase):
         db_api.event_purge(project=None, granularity='days', age=5)
         res = db_api.event_get_all_by_cluster(self.ctx, cluster1.id)
         self.assertEqual(1, len(res))
+
+    def test_event_purge_with_limit(self):
+        cluster1 = shared.create_cluster(self.ctx, self.profile)
+        for i in range(3):
+            self.create_event(self.ctx, entity=cluster1)
+
+        res = db_api.event_purge(None, granularity='days', age=5, limit=2)
+        self.assertEqual(2, res)
+        res = db_api.event_purge(None, granularity='days', age=5, limit=2)
+        self.assertEqual(1, res)
+        res = db_api.event_purge(None, granularity='days', age=5, limit=2)
+        self.assertEqual(0, res)
+        res = db_api.event_get_all_by_cluster(self.ctx, cluster1.id)
+        self.assertEqual(0, len(res))
@@ -0,0 +1,71 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Indexes of the hot-path queries.
+
+The test cases check that SQLite picks the indexes for the queries run by
+the engine on every action and for the pages of the listing APIs.
+"""
+
+import sqlalchemy
+
+from senlin.db.sqlalchemy import api as db_api
+from senlin.tests.unit.common import base
+
+ACTIVE = "('READY', 'WAITING', 'RUNNING', 'WAITING_LIFECYCLE_COMPLETION')"
+
+QUERIES = (
+    ('action_acquire_first_ready', 'ix_action_status_owner_created_at',
+     "SELECT id FROM action WHERE status = 'READY' AND owner IS NULL "
+     "ORDER BY created_at LIMIT 1"),
+    ('action_get_all_active_by_target', 'ix_action_target_status',
+     "SELECT id FROM action WHERE target = :target "
+     "AND status IN " + ACTIVE),
+    ('node_get_all_by_cluster', 'ix_node_cluster_id',
+     "SELECT id FROM node WHERE cluster_id = :cluster"),
+    ('event_get_all_by_cluster', 'ix_event_cluster_id_timestamp',
+     "SELECT id FROM event WHERE cluster_id = :cluster "
+     "ORDER BY timestamp DESC LIMIT 20"),
+    ('dependency_get_depended', 'ix_dependency_dependent',
+     "SELECT depended FROM dependency WHERE dependent = :action"),
+    ('dependency_get_dependents', 'ix_dependency_depended',
+     "SELECT dependent FROM dependency WHERE depended = :action"),
+    ('event_get_all_page', 'ix_event_timestamp_id',
+     "SELECT id FROM event WHERE timestamp > :ts "
+     "OR (timestamp = :ts AND id > :marker) "
+     "ORDER BY timestamp, id LIMIT 20"),
+    ('action_get_all_page', 'ix_action_created_at_id',
+     "SELECT id FROM action WHERE created_at > :ts "
+     "OR (created_at = :ts AND id > :marker) "
+     "ORDER BY created_at, id LIMIT 20"),
+    ('node_get_all_page', 'ix_node_init_at_id',
+     "SELECT id FROM node ORDER BY init_at, id LIMIT 20"),
+)
+
+PARAMS = {'target': 'target-1', 'cluster': 'cluster-1', 'action': 'act-1',
+          'ts': '2020-01-01 01:00:00', 'marker': 'act-3600'}
+
+
+def get_plan(conn, sql):
+    """Get the query plan of a statement as a single line of text."""
+    rows = conn.execute(sqlalchemy.text('EXPLAIN QUERY PLAN ' + sql), PARAMS)
+    return '; '.join(row[-1] for row in rows)
+
+
+class DBIndexesTest(base.SenlinTestCase):
+
+    def test_hot_path_queries_use_indexes(self):
+        engine = db_api.get_engine()
+        with engine.connect() as conn:
+            for name, index, sql in QUERIES:
+                self.assertIn(index, get_plan(conn, sql), name)
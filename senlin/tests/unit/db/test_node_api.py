@@ -54,6 +54,31 @@ class DBAPINodeTest(base.SenlinTestCase):
         self.assertEqual(self.cluster.id, node.cluster_id)
         self.assertEqual(self.profile.id, node.profile_id)
 
+    def test_node_create_many(self):
+        values = []
+        for index in range(1, 4):
+            values.append({
+                'name': 'node-%s' % index,
+                'cluster_id': self.cluster.id,
+                'profile_id': self.profile.id,
+                'user': self.ctx.user_id,
+                'project': self.ctx.project_id,
+                'index': index,
+                'status': consts.NS_INIT,
+                'meta_data': {},
+                'data': {},
+            })
+
+        res = db_api.node_create_many(self.ctx, values)
+
+        self.assertEqual(3, len(res))
+        for index, node_id in enumerate(res, 1):
+            node = db_api.node_get(self.ctx, node_id)
+            self.assertEqual('node-%s' % index, node.name)
+            self.assertEqual(index, node.index)
+            self.assertEqual(self.cluster.id, node.cluster_id)
+            self.assertEqual(self.profile.id, node.profile_id)
+
     def test_node_get(self):
         res = shared.create_node(self.ctx, self.cluster, self.profile)
 
@@ -581,6 +606,75 @@ class DBAPINodeTest(base.SenlinTestCase):
         reason = 'Node new_name: Something is wrong'
         self.assertEqual(reason, cluster.status_reason)
 
+    def test_node_update_many(self):
+        node1 = shared.create_node(self.ctx, self.cluster, self.profile)
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile)
+        values = {
+            node1.id: {'data': {'lb_member': 'MEMBER1'}},
+            node2.id: {'name': 'node2', 'role': 'a new role'},
+        }
+
+        db_api.node_update_many(self.ctx, values)
+
+        node1 = db_api.node_get(self.ctx, node1.id)
+        self.assertEqual({'lb_member': 'MEMBER1'}, node1.data)
+        node2 = db_api.node_get(self.ctx, node2.id)
+        self.assertEqual('node2', node2.name)
+        self.assertEqual('a new role', node2.role)
+
+    def test_node_update_many_not_found(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+        values = {
+            node.id: {'name': 'new_name'},
+            'BogusId': {'name': 'new_name'},
+        }
+
+        db_api.node_update_many(self.ctx, values)
+
+        node = db_api.node_get(self.ctx, node.id)
+        self.assertEqual('new_name', node.name)
+        self.assertIsNone(db_api.node_get(self.ctx, 'BogusId'))
+
+    def test_node_update_many_cluster_status_updated(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+        values = {
+            node.id: {
+                'name': 'new_name',
+                'status': 'ERROR',
+                'status_reason': 'Something is wrong',
+            }
+        }
+
+        db_api.node_update_many(self.ctx, values)
+
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual('WARNING', cluster.status)
+        reason = 'Node new_name: Something is wrong'
+        self.assertEqual(reason, cluster.status_reason)
+
+    def test_batch_update(self):
+        node1 = shared.create_node(self.ctx, self.cluster, self.profile)
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile)
+        action = shared.create_action(self.ctx, target=node1.id,
+                                      action='NODE_CREATE',
+                                      status='RUNNING')
+        nodes = {
+            node1.id: {'data': {'lb_member': 'MEMBER1'}},
+            node2.id: {'meta_data': {'k': 'v'}},
+            'BogusId': {'data': {}},
+        }
+        actions = {action.id: {'outputs': {'nodes_added': [node1.id]}}}
+
+        db_api.batch_update(self.ctx, actions=actions, nodes=nodes)
+
+        node1 = db_api.node_get(self.ctx, node1.id)
+        self.assertEqual({'lb_member': 'MEMBER1'}, node1.data)
+        node2 = db_api.node_get(self.ctx, node2.id)
+        self.assertEqual({'k': 'v'}, node2.meta_data)
+        action = db_api.action_get(self.ctx, action.id)
+        self.assertEqual({'nodes_added': [node1.id]}, action.outputs)
+        self.assertEqual('RUNNING', action.status)
+
     def test_node_migrate_from_none(self):
         node_orphan = shared.create_node(self.ctx, None, self.profile)
         timestamp = tu.utcnow(True)
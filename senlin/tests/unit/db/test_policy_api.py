@@ -83,6 +83,22 @@ class DBAPIPolicyTest(base.SenlinTestCase):
         self.assertIsNotNone(res)
         self.assertEqual(policy.id, res.id)
 
+    def test_policy_get_version(self):
+        data = self.new_policy_data()
+        policy = db_api.policy_create(self.ctx, data)
+
+        res = db_api.policy_get_version(self.ctx, policy.id)
+        self.assertEqual((policy.created_at, None), res)
+
+        new_ctx = utils.dummy_context(project='a-different-project')
+        res = db_api.policy_get_version(new_ctx, policy.id)
+        self.assertIsNone(res)
+        res = db_api.policy_get_version(new_ctx, policy.id,
+                                        project_safe=False)
+        self.assertEqual((policy.created_at, None), res)
+
+        self.assertIsNone(db_api.policy_get_version(self.ctx, 'BOGUS'))
+
     def test_policy_get_admin_context(self):
         data = self.new_policy_data()
         policy = db_api.policy_create(self.ctx, data)
@@ -53,6 +53,21 @@ class DBAPIProfileTest(base.SenlinTestCase):
         self.assertIsNotNone(res)
         self.assertEqual(profile.id, res.id)
 
+    def test_profile_get_version(self):
+        profile = shared.create_profile(self.ctx)
+
+        res = db_api.profile_get_version(self.ctx, profile.id)
+        self.assertEqual((profile.created_at, None), res)
+
+        new_ctx = utils.dummy_context(project='a-different-project')
+        res = db_api.profile_get_version(new_ctx, profile.id)
+        self.assertIsNone(res)
+        res = db_api.profile_get_version(new_ctx, profile.id,
+                                         project_safe=False)
+        self.assertEqual((profile.created_at, None), res)
+
+        self.assertIsNone(db_api.profile_get_version(self.ctx, 'BOGUS'))
+
     def test_profile_get_admin_context(self):
         profile = shared.create_profile(self.ctx)
         admin_ctx = utils.dummy_context(project='a-different-project',
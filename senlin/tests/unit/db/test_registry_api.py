@@ -10,10 +10,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
 import mock
+from oslo_utils import timeutils as tu
 
 from senlin.db.sqlalchemy import api as db_api
-from senlin.db.sqlalchemy import utils as db_utils
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -74,9 +76,10 @@ class DBAPIRegistryTest(base.SenlinTestCase):
         self.assertEqual('DEAD_ENGINE', registries[0].engine_id)
         self.assertEqual('DEAD_ENGINE', registries[1].engine_id)
 
-    @mock.patch.object(db_utils, 'is_service_dead')
-    def test_registry_claim_with_dead_engine(self, mock_check):
-        db_api.service_create('SERVICE_ID_DEAD')
+    def test_registry_claim_with_dead_engine(self):
+        long_ago = tu.utcnow(True) - datetime.timedelta(days=1)
+        with mock.patch.object(tu, 'utcnow', return_value=long_ago):
+            db_api.service_create('SERVICE_ID_DEAD')
         self._create_registry(
             cluster_id='CLUSTER_1', check_type='NODE_STATUS_POLLING',
             interval=60, params={}, engine_id='SERVICE_ID')
@@ -84,13 +87,63 @@ class DBAPIRegistryTest(base.SenlinTestCase):
             cluster_id='CLUSTER_1', check_type='NODE_STATUS_POLLING',
             interval=60, params={}, engine_id='SERVICE_ID_DEAD')
 
-        mock_check.side_effect = [False, True]
-
         registries = db_api.registry_claim(self.ctx, engine_id='ENGINE_ID')
 
         self.assertEqual(1, len(registries))
         self.assertEqual('SERVICE_ID_DEAD', registries[0].engine_id)
 
+    def test_registry_claim_cluster_ids(self):
+        for i in range(3):
+            self._create_registry(
+                cluster_id='CLUSTER_%s' % i, check_type='NODE_STATUS_POLLING',
+                interval=60, params={}, engine_id='DEAD_ENGINE')
+
+        registries = db_api.registry_claim(self.ctx, engine_id='SERVICE_ID',
+                                           cluster_ids=['CLUSTER_0',
+                                                        'CLUSTER_2'])
+
+        self.assertEqual(['CLUSTER_0', 'CLUSTER_2'],
+                         sorted(r.cluster_id for r in registries))
+        self.assertEqual(['CLUSTER_1'],
+                         db_api.registry_get_orphans(self.ctx))
+
+    def test_registry_get_orphans(self):
+        self._create_registry(
+            cluster_id='CLUSTER_1', check_type='NODE_STATUS_POLLING',
+            interval=60, params={}, engine_id='SERVICE_ID')
+        self._create_registry(
+            cluster_id='CLUSTER_2', check_type='NODE_STATUS_POLLING',
+            interval=60, params={}, engine_id='DEAD_ENGINE')
+        self._create_registry(
+            cluster_id='CLUSTER_3', check_type='NODE_STATUS_POLLING',
+            interval=60, params={}, engine_id=None)
+
+        res = db_api.registry_get_orphans(self.ctx)
+
+        self.assertEqual(['CLUSTER_2', 'CLUSTER_3'], sorted(res))
+
+    def test_registry_release(self):
+        for i in range(3):
+            self._create_registry(
+                cluster_id='CLUSTER_%s' % i, check_type='NODE_STATUS_POLLING',
+                interval=60, params={}, engine_id='SERVICE_ID')
+
+        res = db_api.registry_release(self.ctx, 'SERVICE_ID',
+                                      ['CLUSTER_0', 'CLUSTER_1'])
+
+        self.assertEqual(2, res)
+        self.assertIsNone(db_api.registry_get(self.ctx,
+                                              'CLUSTER_0').engine_id)
+        self.assertEqual(['CLUSTER_0', 'CLUSTER_1'],
+                         sorted(db_api.registry_get_orphans(self.ctx)))
+
+        # registries owned by other engines are left alone
+        res = db_api.registry_release(self.ctx, 'OTHER_ENGINE', ['CLUSTER_2'])
+
+        self.assertEqual(0, res)
+        self.assertEqual('SERVICE_ID',
+                         db_api.registry_get(self.ctx, 'CLUSTER_2').engine_id)
+
     def test_registry_delete(self):
         registry = self._create_registry('CLUSTER_ID',
                                          check_type='NODE_STATUS_POLLING',
@@ -10,6 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
+import mock
+from oslo_utils import timeutils as tu
 from oslo_utils import uuidutils
 
 from senlin.db.sqlalchemy import api as db_api
@@ -58,6 +62,16 @@ class DBAPIServiceTest(base.SenlinTestCase):
 
         self.assertEqual(4, len(services))
 
+    def test_service_get_live_ids(self):
+        live = self._create_service('LIVE_ID')
+        long_ago = tu.utcnow(True) - datetime.timedelta(days=1)
+        with mock.patch.object(tu, 'utcnow', return_value=long_ago):
+            self._create_service('DEAD_ID')
+
+        self.assertEqual([live.id], db_api.service_get_live_ids())
+        self.assertEqual(['DEAD_ID', 'LIVE_ID'],
+                         sorted(db_api.service_get_live_ids(2 * 86400)))
+
     def test_service_update(self):
         old_service = self._create_service()
         old_updated_time = old_service.updated_at
@@ -68,6 +82,13 @@ class DBAPIServiceTest(base.SenlinTestCase):
         self.assertEqual('host-updated', new_service.host)
         self.assertGreater(new_service.updated_at, old_updated_time)
 
+    def test_service_update_load(self):
+        old_service = self._create_service()
+
+        new_service = db_api.service_update(old_service.id, {'load': 7})
+
+        self.assertEqual(7, new_service.load)
+
     def test_service_update_values_none(self):
         old_service = self._create_service()
         old_updated_time = old_service.updated_at
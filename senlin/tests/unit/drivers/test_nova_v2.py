@@ -91,6 +91,19 @@ class TestNovaV2(base.SenlinTestCase):
         d.server_get('foo')
         self.compute.get_server.assert_called_once_with('foo')
 
+    def test_server_list(self):
+        d = nova_v2.NovaClient(self.conn_params)
+        self.compute.servers.return_value = ['S1', 'S2']
+
+        res = d.server_list()
+
+        self.assertEqual(['S1', 'S2'], res)
+        self.compute.servers.assert_called_once_with(True)
+        self.compute.servers.reset_mock()
+
+        d.server_list(details=False, status='ACTIVE')
+        self.compute.servers.assert_called_once_with(False, status='ACTIVE')
+
     def test_server_update(self):
         d = nova_v2.NovaClient(self.conn_params)
         attrs = {'mem': 2}
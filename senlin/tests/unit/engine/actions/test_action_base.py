@@ -27,12 +27,14 @@ from senlin.engine import cluster as cluster_mod
 from senlin.engine import dispatcher
 from senlin.engine import environment
 from senlin.engine import event as EVENT
+from senlin.engine import metrics
 from senlin.engine import node as node_mod
 from senlin.objects import action as ao
 from senlin.objects import cluster_lock as cl
 from senlin.objects import cluster_policy as cpo
 from senlin.objects import dependency as dobj
 from senlin.objects import node_lock as nl
+from senlin.objects import unit_of_work
 from senlin.policies import base as policy_mod
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
@@ -93,6 +95,7 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertIsNone(obj.created_at)
         self.assertIsNone(obj.updated_at)
         self.assertEqual({}, obj.data)
+        self.assertIsNone(obj.timing)
 
     def _create_cp_binding(self, cluster_id, policy_id):
         return cpo.ClusterPolicy(cluster_id=cluster_id, policy_id=policy_id,
@@ -168,6 +171,45 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertIsNotNone(obj.created_at)
         self.assertIsNotNone(obj.updated_at)
 
+    @mock.patch.object(ao.Action, 'update')
+    def test_action_store_in_unit_of_work(self, mock_update):
+        values = copy.deepcopy(self.action_values)
+        obj = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='FAKE_ID',
+                        **values)
+
+        with unit_of_work.begin(self.ctx, 'FAKE_ID'):
+            obj.store(self.ctx)
+
+        mock_update.assert_called_once_with(
+            self.ctx, 'FAKE_ID', {
+                'data': obj.data,
+                'inputs': obj.inputs,
+                'outputs': obj.outputs,
+                'updated_at': obj.updated_at,
+            })
+
+    @mock.patch.object(ao.Action, 'update')
+    def test_action_store_in_unit_of_work_changed(self, mock_update):
+        values = copy.deepcopy(self.action_values)
+        obj = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='FAKE_ID',
+                        **values)
+
+        with unit_of_work.begin(self.ctx, 'FAKE_ID'):
+            obj.status_reason = 'Changed'
+            obj.timeout = 7200
+            obj.store(self.ctx)
+
+        # the changed fields are written with the deferrable ones
+        mock_update.assert_called_once_with(
+            self.ctx, 'FAKE_ID', {
+                'status_reason': 'Changed',
+                'timeout': 7200,
+                'data': obj.data,
+                'inputs': obj.inputs,
+                'outputs': obj.outputs,
+                'updated_at': obj.updated_at,
+            })
+
     def test_from_db_record(self):
         values = copy.deepcopy(self.action_values)
         obj = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, **values)
@@ -252,6 +294,31 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual('FAKE_ID', result)
         mock_store.assert_called_once_with(self.ctx)
 
+    @mock.patch.object(ao.Action, 'create_many')
+    def test_action_create_many(self, mock_create):
+        mock_create.return_value = ['ACTION_1', 'ACTION_2']
+
+        result = ab.Action.create_many(
+            self.ctx, ['NODE_ID_1', 'NODE_ID_2'], 'NODE_CREATE',
+            'PARENT_ID', cause=consts.CAUSE_DERIVED)
+
+        self.assertEqual(['ACTION_1', 'ACTION_2'], result)
+        mock_create.assert_called_once_with(self.ctx, mock.ANY,
+                                            dependent='PARENT_ID')
+        values = mock_create.call_args[0][1]
+        self.assertEqual(['node_create_NODE_ID_', 'node_create_NODE_ID_'],
+                         [v['name'] for v in values])
+        self.assertEqual(['NODE_ID_1', 'NODE_ID_2'],
+                         [v['target'] for v in values])
+        for v in values:
+            self.assertEqual('NODE_CREATE', v['action'])
+            self.assertEqual(consts.CAUSE_DERIVED, v['cause'])
+            self.assertEqual(ab.Action.READY, v['status'])
+            self.assertEqual(self.ctx.user_id, v['user'])
+            self.assertEqual(self.ctx.project_id, v['project'])
+            self.assertEqual(self.ctx.user_id, v['context']['user_id'])
+            self.assertIsNotNone(v['created_at'])
+
     @mock.patch.object(ab.Action, 'store')
     @mock.patch.object(ao.Action, 'get_all_active_by_target')
     @mock.patch.object(cl.ClusterLock, 'is_locked')
@@ -467,8 +534,9 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertIsNone(result)
         self.assertEqual(0, mock_call.call_count)
 
+    @mock.patch.object(dispatcher, 'signal_action')
     @mock.patch.object(ao.Action, 'signal')
-    def test_action_signal_cancel(self, mock_call):
+    def test_action_signal_cancel(self, mock_call, mock_push):
         values = copy.deepcopy(self.action_values)
         action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, **values)
         action.store(self.ctx)
@@ -479,7 +547,10 @@ class ActionBaseTest(base.SenlinTestCase):
             result = action.signal(action.SIG_CANCEL)
             self.assertIsNone(result)
             self.assertEqual(1, mock_call.call_count)
+            mock_push.assert_called_once_with(action.id, action.SIG_CANCEL,
+                                              OWNER_ID)
             mock_call.reset_mock()
+            mock_push.reset_mock()
 
         invalid = [action.SUSPENDED, action.SUCCEEDED, action.CANCELLED,
                    action.FAILED]
@@ -559,49 +630,86 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual(action.SUCCEEDED, action.status)
         self.assertEqual('FAKE_REASON', action.status_reason)
         mark_succeed.assert_called_once_with(action.context, 'FAKE_ID',
-                                             mock.ANY)
+                                             mock.ANY, timing=action.timing)
 
         action.set_status(action.RES_ERROR, 'FAKE_ERROR')
         self.assertEqual(action.FAILED, action.status)
         self.assertEqual('FAKE_ERROR', action.status_reason)
         mark_fail.assert_called_once_with(action.context, 'FAKE_ID', mock.ANY,
-                                          'FAKE_ERROR')
+                                          'FAKE_ERROR', timing=action.timing)
 
         mark_fail.reset_mock()
         action.set_status(action.RES_TIMEOUT, 'TIMEOUT_ERROR')
         self.assertEqual(action.FAILED, action.status)
         self.assertEqual('TIMEOUT_ERROR', action.status_reason)
         mark_fail.assert_called_once_with(action.context, 'FAKE_ID', mock.ANY,
-                                          'TIMEOUT_ERROR')
+                                          'TIMEOUT_ERROR',
+                                          timing=action.timing)
 
         mark_fail.reset_mock()
         action.set_status(action.RES_CANCEL, 'CANCELLED')
         self.assertEqual(action.CANCELLED, action.status)
         self.assertEqual('CANCELLED', action.status_reason)
         mark_cancel.assert_called_once_with(action.context, 'FAKE_ID',
-                                            mock.ANY)
+                                            mock.ANY, timing=action.timing)
 
         mark_fail.reset_mock()
         action.set_status(action.RES_LIFECYCLE_COMPLETE, 'LIFECYCLE COMPLETE')
         self.assertEqual(action.SUCCEEDED, action.status)
         self.assertEqual('LIFECYCLE COMPLETE', action.status_reason)
-        mark_ready.assert_called_once_with(action.context, 'FAKE_ID', mock.ANY)
+        mark_ready.assert_called_once_with(action.context, 'FAKE_ID', mock.ANY,
+                                           timing=action.timing)
 
         mark_fail.reset_mock()
         action.set_status(action.RES_RETRY, 'BUSY')
         self.assertEqual(action.READY, action.status)
         self.assertEqual('BUSY', action.status_reason)
-        mock_start.assert_called_once_with(action.id)
+        mock_start.assert_called_once_with()
         mock_sleep.assert_called_once_with(10)
         mock_abandon.assert_called_once_with(
-            action.context, 'FAKE_ID', {'data': {'retries': 1}})
+            action.context, 'FAKE_ID',
+            {'data': {'retries': 1}, 'timing': action.timing})
 
         mark_fail.reset_mock()
         action.data = {'retries': 3}
         action.set_status(action.RES_RETRY, 'BUSY')
         self.assertEqual(action.RES_ERROR, action.status)
         mark_fail.assert_called_once_with(action.context, 'FAKE_ID', mock.ANY,
-                                          'BUSY')
+                                          'BUSY', timing=action.timing)
+
+    @mock.patch.object(EVENT, 'info')
+    @mock.patch.object(ao.Action, 'mark_succeeded')
+    def test_set_status_wakeup_dependents(self, mark_succeed, mock_info):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='FAKE_ID')
+        mark_succeed.return_value = ['DEP1', 'DEP2']
+        mock_wakeup = self.patchobject(action, '_wakeup_dependents')
+
+        action.set_status(action.RES_OK, 'FAKE_REASON')
+
+        mock_wakeup.assert_called_once_with(['DEP1', 'DEP2'])
+
+    @mock.patch.object(ao.Action, 'lock_check')
+    @mock.patch.object(dispatcher, 'wakeup_action')
+    def test_wakeup_dependents(self, mock_wakeup, mock_check):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='FAKE_ID',
+                           owner='ENGINE1')
+        # DEP1 is waiting locally, DEP2 is owned by another engine, DEP3 is
+        # owned by this engine but not waiting yet and DEP4 is gone.
+        mock_wakeup.side_effect = [True, False, True, False, False]
+        mock_check.side_effect = ['ENGINE2', 'ENGINE1',
+                                  exception.ResourceNotFound(type='action',
+                                                             id='DEP4')]
+
+        action._wakeup_dependents(['DEP1', 'DEP2', 'DEP3', 'DEP4'])
+
+        mock_wakeup.assert_has_calls([
+            mock.call('DEP1'), mock.call('DEP2'),
+            mock.call('DEP2', 'ENGINE2'),
+            mock.call('DEP3'), mock.call('DEP4')])
+        mock_check.assert_has_calls([
+            mock.call(action.context, 'DEP2'),
+            mock.call(action.context, 'DEP3'),
+            mock.call(action.context, 'DEP4')])
 
     @mock.patch.object(EVENT, 'info')
     @mock.patch.object(EVENT, 'error')
@@ -705,6 +813,21 @@ class ActionBaseTest(base.SenlinTestCase):
         self.assertEqual(sig_cmd, res)
         mock_query.assert_called_once_with(action.context, 'FAKE_ID')
 
+    @mock.patch.object(ao.Action, 'signal_query')
+    def test_check_signal_local(self, mock_query):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx)
+        action.id = 'FAKE_ID'
+        action.timeout = 100
+        self.patchobject(action, 'is_timeout', return_value=False)
+        dispatcher.add_signal_receiver('FAKE_ID')
+        self.addCleanup(dispatcher.remove_signal_receiver, 'FAKE_ID')
+
+        self.assertIsNone(action._check_signal())
+
+        dispatcher.deliver_signal('FAKE_ID', action.SIG_CANCEL)
+        self.assertEqual(action.SIG_CANCEL, action._check_signal())
+        self.assertEqual(0, mock_query.call_count)
+
     @mock.patch.object(ao.Action, 'signal_query')
     def test_is_cancelled(self, mock_query):
         action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx)
@@ -781,6 +904,59 @@ class ActionBaseTest(base.SenlinTestCase):
                                           sort='priority',
                                           filters={'enabled': True})
 
+    def test_timing(self):
+        timing = ab.Timing()
+
+        with timing.span('outer'):
+            with timing.span('inner', policy='P1'):
+                pass
+
+        res = timing.to_dict()
+        self.assertEqual(['inner', 'outer'],
+                         [s['name'] for s in res['spans']])
+        self.assertEqual('P1', res['spans'][0]['policy'])
+        self.assertLessEqual(res['spans'][1]['start'],
+                             res['spans'][0]['start'])
+        self.assertGreaterEqual(res['total'], res['spans'][1]['duration'])
+
+    def test_timing_span_on_exception(self):
+        timing = ab.Timing()
+
+        def fail():
+            with timing.span('execute'):
+                raise Exception('boom')
+
+        self.assertRaises(Exception, fail)
+        self.assertEqual(['execute'],
+                         [s['name'] for s in timing.to_dict()['spans']])
+
+    @mock.patch.object(ab, 'MAX_SPANS', 2)
+    def test_timing_max_spans(self):
+        timing = ab.Timing()
+        for i in range(3):
+            with timing.span('S%s' % i):
+                pass
+
+        self.assertEqual(['S0', 'S1'],
+                         [s['name'] for s in timing.to_dict()['spans']])
+
+    @mock.patch.object(EVENT, 'info')
+    def test_set_status_timing(self, mock_info):
+        values = copy.deepcopy(self.action_values)
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, **values)
+        action.store(self.ctx)
+        with action.span('execute'):
+            pass
+
+        action.set_status(action.RES_OK, 'FAKE_REASON')
+
+        db_action = ao.Action.get(self.ctx, action.id)
+        self.assertEqual(action.SUCCEEDED, db_action.status)
+        self.assertEqual(action.timing, db_action.timing)
+        self.assertEqual('execute', db_action.timing['spans'][0]['name'])
+        result = ab.Action.load(self.ctx, action.id)
+        self.assertEqual(action.timing, result.timing)
+
     @mock.patch.object(dobj.Dependency, 'get_depended')
     @mock.patch.object(dobj.Dependency, 'get_dependents')
     def test_action_to_dict(self, mock_dep_by, mock_dep_on):
@@ -810,6 +986,7 @@ class ActionBaseTest(base.SenlinTestCase):
             'created_at': ts,
             'updated_at': None,
             'data': {'data_key': 'data_value'},
+            'timing': None,
             'user': USER_ID,
             'project': PROJECT_ID,
         }
@@ -937,6 +1114,10 @@ class ActionPolicyCheckTest(base.SenlinTestCase):
         mock_load.assert_called_once_with(action.context, policy.id)
         # last_op was not updated
         self.assertIsNone(pb.last_op)
+        spans = action.timer.to_dict()['spans']
+        self.assertEqual(1, len(spans))
+        self.assertEqual('policy_pre_op', spans[0]['name'])
+        self.assertEqual('test-policy', spans[0]['policy'])
 
     @mock.patch.object(cpo.ClusterPolicy, 'get_all')
     @mock.patch.object(policy_mod.Policy, 'load')
@@ -968,6 +1149,54 @@ class ActionPolicyCheckTest(base.SenlinTestCase):
         self.assertEqual(0, policy.pre_op.call_count)
         policy.post_op.assert_called_once_with(cluster_id, action)
 
+    @mock.patch.object(cpo.ClusterPolicy, 'get_all')
+    @mock.patch.object(policy_mod.Policy, 'load')
+    def test_policy_check_shared_bindings(self, mock_load, mock_load_all):
+        cluster_id = CLUSTER_ID
+        policy1 = mock.Mock(id=uuidutils.generate_uuid(), cooldown=0,
+                            TARGET=[('AFTER', 'OBJECT_ACTION')])
+        policy2 = mock.Mock(id=uuidutils.generate_uuid(), cooldown=0,
+                            TARGET=[('AFTER', 'OBJECT_ACTION')])
+        pb1 = self._create_cp_binding(cluster_id, policy1.id)
+        pb2 = self._create_cp_binding(cluster_id, policy2.id)
+        pb2.enabled = False
+        entity = mock.Mock(id=cluster_id)
+        entity.rt = {'policies': [policy1, policy2], 'bindings': [pb1, pb2]}
+        action = ab.Action(cluster_id, 'OBJECT_ACTION', self.ctx)
+        action.entity = entity
+
+        res = action.policy_check(cluster_id, 'AFTER')
+
+        self.assertIsNone(res)
+        self.assertEqual(policy_mod.CHECK_OK, action.data['status'])
+        self.assertEqual(0, mock_load_all.call_count)
+        self.assertEqual(0, mock_load.call_count)
+        policy1.post_op.assert_called_once_with(cluster_id, action)
+        self.assertEqual(0, policy2.post_op.call_count)
+
+    @mock.patch.object(cpo.ClusterPolicy, 'get_all')
+    @mock.patch.object(policy_mod.Policy, 'load')
+    def test_policy_check_bindings_changed(self, mock_load, mock_load_all):
+        cluster_id = CLUSTER_ID
+        policy = mock.Mock(id=uuidutils.generate_uuid(), cooldown=0,
+                           TARGET=[('AFTER', 'OBJECT_ACTION')])
+        pb = self._create_cp_binding(cluster_id, policy.id)
+        mock_load_all.return_value = [pb]
+        mock_load.return_value = policy
+        entity = mock.Mock(id=cluster_id)
+        # bindings were changed by the action
+        entity.rt = {'policies': [policy], 'bindings': None}
+        action = ab.Action(cluster_id, 'OBJECT_ACTION', self.ctx)
+        action.entity = entity
+
+        action.policy_check(cluster_id, 'AFTER')
+
+        mock_load_all.assert_called_once_with(
+            action.context, cluster_id, sort='priority',
+            filters={'enabled': True})
+        mock_load.assert_called_once_with(action.context, policy.id)
+        policy.post_op.assert_called_once_with(cluster_id, action)
+
     @mock.patch.object(cpo.ClusterPolicy, 'get_all')
     @mock.patch.object(policy_mod.Policy, 'load')
     @mock.patch.object(ab.Action, '_check_result')
@@ -1033,6 +1262,79 @@ class ActionProcTest(base.SenlinTestCase):
                                           project_safe=False)
         mock_event_info.assert_called_once_with(action, 'start', 'ACTION_I')
         mock_status.assert_called_once_with(action.RES_OK, 'BIG SUCCESS')
+        self.assertFalse(dispatcher.is_receiving('ACTION_ID'))
+
+    @mock.patch.object(ao.Action, 'mark_succeeded')
+    @mock.patch.object(EVENT, 'info')
+    @mock.patch.object(ab.Action, 'load')
+    def test_action_proc_timing(self, mock_load, mock_event_info,
+                                mock_succeed):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='ACTION_ID')
+        action.entity = mock.Mock()
+
+        def execute():
+            with action.span('lock_acquire', lock='cluster'):
+                pass
+            return action.RES_OK, 'BIG SUCCESS'
+
+        self.patchobject(action, 'execute', side_effect=execute)
+        mock_succeed.return_value = []
+        mock_load.return_value = action
+
+        ab.ActionProc(self.ctx, 'ACTION_ID')
+
+        names = [s['name'] for s in action.timing['spans']]
+        self.assertEqual(['load', 'lock_acquire', 'execute'], names)
+        self.assertEqual('cluster', action.timing['spans'][1]['lock'])
+        mock_succeed.assert_called_once_with(self.ctx, 'ACTION_ID', mock.ANY,
+                                             timing=action.timing)
+
+    @mock.patch.object(metrics, 'observe')
+    @mock.patch.object(EVENT, 'info')
+    @mock.patch.object(ab.Action, 'load')
+    def test_action_proc_metrics(self, mock_load, mock_event_info,
+                                 mock_observe):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='ACTION_ID',
+                           created_at=timeutils.utcnow(True))
+        action.entity = mock.Mock()
+        self.patchobject(action, 'execute',
+                         return_value=(action.RES_OK, 'BIG SUCCESS'))
+        self.patchobject(action, 'set_status')
+        mock_load.return_value = action
+
+        ab.ActionProc(self.ctx, 'ACTION_ID')
+
+        mock_observe.assert_has_calls([
+            mock.call(metrics.ACQUIRE_SECONDS, mock.ANY,
+                      action='OBJECT_ACTION'),
+            mock.call(metrics.EXECUTION_SECONDS, mock.ANY,
+                      action='OBJECT_ACTION', status=action.INIT),
+        ])
+
+    @mock.patch.object(EVENT, 'info')
+    @mock.patch.object(ab.Action, 'load')
+    def test_action_proc_signal_receiver(self, mock_load, mock_event_info):
+        action = ab.Action(OBJID, 'OBJECT_ACTION', self.ctx, id='ACTION_ID',
+                           control='CANCEL')
+        action.entity = mock.Mock()
+        signals = []
+
+        def execute():
+            signals.append(action._check_signal())
+            dispatcher.deliver_signal('ACTION_ID', action.SIG_SUSPEND)
+            signals.append(action._check_signal())
+            return action.RES_OK, 'BIG SUCCESS'
+
+        self.patchobject(action, 'execute', side_effect=execute)
+        self.patchobject(action, 'is_timeout', return_value=False)
+        self.patchobject(action, 'set_status')
+        mock_load.return_value = action
+
+        res = ab.ActionProc(self.ctx, 'ACTION_ID')
+
+        self.assertTrue(res)
+        self.assertEqual(['CANCEL', 'SUSPEND'], signals)
+        self.assertFalse(dispatcher.is_receiving('ACTION_ID'))
 
     @mock.patch.object(EVENT, 'info')
     @mock.patch.object(ab.Action, 'load')
@@ -12,6 +12,7 @@
 
 import eventlet
 import mock
+from oslo_config import cfg
 
 from senlin.common import consts
 from senlin.common import scaleutils
@@ -21,6 +22,7 @@ from senlin.engine import cluster as cluster_mod
 from senlin.engine import event as EVENT
 from senlin.engine import node as node_mod
 from senlin.engine import senlin_lock as lock
+from senlin.engine import throttle
 from senlin.objects import action as ao
 from senlin.objects import node as node_obj
 from senlin.policies import base as policy_mod
@@ -575,6 +577,53 @@ class NodeActionTest(base.SenlinTestCase):
         self.assertEqual('GOOD', res_msg)
         action.do_sing.assert_called_once_with()
 
+    @mock.patch.object(throttle, 'get_limiter')
+    def test_execute_throttled(self, mock_get, mock_load):
+        profile = mock.Mock(type_name='os.nova.server',
+                            context={'region_name': 'R1'})
+        node = mock.Mock(id='NID', rt={'profile': profile})
+        mock_load.return_value = node
+        limiter = mock_get.return_value
+        action = node_action.NodeAction(node.id, 'NODE_SING', self.ctx)
+        self.patchobject(action, '_execute',
+                         return_value=(action.RES_OK, 'GOOD'))
+
+        res_code, res_msg = action._execute_throttled()
+
+        self.assertEqual(action.RES_OK, res_code)
+        self.assertEqual('GOOD', res_msg)
+        mock_get.assert_called_once_with('os.nova.server', 'R1')
+        limiter.acquire.assert_called_once_with()
+        limiter.release.assert_called_once_with('NODE_SING', mock.ANY, True)
+
+    @mock.patch.object(throttle, 'get_limiter')
+    def test_execute_throttled_default_region(self, mock_get, mock_load):
+        cfg.CONF.set_override('default_region_name', 'RegionOne')
+        profile = mock.Mock(type_name='os.heat.stack', context={})
+        node = mock.Mock(id='NID', rt={'profile': profile})
+        mock_load.return_value = node
+        limiter = mock_get.return_value
+        action = node_action.NodeAction(node.id, 'NODE_SING', self.ctx)
+        self.patchobject(action, '_execute', side_effect=Exception('BOOM'))
+
+        self.assertRaises(Exception, action._execute_throttled)
+
+        mock_get.assert_called_once_with('os.heat.stack', 'RegionOne')
+        limiter.release.assert_called_once_with('NODE_SING', mock.ANY, False)
+
+    @mock.patch.object(throttle, 'get_limiter')
+    def test_execute_throttled_disabled(self, mock_get, mock_load):
+        node = mock.Mock(id='NID', rt={'profile': mock.Mock()})
+        mock_load.return_value = node
+        mock_get.return_value = None
+        action = node_action.NodeAction(node.id, 'NODE_SING', self.ctx)
+        self.patchobject(action, '_execute',
+                         return_value=(action.RES_ERROR, 'BAD'))
+
+        res = action._execute_throttled()
+
+        self.assertEqual((action.RES_ERROR, 'BAD'), res)
+
     @mock.patch.object(EVENT, 'error')
     def test_execute_bad_action(self, mock_error, mock_load):
         node = mock.Mock()
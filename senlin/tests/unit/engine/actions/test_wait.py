@@ -15,7 +15,7 @@ import mock
 from senlin.engine.actions import base as ab
 from senlin.engine.actions import cluster_action as ca
 from senlin.engine import cluster as cm
-from senlin.engine import scheduler
+from senlin.engine import dispatcher
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -77,8 +77,8 @@ class ClusterActionWaitTest(base.SenlinTestCase):
         self.ctx = utils.dummy_context()
 
     @mock.patch.object(cm.Cluster, 'load')
-    @mock.patch.object(scheduler, 'reschedule')
-    def test_wait_dependents(self, mock_reschedule, mock_load):
+    @mock.patch.object(dispatcher, 'wait')
+    def test_wait_dependents(self, mock_wait, mock_load):
         action = ca.ClusterAction('ID', 'ACTION', self.ctx)
         action.id = 'FAKE_ID'
         self.patchobject(action, 'get_status', side_effect=self.statuses)
@@ -88,4 +88,7 @@ class ClusterActionWaitTest(base.SenlinTestCase):
         res_code, res_msg = action._wait_for_dependents()
         self.assertEqual(self.code, res_code)
         self.assertEqual(self.message, res_msg)
-        self.assertEqual(self.rescheduled_times, mock_reschedule.call_count)
+        self.assertEqual(self.rescheduled_times, mock_wait.call_count)
+        mock_wait.assert_called_with('FAKE_ID', 10)
+        # the action is no longer registered for wakeups
+        self.assertFalse(dispatcher.wakeup('FAKE_ID'))
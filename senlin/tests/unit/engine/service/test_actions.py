@@ -46,7 +46,8 @@ class ActionTest(base.SenlinTestCase):
         expected = [{'k': 'v1'}, {'k': 'v2'}]
         self.assertEqual(expected, result)
 
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         use_replica=True)
 
     @mock.patch.object(ao.Action, 'get_all')
     def test_action_list_with_params(self, mock_get):
@@ -69,7 +70,8 @@ class ActionTest(base.SenlinTestCase):
                                          filters=filters,
                                          limit=100,
                                          sort='status',
-                                         project_safe=True
+                                         project_safe=True,
+                                         use_replica=True
                                          )
 
     def test_action_list_with_bad_params(self):
@@ -86,7 +88,8 @@ class ActionTest(base.SenlinTestCase):
         req = orao.ActionListRequest(project_safe=True)
         result = self.eng.action_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         use_replica=True)
 
         self.ctx.is_admin = True
 
@@ -94,13 +97,15 @@ class ActionTest(base.SenlinTestCase):
         req = orao.ActionListRequest(project_safe=True)
         result = self.eng.action_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         use_replica=True)
 
         mock_get.reset_mock()
         req = orao.ActionListRequest(project_safe=False)
         result = self.eng.action_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=False)
+        mock_get.assert_called_once_with(self.ctx, project_safe=False,
+                                         use_replica=True)
 
     @mock.patch.object(ab.Action, 'create')
     @mock.patch.object(co.Cluster, 'find')
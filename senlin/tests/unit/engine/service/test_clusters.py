@@ -91,7 +91,20 @@ class ClusterTest(base.SenlinTestCase):
         result = self.eng.cluster_list(self.ctx, req.obj_to_primitive())
 
         self.assertEqual([{'k': 'v1'}, {'k': 'v2'}], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         use_replica=True)
+
+    @mock.patch.object(co.Cluster, 'get_all')
+    def test_cluster_list_read_primary(self, mock_get):
+        mock_get.return_value = []
+        self.ctx.read_primary = True
+        req = orco.ClusterListRequest(project_safe=True)
+
+        result = self.eng.cluster_list(self.ctx, req.obj_to_primitive())
+
+        self.assertEqual([], result)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         use_replica=False)
 
     @mock.patch.object(co.Cluster, 'get_all')
     def test_cluster_list_with_params(self, mock_get):
@@ -113,7 +126,7 @@ class ClusterTest(base.SenlinTestCase):
         mock_get.assert_called_once_with(
             self.ctx, limit=10, marker=marker, sort='name:asc',
             filters={'name': ['test_cluster'], 'status': ['ACTIVE']},
-            project_safe=True)
+            project_safe=True, use_replica=True)
 
     @mock.patch.object(service.EngineService, 'check_cluster_quota')
     @mock.patch.object(su, 'check_size_params')
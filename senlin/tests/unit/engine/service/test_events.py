@@ -45,7 +45,8 @@ class EventTest(base.SenlinTestCase):
         expected = [{'level': 'DEBUG'}, {'level': 'INFO'}]
 
         self.assertEqual(expected, result)
-        mock_load.assert_called_once_with(self.ctx, project_safe=True)
+        mock_load.assert_called_once_with(self.ctx, project_safe=True,
+                                          use_replica=True)
 
     @mock.patch.object(eo.Event, 'get_all')
     def test_event_list_with_params(self, mock_load):
@@ -72,7 +73,7 @@ class EventTest(base.SenlinTestCase):
                                           sort=consts.EVENT_TIMESTAMP,
                                           limit=123,
                                           marker=marker_uuid,
-                                          project_safe=True)
+                                          project_safe=True, use_replica=True)
 
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(eo.Event, 'get_all')
@@ -95,7 +96,7 @@ class EventTest(base.SenlinTestCase):
 
         filters = {'cluster_id': ['FAKE1', 'FAKE2']}
         mock_load.assert_called_once_with(self.ctx, filters=filters,
-                                          project_safe=True)
+                                          project_safe=True, use_replica=True)
         mock_find.assert_has_calls([
             mock.call(self.ctx, 'CLUSTERA'),
             mock.call(self.ctx, 'CLUSTER2')
@@ -134,7 +135,8 @@ class EventTest(base.SenlinTestCase):
         req = oreo.EventListRequest(project_safe=True)
         result = self.eng.event_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_load.assert_called_once_with(self.ctx, project_safe=True)
+        mock_load.assert_called_once_with(self.ctx, project_safe=True,
+                                          use_replica=True)
 
         self.ctx.is_admin = True
 
@@ -142,13 +144,15 @@ class EventTest(base.SenlinTestCase):
         req = oreo.EventListRequest(project_safe=True)
         result = self.eng.event_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_load.assert_called_once_with(self.ctx, project_safe=True)
+        mock_load.assert_called_once_with(self.ctx, project_safe=True,
+                                          use_replica=True)
 
         mock_load.reset_mock()
         req = oreo.EventListRequest(project_safe=False)
         result = self.eng.event_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_load.assert_called_once_with(self.ctx, project_safe=False)
+        mock_load.assert_called_once_with(self.ctx, project_safe=False,
+                                          use_replica=True)
 
     @mock.patch.object(eo.Event, 'find')
     def test_event_get(self, mock_find):
@@ -52,7 +52,8 @@ class NodeTest(base.SenlinTestCase):
         result = self.eng.node_list(self.ctx, req.obj_to_primitive())
 
         self.assertEqual([{'k': 'v1'}, {'k': 'v2'}], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         use_replica=True)
 
     @mock.patch.object(co.Cluster, 'find')
     @mock.patch.object(no.Node, 'get_all')
@@ -71,7 +72,7 @@ class NodeTest(base.SenlinTestCase):
         self.assertEqual([{'k': 'v1'}, {'k': 'v2'}], result)
         mock_find.assert_called_once_with(self.ctx, 'MY_CLUSTER_NAME')
         mock_get.assert_called_once_with(self.ctx, cluster_id='CLUSTER_ID',
-                                         project_safe=True)
+                                         project_safe=True, use_replica=True)
 
     @mock.patch.object(no.Node, 'get_all')
     def test_node_list_with_params(self, mock_get):
@@ -90,6 +91,7 @@ class NodeTest(base.SenlinTestCase):
         self.assertEqual([{'k': 'v1'}, {'k': 'v2'}], result)
         mock_get.assert_called_once_with(self.ctx, sort='status', limit=123,
                                          marker=MARKER_UUID, project_safe=True,
+                                         use_replica=True,
                                          filters={'status': ['ACTIVE']})
 
     @mock.patch.object(co.Cluster, 'find')
@@ -115,7 +117,8 @@ class NodeTest(base.SenlinTestCase):
         req = orno.NodeListRequest(project_safe=True)
         result = self.eng.node_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         use_replica=True)
         mock_get.reset_mock()
 
         req = orno.NodeListRequest(project_safe=False)
@@ -128,7 +131,8 @@ class NodeTest(base.SenlinTestCase):
         req = orno.NodeListRequest(project_safe=False)
         result = self.eng.node_list(self.ctx, req.obj_to_primitive())
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=False)
+        mock_get.assert_called_once_with(self.ctx, project_safe=False,
+                                         use_replica=True)
         mock_get.reset_mock()
 
     @mock.patch.object(no.Node, 'get_all')
@@ -139,7 +143,8 @@ class NodeTest(base.SenlinTestCase):
         result = self.eng.node_list(self.ctx, req.obj_to_primitive())
 
         self.assertEqual([], result)
-        mock_get.assert_called_once_with(self.ctx, project_safe=True)
+        mock_get.assert_called_once_with(self.ctx, project_safe=True,
+                                         use_replica=True)
 
     @mock.patch.object(action_mod.Action, 'create')
     @mock.patch.object(no.Node, 'create')
@@ -0,0 +1,91 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from oslo_config import cfg
+
+from senlin.engine import cache
+from senlin.tests.unit.common import base
+
+
+class FakeObject(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class TestObjectCache(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestObjectCache, self).setUp()
+        cfg.CONF.set_override('object_cache_size', 2)
+        self.cache = cache.ObjectCache()
+
+    def test_get_put(self):
+        obj = FakeObject('obj1')
+        self.cache.put('ID1', 'V1', obj)
+
+        res = self.cache.get('ID1', 'V1')
+
+        self.assertIsNot(obj, res)
+        self.assertEqual('obj1', res.name)
+        self.assertIsNone(self.cache.get('ID2', 'V1'))
+
+    def test_get_copy(self):
+        self.cache.put('ID1', 'V1', FakeObject('obj1'))
+
+        res = self.cache.get('ID1', 'V1')
+        res.name = 'changed'
+
+        self.assertEqual('obj1', self.cache.get('ID1', 'V1').name)
+
+    def test_get_stale(self):
+        self.cache.put('ID1', 'V1', FakeObject('obj1'))
+
+        self.assertIsNone(self.cache.get('ID1', 'V2'))
+        self.assertEqual(0, len(self.cache))
+
+    def test_put_evict_least_recently_used(self):
+        self.cache.put('ID1', 'V1', FakeObject('obj1'))
+        self.cache.put('ID2', 'V1', FakeObject('obj2'))
+        self.cache.get('ID1', 'V1')
+
+        self.cache.put('ID3', 'V1', FakeObject('obj3'))
+
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNotNone(self.cache.get('ID1', 'V1'))
+        self.assertIsNone(self.cache.get('ID2', 'V1'))
+        self.assertIsNotNone(self.cache.get('ID3', 'V1'))
+
+    def test_put_disabled(self):
+        cfg.CONF.set_override('object_cache_size', 0)
+        self.assertFalse(self.cache.enabled())
+
+        self.cache.put('ID1', 'V1', FakeObject('obj1'))
+
+        self.assertEqual(0, len(self.cache))
+
+    def test_invalidate(self):
+        self.cache.put('ID1', 'V1', FakeObject('obj1'))
+        self.cache.put('ID2', 'V1', FakeObject('obj2'))
+
+        self.cache.invalidate('ID1')
+        self.cache.invalidate('ID3')
+
+        self.assertIsNone(self.cache.get('ID1', 'V1'))
+        self.assertIsNotNone(self.cache.get('ID2', 'V1'))
+
+    def test_clear(self):
+        self.cache.put('ID1', 'V1', FakeObject('obj1'))
+
+        self.cache.clear()
+
+        self.assertEqual(0, len(self.cache))
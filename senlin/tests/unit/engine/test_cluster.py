@@ -22,7 +22,6 @@ from senlin.engine import health_manager
 from senlin.engine import node as node_mod
 from senlin.objects import cluster as co
 from senlin.objects import cluster_policy as cpo
-from senlin.objects import node as no
 from senlin.policies import base as pcb
 from senlin.profiles import base as pfb
 from senlin.tests.unit.common import base
@@ -64,7 +63,8 @@ class TestCluster(base.SenlinTestCase):
         self.assertEqual({}, cluster.metadata)
         self.assertEqual({}, cluster.dependents)
         self.assertEqual({}, cluster.config)
-        self.assertEqual({'profile': None, 'nodes': [], 'policies': []},
+        self.assertEqual({'profile': None, 'nodes': [], 'policies': [],
+                          'bindings': None},
                          cluster.rt)
 
     def test_init_with_none(self):
@@ -81,24 +81,33 @@ class TestCluster(base.SenlinTestCase):
     @mock.patch.object(cm.Cluster, '_load_runtime_data')
     def test_init_with_context(self, mock_load):
         cm.Cluster('test-cluster', 0, PROFILE_ID, context=self.context)
-        mock_load.assert_called_once_with(self.context)
+        mock_load.assert_called_once_with(self.context, None)
+
+    @mock.patch.object(cm.Cluster, '_load_runtime_data')
+    def test_init_with_runtime_data(self, mock_load):
+        data = mock.Mock()
+        cm.Cluster('test-cluster', 0, PROFILE_ID, context=self.context,
+                   runtime_data=data)
+        mock_load.assert_called_once_with(self.context, data)
 
-    @mock.patch.object(cpo.ClusterPolicy, 'get_all')
     @mock.patch.object(pcb.Policy, 'load')
     @mock.patch.object(pfb.Profile, 'load')
-    @mock.patch.object(no.Node, 'get_all_by_cluster')
-    def test_load_runtime_data(self, mock_nodes, mock_profile, mock_policy,
-                               mock_pb):
+    @mock.patch.object(co.Cluster, 'get_runtime_data')
+    def test_load_runtime_data(self, mock_data, mock_profile, mock_policy):
         x_binding = mock.Mock()
-        x_binding.policy_id = POLICY_ID
-        mock_pb.return_value = [x_binding]
+        x_node_1 = mock.Mock()
+        x_node_2 = mock.Mock()
+        x_db_profile = mock.Mock()
+        mock_data.return_value = {
+            'cluster': mock.Mock(),
+            'profile': x_db_profile,
+            'bindings': [x_binding],
+            'nodes': [x_node_1, x_node_2],
+        }
         x_policy = mock.Mock()
         mock_policy.return_value = x_policy
         x_profile = mock.Mock()
         mock_profile.return_value = x_profile
-        x_node_1 = mock.Mock()
-        x_node_2 = mock.Mock()
-        mock_nodes.return_value = [x_node_1, x_node_2]
 
         cluster = cm.Cluster('test-cluster', 0, PROFILE_ID)
         cluster.id = CLUSTER_ID
@@ -111,15 +120,47 @@ class TestCluster(base.SenlinTestCase):
         self.assertEqual(2, len(rt['nodes']))
         self.assertIsInstance(rt['nodes'], list)
         self.assertEqual([x_policy], rt['policies'])
+        self.assertEqual([x_binding], rt['bindings'])
 
-        mock_pb.assert_called_once_with(self.context, CLUSTER_ID)
+        mock_data.assert_called_once_with(self.context, CLUSTER_ID,
+                                          project_safe=False)
         mock_policy.assert_called_once_with(self.context,
-                                            POLICY_ID,
-                                            project_safe=False)
+                                            db_policy=x_binding.policy)
         mock_profile.assert_called_once_with(self.context,
-                                             profile_id=PROFILE_ID,
-                                             project_safe=False)
-        mock_nodes.assert_called_once_with(self.context, CLUSTER_ID)
+                                             profile=x_db_profile)
+
+    @mock.patch.object(pcb.Policy, 'load')
+    @mock.patch.object(pfb.Profile, 'load')
+    @mock.patch.object(co.Cluster, 'get_runtime_data')
+    def test_load_runtime_data_preloaded(self, mock_data, mock_profile,
+                                         mock_policy):
+        x_binding = mock.Mock()
+        x_node = mock.Mock()
+        data = {
+            'cluster': mock.Mock(),
+            'profile': mock.Mock(),
+            'bindings': [x_binding],
+            'nodes': [x_node],
+        }
+        cluster = cm.Cluster('test-cluster', 0, PROFILE_ID)
+        cluster.id = CLUSTER_ID
+
+        cluster._load_runtime_data(self.context, data)
+
+        self.assertEqual(0, mock_data.call_count)
+        self.assertEqual(mock_profile.return_value, cluster.rt['profile'])
+        self.assertEqual([mock_policy.return_value], cluster.rt['policies'])
+        self.assertEqual([x_binding], cluster.rt['bindings'])
+        self.assertEqual([x_node], cluster.rt['nodes'])
+
+    @mock.patch.object(co.Cluster, 'get_runtime_data')
+    def test_load_runtime_data_not_found(self, mock_data):
+        mock_data.return_value = None
+        cluster = cm.Cluster('test-cluster', 0, PROFILE_ID)
+        cluster.id = CLUSTER_ID
+
+        self.assertRaises(exception.ResourceNotFound,
+                          cluster._load_runtime_data, self.context)
 
     def test_load_runtime_data_id_is_none(self):
         cluster = cm.Cluster('test-cluster', 0, PROFILE_ID)
@@ -218,29 +259,31 @@ class TestCluster(base.SenlinTestCase):
         self.assertEqual(mock_init.return_value, result)
         mock_init.assert_called_once_with(self.context, x_obj)
 
-    @mock.patch.object(co.Cluster, 'get')
+    @mock.patch.object(co.Cluster, 'get_runtime_data')
     @mock.patch.object(cm.Cluster, '_from_object')
-    def test_load_via_cluster_id(self, mock_init, mock_get):
+    def test_load_via_cluster_id(self, mock_init, mock_data):
         x_obj = mock.Mock()
-        mock_get.return_value = x_obj
+        x_data = {'cluster': x_obj}
+        mock_data.return_value = x_data
 
         result = cm.Cluster.load(self.context, cluster_id=CLUSTER_ID)
 
         self.assertEqual(mock_init.return_value, result)
-        mock_get.assert_called_once_with(self.context, CLUSTER_ID,
-                                         project_safe=True)
-        mock_init.assert_called_once_with(self.context, x_obj)
-
-    @mock.patch.object(co.Cluster, 'get')
-    def test_load_not_found(self, mock_get):
-        mock_get.return_value = None
+        mock_data.assert_called_once_with(self.context, CLUSTER_ID,
+                                          project_safe=True)
+        mock_init.assert_called_once_with(self.context, x_obj,
+                                          runtime_data=x_data)
+
+    @mock.patch.object(co.Cluster, 'get_runtime_data')
+    def test_load_not_found(self, mock_data):
+        mock_data.return_value = None
         ex = self.assertRaises(exception.ResourceNotFound,
                                cm.Cluster.load,
                                self.context, cluster_id=CLUSTER_ID)
         self.assertEqual("The cluster '%s' could not be found." % CLUSTER_ID,
                          six.text_type(ex))
-        mock_get.assert_called_once_with(self.context, CLUSTER_ID,
-                                         project_safe=True)
+        mock_data.assert_called_once_with(self.context, CLUSTER_ID,
+                                          project_safe=True)
 
     @mock.patch.object(cm.Cluster, '_from_object')
     @mock.patch.object(co.Cluster, 'get_all')
@@ -532,6 +575,7 @@ class TestCluster(base.SenlinTestCase):
 
         binding = mock.Mock()
         mock_cp.return_value = binding
+        cluster.rt['bindings'] = []
 
         values = {'enabled': True}
         cluster.attach_policy(self.context, POLICY_ID, values)
@@ -541,6 +585,7 @@ class TestCluster(base.SenlinTestCase):
                                         enabled=True, data=None)
         binding.store.assert_called_once_with(self.context)
         self.assertIn(policy, cluster.policies)
+        self.assertIsNone(cluster.rt['bindings'])
 
     @mock.patch.object(pcb.Policy, 'load')
     def test_attach_policy_already_attached(self, mock_load):
@@ -653,6 +698,7 @@ class TestCluster(base.SenlinTestCase):
         existing = mock.Mock()
         existing.id = POLICY_ID
         cluster.rt['policies'] = [existing]
+        cluster.rt['bindings'] = [mock.Mock(policy_id=POLICY_ID)]
         policy.detach.return_value = (True, None)
         mock_load.return_value = policy
 
@@ -665,6 +711,7 @@ class TestCluster(base.SenlinTestCase):
         mock_detach.assert_called_once_with(self.context, CLUSTER_ID,
                                             POLICY_ID)
         self.assertEqual([], cluster.rt['policies'])
+        self.assertIsNone(cluster.rt['bindings'])
 
     def test_detach_policy_not_attached(self):
         cluster = cm.Cluster('test-cluster', 0, PROFILE_ID)
@@ -710,6 +757,7 @@ class TestCluster(base.SenlinTestCase):
         self.assertEqual('Policy updated.', reason)
         mock_update.assert_called_once_with(
             self.context, CLUSTER_ID, POLICY_ID, {'enabled': False})
+        self.assertIsNone(cluster.rt['bindings'])
 
     def test_update_policy_not_attached(self):
         cluster = cm.Cluster('test-cluster', 0, PROFILE_ID)
@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+
+import eventlet
 import mock
 from oslo_config import cfg
 from oslo_context import context
@@ -17,9 +19,11 @@ import oslo_messaging
 
 from senlin.common import consts
 from senlin.common import messaging
+from senlin.common import utils as common_utils
 from senlin.engine import dispatcher
 from senlin.engine import scheduler
 from senlin.engine import service
+from senlin.objects import service as service_obj
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
 
@@ -70,11 +74,15 @@ class TestDispatcher(base.SenlinTestCase):
         disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
         disp.start_action(self.context, action_id='FOO')
 
-        mock_start.assert_called_once_with('1234', 'FOO')
+        mock_start.assert_called_once_with('1234', 'FOO', limit=None)
         mock_start.reset_mock()
 
         disp.start_action(self.context)
-        mock_start.assert_called_once_with('1234', None)
+        mock_start.assert_called_once_with('1234', None, limit=None)
+        mock_start.reset_mock()
+
+        disp.start_action(self.context, limit=50)
+        mock_start.assert_called_once_with('1234', None, limit=50)
 
     @mock.patch.object(scheduler.ThreadGroupManager, 'cancel_action')
     def test_cancel_action(self, mock_cancel):
@@ -97,6 +105,34 @@ class TestDispatcher(base.SenlinTestCase):
 
         mock_resume.assert_called_once_with('FOO')
 
+    @mock.patch.object(dispatcher, 'wakeup')
+    def test_wakeup_action(self, mock_wakeup):
+        disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
+        disp.wakeup_action(self.context, action_id='FOO')
+
+        mock_wakeup.assert_called_once_with('FOO')
+
+    @mock.patch.object(dispatcher, 'deliver_signal')
+    def test_signal_action(self, mock_deliver):
+        disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
+        disp.signal_action(self.context, action_id='FOO', signal='CANCEL')
+
+        mock_deliver.assert_called_once_with('FOO', 'CANCEL')
+
+    @mock.patch.object(dispatcher, 'add_lock_watcher')
+    def test_watch_lock(self, mock_add):
+        disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
+        disp.watch_lock(self.context, cluster_id='C1', watcher_id='E1')
+
+        mock_add.assert_called_once_with('C1', 'E1')
+
+    @mock.patch.object(dispatcher, 'wakeup_lock_waiter')
+    def test_lock_released(self, mock_wakeup):
+        disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
+        disp.lock_released(self.context, cluster_id='C1')
+
+        mock_wakeup.assert_called_once_with('C1')
+
     @mock.patch.object(scheduler.ThreadGroupManager, 'stop')
     def test_stop(self, mock_stop):
         disp = dispatcher.Dispatcher(self.svc, 'TOPIC', '1', self.thm)
@@ -161,3 +197,278 @@ class TestDispatcher(base.SenlinTestCase):
 
         mock_notify.assert_called_once_with(dispatcher.START_ACTION,
                                             'FAKE_ENGINE')
+
+    @mock.patch.object(dispatcher, '_dispatch')
+    @mock.patch.object(eventlet, 'spawn_after')
+    def test_start_action_function_coalesced(self, mock_spawn,
+                                             mock_dispatch):
+        self.addCleanup(setattr, dispatcher, '_PENDING_DISPATCH', None)
+
+        self.assertTrue(dispatcher.start_action())
+        self.assertTrue(dispatcher.start_action())
+
+        mock_spawn.assert_called_once_with(0.1, dispatcher._flush)
+        self.assertEqual(0, mock_dispatch.call_count)
+
+        dispatcher._flush()
+
+        mock_dispatch.assert_called_once_with()
+        self.assertIsNone(dispatcher._PENDING_DISPATCH)
+
+    @mock.patch.object(dispatcher, '_dispatch')
+    @mock.patch.object(eventlet, 'spawn_after')
+    def test_start_action_function_no_window(self, mock_spawn,
+                                             mock_dispatch):
+        cfg.CONF.set_override('dispatch_coalesce_window', 0)
+
+        res = dispatcher.start_action()
+
+        self.assertEqual(mock_dispatch.return_value, res)
+        mock_dispatch.assert_called_once_with()
+        self.assertEqual(0, mock_spawn.call_count)
+
+    @mock.patch.object(common_utils, 'get_live_engines')
+    @mock.patch.object(service_obj.Service, 'get_all')
+    def test_get_candidates(self, mock_get_all, mock_live):
+        self.patchobject(dispatcher, '_ENGINE_LOADS', new={})
+        self.patchobject(dispatcher, '_ENGINE_LOADS_EXPIRY', new=0)
+        mock_get_all.return_value = [
+            mock.Mock(id='E1', disabled=False, load=5),
+            mock.Mock(id='E2', disabled=False, load=None),
+            mock.Mock(id='E3', disabled=True, load=0),
+            mock.Mock(id='E4', disabled=False, load=0),
+            mock.Mock(id='E5', disabled=False, load=2),
+        ]
+        mock_live.return_value = frozenset(['E1', 'E2', 'E3', 'E5'])
+
+        res = dispatcher._get_candidates()
+
+        self.assertEqual(['E2', 'E5', 'E1'], res)
+        mock_live.assert_called_once_with(mock.ANY)
+
+        # the loads are cached like the live engines
+        dispatcher._get_candidates()
+        self.assertEqual(1, mock_get_all.call_count)
+
+    @mock.patch.object(dispatcher, 'notify')
+    @mock.patch.object(messaging, 'get_rpc_client')
+    @mock.patch.object(dispatcher, '_get_candidates')
+    def test_dispatch_targeted(self, mock_candidates, mock_rpc,
+                               mock_notify):
+        cfg.CONF.set_override('action_acquire_batch_size', 10)
+        self.patchobject(dispatcher, '_ENGINE_LOADS', new={'E1': 0})
+        mock_candidates.return_value = ['E1', 'E2']
+        mock_client = mock_rpc.return_value
+        mock_context = mock_client.prepare.return_value
+
+        res = dispatcher._dispatch()
+
+        self.assertTrue(res)
+        mock_client.prepare.assert_called_once_with(server='E1')
+        mock_context.cast.assert_called_once_with(
+            mock.ANY, dispatcher.START_ACTION, limit=10)
+        self.assertEqual(0, mock_notify.call_count)
+        # the batch claimed counts on the load of the engine
+        self.assertEqual({'E1': 10}, dispatcher._ENGINE_LOADS)
+
+    @mock.patch.object(common_utils, 'get_live_engines')
+    @mock.patch.object(service_obj.Service, 'get_all')
+    @mock.patch.object(messaging, 'get_rpc_client')
+    def test_dispatch_spread(self, mock_rpc, mock_get_all, mock_live):
+        self.patchobject(dispatcher, '_ENGINE_LOADS', new={})
+        self.patchobject(dispatcher, '_ENGINE_LOADS_EXPIRY', new=0)
+        mock_get_all.return_value = [
+            mock.Mock(id='E1', disabled=False, load=0),
+            mock.Mock(id='E2', disabled=False, load=0),
+            mock.Mock(id='E3', disabled=False, load=0),
+        ]
+        mock_live.return_value = frozenset(['E1', 'E2', 'E3'])
+        mock_client = mock_rpc.return_value
+
+        for i in range(3):
+            dispatcher._dispatch()
+
+        # each batch of ready actions goes to another engine
+        servers = [c[1]['server']
+                   for c in mock_client.prepare.call_args_list]
+        self.assertEqual(['E1', 'E2', 'E3'], sorted(servers))
+
+    @mock.patch.object(dispatcher, 'notify')
+    @mock.patch.object(messaging, 'get_rpc_client')
+    @mock.patch.object(dispatcher, '_get_candidates')
+    def test_dispatch_targeted_next_engine(self, mock_candidates, mock_rpc,
+                                           mock_notify):
+        self.patchobject(dispatcher, '_ENGINE_LOADS', new={})
+        mock_candidates.return_value = ['E1', 'E2']
+        mock_client = mock_rpc.return_value
+        mock_context = mock_client.prepare.return_value
+        mock_context.cast.side_effect = [
+            oslo_messaging.MessageDeliveryFailure(), None]
+
+        res = dispatcher._dispatch()
+
+        self.assertTrue(res)
+        self.assertEqual([mock.call(server='E1'), mock.call(server='E2')],
+                         mock_client.prepare.call_args_list)
+        self.assertEqual(0, mock_notify.call_count)
+
+    @mock.patch.object(dispatcher, 'notify')
+    @mock.patch.object(messaging, 'get_rpc_client')
+    @mock.patch.object(dispatcher, '_get_candidates')
+    def test_dispatch_not_sent(self, mock_candidates, mock_rpc,
+                               mock_notify):
+        mock_candidates.return_value = ['E1']
+        mock_context = mock_rpc.return_value.prepare.return_value
+        mock_context.cast.side_effect = (
+            oslo_messaging.MessageDeliveryFailure())
+
+        res = dispatcher._dispatch()
+
+        self.assertEqual(mock_notify.return_value, res)
+        mock_notify.assert_called_once_with(dispatcher.START_ACTION)
+
+    @mock.patch.object(dispatcher, 'notify')
+    @mock.patch.object(dispatcher, '_get_candidates')
+    def test_dispatch_not_targeted(self, mock_candidates, mock_notify):
+        cfg.CONF.set_override('dispatch_targeted', False)
+
+        res = dispatcher._dispatch()
+
+        self.assertEqual(mock_notify.return_value, res)
+        mock_notify.assert_called_once_with(dispatcher.START_ACTION)
+        self.assertEqual(0, mock_candidates.call_count)
+
+    @mock.patch.object(dispatcher, 'notify')
+    def test_wakeup_action_function_local(self, mock_notify):
+        dispatcher.add_waiter('FAKE_ACTION')
+        self.addCleanup(dispatcher.remove_waiter, 'FAKE_ACTION')
+
+        res = dispatcher.wakeup_action('FAKE_ACTION', 'FAKE_ENGINE')
+
+        self.assertTrue(res)
+        self.assertEqual(0, mock_notify.call_count)
+
+    @mock.patch.object(dispatcher, 'notify')
+    def test_wakeup_action_function_remote(self, mock_notify):
+        res = dispatcher.wakeup_action('FAKE_ACTION', 'FAKE_ENGINE')
+
+        self.assertEqual(mock_notify.return_value, res)
+        mock_notify.assert_called_once_with(dispatcher.WAKEUP_ACTION,
+                                            'FAKE_ENGINE',
+                                            action_id='FAKE_ACTION')
+
+    @mock.patch.object(dispatcher, 'notify')
+    def test_wakeup_action_function_unknown(self, mock_notify):
+        res = dispatcher.wakeup_action('FAKE_ACTION')
+
+        self.assertFalse(res)
+        self.assertEqual(0, mock_notify.call_count)
+
+    def test_wait_woken_up(self):
+        dispatcher.add_waiter('FAKE_ACTION')
+        self.addCleanup(dispatcher.remove_waiter, 'FAKE_ACTION')
+
+        self.assertTrue(dispatcher.wakeup('FAKE_ACTION'))
+        self.assertTrue(dispatcher.wait('FAKE_ACTION', 10))
+
+        # the waiter is re-armed after being woken up
+        self.assertFalse(dispatcher.wait('FAKE_ACTION', 0))
+
+    @mock.patch.object(eventlet, 'sleep')
+    def test_wait_not_registered(self, mock_sleep):
+        self.assertFalse(dispatcher.wait('FAKE_ACTION', 10))
+        mock_sleep.assert_called_once_with(10)
+
+    def test_wakeup_not_registered(self):
+        self.assertFalse(dispatcher.wakeup('FAKE_ACTION'))
+
+    @mock.patch.object(dispatcher, 'notify')
+    def test_signal_action_function_local(self, mock_notify):
+        dispatcher.add_signal_receiver('FAKE_ACTION')
+        self.addCleanup(dispatcher.remove_signal_receiver, 'FAKE_ACTION')
+
+        res = dispatcher.signal_action('FAKE_ACTION', 'CANCEL', 'FAKE_ENGINE')
+
+        self.assertTrue(res)
+        self.assertEqual('CANCEL', dispatcher.get_signal('FAKE_ACTION'))
+        self.assertEqual(0, mock_notify.call_count)
+
+    @mock.patch.object(dispatcher, 'notify')
+    def test_signal_action_function_remote(self, mock_notify):
+        res = dispatcher.signal_action('FAKE_ACTION', 'CANCEL', 'FAKE_ENGINE')
+
+        self.assertEqual(mock_notify.return_value, res)
+        mock_notify.assert_called_once_with(dispatcher.SIGNAL_ACTION,
+                                            'FAKE_ENGINE',
+                                            action_id='FAKE_ACTION',
+                                            signal='CANCEL')
+        self.assertFalse(dispatcher.is_receiving('FAKE_ACTION'))
+
+    @mock.patch.object(dispatcher, 'notify')
+    def test_signal_action_function_unknown(self, mock_notify):
+        res = dispatcher.signal_action('FAKE_ACTION', 'CANCEL')
+
+        self.assertFalse(res)
+        self.assertEqual(0, mock_notify.call_count)
+
+    def test_add_signal_receiver(self):
+        dispatcher.add_signal_receiver('FAKE_ACTION')
+        self.addCleanup(dispatcher.remove_signal_receiver, 'FAKE_ACTION')
+        self.assertTrue(dispatcher.is_receiving('FAKE_ACTION'))
+        self.assertIsNone(dispatcher.get_signal('FAKE_ACTION'))
+
+        # A delivered signal is not replaced by the recorded one
+        dispatcher.deliver_signal('FAKE_ACTION', 'SUSPEND')
+        dispatcher.add_signal_receiver('FAKE_ACTION', 'CANCEL')
+        self.assertEqual('SUSPEND', dispatcher.get_signal('FAKE_ACTION'))
+
+        dispatcher.remove_signal_receiver('FAKE_ACTION')
+        self.assertFalse(dispatcher.is_receiving('FAKE_ACTION'))
+        self.assertFalse(dispatcher.deliver_signal('FAKE_ACTION', 'CANCEL'))
+
+    def test_lock_waiters_fifo(self):
+        dispatcher.add_lock_waiter('C1', 'A1')
+        dispatcher.add_lock_waiter('C1', 'A2')
+        self.addCleanup(dispatcher._LOCK_WAITERS.pop, 'C1', None)
+
+        self.assertTrue(dispatcher.is_first_lock_waiter('C1', 'A1'))
+        self.assertFalse(dispatcher.is_first_lock_waiter('C1', 'A2'))
+
+        # Only the first waiter is woken up
+        self.assertTrue(dispatcher.wakeup_lock_waiter('C1'))
+        self.assertTrue(dispatcher.wait_lock('C1', 'A1', 0))
+        self.assertFalse(dispatcher.wait_lock('C1', 'A2', 0))
+
+        dispatcher.remove_lock_waiter('C1', 'A1', wakeup_next=True)
+        self.assertTrue(dispatcher.is_first_lock_waiter('C1', 'A2'))
+        self.assertTrue(dispatcher.wait_lock('C1', 'A2', 0))
+
+        dispatcher.remove_lock_waiter('C1', 'A2')
+        self.assertNotIn('C1', dispatcher._LOCK_WAITERS)
+        self.assertFalse(dispatcher.wakeup_lock_waiter('C1'))
+
+    @mock.patch.object(eventlet, 'sleep')
+    def test_wait_lock_not_registered(self, mock_sleep):
+        self.assertFalse(dispatcher.wait_lock('C1', 'A1', 10))
+        mock_sleep.assert_called_once_with(10)
+
+    @mock.patch.object(dispatcher, 'notify', autospec=True)
+    def test_watch_lock_function(self, mock_notify):
+        res = dispatcher.watch_lock('C1', 'E1', 'E2')
+
+        self.assertEqual(mock_notify.return_value, res)
+        mock_notify.assert_called_once_with(dispatcher.WATCH_LOCK, 'E1',
+                                            cluster_id='C1', watcher_id='E2')
+
+    @mock.patch.object(dispatcher, 'wakeup_lock_waiter')
+    @mock.patch.object(dispatcher, 'notify')
+    def test_release_lock(self, mock_notify, mock_wakeup):
+        dispatcher.add_lock_watcher('C1', 'E1')
+        dispatcher.add_lock_watcher('C1', 'E1')
+
+        dispatcher.release_lock('C1')
+
+        mock_wakeup.assert_called_once_with('C1')
+        mock_notify.assert_called_once_with(dispatcher.LOCK_RELEASED, 'E1',
+                                            cluster_id='C1')
+        self.assertNotIn('C1', dispatcher._LOCK_WATCHERS)
@@ -21,6 +21,7 @@ from oslo_utils import uuidutils
 from senlin.common import consts
 from senlin.common import context
 from senlin.common import messaging as rpc_messaging
+from senlin.engine import metrics
 from senlin.engine import service
 from senlin.objects import service as service_obj
 from senlin.tests.unit.common import base
@@ -82,9 +83,10 @@ class EngineBasicTest(base.SenlinTestCase):
         self.assertEqual(self.fake_rpc_server, self.eng._rpc_server)
         self.fake_rpc_server.start.assert_called_once_with()
 
+    @mock.patch('senlin.engine.event.flush')
     @mock.patch.object(service_obj.Service, 'delete')
-    def test_engine_stop(self, mock_delete, mock_msg_cls, mock_hm_cls,
-                         mock_disp_cls):
+    def test_engine_stop(self, mock_delete, mock_flush, mock_msg_cls,
+                         mock_hm_cls, mock_disp_cls):
         mock_disp = mock_disp_cls.return_value
         mock_hm = mock_hm_cls.return_value
         self.eng.start()
@@ -96,6 +98,7 @@ class EngineBasicTest(base.SenlinTestCase):
 
         mock_disp.stop.assert_called_once_with()
         mock_hm.stop.assert_called_once_with()
+        mock_flush.assert_called_once_with()
 
         mock_delete.assert_called_once_with(self.fake_id)
 
@@ -163,8 +166,30 @@ class EngineStatusTest(base.SenlinTestCase):
     @mock.patch.object(service_obj.Service, 'update')
     def test_service_manage_report_update(self, mock_update):
         mock_update.return_value = mock.Mock()
+        self.eng.TG = mock.Mock(running_actions=3)
         self.eng.service_manage_report()
-        mock_update.assert_called_once_with(mock.ANY, self.eng.engine_id)
+        mock_update.assert_called_once_with(mock.ANY, self.eng.engine_id,
+                                            {'load': 3})
+
+    @mock.patch.object(metrics, 'dump')
+    def test_service_manage_metrics(self, mock_dump):
+        self.eng.TG = mock.Mock()
+        self.eng.engine_id = 'ENGINE'
+
+        self.eng.service_manage_metrics()
+
+        self.eng.TG.update_metrics.assert_called_once_with('ENGINE')
+        mock_dump.assert_called_once_with('ENGINE')
+
+    @mock.patch.object(metrics, 'dump')
+    def test_service_manage_metrics_with_exception(self, mock_dump):
+        self.eng.TG = mock.Mock()
+        mock_dump.side_effect = IOError('boom')
+
+        # the error is only logged
+        self.eng.service_manage_metrics()
+
+        mock_dump.assert_called_once_with(self.eng.engine_id)
 
     @mock.patch.object(service_obj.Service, 'gc_by_engine')
     @mock.patch.object(service_obj.Service, 'get_all')
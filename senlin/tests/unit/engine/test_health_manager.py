@@ -673,6 +673,42 @@ class TestNodePollStatusHealthCheck(base.SenlinTestCase):
         self.assertTrue(res)
         mock_tu.assert_called_once_with(node.updated_at, 1)
 
+    @mock.patch.object(tu, 'is_older_than')
+    @mock.patch.object(hm.profile_base.Profile, 'check_objects')
+    def test_run_health_checks(self, mock_check, mock_tu):
+        mock_tu.return_value = True
+        mock_check.return_value = {'NODE1': True, 'NODE2': False}
+
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='NODE1')
+        node2 = mock.Mock(id='NODE2', updated_at='2018-08-13 18:00:00')
+        nodes = [node1, node2]
+
+        # do it
+        res = self.hc.run_health_checks(ctx, nodes)
+
+        self.assertEqual({'NODE1': True, 'NODE2': False}, res)
+        mock_check.assert_called_once_with(ctx, nodes)
+        mock_tu.assert_called_once_with(node2.updated_at, 1)
+
+    @mock.patch.object(node_mod.Node, '_from_object')
+    @mock.patch.object(hm.profile_base.Profile, 'check_objects')
+    def test_run_health_checks_object_not_found(self, mock_check,
+                                                mock_node_obj):
+        # the server of NODE2 is not listed
+        mock_check.return_value = {'NODE1': True}
+
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='NODE1')
+        node2 = mock.Mock(id='NODE2')
+
+        # do it
+        res = self.hc.run_health_checks(ctx, [node1, node2])
+
+        # NODE2 is left to be checked on its own
+        self.assertEqual({'NODE1': True}, res)
+        self.assertFalse(mock_node_obj.called)
+
 
 class TestNodePollUrlHealthCheck(base.SenlinTestCase):
     def setUp(self):
@@ -923,6 +959,133 @@ class TestNodePollUrlHealthCheck(base.SenlinTestCase):
         )
         mock_sleep.assert_not_called()
 
+    @mock.patch.object(hm.eventlet, 'sleep')
+    @mock.patch.object(tu, 'is_older_than')
+    @mock.patch.object(hm.prober, 'get_prober')
+    def test_run_health_checks(self, mock_prober, mock_older, mock_sleep):
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='NODE1', status=consts.NS_ACTIVE)
+        node1.name = 'node1'
+        node2 = mock.Mock(id='NODE2', status=consts.NS_ACTIVE)
+        node2.name = 'node2'
+        node3 = mock.Mock(id='NODE3', status=consts.NS_ACTIVE)
+        node3.name = 'node3'
+        self.hc.params['poll_url'] = 'http://{nodename}/health'
+        mock_older.return_value = True
+        x_prober = mock_prober.return_value
+        err = utils.URLFetchError('Error')
+        x_prober.fetch_many.side_effect = [
+            {
+                'NODE1': 'FAKE_HEALTHY_PATTERN',
+                'NODE2': 'BROKEN',
+                'NODE3': err,
+            },
+            {
+                'NODE2': 'FAKE_HEALTHY_PATTERN',
+                'NODE3': err,
+            },
+        ]
+
+        # do it
+        res = self.hc.run_health_checks(ctx, [node1, node2, node3])
+
+        self.assertEqual({'NODE1': True, 'NODE2': True, 'NODE3': False}, res)
+        x_prober.fetch_many.assert_has_calls([
+            mock.call({'NODE1': 'http://node1/health',
+                       'NODE2': 'http://node2/health',
+                       'NODE3': 'http://node3/health'},
+                      timeout=1, verify=True, concurrency=10, watch=None),
+            mock.call({'NODE2': 'http://node2/health',
+                       'NODE3': 'http://node3/health'},
+                      timeout=1, verify=True, concurrency=10, watch=None),
+        ])
+        # the nodes are retried together, not one by one
+        mock_sleep.assert_called_once_with(1)
+
+    @mock.patch.object(hm.eventlet, 'sleep')
+    @mock.patch.object(tu, 'is_older_than')
+    @mock.patch.object(hm.prober, 'get_prober')
+    def test_run_health_checks_deadline(self, mock_prober, mock_older,
+                                        mock_sleep):
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='NODE1', status=consts.NS_ACTIVE)
+        node2 = mock.Mock(id='NODE2', status=consts.NS_ACTIVE)
+        mock_older.return_value = True
+        x_prober = mock_prober.return_value
+        x_prober.fetch_many.return_value = {'NODE1': 'BROKEN',
+                                            'NODE2': 'FAKE_HEALTHY_PATTERN'}
+        watch = mock.Mock()
+        # less time is left than the retry interval
+        watch.leftover.return_value = 0.5
+
+        # do it
+        res = self.hc.run_health_checks(ctx, [node1, node2], watch)
+
+        # NODE1 is left to the next round instead of being probed again
+        self.assertEqual({'NODE2': True}, res)
+        self.assertEqual(1, x_prober.fetch_many.call_count)
+        self.assertEqual(watch, x_prober.fetch_many.call_args[1]['watch'])
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(hm.eventlet, 'sleep')
+    @mock.patch.object(tu, 'is_older_than')
+    @mock.patch.object(hm.prober, 'get_prober')
+    def test_run_health_checks_deadline_not_probed(self, mock_prober,
+                                                   mock_older, mock_sleep):
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='NODE1', status=consts.NS_ACTIVE)
+        node2 = mock.Mock(id='NODE2', status=consts.NS_ACTIVE)
+        self.hc.params['poll_url_retry_limit'] = 1
+        mock_older.return_value = True
+        x_prober = mock_prober.return_value
+        # the URL of NODE2 is not probed before the deadline
+        x_prober.fetch_many.return_value = {'NODE1': 'BROKEN'}
+        watch = mock.Mock()
+        watch.leftover.return_value = 0
+
+        # do it
+        res = self.hc.run_health_checks(ctx, [node1, node2], watch)
+
+        self.assertEqual({'NODE1': False}, res)
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(hm.eventlet, 'sleep')
+    @mock.patch.object(tu, 'is_older_than')
+    @mock.patch.object(hm.prober, 'get_prober')
+    def test_run_health_checks_skip_recovery(self, mock_prober, mock_older,
+                                             mock_sleep):
+        ctx = mock.Mock()
+        node1 = mock.Mock(id='NODE1', status=consts.NS_ACTIVE,
+                          updated_at='2018-08-13 18:00:00')
+        node2 = mock.Mock(id='NODE2', status=consts.NS_ERROR)
+        node3 = mock.Mock(id='NODE3', status=consts.NS_ACTIVE)
+        self.hc.params['poll_url_conn_error_as_unhealthy'] = False
+        # NODE1 was updated recently
+        mock_older.return_value = False
+        x_prober = mock_prober.return_value
+        x_prober.fetch_many.return_value = {
+            'NODE1': 'BROKEN',
+            'NODE2': 'BROKEN',
+            'NODE3': utils.URLFetchError('Error'),
+        }
+
+        # do it
+        res = self.hc.run_health_checks(ctx, [node1, node2, node3])
+
+        self.assertEqual({'NODE1': True, 'NODE2': True, 'NODE3': True}, res)
+        self.assertEqual(1, x_prober.fetch_many.call_count)
+        mock_older.assert_called_once_with(node1.updated_at, 1)
+        mock_sleep.assert_not_called()
+
+    def test_is_healthy_response(self):
+        self.assertTrue(self.hc._is_healthy_response(
+            'contains FAKE_HEALTHY_PATTERN'))
+        self.assertFalse(self.hc._is_healthy_response('BROKEN'))
+
+        # the pattern is compiled only once
+        self.assertEqual(['FAKE_HEALTHY_PATTERN'],
+                         list(self.hc._healthy_patterns))
+
 
 class TestHealthManager(base.SenlinTestCase):
 
@@ -948,9 +1111,14 @@ class TestHealthManager(base.SenlinTestCase):
         self.hm._dummy_task()
         mock_load.assert_called_once_with()
 
+    @mock.patch.object(hr.HealthRegistry, 'get_orphans')
+    @mock.patch.object(utils, 'get_live_engines')
     @mock.patch.object(hm.HealthManager, "_start_check")
     @mock.patch.object(hr.HealthRegistry, 'claim')
-    def test_load_runtime_registry(self, mock_claim, mock_check):
+    def test_load_runtime_registry(self, mock_claim, mock_check, mock_live,
+                                   mock_orphans):
+        mock_live.return_value = frozenset(['ENGINE_ID'])
+        mock_orphans.return_value = ['CID1', 'CID2']
         fake_claims = [
             {
                 'cluster_id': 'CID1',
@@ -977,12 +1145,83 @@ class TestHealthManager(base.SenlinTestCase):
         self.hm._load_runtime_registry()
 
         # assertions
-        mock_claim.assert_called_once_with(self.hm.ctx, self.hm.engine_id)
+        mock_live.assert_called_once_with(self.hm.ctx)
+        mock_orphans.assert_called_once_with(self.hm.ctx)
+        mock_claim.assert_called_once_with(self.hm.ctx, self.hm.engine_id,
+                                           cluster_ids=['CID1', 'CID2'])
         mock_check.assert_has_calls(
             [
                 mock.call(fake_claims[0])
             ]
         )
+        self.assertEqual(frozenset(['ENGINE_ID']), self.hm._live_engines)
+
+    @mock.patch.object(hr.HealthRegistry, 'get_orphans')
+    @mock.patch.object(utils, 'get_live_engines')
+    @mock.patch.object(hr.HealthRegistry, 'claim')
+    def test_load_runtime_registry_engines_unchanged(self, mock_claim,
+                                                     mock_live, mock_orphans):
+        mock_live.return_value = frozenset(['ENGINE_ID'])
+        mock_orphans.return_value = []
+        self.hm._live_engines = frozenset(['ENGINE_ID'])
+        self.hm._ring = hm.hash_ring.HashRing(['ENGINE_ID'])
+
+        with mock.patch.object(self.hm, '_release_registries') as mock_rel:
+            self.hm._load_runtime_registry()
+
+        mock_live.assert_called_once_with(self.hm.ctx)
+        self.assertEqual(0, mock_rel.call_count)
+        self.assertEqual(0, mock_claim.call_count)
+
+    @mock.patch.object(hr.HealthRegistry, 'get_orphans')
+    @mock.patch.object(utils, 'get_live_engines')
+    @mock.patch.object(hr.HealthRegistry, 'claim')
+    def test_load_runtime_registry_other_engines(self, mock_claim, mock_live,
+                                                 mock_orphans):
+        mock_live.return_value = frozenset(['ENGINE_ID', 'OTHER_ENGINE'])
+        mock_orphans.return_value = ['CID1', 'CID2']
+
+        with mock.patch.object(hm.hash_ring.HashRing,
+                               'get_member') as mock_member:
+            mock_member.side_effect = lambda cid: {
+                'CID1': 'OTHER_ENGINE', 'CID2': 'ENGINE_ID'}[cid]
+            self.hm._load_runtime_registry()
+
+        # only the clusters which belong to this engine are claimed
+        mock_claim.assert_called_once_with(self.hm.ctx, 'ENGINE_ID',
+                                           cluster_ids=['CID2'])
+        self.assertEqual(frozenset(['ENGINE_ID', 'OTHER_ENGINE']),
+                         self.hm._live_engines)
+
+    @mock.patch.object(hr.HealthRegistry, 'release')
+    @mock.patch.object(hm.HealthManager, '_stop_check')
+    def test_release_registries(self, mock_stop, mock_release):
+        entry1 = {'cluster_id': 'CID1', 'enabled': True}
+        entry2 = {'cluster_id': 'CID2', 'enabled': True}
+        self.hm.rt['registries'] = [entry1, entry2]
+        self.hm._ring = mock.Mock()
+        self.hm._ring.get_member.side_effect = lambda cid: {
+            'CID1': 'OTHER_ENGINE', 'CID2': 'ENGINE_ID'}[cid]
+
+        self.hm._release_registries()
+
+        self.assertEqual([entry2], self.hm.registries)
+        mock_stop.assert_called_once_with(entry1)
+        mock_release.assert_called_once_with(self.hm.ctx, 'ENGINE_ID',
+                                             ['CID1'])
+
+    @mock.patch.object(hr.HealthRegistry, 'release')
+    @mock.patch.object(hm.HealthManager, '_stop_check')
+    def test_release_registries_none(self, mock_stop, mock_release):
+        entry = {'cluster_id': 'CID1', 'enabled': True}
+        self.hm.rt['registries'] = [entry]
+        self.hm._ring = hm.hash_ring.HashRing(['ENGINE_ID'])
+
+        self.hm._release_registries()
+
+        self.assertEqual([entry], self.hm.registries)
+        mock_stop.assert_not_called()
+        mock_release.assert_not_called()
 
     @mock.patch.object(obj_profile.Profile, 'get')
     @mock.patch.object(obj_cluster.Cluster, 'get')
@@ -1251,7 +1490,8 @@ class TestHealthManager(base.SenlinTestCase):
         x_node2 = mock.Mock(id='FAKE_NODE2', status="ERROR")
         mock_nodes.return_value = [x_node1, x_node2]
 
-        hc_true = {'run_health_check.return_value': True}
+        hc_true = {'run_health_check.return_value': True,
+                   'run_health_checks.return_value': {}}
 
         hc_test_values = [
             [
@@ -1320,8 +1560,10 @@ class TestHealthManager(base.SenlinTestCase):
 
         mock_recover.return_value = {'action': 'FAKE_ACTION_ID'}
 
-        hc_true = {'run_health_check.return_value': True}
-        hc_false = {'run_health_check.return_value': False}
+        hc_true = {'run_health_check.return_value': True,
+                   'run_health_checks.return_value': {}}
+        hc_false = {'run_health_check.return_value': False,
+                    'run_health_checks.return_value': {}}
 
         hc_test_values = [
             [
@@ -1400,8 +1642,10 @@ class TestHealthManager(base.SenlinTestCase):
         x_node = mock.Mock(id='FAKE_NODE1', status="ERROR")
         mock_nodes.return_value = [x_node]
 
-        hc_true = {'run_health_check.return_value': True}
-        hc_false = {'run_health_check.return_value': False}
+        hc_true = {'run_health_check.return_value': True,
+                   'run_health_checks.return_value': {}}
+        hc_false = {'run_health_check.return_value': False,
+                    'run_health_checks.return_value': {}}
 
         hc_test_values = [
             [
@@ -1488,7 +1732,8 @@ class TestHealthManager(base.SenlinTestCase):
 
         mock_recover.return_value = {'action': 'FAKE_ACTION_ID'}
 
-        hc_false = {'run_health_check.return_value': False}
+        hc_false = {'run_health_check.return_value': False,
+                    'run_health_checks.return_value': {}}
 
         hc_test_values = [
             [
@@ -1547,6 +1792,140 @@ class TestHealthManager(base.SenlinTestCase):
 
         mock_ctx.assert_not_called()
 
+    @mock.patch.object(hm.LOG, 'warning')
+    @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
+    @mock.patch.object(hm.HealthManager, "_recover_node")
+    @mock.patch.object(obj_cluster.Cluster, 'get')
+    @mock.patch.object(context, 'get_service_context')
+    def test_execute_health_check_invalid_cond(
+            self, mock_ctx, mock_get, mock_recover, mock_nodes, mock_log):
+        mock_get.return_value = mock.Mock(user='USER_ID',
+                                          project='PROJECT_ID')
+
+        self.hm._execute_health_check(1, 'CLUSTER_ID', {}, 'blah', 1)
+
+        mock_nodes.assert_not_called()
+        mock_recover.assert_not_called()
+        mock_log.assert_called_once_with(
+            'Error while performing health check: %s', mock.ANY)
+
+    @mock.patch.object(hm.metrics, 'inc')
+    @mock.patch.object(hm.HealthManager, '_check_nodes')
+    @mock.patch.object(obj_node.Node, 'get_all_by_cluster')
+    @mock.patch.object(hm.HealthManager, "_recover_node")
+    @mock.patch.object(hm.HealthManager, "_wait_for_action")
+    @mock.patch.object(obj_cluster.Cluster, 'get')
+    @mock.patch.object(context, 'get_service_context')
+    def test_execute_health_check_skipped(self, mock_ctx, mock_get, mock_wait,
+                                          mock_recover, mock_nodes,
+                                          mock_check, mock_inc):
+        mock_get.return_value = mock.Mock(user='USER_ID',
+                                          project='PROJECT_ID')
+        ctx = mock.Mock()
+        mock_ctx.return_value = ctx
+        x_node1 = mock.Mock(id='NODE1')
+        x_node2 = mock.Mock(id='NODE2')
+        x_node3 = mock.Mock(id='NODE3')
+        mock_nodes.return_value = [x_node1, x_node2, x_node3]
+        # NODE3 was not checked before the deadline
+        mock_check.return_value = {'NODE1': True, 'NODE2': False}
+        mock_recover.return_value = {'action': 'FAKE_ACTION_ID'}
+        mock_wait.return_value = (True, "")
+
+        self.hm._execute_health_check(10, 'CLUSTER_ID', {},
+                                      consts.ANY_FAILED, 1)
+
+        mock_check.assert_called_once_with(
+            ctx, 'CLUSTER_ID', [x_node1, x_node2, x_node3],
+            consts.ANY_FAILED, mock.ANY)
+        mock_recover.assert_called_once_with('NODE2', ctx, {})
+        mock_inc.assert_called_once_with(hm.metrics.HEALTH_CHECKS_SKIPPED, 1)
+
+    @mock.patch.object(hm.metrics, 'inc')
+    @mock.patch.object(hm.metrics, 'observe')
+    @mock.patch.object(tu, 'StopWatch')
+    @mock.patch.object(obj_cluster.Cluster, 'get')
+    def test_execute_health_check_overrun(self, mock_get, mock_watch,
+                                          mock_observe, mock_inc):
+        mock_get.return_value = None
+        watch = mock_watch.return_value.start.return_value
+        watch.elapsed.return_value = 12.5
+
+        self.hm._execute_health_check(10, 'CLUSTER_ID', {},
+                                      consts.ANY_FAILED, 1)
+
+        mock_watch.assert_called_once_with(duration=10)
+        mock_observe.assert_called_once_with(
+            hm.metrics.HEALTH_SWEEP_SECONDS, 12.5)
+        mock_inc.assert_called_once_with(hm.metrics.HEALTH_SWEEP_OVERRUNS)
+
+    def test_check_nodes(self):
+        ctx = mock.Mock()
+        x_node1 = mock.Mock(id='NODE1')
+        x_node2 = mock.Mock(id='NODE2')
+        hc = mock.Mock()
+        hc.run_health_checks.return_value = {}
+        hc.run_health_check.side_effect = lambda c, n: n.id == 'NODE1'
+        self.hm.health_check_types = {'CLUSTER_ID': [hc]}
+        watch = tu.StopWatch(duration=10).start()
+
+        res = self.hm._check_nodes(ctx, 'CLUSTER_ID', [x_node1, x_node2],
+                                   consts.ANY_FAILED, watch)
+
+        self.assertEqual({'NODE1': True, 'NODE2': False}, res)
+        hc.run_health_check.assert_has_calls(
+            [mock.call(ctx, x_node1), mock.call(ctx, x_node2)],
+            any_order=True)
+
+    @mock.patch.object(hm.LOG, 'warning')
+    def test_check_nodes_failed(self, mock_log):
+        x_node = mock.Mock(id='NODE1')
+        hc = mock.Mock()
+        hc.run_health_checks.return_value = {}
+        hc.run_health_check.side_effect = Exception('boom')
+        self.hm.health_check_types = {'CLUSTER_ID': [hc]}
+        watch = tu.StopWatch(duration=10).start()
+
+        res = self.hm._check_nodes(mock.Mock(), 'CLUSTER_ID', [x_node],
+                                   consts.ANY_FAILED, watch)
+
+        # a node whose check failed is neither healthy nor unhealthy
+        self.assertEqual({}, res)
+        self.assertEqual(1, mock_log.call_count)
+
+    def test_check_nodes_bulk(self):
+        ctx = mock.Mock()
+        x_node1 = mock.Mock(id='NODE1')
+        x_node2 = mock.Mock(id='NODE2')
+        hc = mock.Mock()
+        hc.run_health_checks.return_value = {'NODE1': False}
+        hc.run_health_check.return_value = True
+        self.hm.health_check_types = {'CLUSTER_ID': [hc]}
+        watch = tu.StopWatch(duration=10).start()
+
+        res = self.hm._check_nodes(ctx, 'CLUSTER_ID', [x_node1, x_node2],
+                                   consts.ANY_FAILED, watch)
+
+        self.assertEqual({'NODE1': False, 'NODE2': True}, res)
+        hc.run_health_checks.assert_called_once_with(
+            ctx, [x_node1, x_node2], watch)
+        hc.run_health_check.assert_called_once_with(ctx, x_node2)
+
+    def test_check_nodes_deadline(self):
+        x_node = mock.Mock(id='NODE1')
+        hc = mock.Mock()
+        hc.run_health_checks.return_value = {}
+        self.hm.health_check_types = {'CLUSTER_ID': [hc]}
+        watch = mock.Mock()
+        watch.expired.return_value = True
+        watch.leftover.return_value = 0
+
+        res = self.hm._check_nodes(mock.Mock(), 'CLUSTER_ID', [x_node],
+                                   consts.ANY_FAILED, watch)
+
+        self.assertEqual({}, res)
+        hc.run_health_check.assert_not_called()
+
     def test_start_check_invalid_type(self):
         entry = {
             'cluster_id': 'CCID',
@@ -1586,7 +1965,7 @@ class TestHealthManager(base.SenlinTestCase):
         expected['timer'] = x_timer
         self.assertEqual(expected, res)
         mock_add_timer.assert_called_once_with(
-            self.hm._execute_health_check, None, None, 12, 'CCID',
+            self.hm._execute_health_check, mock.ANY, None, 12, 'CCID',
             {'operation': 'REBUILD'}, 'ANY_FAILED', 1)
         mock_add_hc.assert_called_once_with('CCID', mock.ANY)
         mock_hc_factory.assert_called_once_with(
@@ -1617,7 +1996,7 @@ class TestHealthManager(base.SenlinTestCase):
         expected['timer'] = x_timer
         self.assertEqual(expected, res)
         mock_add_timer.assert_called_once_with(
-            self.hm._execute_health_check, None, None, 12, 'CCID',
+            self.hm._execute_health_check, mock.ANY, None, 12, 'CCID',
             {'operation': 'REBUILD'}, 'ANY_FAILED', 1)
         mock_add_hc.assert_called_once_with('CCID', mock.ANY)
         mock_hc_factory.assert_called_once_with(
@@ -1651,7 +2030,7 @@ class TestHealthManager(base.SenlinTestCase):
         expected['timer'] = x_timer
         self.assertEqual(expected, res)
         mock_add_timer.assert_called_once_with(
-            self.hm._execute_health_check, None, None, 12, 'CCID',
+            self.hm._execute_health_check, mock.ANY, None, 12, 'CCID',
             {'operation': 'REBUILD'}, 'ALL_FAILED', 1)
         mock_add_hc.assert_has_calls(
             [
@@ -1670,6 +2049,90 @@ class TestHealthManager(base.SenlinTestCase):
             ]
         )
 
+    @mock.patch.object(hm.time, 'time')
+    @mock.patch.object(hm, '_get_phase')
+    @mock.patch.object(threadgroup.ThreadGroup, 'add_dynamic_timer')
+    @mock.patch.object(hm.HealthCheckType, 'factory')
+    def test_start_check_spread(self, mock_hc_factory, mock_add_timer,
+                                mock_phase, mock_time):
+        cfg.CONF.set_override('health_check_jitter', 0.2,
+                              group='health_manager')
+        mock_phase.return_value = 0.35
+        mock_time.return_value = 1002.0
+        entry = {
+            'cluster_id': 'CCID',
+            'interval': 20,
+            'check_type': consts.NODE_STATUS_POLLING,
+            'params': {
+                'recovery_conditional': 'ANY_FAILED',
+                'node_update_timeout': 1,
+            },
+        }
+
+        self.hm._start_check(entry)
+
+        mock_phase.assert_called_once_with('CCID', 0.2)
+        # the check fires at 1007s, i.e. 35% into an interval
+        delay = mock_add_timer.call_args[0][1]
+        self.assertAlmostEqual(5.0, delay)
+        self.assertAlmostEqual(0.35, self.hm._timer_phases['CCID'])
+        self.assertEqual(1, self.hm._timer_slots[3])
+
+    def test_get_phase(self):
+        phases = [hm._get_phase('cluster-%s' % i) for i in range(1000)]
+
+        self.assertEqual(phases[0], hm._get_phase('cluster-0'))
+        self.assertTrue(all(0 <= p < 1 for p in phases))
+        # the phases are spread over the interval
+        for slot in range(hm.TIMER_SLOTS):
+            count = len([p for p in phases
+                         if int(p * hm.TIMER_SLOTS) == slot])
+            self.assertTrue(50 < count < 150)
+
+    def test_get_phase_jitter(self):
+        phase = hm._get_phase('cluster-0')
+        jittered = hm._get_phase('cluster-0', 0.2)
+
+        # the jitter is derived from the cluster ID as well
+        self.assertEqual(jittered, hm._get_phase('cluster-0', 0.2))
+        self.assertTrue(0 <= (jittered - phase) % 1.0 < 0.2)
+
+    @mock.patch.object(hm.metrics, 'set_gauge')
+    def test_set_timer_phase(self, mock_gauge):
+        self.hm._set_timer_phase('CID1', 0.05)
+        self.hm._set_timer_phase('CID2', 0.08)
+        self.hm._set_timer_phase('CID3', 0.95)
+        mock_gauge.reset_mock()
+
+        # a restarted timer moves to its new slot
+        self.hm._set_timer_phase('CID3', 0.55)
+
+        self.assertEqual([2, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+                         self.hm._timer_slots)
+        mock_gauge.assert_has_calls([
+            mock.call(hm.metrics.HEALTH_CHECK_TIMERS, 3),
+            mock.call(hm.metrics.HEALTH_TIMER_SLOT_TIMERS, 1, slot='5'),
+            mock.call(hm.metrics.HEALTH_TIMER_SLOT_TIMERS, 0, slot='9'),
+        ])
+        self.assertEqual(3, mock_gauge.call_count)
+
+    @mock.patch.object(hm.metrics, 'set_gauge')
+    def test_set_timer_phase_stopped(self, mock_gauge):
+        self.hm._set_timer_phase('CID1', 0.05)
+        self.hm._set_timer_phase('CID2', 0.08)
+        mock_gauge.reset_mock()
+
+        self.hm._set_timer_phase('CID1', None)
+        self.hm._set_timer_phase('CID_UNKNOWN', None)
+
+        self.assertEqual({'CID2': 0.08}, self.hm._timer_phases)
+        self.assertEqual(1, self.hm._timer_slots[0])
+        mock_gauge.assert_has_calls([
+            mock.call(hm.metrics.HEALTH_CHECK_TIMERS, 1),
+            mock.call(hm.metrics.HEALTH_TIMER_SLOT_TIMERS, 1, slot='0'),
+        ])
+        self.assertEqual(2, mock_gauge.call_count)
+
     def test_start_check_for_listening(self):
         x_listener = mock.Mock()
         mock_add_listener = self.patchobject(self.hm, '_add_listener',
@@ -1722,6 +2185,7 @@ class TestHealthManager(base.SenlinTestCase):
         x_hc_types.__contains__.return_value = True
         x_hc_types.__iter__.return_value = ['CLUSTER_ID']
         self.hm.health_check_types = x_hc_types
+        self.hm._set_timer_phase('CLUSTER_ID', 0.5)
 
         # do it
         res = self.hm._stop_check(entry)
@@ -1730,6 +2194,8 @@ class TestHealthManager(base.SenlinTestCase):
         x_timer.stop.assert_called_once_with()
         mock_timer_done.assert_called_once_with(x_timer)
         x_hc_types.pop.assert_called_once_with('CLUSTER_ID')
+        self.assertEqual({}, self.hm._timer_phases)
+        self.assertEqual([0] * hm.TIMER_SLOTS, self.hm._timer_slots)
 
     def test_stop_check_with_listener(self):
         x_thread = mock.Mock()
@@ -1912,6 +2378,42 @@ class TestHealthManager(base.SenlinTestCase):
                       self.hm.rt['registries'])
         mock_update.assert_called_once_with(ctx, 'FAKE_ID', {'enabled': False})
 
+    @mock.patch.object(context, 'get_admin_context')
+    @mock.patch.object(utils, 'get_live_engines')
+    def test_get_owner_engine(self, mock_live, mock_ctx):
+        mock_live.return_value = frozenset(['E1', 'E2'])
+
+        result = hm.get_owner_engine('CID')
+
+        self.assertIn(result, ['E1', 'E2'])
+        self.assertEqual(result, hm.get_owner_engine('CID'))
+        mock_live.assert_called_with(mock_ctx.return_value)
+
+    @mock.patch.object(hm, 'notify')
+    @mock.patch.object(hm, 'get_owner_engine')
+    def test_register(self, mock_owner, mock_notify):
+        mock_owner.return_value = 'E1'
+
+        hm.register('CID', engine_id=None, interval=30)
+
+        mock_owner.assert_called_once_with('CID')
+        mock_notify.assert_called_once_with(
+            'E1', 'register_cluster', cluster_id='CID', interval=30,
+            node_update_timeout=300, params={}, enabled=True)
+
+    @mock.patch.object(hr.HealthRegistry, 'delete')
+    @mock.patch.object(hm, 'notify')
+    @mock.patch.object(hm, 'get_manager_engine')
+    def test_unregister_released(self, mock_engine, mock_notify,
+                                 mock_delete):
+        mock_engine.return_value = None
+
+        res = hm.unregister('CID')
+
+        self.assertTrue(res)
+        mock_notify.assert_not_called()
+        mock_delete.assert_called_once_with(mock.ANY, 'CID')
+
     @mock.patch.object(context, 'get_admin_context')
     @mock.patch.object(hr.HealthRegistry, 'get')
     def test_get_manager_engine(self, mock_get, mock_ctx):
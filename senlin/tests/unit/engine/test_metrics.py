@@ -0,0 +1,121 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+import os
+import shutil
+import tempfile
+
+from oslo_config import cfg
+
+from senlin.engine import metrics
+from senlin.tests.unit.common import base
+
+
+class TestMetrics(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestMetrics, self).setUp()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_histogram(self):
+        histogram = metrics.Histogram(buckets=(1, 10))
+        histogram.observe(0.5)
+        histogram.observe(1)
+        histogram.observe(5)
+        histogram.observe(50)
+
+        self.assertEqual({
+            'count': 4,
+            'sum': 56.5,
+            'buckets': [('1', 2), ('10', 3), ('+Inf', 4)],
+        }, histogram.to_dict())
+
+    def test_get_stats(self):
+        metrics.set_gauge('GAUGE', 3, engine='E1')
+        metrics.set_gauge('GAUGE', 5, engine='E1')
+        metrics.inc('COUNTER', action='A', status='OK')
+        metrics.inc('COUNTER', action='A', status='OK')
+        metrics.observe('HISTOGRAM', 2, action='A')
+
+        res = metrics.get_stats()
+
+        self.assertEqual(3, len(res))
+        self.assertEqual({'name': 'GAUGE', 'type': 'gauge',
+                          'labels': {'engine': 'E1'}, 'value': 5}, res[0])
+        self.assertEqual({'name': 'COUNTER', 'type': 'counter',
+                          'labels': {'action': 'A', 'status': 'OK'},
+                          'value': 2}, res[1])
+        self.assertEqual('histogram', res[2]['type'])
+        self.assertEqual(1, res[2]['count'])
+        self.assertEqual(2, res[2]['sum'])
+
+    def test_disabled(self):
+        cfg.CONF.set_override('enabled', False, group='metrics')
+
+        metrics.set_gauge('GAUGE', 3)
+        metrics.inc('COUNTER')
+        metrics.observe('HISTOGRAM', 2)
+
+        self.assertEqual([], metrics.get_stats())
+
+    def test_render_text(self):
+        metrics.inc('counter_total', action='CLUSTER_CREATE')
+        metrics.observe('duration_seconds', 0.2, action='CLUSTER_CREATE')
+
+        res = metrics.render_text()
+
+        lines = res.splitlines()
+        self.assertEqual('# TYPE counter_total counter', lines[0])
+        self.assertEqual('counter_total{action="CLUSTER_CREATE"} 1',
+                         lines[1])
+        self.assertEqual('# TYPE duration_seconds histogram', lines[2])
+        self.assertIn('duration_seconds_bucket{action="CLUSTER_CREATE",'
+                      'le="0.1"} 0', lines)
+        self.assertIn('duration_seconds_bucket{action="CLUSTER_CREATE",'
+                      'le="0.5"} 1', lines)
+        self.assertIn('duration_seconds_bucket{action="CLUSTER_CREATE",'
+                      'le="+Inf"} 1', lines)
+        self.assertIn('duration_seconds_sum{action="CLUSTER_CREATE"} 0.2',
+                      lines)
+        self.assertIn('duration_seconds_count{action="CLUSTER_CREATE"} 1',
+                      lines)
+
+    def test_get_dump_file(self):
+        self.assertIsNone(metrics.get_dump_file('E1'))
+
+        cfg.CONF.set_override('dump_dir', '/tmp/metrics', group='metrics')
+        self.assertEqual('/tmp/metrics/senlin-engine-E1.prom',
+                         metrics.get_dump_file('E1'))
+
+        cfg.CONF.set_override('dump_format', 'json', group='metrics')
+        self.assertEqual('/tmp/metrics/senlin-engine-E1.json',
+                         metrics.get_dump_file('E1'))
+
+    def test_dump(self):
+        dump_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dump_dir)
+        cfg.CONF.set_override('dump_dir', dump_dir, group='metrics')
+        metrics.set_gauge('GAUGE', 3)
+
+        metrics.dump('E1')
+        with open(os.path.join(dump_dir, 'senlin-engine-E1.prom')) as f:
+            self.assertEqual('# TYPE GAUGE gauge\nGAUGE 3\n', f.read())
+
+        cfg.CONF.set_override('dump_format', 'json', group='metrics')
+        metrics.dump('E1')
+        with open(os.path.join(dump_dir, 'senlin-engine-E1.json')) as f:
+            self.assertEqual(metrics.get_stats(), json.load(f))
+
+        self.assertEqual(['senlin-engine-E1.json', 'senlin-engine-E1.prom'],
+                         sorted(os.listdir(dump_dir)))
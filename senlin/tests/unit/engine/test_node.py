@@ -93,6 +93,25 @@ class TestNode(base.SenlinTestCase):
         self.assertEqual({}, node_info.metadata)
         self.assertEqual({}, node_info.data)
 
+    def test_node_store_many(self):
+        node1 = nodem.Node('node1', PROFILE_ID, CLUSTER_ID, index=1,
+                           user=self.context.user_id,
+                           project=self.context.project_id)
+        node2 = nodem.Node('node2', PROFILE_ID, CLUSTER_ID, index=2,
+                           user=self.context.user_id,
+                           project=self.context.project_id)
+
+        res = nodem.Node.store_many(self.context, [node1, node2])
+
+        self.assertEqual([node1.id, node2.id], res)
+        for node in (node1, node2):
+            node_info = node_obj.Node.get(self.context, node.id)
+            self.assertEqual(node.name, node_info.name)
+            self.assertEqual(node.index, node_info.index)
+            self.assertEqual(CLUSTER_ID, node_info.cluster_id)
+            self.assertEqual('INIT', node_info.status)
+            self.assertIsNotNone(node_info.init_at)
+
     def test_node_store_update(self):
         node = nodem.Node('node1', PROFILE_ID, "", user=self.context.user_id,
                           project=self.context.project_id)
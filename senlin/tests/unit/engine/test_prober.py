@@ -0,0 +1,153 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+import mock
+from oslo_config import cfg
+import requests
+
+from senlin.common import utils
+from senlin.engine import metrics
+from senlin.engine import prober
+from senlin.tests.unit.common import base
+
+
+class TestHTTPProber(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestHTTPProber, self).setUp()
+        self.prober = prober.HTTPProber(10, 2)
+        self.session = mock.Mock()
+        self.prober._session = self.session
+
+    def _response(self, chunks, encoding='utf-8'):
+        resp = mock.Mock(encoding=encoding)
+        resp.iter_content.return_value = chunks
+        return resp
+
+    def test_init(self):
+        p = prober.HTTPProber(10, 2)
+
+        adapter = p._session.get_adapter('http://host/path')
+        self.assertEqual(adapter, p._session.get_adapter('https://host/'))
+        self.assertEqual(2, adapter._pool_maxsize)
+        self.assertEqual(10, p._pool.size)
+
+    @mock.patch.object(metrics, 'observe')
+    def test_fetch(self, mock_observe):
+        resp = self._response([b'HEAL', b'THY'])
+        self.session.get.return_value = resp
+
+        res = self.prober.fetch('http://host/health', timeout=3,
+                                verify=False)
+
+        self.assertEqual('HEALTHY', res)
+        self.session.get.assert_called_once_with(
+            'http://host/health', stream=True, verify=False, timeout=3)
+        resp.raise_for_status.assert_called_once_with()
+        resp.close.assert_called_once_with()
+        mock_observe.assert_called_once_with(metrics.HEALTH_PROBE_SECONDS,
+                                             mock.ANY)
+
+    @mock.patch.object(metrics, 'inc')
+    def test_fetch_connection_error(self, mock_inc):
+        self.session.get.side_effect = requests.exceptions.ConnectionError(
+            'refused')
+
+        self.assertRaises(utils.URLFetchError, self.prober.fetch,
+                          'http://host/health')
+
+        mock_inc.assert_called_once_with(metrics.HEALTH_PROBE_ERRORS)
+
+    def test_fetch_http_error(self):
+        resp = self._response([])
+        resp.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            '500')
+        self.session.get.return_value = resp
+
+        self.assertRaises(utils.URLFetchError, self.prober.fetch,
+                          'http://host/health')
+
+        resp.close.assert_called_once_with()
+
+    def test_fetch_too_large(self):
+        cfg.CONF.set_override('max_response_size', 4)
+        resp = self._response([b'HEAL', b'THY'])
+        self.session.get.return_value = resp
+
+        self.assertRaises(utils.URLFetchError, self.prober.fetch,
+                          'http://host/health')
+
+        resp.close.assert_called_once_with()
+
+    @mock.patch.object(prober.HTTPProber, 'fetch')
+    def test_fetch_many(self, mock_fetch):
+        err = utils.URLFetchError('boom')
+
+        def _fetch(url, timeout, verify):
+            if url == 'URL2':
+                raise err
+            return 'DATA_OF_' + url
+
+        mock_fetch.side_effect = _fetch
+
+        res = self.prober.fetch_many({'NODE1': 'URL1', 'NODE2': 'URL2'},
+                                     timeout=2, verify=False)
+
+        self.assertEqual({'NODE1': 'DATA_OF_URL1', 'NODE2': err}, res)
+        mock_fetch.assert_has_calls(
+            [mock.call('URL1', timeout=2, verify=False),
+             mock.call('URL2', timeout=2, verify=False)], any_order=True)
+
+    @mock.patch.object(prober.HTTPProber, 'fetch')
+    def test_fetch_many_concurrency(self, mock_fetch):
+        running = []
+        peak = []
+
+        def _fetch(url, timeout, verify):
+            running.append(url)
+            peak.append(len(running))
+            eventlet.sleep(0)
+            running.remove(url)
+            return url
+
+        mock_fetch.side_effect = _fetch
+        urls = dict(('NODE%s' % i, 'URL%s' % i) for i in range(5))
+
+        res = self.prober.fetch_many(urls, concurrency=2)
+
+        self.assertEqual(urls, res)
+        self.assertEqual(2, max(peak))
+
+    @mock.patch.object(prober.HTTPProber, 'fetch')
+    def test_fetch_many_deadline(self, mock_fetch):
+        watch = mock.Mock()
+        watch.expired.side_effect = [False, True]
+        mock_fetch.return_value = 'DATA'
+
+        res = self.prober.fetch_many({'NODE1': 'URL1', 'NODE2': 'URL2'},
+                                     watch=watch)
+
+        # the URL left when the deadline is reached is not fetched
+        self.assertEqual(1, len(res))
+        self.assertEqual(1, mock_fetch.call_count)
+
+    @mock.patch.object(prober, 'HTTPProber')
+    def test_get_prober(self, mock_prober):
+        self.patchobject(prober, '_prober', new=None)
+        cfg.CONF.set_override('probe_pool_size', 20, group='health_manager')
+
+        res = prober.get_prober()
+
+        self.assertEqual(mock_prober.return_value, res)
+        self.assertEqual(res, prober.get_prober())
+        mock_prober.assert_called_once_with(20, 10)
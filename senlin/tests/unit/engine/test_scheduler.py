@@ -16,9 +16,13 @@ from oslo_config import cfg
 from oslo_context import context as oslo_context
 from oslo_service import threadgroup
 
+from senlin.common import consts
 from senlin.db import api as db_api
 from senlin.engine.actions import base as actionm
+from senlin.engine import dispatcher
+from senlin.engine import metrics
 from senlin.engine import scheduler
+from senlin.objects import action as ao
 from senlin.tests.unit.common import base
 
 
@@ -72,6 +76,25 @@ class SchedulerTest(base.SenlinTestCase):
             cfg.CONF.periodic_interval,
             tgm._service_task)
 
+    @mock.patch.object(metrics, 'set_gauge')
+    @mock.patch.object(ao.Action, 'count_ready')
+    def test_update_metrics(self, mock_count, mock_gauge):
+        cfg.CONF.set_override('scheduler_thread_pool_size', 100)
+        mock_count.return_value = 7
+        mock_group = mock.Mock()
+        mock_group.pool.running.return_value = 3
+        self.mock_tg.return_value = mock_group
+        tgm = scheduler.ThreadGroupManager()
+
+        tgm.update_metrics('ENGINE')
+
+        mock_count.assert_called_once_with(tgm.db_session)
+        mock_gauge.assert_has_calls([
+            mock.call(metrics.THREADS_RUNNING, 3, engine='ENGINE'),
+            mock.call(metrics.THREAD_POOL_SIZE, 100, engine='ENGINE'),
+            mock.call(metrics.READY_ACTIONS, 7, engine='ENGINE'),
+        ])
+
     def test_start(self):
         def f():
             pass
@@ -87,7 +110,7 @@ class SchedulerTest(base.SenlinTestCase):
             oslo_context.get_current(),
             None, f)
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_batch')
     @mock.patch.object(db_api, 'action_acquire')
     def test_start_action(self, mock_action_acquire,
                           mock_action_acquire_1st):
@@ -96,7 +119,7 @@ class SchedulerTest(base.SenlinTestCase):
         action = mock.Mock()
         action.id = '0123'
         mock_action_acquire.return_value = action
-        mock_action_acquire_1st.return_value = None
+        mock_action_acquire_1st.return_value = []
 
         tgm = scheduler.ThreadGroupManager()
         tgm.start_action('4567', '0123')
@@ -107,12 +130,31 @@ class SchedulerTest(base.SenlinTestCase):
             None, actionm.ActionProc,
             tgm.db_session, '0123')
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    def test_start_action_running_actions(self, mock_acquire_action):
+        action1 = mock.Mock(id='ID1', action='CLUSTER_CREATE')
+        action2 = mock.Mock(id='ID2', action='CLUSTER_DELETE')
+        mock_acquire_action.return_value = [action1, action2]
+        cfg.CONF.set_override('action_acquire_batch_size', 5)
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+        thread = mock_group.add_thread.return_value
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.start_action('4567')
+
+        self.assertEqual(2, tgm.running_actions)
+        thread.link.assert_called_with(tgm._action_done)
+
+        tgm._action_done(thread)
+        self.assertEqual(1, tgm.running_actions)
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
     def test_start_action_no_action_id(self, mock_acquire_action):
         mock_action = mock.Mock()
         mock_action.id = '0123'
         mock_action.action = 'CLUSTER_CREATE'
-        mock_acquire_action.side_effect = [mock_action, None]
+        mock_acquire_action.side_effect = [[mock_action], []]
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
 
@@ -126,32 +168,7 @@ class SchedulerTest(base.SenlinTestCase):
             tgm.db_session, '0123')
 
     @mock.patch.object(scheduler, 'sleep')
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
-    def test_start_action_batch_control(self, mock_acquire_action, mock_sleep):
-        mock_action1 = mock.Mock()
-        mock_action1.id = 'ID1'
-        mock_action1.action = 'NODE_CREATE'
-        mock_action2 = mock.Mock()
-        mock_action2.id = 'ID2'
-        mock_action2.action = 'CLUSTER_CREATE'
-        mock_action3 = mock.Mock()
-        mock_action3.id = 'ID3'
-        mock_action3.action = 'NODE_DELETE'
-        mock_acquire_action.side_effect = [mock_action1, mock_action2,
-                                           mock_action3, None]
-        mock_group = mock.Mock()
-        self.mock_tg.return_value = mock_group
-        cfg.CONF.set_override('max_actions_per_batch', 1)
-        cfg.CONF.set_override('batch_interval', 2)
-
-        tgm = scheduler.ThreadGroupManager()
-        tgm.start_action('4567')
-
-        mock_sleep.assert_called_once_with(2)
-        self.assertEqual(mock_group.add_thread.call_count, 3)
-
-    @mock.patch.object(scheduler, 'sleep')
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_batch')
     def test_start_action_multiple_batches(self, mock_acquire_action,
                                            mock_sleep):
         action_types = ['NODE_CREATE', 'NODE_DELETE']
@@ -162,27 +179,154 @@ class SchedulerTest(base.SenlinTestCase):
             mock_action.action = action_types[index % 2]
             actions.append(mock_action)
 
-        # Add a None at the end to end the process.
-        actions.insert(len(actions), None)
-
-        mock_acquire_action.side_effect = actions
+        mock_acquire_action.side_effect = [actions[:5], actions[5:], []]
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
+        cfg.CONF.set_override('action_acquire_batch_size', 5)
         cfg.CONF.set_override('max_actions_per_batch', 3)
         cfg.CONF.set_override('batch_interval', 5)
 
         tgm = scheduler.ThreadGroupManager()
         tgm.start_action(worker_id='4567')
 
-        self.assertEqual(mock_sleep.call_count, 3)
-        self.assertEqual(mock_group.add_thread.call_count, 10)
+        # node actions are throttled in the action threads instead of
+        # pausing the dispatcher
+        self.assertEqual(0, mock_sleep.call_count)
+        self.assertEqual(10, mock_group.add_thread.call_count)
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    def test_start_action_partial_batch(self, mock_acquire_action):
+        cfg.CONF.set_override('action_acquire_batch_size', 2)
+        action1 = mock.Mock(id='ID1', action='CLUSTER_CREATE')
+        action2 = mock.Mock(id='ID2', action='CLUSTER_DELETE')
+        action3 = mock.Mock(id='ID3', action='CLUSTER_UPDATE')
+        mock_acquire_action.side_effect = [[action1, action2], [action3]]
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.start_action('4567')
+
+        self.assertEqual(3, mock_group.add_thread.call_count)
+        # a short batch means the ready queue is drained
+        self.assertEqual(2, mock_acquire_action.call_count)
+        mock_acquire_action.assert_called_with(tgm.db_session, '4567',
+                                               mock.ANY, 2, action_ids=None)
+
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(dispatcher, 'add_load')
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    def test_start_action_limit(self, mock_acquire_action, mock_add_load,
+                                mock_start):
+        cfg.CONF.set_override('action_acquire_batch_size', 2)
+        actions = [mock.Mock(id='ID%s' % i) for i in range(3)]
+        mock_acquire_action.side_effect = [actions[:2], actions[2:]]
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.start_action('4567', limit=3)
+
+        self.assertEqual(3, mock_group.add_thread.call_count)
+        self.assertEqual(
+            [mock.call(tgm.db_session, '4567', mock.ANY, 2, action_ids=None),
+             mock.call(tgm.db_session, '4567', mock.ANY, 1, action_ids=None)],
+            mock_acquire_action.call_args_list)
+        # the actions left are dispatched again
+        mock_add_load.assert_called_once_with('4567', 3)
+        mock_start.assert_called_once_with()
+
+    @mock.patch.object(dispatcher, 'start_action')
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    def test_start_action_limit_drained(self, mock_acquire_action,
+                                        mock_start):
+        cfg.CONF.set_override('action_acquire_batch_size', 2)
+        mock_acquire_action.side_effect = [[mock.Mock(id='ID1')]]
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.start_action('4567', limit=3)
+
+        self.assertEqual(1, mock_group.add_thread.call_count)
+        self.assertEqual(0, mock_start.call_count)
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    def test_start_action_spread(self, mock_acquire_action):
+        cfg.CONF.set_override('action_acquire_batch_size', 2)
+        ready = ['ID%s' % i for i in range(6)]
+
+        def _acquire(session, worker_id, timestamp, limit, action_ids=None):
+            claimed = [mock.Mock(id=a) for a in ready[:limit]]
+            del ready[:limit]
+            return claimed
+
+        mock_acquire_action.side_effect = _acquire
+        groups = {'E1': mock.Mock(), 'E2': mock.Mock()}
+        engines = {}
+        for engine_id in sorted(groups):
+            self.mock_tg.return_value = groups[engine_id]
+            engines[engine_id] = scheduler.ThreadGroupManager()
+        self.patchobject(dispatcher, '_ENGINE_LOADS',
+                         new={'E1': 0, 'E2': 0})
+
+        def _dispatch():
+            # the request goes to the least loaded engine
+            loads = dispatcher._ENGINE_LOADS
+            engine_id = min(sorted(loads), key=lambda e: loads[e])
+            engines[engine_id].start_action(engine_id, limit=2)
+
+        self.patchobject(dispatcher, 'start_action', side_effect=_dispatch)
+
+        engines['E1'].start_action('E1', limit=2)
+
+        # the actions are spread across the engines
+        self.assertEqual([], ready)
+        self.assertEqual(4, groups['E1'].add_thread.call_count)
+        self.assertEqual(2, groups['E2'].add_thread.call_count)
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
+    @mock.patch.object(db_api, 'action_get_all_ready')
+    def test_start_action_fair_share(self, mock_ready, mock_acquire):
+        cfg.CONF.set_override('scheduler_fair_share', True)
+        cfg.CONF.set_override('scheduler_candidate_limit', 10)
+        cfg.CONF.set_override('scheduler_project_candidate_limit', 5)
+        cfg.CONF.set_override('scheduler_priority_actions', ['NODE_RECOVER'])
+        a1 = mock.Mock(id='ID1', action='NODE_CREATE', project='P1',
+                       cause=consts.CAUSE_DERIVED)
+        a2 = mock.Mock(id='ID2', action='NODE_CREATE', project='P1',
+                       cause=consts.CAUSE_DERIVED)
+        a3 = mock.Mock(id='ID3', action='NODE_RECOVER', project='P2',
+                       cause=consts.CAUSE_RPC)
+        mock_ready.side_effect = [[a1, a2, a3], []]
+        # the DB returns claimed actions in creation order
+        mock_acquire.return_value = [a1, a3]
+        cfg.CONF.set_override('action_acquire_batch_size', 2)
+        mock_group = mock.Mock()
+        self.mock_tg.return_value = mock_group
+
+        tgm = scheduler.ThreadGroupManager()
+        tgm.start_action('4567')
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+        mock_ready.assert_called_with(tgm.db_session, limit=10,
+                                      priority_actions=['NODE_RECOVER'],
+                                      project_limit=5)
+        mock_acquire.assert_called_once_with(tgm.db_session, '4567',
+                                             mock.ANY, 2,
+                                             action_ids=['ID3', 'ID1'])
+        self.assertEqual([
+            mock.call(tgm._start_with_trace, mock.ANY, None,
+                      actionm.ActionProc, tgm.db_session, 'ID3'),
+            mock.call(tgm._start_with_trace, mock.ANY, None,
+                      actionm.ActionProc, tgm.db_session, 'ID1'),
+        ], mock_group.add_thread.call_args_list)
+
+    @mock.patch.object(db_api, 'action_acquire_batch')
     @mock.patch.object(db_api, 'action_acquire')
     def test_start_action_failed_locking_action(self, mock_acquire_action,
                                                 mock_acquire_action_1st):
         mock_acquire_action.return_value = None
-        mock_acquire_action_1st.return_value = None
+        mock_acquire_action_1st.return_value = []
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
 
@@ -190,9 +334,9 @@ class SchedulerTest(base.SenlinTestCase):
         res = tgm.start_action('4567', '0123')
         self.assertIsNone(res)
 
-    @mock.patch.object(db_api, 'action_acquire_first_ready')
+    @mock.patch.object(db_api, 'action_acquire_batch')
     def test_start_action_no_action_ready(self, mock_acquire_action):
-        mock_acquire_action.return_value = None
+        mock_acquire_action.return_value = []
         mock_group = mock.Mock()
         self.mock_tg.return_value = mock_group
 
@@ -286,3 +430,105 @@ class SchedulerTest(base.SenlinTestCase):
         mock_sleep = self.patchobject(eventlet, 'sleep')
         scheduler.sleep(1)
         mock_sleep.assert_called_once_with(1)
+
+
+class ActionQueueTest(base.SenlinTestCase):
+
+    def _action(self, aid, project, action='NODE_CREATE',
+                cause=consts.CAUSE_DERIVED):
+        return mock.Mock(id=aid, project=project, action=action, cause=cause)
+
+    def test_priority(self):
+        queue = scheduler.ActionQueue()
+
+        self.assertEqual(
+            queue.PRIORITY_HIGH,
+            queue.priority(self._action('A', 'P', action='NODE_RECOVER')))
+        self.assertEqual(
+            queue.PRIORITY_HIGH,
+            queue.priority(self._action('A', 'P', action='CLUSTER_CHECK',
+                                        cause=consts.CAUSE_RPC)))
+        self.assertEqual(
+            queue.PRIORITY_NORMAL,
+            queue.priority(self._action('A', 'P', cause=consts.CAUSE_RPC)))
+        self.assertEqual(
+            queue.PRIORITY_LOW,
+            queue.priority(self._action('A', 'P')))
+
+    def test_priority_configured(self):
+        cfg.CONF.set_override('scheduler_priority_actions', ['NODE_CREATE'])
+        queue = scheduler.ActionQueue()
+
+        self.assertEqual(queue.PRIORITY_HIGH,
+                         queue.priority(self._action('A', 'P')))
+        self.assertEqual(
+            queue.PRIORITY_LOW,
+            queue.priority(self._action('A', 'P', action='NODE_RECOVER')))
+
+    def test_order_fair_share(self):
+        actions = [self._action('A%d' % i, 'P1') for i in range(4)]
+        actions += [self._action('B0', 'P2'), self._action('C0', 'P3')]
+        actions.append(self._action('B1', 'P2'))
+
+        queue = scheduler.ActionQueue()
+        result = queue.order(actions)
+
+        self.assertEqual(['A0', 'B0', 'C0', 'A1', 'B1', 'A2', 'A3'],
+                         [a.id for a in result])
+
+    def test_order_priorities(self):
+        actions = [
+            self._action('D1', 'P1'),
+            self._action('R1', 'P1', cause=consts.CAUSE_RPC),
+            self._action('H1', 'P2', action='NODE_RECOVER'),
+            self._action('D2', 'P2'),
+        ]
+
+        queue = scheduler.ActionQueue()
+        result = queue.order(actions)
+
+        self.assertEqual(['H1', 'R1', 'D1', 'D2'], [a.id for a in result])
+
+    def test_order_across_rounds(self):
+        queue = scheduler.ActionQueue()
+        actions = [self._action('A0', 'P1'), self._action('A1', 'P1'),
+                   self._action('B0', 'P2'), self._action('C0', 'P3')]
+
+        # only the head of the queue is scheduled in the first round
+        queue.record(queue.order(actions)[:2])
+        result = queue.order([actions[1], actions[3]])
+
+        # P3 was not served in the first round, so it comes first now
+        self.assertEqual(['C0', 'A1'], [a.id for a in result])
+
+    @mock.patch.object(metrics, 'inc')
+    def test_record(self, mock_inc):
+        queue = scheduler.ActionQueue()
+
+        priorities, projects = queue.record([
+            self._action('A1', 'P1'),
+            self._action('A2', 'P1', action='NODE_RECOVER'),
+            self._action('A3', 'P2'),
+        ])
+
+        self.assertEqual({'LOW': 2, 'HIGH': 1}, dict(priorities))
+        self.assertEqual({'P1': 2, 'P2': 1}, dict(projects))
+        mock_inc.assert_has_calls([
+            mock.call(metrics.ACTIONS_SCHEDULED, priority='LOW',
+                      project='P1'),
+            mock.call(metrics.ACTIONS_SCHEDULED, priority='HIGH',
+                      project='P1'),
+            mock.call(metrics.ACTIONS_SCHEDULED, priority='LOW',
+                      project='P2'),
+        ])
+
+    def test_forget(self):
+        queue = scheduler.ActionQueue()
+        queue.record([self._action('B1', 'P2'), self._action('A1', 'P1')])
+
+        queue.forget(['P2', 'P3'])
+
+        # P1 has no ready actions left, it is served first when it is back
+        result = queue.order([self._action('B2', 'P2'),
+                              self._action('A2', 'P1')])
+        self.assertEqual(['A2', 'B2'], [a.id for a in result])
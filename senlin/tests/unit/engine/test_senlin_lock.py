@@ -11,8 +11,10 @@
 # under the License.
 
 import mock
+from oslo_config import cfg
 
 from senlin.common import utils as common_utils
+from senlin.engine import dispatcher
 from senlin.engine import senlin_lock as lockm
 from senlin.objects import action as ao
 from senlin.objects import cluster_lock as clo
@@ -56,38 +58,97 @@ class SenlinLockTest(base.SenlinTestCase):
                                          'NEW_ENGINE')
 
         self.assertTrue(res)
-        mock_acquire.assert_called_with("CLUSTER_A", "ACTION_XYZ",
-                                        lockm.CLUSTER_SCOPE)
-        self.assertEqual(3, mock_acquire.call_count)
+        mock_acquire.assert_called_once_with("CLUSTER_A", "ACTION_XYZ",
+                                             lockm.CLUSTER_SCOPE)
         mock_steal.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ')
         mock_gc.assert_called_once_with(mock.ANY)
 
     @mock.patch.object(common_utils, 'is_engine_dead')
     @mock.patch.object(clo.ClusterLock, "acquire")
     def test_cluster_lock_acquire_failed(self, mock_acquire, mock_dead):
+        cfg.CONF.set_override('lock_wait_timeout', 0)
+        mock_dead.return_value = False
+        mock_acquire.return_value = ['ACTION_ABC']
+
+        res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A', 'ACTION_XYZ')
+
+        self.assertFalse(res)
+        mock_acquire.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ',
+                                             lockm.CLUSTER_SCOPE)
+
+    @mock.patch.object(dispatcher, 'watch_lock')
+    @mock.patch.object(dispatcher, 'wait_lock')
+    @mock.patch.object(common_utils, 'is_engine_dead')
+    @mock.patch.object(clo.ClusterLock, "acquire")
+    def test_cluster_lock_acquire_after_wait(self, mock_acquire, mock_dead,
+                                             mock_wait, mock_watch):
+        mock_dead.return_value = False
+        mock_acquire.side_effect = [['ACTION_ABC'], ['ACTION_XYZ']]
+
+        res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A', 'ACTION_XYZ',
+                                         'NEW_ENGINE')
+
+        self.assertTrue(res)
+        self.assertEqual(2, mock_acquire.call_count)
+        mock_watch.assert_called_once_with('CLUSTER_A', 'ENGINE',
+                                           'NEW_ENGINE')
+        mock_wait.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ', 5)
+        self.assertFalse(dispatcher.is_first_lock_waiter('CLUSTER_A',
+                                                         'ACTION_XYZ'))
+
+    @mock.patch.object(lockm, 'wallclock')
+    @mock.patch.object(dispatcher, 'watch_lock')
+    @mock.patch.object(dispatcher, 'wait_lock')
+    @mock.patch.object(common_utils, 'is_engine_dead')
+    @mock.patch.object(clo.ClusterLock, "acquire")
+    def test_cluster_lock_acquire_wait_timeout(self, mock_acquire, mock_dead,
+                                               mock_wait, mock_watch,
+                                               mock_time):
         mock_dead.return_value = False
         mock_acquire.return_value = ['ACTION_ABC']
+        mock_time.side_effect = [0, 58, 61]
 
         res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A', 'ACTION_XYZ')
 
         self.assertFalse(res)
-        mock_acquire.assert_called_with('CLUSTER_A', 'ACTION_XYZ',
-                                        lockm.CLUSTER_SCOPE)
-        self.assertEqual(3, mock_acquire.call_count)
+        self.assertEqual(2, mock_acquire.call_count)
+        mock_wait.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ', 2)
+        # The engine of the waiting action is unknown
+        self.assertEqual(0, mock_watch.call_count)
+
+    @mock.patch.object(lockm, 'wallclock')
+    @mock.patch.object(dispatcher, 'wait_lock')
+    @mock.patch.object(clo.ClusterLock, "acquire")
+    def test_cluster_lock_acquire_not_first(self, mock_acquire, mock_wait,
+                                            mock_time):
+        dispatcher.add_lock_waiter('CLUSTER_A', 'ACTION_ABC')
+        self.addCleanup(dispatcher.remove_lock_waiter, 'CLUSTER_A',
+                        'ACTION_ABC')
+        mock_acquire.return_value = ['ACTION_ABC']
+        mock_time.side_effect = [0, 0, 61]
+
+        res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A', 'ACTION_XYZ',
+                                         'ENGINE')
+
+        self.assertFalse(res)
+        # Only the first waiter in the queue tries the lock again
+        mock_acquire.assert_called_once_with('CLUSTER_A', 'ACTION_XYZ',
+                                             lockm.CLUSTER_SCOPE)
 
     @mock.patch.object(clo.ClusterLock, "acquire")
     @mock.patch.object(clo.ClusterLock, "steal")
     def test_cluster_lock_acquire_forced(self, mock_steal, mock_acquire):
+        cfg.CONF.set_override('lock_wait_timeout', 0)
         mock_acquire.return_value = ['ACTION_ABC']
         mock_steal.return_value = ['ACTION_XY']
+        self.stub_get.return_value = None
 
         res = lockm.cluster_lock_acquire(self.ctx, 'CLUSTER_A',
                                          'ACTION_XY', forced=True)
 
         self.assertTrue(res)
-        mock_acquire.assert_called_with('CLUSTER_A', 'ACTION_XY',
-                                        lockm.CLUSTER_SCOPE)
-        self.assertEqual(3, mock_acquire.call_count)
+        mock_acquire.assert_called_once_with('CLUSTER_A', 'ACTION_XY',
+                                             lockm.CLUSTER_SCOPE)
         mock_steal.assert_called_once_with('CLUSTER_A', 'ACTION_XY')
 
     @mock.patch.object(common_utils, 'is_engine_dead')
@@ -95,6 +156,7 @@ class SenlinLockTest(base.SenlinTestCase):
     @mock.patch.object(clo.ClusterLock, "steal")
     def test_cluster_lock_acquire_steal_failed(self, mock_steal, mock_acquire,
                                                mock_dead):
+        cfg.CONF.set_override('lock_wait_timeout', 0)
         mock_dead.return_value = False
         mock_acquire.return_value = ['ACTION_ABC']
         mock_steal.return_value = []
@@ -103,17 +165,28 @@ class SenlinLockTest(base.SenlinTestCase):
                                          'ACTION_XY', forced=True)
 
         self.assertFalse(res)
-        mock_acquire.assert_called_with('CLUSTER_A', 'ACTION_XY',
-                                        lockm.CLUSTER_SCOPE)
-        self.assertEqual(3, mock_acquire.call_count)
+        mock_acquire.assert_called_once_with('CLUSTER_A', 'ACTION_XY',
+                                             lockm.CLUSTER_SCOPE)
         mock_steal.assert_called_once_with('CLUSTER_A', 'ACTION_XY')
 
+    @mock.patch.object(dispatcher, 'release_lock')
     @mock.patch.object(clo.ClusterLock, "release")
-    def test_cluster_lock_release(self, mock_release):
+    def test_cluster_lock_release(self, mock_release, mock_notify):
         actual = lockm.cluster_lock_release('C', 'A', 'S')
 
         self.assertEqual(mock_release.return_value, actual)
         mock_release.assert_called_once_with('C', 'A', 'S')
+        mock_notify.assert_called_once_with('C')
+
+    @mock.patch.object(dispatcher, 'release_lock')
+    @mock.patch.object(clo.ClusterLock, "release")
+    def test_cluster_lock_release_not_owner(self, mock_release, mock_notify):
+        mock_release.return_value = False
+
+        actual = lockm.cluster_lock_release('C', 'A', 'S')
+
+        self.assertFalse(actual)
+        self.assertEqual(0, mock_notify.call_count)
 
     @mock.patch.object(nlo.NodeLock, "acquire")
     def test_node_lock_acquire_already_owner(self, mock_acquire):
@@ -0,0 +1,201 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+import mock
+from oslo_config import cfg
+from oslo_utils import timeutils
+
+from senlin.engine import throttle
+from senlin.tests.unit.common import base
+
+
+class TestAdaptiveLimiter(base.SenlinTestCase):
+
+    def test_init(self):
+        limiter = throttle.AdaptiveLimiter('NAME', 20, 1, 10)
+
+        self.assertEqual('NAME', limiter.name)
+        self.assertEqual(10, limiter.limit)
+        self.assertEqual(0, limiter.active)
+        self.assertEqual(0, limiter.waiting)
+        self.assertEqual({}, limiter.latency)
+
+    def test_additive_increase(self):
+        limiter = throttle.AdaptiveLimiter('NAME', 2, 1, 3)
+
+        limiter.acquire()
+        limiter.release('NODE_CREATE', 10, True)
+        self.assertEqual(3, limiter.limit)
+        self.assertEqual(10, limiter.latency['NODE_CREATE'])
+
+        limiter.acquire()
+        limiter.release('NODE_CREATE', 15, True)
+        # capped by the maximum
+        self.assertEqual(3, limiter.limit)
+        self.assertEqual(11, limiter.latency['NODE_CREATE'])
+        self.assertEqual(2, limiter.successes)
+        self.assertEqual(0, limiter.active)
+
+    def test_decrease_on_failure(self):
+        limiter = throttle.AdaptiveLimiter('NAME', 8, 3, 10)
+
+        limiter.acquire()
+        limiter.release('NODE_CREATE', 1, False)
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(1, limiter.failures)
+
+        limiter.acquire()
+        limiter.release('NODE_CREATE', 1, False)
+        # bounded by the minimum
+        self.assertEqual(3, limiter.limit)
+
+    def test_decrease_on_slow_operation(self):
+        limiter = throttle.AdaptiveLimiter('NAME', 8, 1, 10)
+
+        limiter.acquire()
+        limiter.release('NODE_CHECK', 1, True)
+        limiter.acquire()
+        limiter.release('NODE_CREATE', 60, True)
+        self.assertEqual(10, limiter.limit)
+
+        limiter.acquire()
+        limiter.release('NODE_CHECK', 5, True)
+        self.assertEqual(5, limiter.limit)
+        self.assertEqual(0, limiter.failures)
+
+    def test_waiters_woken_up_in_order(self):
+        limiter = throttle.AdaptiveLimiter('NAME', 1, 1, 1)
+        limiter.acquire()
+        started = []
+
+        def worker(name):
+            limiter.acquire()
+            started.append(name)
+
+        eventlet.spawn(worker, 'W1')
+        eventlet.spawn(worker, 'W2')
+        eventlet.sleep(0)
+        self.assertEqual(2, limiter.waiting)
+        self.assertEqual([], started)
+
+        limiter.release('NODE_CREATE', 1, True)
+        eventlet.sleep(0)
+        self.assertEqual(['W1'], started)
+        self.assertEqual(1, limiter.active)
+
+        limiter.release('NODE_CREATE', 1, True)
+        eventlet.sleep(0)
+        self.assertEqual(['W1', 'W2'], started)
+        self.assertEqual(0, limiter.waiting)
+
+    def test_waiter_killed(self):
+        limiter = throttle.AdaptiveLimiter('NAME', 1, 1, 1)
+        limiter.acquire()
+        gt = eventlet.spawn(limiter.acquire)
+        eventlet.sleep(0)
+        self.assertEqual(1, limiter.waiting)
+
+        gt.kill()
+
+        self.assertEqual(0, limiter.waiting)
+        self.assertEqual(1, limiter.active)
+
+    def test_waiter_killed_after_handover(self):
+        limiter = throttle.AdaptiveLimiter('NAME', 1, 1, 1)
+        limiter.acquire()
+        gt = eventlet.spawn(limiter.acquire)
+        eventlet.sleep(0)
+
+        # the slot is handed over but the waiter is killed before it runs
+        limiter.release('NODE_CREATE', 1, True)
+        gt.kill()
+
+        self.assertEqual(0, limiter.waiting)
+        self.assertEqual(0, limiter.active)
+
+    @mock.patch.object(eventlet, 'sleep')
+    @mock.patch.object(timeutils, 'now')
+    def test_acquire_paced(self, mock_now, mock_sleep):
+        self.patchobject(throttle, '_BATCH', new={'count': 0, 'end': 0})
+        cfg.CONF.set_override('max_actions_per_batch', 2)
+        cfg.CONF.set_override('batch_interval', 5)
+        mock_now.side_effect = [100, 101, 102, 105]
+        limiter = throttle.AdaptiveLimiter('NAME', 10, 1, 10)
+
+        limiter.acquire()
+        limiter.acquire()
+        # the third operation waits for the next batch
+        limiter.acquire()
+
+        mock_sleep.assert_called_once_with(3)
+        self.assertEqual(3, limiter.active)
+        self.assertEqual({'count': 1, 'end': 110}, throttle._BATCH)
+
+    def test_to_dict(self):
+        limiter = throttle.AdaptiveLimiter('NAME', 2, 1, 5)
+        limiter.acquire()
+
+        expected = {
+            'name': 'NAME',
+            'limit': 2,
+            'active': 1,
+            'waiting': 0,
+            'latency': {},
+            'successes': 0,
+            'failures': 0,
+        }
+        self.assertEqual(expected, limiter.to_dict())
+
+
+class TestGetLimiter(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestGetLimiter, self).setUp()
+        self.patchobject(throttle, '_LIMITERS', new={})
+
+    def test_get_limiter(self):
+        cfg.CONF.set_override('initial_limit', 5, group='throttle')
+        cfg.CONF.set_override('max_limit', 50, group='throttle')
+        cfg.CONF.set_override('max_limits', {'os.heat.stack': '8'},
+                              group='throttle')
+
+        nova = throttle.get_limiter('os.nova.server', 'R1')
+        heat = throttle.get_limiter('os.heat.stack', 'R1')
+        nova2 = throttle.get_limiter('os.nova.server', 'R2')
+
+        self.assertEqual('os.nova.server@R1', nova.name)
+        self.assertEqual(5, nova.limit)
+        self.assertEqual(50, nova.maximum)
+        self.assertEqual(8, heat.maximum)
+        self.assertIsNot(nova, nova2)
+        self.assertIs(nova, throttle.get_limiter('os.nova.server', 'R1'))
+        self.assertEqual(3, len(throttle.get_stats()))
+
+    def test_get_limiter_batch_size(self):
+        cfg.CONF.set_override('max_actions_per_batch', 4)
+
+        limiter = throttle.get_limiter('os.nova.server', 'R1')
+
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(4, limiter.maximum)
+
+    def test_get_limiter_no_region(self):
+        limiter = throttle.get_limiter('container.dockerinc.docker')
+
+        self.assertEqual('container.dockerinc.docker', limiter.name)
+
+    def test_get_limiter_disabled(self):
+        cfg.CONF.set_override('enabled', False, group='throttle')
+
+        self.assertIsNone(throttle.get_limiter('os.nova.server', 'R1'))
+        self.assertEqual([], throttle.get_stats())
@@ -11,9 +11,11 @@
 # under the License.
 
 import mock
+from oslo_config import cfg
 import testtools
 
 from senlin.common import consts
+from senlin.engine import metrics
 from senlin.events import base
 from senlin.events import database as DB
 from senlin.objects import event as eo
@@ -27,10 +29,12 @@ class TestDatabase(testtools.TestCase):
     def setUp(self):
         super(TestDatabase, self).setUp()
         self.context = utils.dummy_context()
+        self.addCleanup(cfg.CONF.reset)
+        self.addCleanup(DB._BUFFER.clear)
 
     @mock.patch.object(base.EventBackend, '_check_entity')
-    @mock.patch.object(eo.Event, 'create')
-    def test_dump(self, mock_create, mock_check):
+    @mock.patch.object(DB, '_schedule_flush')
+    def test_dump(self, mock_schedule, mock_check):
         mock_check.return_value = 'CLUSTER'
         entity = mock.Mock(id='CLUSTER_ID')
         entity.name = 'cluster1'
@@ -41,8 +45,9 @@ class TestDatabase(testtools.TestCase):
 
         self.assertIsNone(res)
         mock_check.assert_called_once_with(entity)
-        mock_create.assert_called_once_with(
-            self.context,
+        mock_schedule.assert_called_once_with()
+        self.assertEqual(1, len(DB._BUFFER))
+        self.assertEqual(
             {
                 'level': 'LEVEL',
                 'timestamp': mock.ANY,
@@ -56,11 +61,12 @@ class TestDatabase(testtools.TestCase):
                 'status': 'STATUS',
                 'status_reason': 'REASON',
                 'meta_data': {}
-            })
+            },
+            DB._BUFFER[0][0])
 
     @mock.patch.object(base.EventBackend, '_check_entity')
-    @mock.patch.object(eo.Event, 'create')
-    def test_dump_with_extra_but_no_status_(self, mock_create, mock_check):
+    @mock.patch.object(DB, '_schedule_flush')
+    def test_dump_with_extra_but_no_status_(self, mock_schedule, mock_check):
         mock_check.return_value = 'NODE'
         entity = mock.Mock(id='NODE_ID', status='S1', status_reason='R1',
                            cluster_id='CLUSTER_ID')
@@ -74,8 +80,9 @@ class TestDatabase(testtools.TestCase):
 
         self.assertIsNone(res)
         mock_check.assert_called_once_with(entity)
-        mock_create.assert_called_once_with(
-            self.context,
+        mock_schedule.assert_called_once_with()
+        self.assertEqual(1, len(DB._BUFFER))
+        self.assertEqual(
             {
                 'level': 'LEVEL',
                 'timestamp': 'NOW',
@@ -89,11 +96,12 @@ class TestDatabase(testtools.TestCase):
                 'status': 'S1',
                 'status_reason': 'R1',
                 'meta_data': {'foo': 'bar'}
-            })
+            },
+            DB._BUFFER[0][0])
 
     @mock.patch.object(base.EventBackend, '_check_entity')
-    @mock.patch.object(eo.Event, 'create')
-    def test_dump_operation_action(self, mock_create, mock_check):
+    @mock.patch.object(DB, '_schedule_flush')
+    def test_dump_operation_action(self, mock_schedule, mock_check):
         mock_check.return_value = 'CLUSTER'
         entity = mock.Mock(id='CLUSTER_ID')
         entity.name = 'cluster1'
@@ -104,8 +112,9 @@ class TestDatabase(testtools.TestCase):
 
         self.assertIsNone(res)
         mock_check.assert_called_once_with(entity)
-        mock_create.assert_called_once_with(
-            self.context,
+        mock_schedule.assert_called_once_with()
+        self.assertEqual(1, len(DB._BUFFER))
+        self.assertEqual(
             {
                 'level': 'LEVEL',
                 'timestamp': mock.ANY,
@@ -119,4 +128,106 @@ class TestDatabase(testtools.TestCase):
                 'status': 'STATUS',
                 'status_reason': 'REASON',
                 'meta_data': {}
-            })
+            },
+            DB._BUFFER[0][0])
+
+    @mock.patch.object(base.EventBackend, '_check_entity')
+    @mock.patch.object(DB, '_schedule_flush')
+    @mock.patch.object(eo.Event, 'create')
+    def test_dump_not_buffered(self, mock_create, mock_schedule, mock_check):
+        cfg.CONF.set_override('event_buffer_size', 0, group='dispatchers')
+        mock_check.return_value = 'CLUSTER'
+        entity = mock.Mock(id='CLUSTER_ID')
+        entity.name = 'cluster1'
+        action = mock.Mock(context=self.context, action='ACTION',
+                           entity=entity)
+
+        res = DB.DBEvent.dump('LEVEL', action, phase='STATUS', reason='REASON')
+
+        self.assertIsNone(res)
+        mock_create.assert_called_once_with(self.context, mock.ANY)
+        self.assertEqual(0, len(DB._BUFFER))
+        self.assertEqual(0, mock_schedule.call_count)
+
+    @mock.patch.object(metrics, 'inc')
+    @mock.patch.object(base.EventBackend, '_check_entity')
+    @mock.patch.object(DB, '_schedule_flush')
+    def test_dump_buffer_full(self, mock_schedule, mock_check, mock_inc):
+        cfg.CONF.set_override('event_buffer_size', 1, group='dispatchers')
+        DB._BUFFER.append(({'oid': 'OLD'}, 0))
+        mock_check.return_value = 'CLUSTER'
+        entity = mock.Mock(id='CLUSTER_ID')
+        entity.name = 'cluster1'
+        action = mock.Mock(context=self.context, action='ACTION',
+                           entity=entity)
+
+        res = DB.DBEvent.dump('LEVEL', action, phase='STATUS', reason='REASON')
+
+        self.assertIsNone(res)
+        self.assertEqual([({'oid': 'OLD'}, 0)], list(DB._BUFFER))
+        mock_inc.assert_called_once_with(metrics.EVENTS_DROPPED)
+        self.assertEqual(0, mock_schedule.call_count)
+
+    @mock.patch('eventlet.spawn_after')
+    def test_schedule_flush(self, mock_spawn):
+        self.addCleanup(setattr, DB, '_PENDING_FLUSH', None)
+        cfg.CONF.set_override('event_flush_interval', 2.5,
+                              group='dispatchers')
+        DB._BUFFER.append(({'oid': 'FAKE'}, 0))
+
+        DB._schedule_flush()
+        DB._schedule_flush()
+
+        mock_spawn.assert_called_once_with(2.5, DB.flush)
+        self.assertEqual(mock_spawn.return_value, DB._PENDING_FLUSH)
+
+    @mock.patch('eventlet.spawn')
+    def test_schedule_flush_batch_full(self, mock_spawn):
+        self.addCleanup(setattr, DB, '_PENDING_FLUSH', None)
+        cfg.CONF.set_override('event_batch_size', 2, group='dispatchers')
+        pending = mock.Mock()
+        DB._PENDING_FLUSH = pending
+        DB._BUFFER.extend([({'oid': 'E1'}, 0), ({'oid': 'E2'}, 0)])
+
+        DB._schedule_flush()
+
+        pending.cancel.assert_called_once_with()
+        mock_spawn.assert_called_once_with(DB.flush)
+        self.assertEqual(mock_spawn.return_value, DB._PENDING_FLUSH)
+
+    @mock.patch.object(metrics, 'observe')
+    @mock.patch.object(eo.Event, 'create_many')
+    def test_flush(self, mock_create, mock_observe):
+        cfg.CONF.set_override('event_batch_size', 2, group='dispatchers')
+        DB._BUFFER.extend([({'oid': 'E1'}, 0), ({'oid': 'E2'}, 0),
+                           ({'oid': 'E3'}, 0)])
+
+        DB.DBEvent.flush()
+
+        self.assertEqual(0, len(DB._BUFFER))
+        mock_create.assert_has_calls([
+            mock.call(mock.ANY, [{'oid': 'E1'}, {'oid': 'E2'}]),
+            mock.call(mock.ANY, [{'oid': 'E3'}]),
+        ])
+        self.assertEqual(3, mock_observe.call_count)
+        mock_observe.assert_called_with(metrics.EVENT_DELAY_SECONDS,
+                                        mock.ANY)
+        self.assertIsNone(DB._PENDING_FLUSH)
+
+    @mock.patch.object(metrics, 'inc')
+    @mock.patch.object(eo.Event, 'create')
+    @mock.patch.object(eo.Event, 'create_many')
+    def test_flush_batch_failed(self, mock_create_many, mock_create,
+                                mock_inc):
+        mock_create_many.side_effect = Exception('boom')
+        mock_create.side_effect = [mock.Mock(), Exception('bad')]
+        DB._BUFFER.extend([({'oid': 'E1'}, 0), ({'oid': 'E2'}, 0)])
+
+        DB.flush()
+
+        self.assertEqual(0, len(DB._BUFFER))
+        mock_create.assert_has_calls([
+            mock.call(mock.ANY, {'oid': 'E1'}),
+            mock.call(mock.ANY, {'oid': 'E2'}),
+        ])
+        mock_inc.assert_called_once_with(metrics.EVENTS_DROPPED)
@@ -20,6 +20,7 @@ from senlin.db import api as db_api
 from senlin.objects import cluster as co
 from senlin.tests.unit.common import base
 from senlin.tests.unit.common import utils
+from senlin.tests.unit.db import shared
 
 
 class TestCluster(base.SenlinTestCase):
@@ -39,6 +40,38 @@ class TestCluster(base.SenlinTestCase):
         self.assertEqual(x_cluster, result)
         mock_get.assert_called_once_with(self.ctx, aid, project_safe=True)
 
+    def test_get_runtime_data(self):
+        profile = shared.create_profile(self.ctx)
+        cluster = shared.create_cluster(self.ctx, profile)
+        node = shared.create_node(self.ctx, cluster, profile)
+        policy = shared.create_policy(self.ctx)
+        db_api.cluster_policy_attach(self.ctx, cluster.id, policy.id,
+                                     {'priority': 10, 'enabled': True})
+
+        res = co.Cluster.get_runtime_data(self.ctx, cluster.id)
+
+        self.assertIsInstance(res['cluster'], co.Cluster)
+        self.assertEqual(cluster.id, res['cluster'].id)
+        self.assertEqual(profile.id, res['profile'].id)
+        self.assertEqual(1, len(res['bindings']))
+        binding = res['bindings'][0]
+        self.assertEqual(policy.id, binding.policy_id)
+        self.assertEqual(policy.id, binding.policy.id)
+        self.assertEqual(res['cluster'], binding.cluster)
+        self.assertEqual([node.id], [n.id for n in res['nodes']])
+        self.assertEqual(profile.name, res['nodes'][0].profile_name)
+
+    @mock.patch.object(db_api, 'cluster_get_runtime_data')
+    def test_get_runtime_data_not_found(self, mock_get):
+        mock_get.return_value = None
+
+        res = co.Cluster.get_runtime_data(self.ctx, 'FAKE_ID',
+                                          project_safe=False)
+
+        self.assertIsNone(res)
+        mock_get.assert_called_once_with(self.ctx, 'FAKE_ID',
+                                         project_safe=False)
+
     @mock.patch.object(co.Cluster, 'get_by_name')
     @mock.patch.object(co.Cluster, 'get')
     def test_find_by_uuid_as_name(self, mock_get, mock_get_name):
@@ -60,9 +60,29 @@ class TestHealthRegistry(testtools.TestCase):
         result = hro.HealthRegistry.claim(self.ctx, "FAKE_ENGINE")
 
         self.assertEqual([x_obj], result)
-        mock_claim.assert_called_once_with(self.ctx, "FAKE_ENGINE")
+        mock_claim.assert_called_once_with(self.ctx, "FAKE_ENGINE",
+                                           cluster_ids=None)
         mock_from.assert_called_once_with(self.ctx, mock.ANY, x_registry)
 
+    @mock.patch.object(db_api, 'registry_get_orphans')
+    def test_get_orphans(self, mock_get):
+        mock_get.return_value = ['CID1']
+
+        result = hro.HealthRegistry.get_orphans(self.ctx)
+
+        self.assertEqual(['CID1'], result)
+        mock_get.assert_called_once_with(self.ctx)
+
+    @mock.patch.object(db_api, 'registry_release')
+    def test_release(self, mock_release):
+        mock_release.return_value = 1
+
+        result = hro.HealthRegistry.release(self.ctx, "FAKE_ENGINE", ['CID1'])
+
+        self.assertEqual(1, result)
+        mock_release.assert_called_once_with(self.ctx, "FAKE_ENGINE",
+                                             ['CID1'])
+
     @mock.patch.object(db_api, 'registry_delete')
     def test_delete(self, mock_delete):
         hro.HealthRegistry.delete(self.ctx, "FAKE_ID")
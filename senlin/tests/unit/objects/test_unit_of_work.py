@@ -0,0 +1,196 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_config import cfg
+import six
+
+from senlin.db import api as db_api
+from senlin.objects import action as ao
+from senlin.objects import node as no
+from senlin.objects import unit_of_work as uow
+from senlin.tests.unit.common import base
+from senlin.tests.unit.common import utils
+
+
+class TestUnitOfWork(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestUnitOfWork, self).setUp()
+        self.ctx = utils.dummy_context()
+
+    def test_defer(self):
+        unit = uow.UnitOfWork(self.ctx, 'ACTION_ID')
+
+        self.assertTrue(unit.defer(uow.NODE, 'NODE_ID', {'data': {'a': 1}}))
+        self.assertTrue(unit.defer(uow.NODE, 'NODE_ID', {'meta_data': {}}))
+        self.assertTrue(unit.defer(uow.ACTION, 'ACTION_ID',
+                                   {'outputs': {'b': 2}}))
+
+        self.assertEqual({'data': {'a': 1}, 'meta_data': {}},
+                         unit.get_pending(uow.NODE, 'NODE_ID'))
+        self.assertEqual({'outputs': {'b': 2}},
+                         unit.get_pending(uow.ACTION, 'ACTION_ID'))
+
+    def test_defer_not_deferrable(self):
+        unit = uow.UnitOfWork(self.ctx, 'ACTION_ID')
+        unit.defer(uow.NODE, 'NODE_ID', {'data': {'a': 1}, 'meta_data': {}})
+
+        res = unit.defer(uow.NODE, 'NODE_ID',
+                         {'status': 'ACTIVE', 'data': {'a': 2}})
+
+        self.assertFalse(res)
+        # the immediate update supersedes the deferred data
+        self.assertEqual({'meta_data': {}},
+                         unit.get_pending(uow.NODE, 'NODE_ID'))
+        self.assertFalse(unit.defer(uow.ACTION, 'ACTION_ID', {}))
+
+    @mock.patch.object(db_api, 'batch_update')
+    def test_flush(self, mock_update):
+        unit = uow.UnitOfWork(self.ctx, 'ACTION_ID')
+        unit.defer(uow.NODE, 'NODE_ID', {'data': {'a': 1}})
+        unit.defer(uow.ACTION, 'ACTION_ID', {'data': {'b': 2}})
+
+        unit.flush()
+        unit.flush()
+
+        mock_update.assert_called_once_with(
+            self.ctx, actions={'ACTION_ID': {'data': {'b': 2}}},
+            nodes={'NODE_ID': {'data': {'a': 1}}})
+        self.assertIsNone(unit.get_pending(uow.NODE, 'NODE_ID'))
+
+    @mock.patch.object(db_api, 'batch_update')
+    def test_flush_failed(self, mock_update):
+        mock_update.side_effect = Exception('boom')
+        unit = uow.UnitOfWork(self.ctx, 'ACTION_ID')
+        unit.defer(uow.NODE, 'NODE_ID', {'data': {'a': 1}})
+
+        ex = self.assertRaises(Exception, unit.flush)
+
+        self.assertEqual('boom', six.text_type(ex))
+        self.assertIsNone(unit.get_pending(uow.NODE, 'NODE_ID'))
+
+    @mock.patch.object(db_api, 'batch_update')
+    def test_begin(self, mock_update):
+        self.assertIsNone(uow.current())
+
+        with uow.begin(self.ctx, 'ACTION_ID') as unit:
+            self.assertEqual(unit, uow.current())
+            self.assertTrue(uow.defer(uow.NODE, 'NODE_ID', {'data': {}}))
+            self.assertFalse(mock_update.called)
+
+        self.assertIsNone(uow.current())
+        mock_update.assert_called_once_with(
+            self.ctx, actions={}, nodes={'NODE_ID': {'data': {}}})
+
+    @mock.patch.object(db_api, 'batch_update')
+    def test_begin_flush_failed(self, mock_update):
+        mock_update.side_effect = Exception('boom')
+
+        def _run():
+            with uow.begin(self.ctx, 'ACTION_ID'):
+                uow.defer(uow.NODE, 'NODE_ID', {'data': {}})
+
+        ex = self.assertRaises(Exception, _run)
+
+        self.assertEqual('boom', six.text_type(ex))
+        self.assertIsNone(uow.current())
+
+    @mock.patch.object(uow.LOG, 'exception')
+    @mock.patch.object(db_api, 'batch_update')
+    def test_begin_block_failed(self, mock_update, mock_log):
+        mock_update.side_effect = Exception('boom')
+
+        def _run():
+            with uow.begin(self.ctx, 'ACTION_ID'):
+                uow.defer(uow.NODE, 'NODE_ID', {'data': {}})
+                raise ValueError('block failed')
+
+        # the error of the block wins over the error of the flush
+        self.assertRaises(ValueError, _run)
+
+        self.assertEqual(1, mock_update.call_count)
+        self.assertEqual(1, mock_log.call_count)
+        self.assertIsNone(uow.current())
+
+    def test_begin_disabled(self):
+        cfg.CONF.set_override('batch_action_writes', False)
+
+        with uow.begin(self.ctx, 'ACTION_ID') as unit:
+            self.assertIsNone(unit)
+            self.assertIsNone(uow.current())
+            self.assertFalse(uow.defer(uow.NODE, 'NODE_ID', {'data': {}}))
+
+    @mock.patch.object(db_api, 'batch_update')
+    def test_checkpoint(self, mock_update):
+        # no unit of work is active
+        uow.checkpoint()
+
+        with uow.begin(self.ctx, 'ACTION_ID'):
+            uow.defer(uow.ACTION, 'ACTION_ID', {'data': {}})
+            uow.checkpoint()
+            mock_update.assert_called_once_with(
+                self.ctx, actions={'ACTION_ID': {'data': {}}}, nodes={})
+
+        self.assertEqual(1, mock_update.call_count)
+
+    @mock.patch.object(db_api, 'node_update')
+    def test_node_update_deferred(self, mock_update):
+        with mock.patch.object(db_api, 'batch_update') as mock_batch:
+            with uow.begin(self.ctx, 'ACTION_ID'):
+                no.Node.update(self.ctx, 'NODE_ID', {'metadata': {'k': 'v'}})
+                no.Node.update(self.ctx, 'NODE_ID', {'status': 'ACTIVE'})
+                self.assertFalse(mock_batch.called)
+
+        mock_update.assert_called_once_with(self.ctx, 'NODE_ID',
+                                            {'status': 'ACTIVE'})
+        mock_batch.assert_called_once_with(
+            self.ctx, actions={}, nodes={'NODE_ID': {'meta_data': {'k': 'v'}}})
+
+    @mock.patch.object(db_api, 'node_update_many')
+    def test_node_update_many_deferred(self, mock_update):
+        values = {
+            'NODE1': {'data': {'lb_member': 'M1'}},
+            'NODE2': {'status': 'ERROR'},
+        }
+        with uow.begin(self.ctx, 'ACTION_ID') as unit:
+            no.Node.update_many(self.ctx, values)
+
+            self.assertEqual({'data': {'lb_member': 'M1'}},
+                             unit.get_pending(uow.NODE, 'NODE1'))
+            unit.flush = mock.Mock()
+
+        mock_update.assert_called_once_with(
+            self.ctx, {'NODE2': {'status': 'ERROR'}})
+
+    @mock.patch.object(db_api, 'action_update')
+    def test_action_update_deferred(self, mock_update):
+        with uow.begin(self.ctx, 'ACTION_ID') as unit:
+            ao.Action.update(self.ctx, 'ACTION_ID', {'outputs': {'a': 1}})
+
+            self.assertEqual({'outputs': {'a': 1}},
+                             unit.get_pending(uow.ACTION, 'ACTION_ID'))
+            unit.flush = mock.Mock()
+
+        self.assertFalse(mock_update.called)
+
+    def test_apply_pending(self):
+        node = no.Node(id='NODE_ID', data={}, metadata={})
+
+        with uow.begin(self.ctx, 'ACTION_ID') as unit:
+            uow.defer(uow.NODE, 'NODE_ID',
+                      {'data': {'lb_member': 'M1'}, 'meta_data': {'k': 'v'}})
+            uow.apply_pending(uow.NODE, node)
+            unit.flush = mock.Mock()
+
+        self.assertEqual({'lb_member': 'M1'}, node.data)
+        self.assertEqual({'k': 'v'}, node.metadata)
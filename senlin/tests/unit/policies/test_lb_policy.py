@@ -229,7 +229,7 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
 
     @mock.patch.object(lb_policy.LoadBalancingPolicy, '_build_policy_data')
     @mock.patch.object(policy_base.Policy, 'attach')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'update_many')
     def test_attach_succeeded(self, m_update, m_attach, m_build):
         cluster = mock.Mock(id='CLUSTER_ID', data={})
         node1 = mock.Mock(id='fake1', data={})
@@ -261,13 +261,11 @@ class TestLoadBalancingPolicy(base.SenlinTestCase):
             mock.call(node2, 'LB_ID', 'POOL_ID', 80, 'internal-subnet')
         ]
         self.lb_driver.member_add.assert_has_calls(member_add_calls)
-        node_update_calls = [
-            mock.call(mock.ANY, node1.id,
-                      {'data': {'lb_member': 'MEMBER1_ID'}}),
-            mock.call(mock.ANY, node2.id,
-                      {'data': {'lb_member': 'MEMBER2_ID'}})
-        ]
-        m_update.assert_has_calls(node_update_calls)
+        m_update.assert_called_once_with(
+            mock.ANY, {
+                node1.id: {'data': {'lb_member': 'MEMBER1_ID'}},
+                node2.id: {'data': {'lb_member': 'MEMBER2_ID'}}
+            })
         expected = {
             policy.id: {'vip_address': '192.168.1.100'}
         }
@@ -695,8 +693,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
 
         self.assertIsNone(res)
 
-    @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'get_all')
+    @mock.patch.object(no.Node, 'update_many')
     def test_add_member(self, m_node_update, m_node_get,
                         m_extract, m_load):
         node1 = mock.Mock(id='NODE1_ID', data={})
@@ -723,7 +721,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         }
         cp.data = cp_data
         self.lb_driver.member_add.side_effect = ['MEMBER1_ID', 'MEMBER2_ID']
-        m_node_get.side_effect = [node1, node2]
+        m_node_get.return_value = [node1, node2]
         m_extract.return_value = policy_data
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         policy._lbaasclient = self.lb_driver
@@ -736,24 +734,18 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         # assertions
         self.assertEqual([], res)
         m_extract.assert_called_once_with(cp_data)
-        calls_node_get = [
-            mock.call('action_context', node_id='NODE1_ID'),
-            mock.call('action_context', node_id='NODE2_ID')
-        ]
-        m_node_get.assert_has_calls(calls_node_get)
-        calls_node_update = [
-            mock.call(action.context, 'NODE1_ID', mock.ANY),
-            mock.call(action.context, 'NODE2_ID', mock.ANY)
-        ]
-        m_node_update.assert_has_calls(calls_node_update)
+        m_node_get.assert_called_once_with(
+            'action_context', filters={'id': ['NODE1_ID', 'NODE2_ID']})
+        m_node_update.assert_called_once_with(
+            action.context, {'NODE1_ID': mock.ANY, 'NODE2_ID': mock.ANY})
         calls_member_add = [
             mock.call(node1, 'LB_ID', 'POOL_ID', 80, 'test-subnet'),
             mock.call(node2, 'LB_ID', 'POOL_ID', 80, 'test-subnet'),
         ]
         self.lb_driver.member_add.assert_has_calls(calls_member_add)
 
-    @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'get_all')
+    @mock.patch.object(no.Node, 'update_many')
     def test_add_member_fail(self, m_node_update, m_node_get,
                              m_extract, m_load):
         node1 = mock.Mock(id='NODE1_ID', data={})
@@ -779,7 +771,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         }
         cp.data = cp_data
         self.lb_driver.member_add.return_value = None
-        m_node_get.return_value = node1
+        m_node_get.return_value = [node1]
         m_extract.return_value = policy_data
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         policy._lbaasclient = self.lb_driver
@@ -793,9 +785,9 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.assertEqual(['NODE1_ID'], res)
         m_extract.assert_called_once_with(cp_data)
         m_node_get.assert_called_once_with(
-            'action_context', node_id='NODE1_ID')
+            'action_context', filters={'id': ['NODE1_ID']})
         m_node_update.assert_called_once_with(
-            'action_context', 'NODE1_ID', mock.ANY)
+            'action_context', {'NODE1_ID': mock.ANY})
         self.lb_driver.member_add.assert_called_once_with(
             node1, 'LB_ID', 'POOL_ID', 80, 'test-subnet')
 
@@ -919,8 +911,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
                                       cp, self.lb_driver)
         self.assertFalse(m_remove.called)
 
-    @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'get_all')
+    @mock.patch.object(no.Node, 'update_many')
     def test_remove_member(self, m_node_update, m_node_get,
                            m_extract, m_load):
         node1 = mock.Mock(id='NODE1', data={'lb_member': 'MEM_ID1'})
@@ -947,7 +939,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         }
         cp.data = cp_data
         self.lb_driver.member_remove.return_value = True
-        m_node_get.side_effect = [node1, node2]
+        m_node_get.return_value = [node1, node2]
         m_extract.return_value = policy_data
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         policy._lbaasclient = self.lb_driver
@@ -957,16 +949,10 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
                                     cp, self.lb_driver)
 
         m_extract.assert_called_once_with(cp_data)
-        calls_node_get = [
-            mock.call(action.context, node_id='NODE1'),
-            mock.call(action.context, node_id='NODE2')
-        ]
-        m_node_get.assert_has_calls(calls_node_get)
-        calls_node_update = [
-            mock.call(action.context, 'NODE1', mock.ANY),
-            mock.call(action.context, 'NODE2', mock.ANY)
-        ]
-        m_node_update.assert_has_calls(calls_node_update)
+        m_node_get.assert_called_once_with(
+            action.context, filters={'id': ['NODE1', 'NODE2']})
+        m_node_update.assert_called_once_with(
+            action.context, {'NODE1': mock.ANY, 'NODE2': mock.ANY})
         calls_member_del = [
             mock.call('LB_ID', 'POOL_ID', 'MEM_ID1'),
             mock.call('LB_ID', 'POOL_ID', 'MEM_ID2')
@@ -974,8 +960,8 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         self.lb_driver.member_remove.assert_has_calls(calls_member_del)
         self.assertEqual([], res)
 
-    @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'get_all')
+    @mock.patch.object(no.Node, 'update_many')
     def test_remove_member_not_in_pool(self, m_node_update, m_node_get,
                                        m_extract, m_load):
         node1 = mock.Mock(id='NODE1', data={'lb_member': 'MEM_ID1'})
@@ -1002,7 +988,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         }
         cp.data = cp_data
         self.lb_driver.member_remove.return_value = True
-        m_node_get.side_effect = [node1, node2]
+        m_node_get.return_value = [node1, node2]
         m_extract.return_value = policy_data
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         policy._lbaasclient = self.lb_driver
@@ -1012,19 +998,16 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
                                     cp, self.lb_driver)
 
         m_extract.assert_called_once_with(cp_data)
-        calls_node_get = [
-            mock.call(action.context, node_id='NODE1'),
-            mock.call(action.context, node_id='NODE2')
-        ]
-        m_node_get.assert_has_calls(calls_node_get)
+        m_node_get.assert_called_once_with(
+            action.context, filters={'id': ['NODE1', 'NODE2']})
         m_node_update.assert_called_once_with(
-            action.context, 'NODE1', mock.ANY)
+            action.context, {'NODE1': mock.ANY})
         self.lb_driver.member_remove.assert_called_once_with(
             'LB_ID', 'POOL_ID', 'MEM_ID1')
         self.assertEqual([], res)
 
-    @mock.patch.object(no.Node, 'get')
-    @mock.patch.object(no.Node, 'update')
+    @mock.patch.object(no.Node, 'get_all')
+    @mock.patch.object(no.Node, 'update_many')
     def test_remove_member_fail(self, m_node_update, m_node_get,
                                 m_extract, m_load):
         node1 = mock.Mock(id='NODE1', data={'lb_member': 'MEM_ID1'})
@@ -1050,7 +1033,7 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
         }
         cp.data = cp_data
         self.lb_driver.member_remove.return_value = False
-        m_node_get.return_value = node1
+        m_node_get.return_value = [node1]
         m_extract.return_value = policy_data
         policy = lb_policy.LoadBalancingPolicy('test-policy', self.spec)
         policy._lbaasclient = self.lb_driver
@@ -1060,9 +1043,10 @@ class TestLoadBalancingPolicyOperations(base.SenlinTestCase):
                                     cp, self.lb_driver)
 
         m_extract.assert_called_once_with(cp_data)
-        m_node_get.assert_called_once_with(action.context, node_id='NODE1')
+        m_node_get.assert_called_once_with(
+            action.context, filters={'id': ['NODE1']})
         m_node_update.assert_called_once_with(
-            action.context, 'NODE1', mock.ANY)
+            action.context, {'NODE1': mock.ANY})
         self.lb_driver.member_remove.assert_called_once_with(
             'LB_ID', 'POOL_ID', 'MEM_ID1')
         self.assertEqual(['NODE1'], res)
@@ -11,6 +11,7 @@
 # under the License.
 
 import mock
+from oslo_config import cfg
 from oslo_context import context as oslo_ctx
 from oslo_utils import timeutils
 import six
@@ -223,6 +224,59 @@ class TestPolicyBase(base.SenlinTestCase):
         self.assertEqual("The policy 'None' could not be found.",
                          six.text_type(ex))
 
+    def test_load_cached(self):
+        cfg.CONF.set_override('object_cache_size', 10)
+        self.addCleanup(pb.Policy._cache.clear)
+        policy = utils.create_policy(self.ctx, UUID1)
+
+        res1 = pb.Policy.load(self.ctx, policy.id)
+        with mock.patch.object(po.Policy, 'get') as mock_get:
+            res2 = pb.Policy.load(self.ctx, policy.id)
+
+        self.assertEqual(0, mock_get.call_count)
+        self.assertIsNot(res1, res2)
+        self.assertEqual(policy.id, res2.id)
+        self.assertEqual({'key1': 'value1', 'key2': 2}, res2.properties)
+
+    def test_load_cached_stale(self):
+        cfg.CONF.set_override('object_cache_size', 10)
+        self.addCleanup(pb.Policy._cache.clear)
+        policy = utils.create_policy(self.ctx, UUID1)
+        pb.Policy.load(self.ctx, policy.id)
+
+        # updated by another engine
+        po.Policy.update(self.ctx, policy.id,
+                         {'name': 'new-name',
+                          'updated_at': timeutils.utcnow(True)})
+        res = pb.Policy.load(self.ctx, policy.id)
+
+        self.assertEqual('new-name', res.name)
+
+    def test_load_cached_diff_project(self):
+        cfg.CONF.set_override('object_cache_size', 10)
+        self.addCleanup(pb.Policy._cache.clear)
+        policy = utils.create_policy(self.ctx, UUID1)
+        pb.Policy.load(self.ctx, policy.id)
+
+        new_ctx = utils.dummy_context(project='a-different-project')
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Policy.load,
+                          new_ctx, policy.id, None)
+
+    def test_delete_cached(self):
+        cfg.CONF.set_override('object_cache_size', 10)
+        self.addCleanup(pb.Policy._cache.clear)
+        policy = utils.create_policy(self.ctx, UUID1)
+        pb.Policy.load(self.ctx, policy.id)
+        self.assertEqual(1, len(pb.Policy._cache))
+
+        pb.Policy.delete(self.ctx, policy.id)
+
+        self.assertEqual(0, len(pb.Policy._cache))
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Policy.load,
+                          self.ctx, policy.id, None)
+
     def test_delete(self):
         policy = utils.create_policy(self.ctx, UUID1)
         policy_id = policy.id
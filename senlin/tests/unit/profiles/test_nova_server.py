@@ -11,6 +11,7 @@
 # under the License.
 
 import base64
+import copy
 
 import mock
 from oslo_utils import encodeutils
@@ -1369,6 +1370,84 @@ class TestNovaServerBasic(base.SenlinTestCase):
                          six.text_type(ex))
         cc.server_get.assert_called_once_with('FAKE_ID')
 
+    def test_do_check_objects(self):
+        spec = copy.deepcopy(self.spec)
+        del spec['properties']['name']
+        profile = server.ServerProfile('t', spec)
+        cc = mock.Mock()
+        cc.server_list.return_value = [
+            mock.Mock(id='SERVER1', status='ACTIVE'),
+            mock.Mock(id='SERVER2', status='ERROR'),
+        ]
+        profile._computeclient = cc
+        nodes = []
+        for i, physical_id in enumerate(['SERVER1', 'SERVER2', 'SERVER3',
+                                         None]):
+            node = mock.Mock(id='NODE%s' % (i + 1), physical_id=physical_id,
+                             project='P')
+            node.name = 'node%s' % (i + 1)
+            nodes.append(node)
+
+        res = profile.do_check_objects(nodes)
+
+        # NODE3 is not listed, it is left for a check of its own
+        self.assertEqual({'NODE1': True, 'NODE2': False, 'NODE4': False},
+                         res)
+        cc.server_list.assert_called_once_with(
+            name='^(node1|node2|node3)$')
+
+    def test_do_check_objects_batched(self):
+        spec = copy.deepcopy(self.spec)
+        del spec['properties']['name']
+        profile = server.ServerProfile('t', spec)
+        self.patchobject(profile, 'CHECK_BATCH_SIZE', new=2)
+        cc = mock.Mock()
+        cc.server_list.side_effect = [
+            [mock.Mock(id='S1', status='ACTIVE'),
+             mock.Mock(id='S2', status='ACTIVE')],
+            [mock.Mock(id='S3', status='ACTIVE')],
+        ]
+        profile._computeclient = cc
+        nodes = []
+        for i in range(3):
+            node = mock.Mock(id='N%s' % i, physical_id='S%s' % (i + 1),
+                             project='P')
+            node.name = 'n%s' % i
+            nodes.append(node)
+
+        res = profile.do_check_objects(nodes)
+
+        self.assertEqual({'N0': True, 'N1': True, 'N2': True}, res)
+        cc.server_list.assert_has_calls([
+            mock.call(name='^(n0|n1)$'),
+            mock.call(name='^(n2)$'),
+        ])
+
+    def test_do_check_objects_server_name(self):
+        profile = server.ServerProfile('t', self.spec)
+        cc = mock.Mock()
+        cc.server_list.return_value = [mock.Mock(id='S1', status='ACTIVE')]
+        profile._computeclient = cc
+        node = mock.Mock(id='NODE1', physical_id='S1', project='P')
+        node.name = 'node-1'
+
+        res = profile.do_check_objects([node])
+
+        self.assertEqual({'NODE1': True}, res)
+        cc.server_list.assert_called_once_with(name='^(FAKE_SERVER_NAME)$')
+
+    def test_do_check_objects_failed(self):
+        profile = server.ServerProfile('t', self.spec)
+        cc = mock.Mock()
+        cc.server_list.side_effect = exc.InternalError(code=500,
+                                                       message='BOOM')
+        profile._computeclient = cc
+        node = mock.Mock(id='NODE1', physical_id='SERVER1', project='P')
+        node.name = 'node-1'
+
+        self.assertRaises(exc.InternalError,
+                          profile.do_check_objects, [node])
+
     @mock.patch.object(server.ServerProfile, 'do_delete')
     @mock.patch.object(server.ServerProfile, 'do_create')
     def test_do_recover_operation_is_none(self, mock_create, mock_delete):
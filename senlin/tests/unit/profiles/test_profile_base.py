@@ -13,7 +13,9 @@
 import copy
 
 import mock
+from oslo_config import cfg
 from oslo_context import context as oslo_ctx
+from oslo_utils import timeutils
 import six
 
 from senlin.common import context as senlin_ctx
@@ -282,6 +284,62 @@ class TestProfileBase(base.SenlinTestCase):
         mock_get.assert_called_once_with(self.ctx, 'FAKE_ID',
                                          project_safe=True)
 
+    def test_load_cached(self):
+        cfg.CONF.set_override('object_cache_size', 10)
+        self.addCleanup(pb.Profile._cache.clear)
+        obj = self._create_profile('test-profile-dd')
+        profile_id = obj.store(self.ctx)
+
+        res1 = pb.Profile.load(self.ctx, profile_id=profile_id)
+        with mock.patch.object(po.Profile, 'get') as mock_get:
+            res2 = pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        self.assertEqual(0, mock_get.call_count)
+        self.assertIsNot(res1, res2)
+        self.assertEqual(profile_id, res2.id)
+        self.assertEqual('test-profile-dd', res2.name)
+
+    def test_load_cached_stale(self):
+        cfg.CONF.set_override('object_cache_size', 10)
+        self.addCleanup(pb.Profile._cache.clear)
+        obj = self._create_profile('test-profile-ee')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        # updated by another engine
+        po.Profile.update(self.ctx, profile_id,
+                          {'name': 'new-name',
+                           'updated_at': timeutils.utcnow(True)})
+        res = pb.Profile.load(self.ctx, profile_id=profile_id)
+
+        self.assertEqual('new-name', res.name)
+
+    def test_load_cached_invalidated(self):
+        cfg.CONF.set_override('object_cache_size', 10)
+        self.addCleanup(pb.Profile._cache.clear)
+        obj = self._create_profile('test-profile-ff')
+        profile_id = obj.store(self.ctx)
+        pb.Profile.load(self.ctx, profile_id=profile_id)
+        self.assertEqual(1, len(pb.Profile._cache))
+
+        obj.name = 'new-name'
+        obj.store(self.ctx)
+
+        self.assertEqual(0, len(pb.Profile._cache))
+        res = pb.Profile.load(self.ctx, profile_id=profile_id)
+        self.assertEqual('new-name', res.name)
+
+    @mock.patch.object(po.Profile, 'get_version')
+    def test_load_cached_not_found(self, mock_version):
+        cfg.CONF.set_override('object_cache_size', 10)
+        mock_version.return_value = None
+
+        self.assertRaises(exception.ResourceNotFound,
+                          pb.Profile.load,
+                          self.ctx, profile_id='FAKE_ID')
+        mock_version.assert_called_once_with(self.ctx, 'FAKE_ID',
+                                             project_safe=True)
+
     @mock.patch.object(senlin_ctx, 'get_service_credentials')
     def test_create(self, mock_creds):
         mock_creds.return_value = {}
@@ -420,6 +478,24 @@ class TestProfileBase(base.SenlinTestCase):
         res_obj = profile.do_check.return_value
         self.assertEqual(res_obj, res)
 
+    @mock.patch.object(pb.Profile, 'load')
+    def test_check_objects(self, mock_load):
+        profile1 = mock.Mock()
+        profile1.do_check_objects.return_value = {'NODE1': True}
+        profile2 = mock.Mock()
+        profile2.do_check_objects.side_effect = Exception('BOOM')
+        profiles = {'PROFILE1': profile1, 'PROFILE2': profile2}
+        mock_load.side_effect = lambda ctx, profile_id: profiles[profile_id]
+        obj1 = mock.Mock(id='NODE1', profile_id='PROFILE1')
+        obj2 = mock.Mock(id='NODE2', profile_id='PROFILE2')
+
+        res = pb.Profile.check_objects(self.ctx, [obj1, obj2])
+
+        self.assertEqual({'NODE1': True}, res)
+        self.assertEqual(2, mock_load.call_count)
+        profile1.do_check_objects.assert_called_once_with([obj1])
+        profile2.do_check_objects.assert_called_once_with([obj2])
+
     @mock.patch.object(pb.Profile, 'load')
     def test_delete_object(self, mock_load):
         profile = mock.Mock()
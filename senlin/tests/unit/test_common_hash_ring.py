@@ -0,0 +1,64 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from senlin.common import hash_ring
+from senlin.tests.unit.common import base
+
+
+class TestHashRing(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TestHashRing, self).setUp()
+        self.keys = ['cluster-%s' % i for i in range(1000)]
+
+    def _assign(self, ring):
+        return dict((key, ring.get_member(key)) for key in self.keys)
+
+    def test_empty(self):
+        ring = hash_ring.HashRing([])
+
+        self.assertIsNone(ring.get_member('cluster-0'))
+
+    def test_stable(self):
+        ring1 = hash_ring.HashRing(['E1', 'E2', 'E3'])
+        ring2 = hash_ring.HashRing(['E3', 'E1', 'E2'])
+
+        self.assertEqual(self._assign(ring1), self._assign(ring2))
+
+    def test_balanced(self):
+        ring = hash_ring.HashRing(['E1', 'E2', 'E3', 'E4'])
+
+        assigned = list(self._assign(ring).values())
+
+        for member in ('E1', 'E2', 'E3', 'E4'):
+            # each member gets a fair share of the keys
+            self.assertTrue(150 < assigned.count(member) < 350)
+
+    def test_member_added(self):
+        before = self._assign(hash_ring.HashRing(['E1', 'E2', 'E3']))
+        after = self._assign(hash_ring.HashRing(['E1', 'E2', 'E3', 'E4']))
+
+        moved = [key for key in self.keys if before[key] != after[key]]
+
+        # only the keys taken over by the new member move
+        self.assertTrue(all(after[key] == 'E4' for key in moved))
+        self.assertTrue(150 < len(moved) < 350)
+
+    def test_member_removed(self):
+        before = self._assign(hash_ring.HashRing(['E1', 'E2', 'E3']))
+        after = self._assign(hash_ring.HashRing(['E1', 'E3']))
+
+        moved = [key for key in self.keys if before[key] != after[key]]
+
+        # only the keys of the removed member move
+        self.assertTrue(all(before[key] == 'E2' for key in moved))
+        self.assertEqual(list(before.values()).count('E2'), len(moved))
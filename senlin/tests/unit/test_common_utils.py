@@ -10,7 +10,6 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import datetime
 import mock
 from oslo_log import log as logging
 from oslo_utils import timeutils
@@ -239,37 +238,66 @@ class EngineDeathTest(base.SenlinTestCase):
         super(EngineDeathTest, self).setUp()
         self.ctx = mock.Mock()
 
-    @mock.patch.object(service_obj.Service, 'get')
-    def test_engine_is_none(self, mock_service):
-        mock_service.return_value = None
-        self.assertTrue(utils.is_engine_dead(self.ctx, 'fake_engine_id'))
-        mock_service.assert_called_once_with(self.ctx, 'fake_engine_id')
-
-    @mock.patch.object(service_obj.Service, 'get')
+    @mock.patch.object(service_obj.Service, 'get_live_ids')
     def test_engine_is_dead(self, mock_service):
-        delta = datetime.timedelta(seconds=3 * cfg.CONF.periodic_interval)
-        update_time = timeutils.utcnow(True) - delta
-        mock_service.return_value = mock.Mock(updated_at=update_time)
+        mock_service.return_value = ['another_engine_id']
 
         res = utils.is_engine_dead(self.ctx, 'fake_engine_id')
 
         self.assertTrue(res)
-        mock_service.assert_called_once_with(self.ctx, 'fake_engine_id')
+        mock_service.assert_called_once_with(
+            self.ctx, 2 * cfg.CONF.periodic_interval)
 
-    @mock.patch.object(service_obj.Service, 'get')
+    @mock.patch.object(service_obj.Service, 'get_live_ids')
     def test_engine_is_alive(self, mock_svc):
-        mock_svc.return_value = mock.Mock(updated_at=timeutils.utcnow(True))
+        mock_svc.return_value = ['fake_engine_id']
 
         res = utils.is_engine_dead(self.ctx, 'fake_engine_id')
 
         self.assertFalse(res)
-        mock_svc.assert_called_once_with(self.ctx, 'fake_engine_id')
+        mock_svc.assert_called_once_with(
+            self.ctx, 2 * cfg.CONF.periodic_interval)
 
-    @mock.patch.object(service_obj.Service, 'get')
+    @mock.patch.object(service_obj.Service, 'get_live_ids')
     def test_use_specified_duration(self, mock_svc):
-        mock_svc.return_value = mock.Mock(updated_at=timeutils.utcnow(True))
+        mock_svc.return_value = ['fake_engine_id']
 
         res = utils.is_engine_dead(self.ctx, 'fake_engine_id', 10000)
 
         self.assertFalse(res)
-        mock_svc.assert_called_once_with(self.ctx, 'fake_engine_id')
+        mock_svc.assert_called_once_with(self.ctx, 10000)
+
+    @mock.patch.object(service_obj.Service, 'get_live_ids')
+    def test_live_engines_cached(self, mock_svc):
+        cfg.CONF.set_override('live_engine_cache_ttl', 60)
+        self.addCleanup(utils._LIVE_ENGINES.clear)
+        mock_svc.return_value = ['fake_engine_id']
+
+        self.assertFalse(utils.is_engine_dead(self.ctx, 'fake_engine_id'))
+        self.assertFalse(utils.is_engine_dead(self.ctx, 'fake_engine_id'))
+
+        self.assertEqual(1, mock_svc.call_count)
+
+    @mock.patch.object(service_obj.Service, 'get_live_ids')
+    def test_live_engines_cache_expired(self, mock_svc):
+        cfg.CONF.set_override('live_engine_cache_ttl', 60)
+        self.addCleanup(utils._LIVE_ENGINES.clear)
+        mock_svc.side_effect = [['engine_1'], ['engine_2']]
+        now = timeutils.now()
+        self.patchobject(timeutils, 'now', side_effect=[now, now + 61])
+
+        res = utils.get_live_engines(self.ctx)
+        self.assertEqual(frozenset(['engine_1']), res)
+        res = utils.get_live_engines(self.ctx)
+        self.assertEqual(frozenset(['engine_2']), res)
+
+    @mock.patch.object(service_obj.Service, 'get_live_ids')
+    def test_engine_not_cached_checked_again(self, mock_svc):
+        cfg.CONF.set_override('live_engine_cache_ttl', 60)
+        self.addCleanup(utils._LIVE_ENGINES.clear)
+        mock_svc.side_effect = [['another_engine_id'], ['fake_engine_id']]
+
+        res = utils.is_engine_dead(self.ctx, 'fake_engine_id')
+
+        self.assertFalse(res)
+        self.assertEqual(2, mock_svc.call_count)